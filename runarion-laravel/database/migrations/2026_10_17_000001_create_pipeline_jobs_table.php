@@ -0,0 +1,57 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    /**
+     * Run the migrations.
+     *
+     * Creates the pipeline_jobs table backing the Python service's background
+     * job executor. Deconstructor, novel writer and full novel pipeline runs
+     * are enqueued here instead of being started on ad-hoc threads, so the
+     * number of concurrent runs is bounded per job type, workspaces are served
+     * fairly, and runs interrupted by a worker restart are picked up again.
+     */
+    public function up(): void
+    {
+        Schema::create('pipeline_jobs', function (Blueprint $table) {
+            $table->ulid('id')->primary();
+
+            $table->string('job_type')->comment('deconstruct, novel_writer, novel_pipeline');
+            $table->ulid('workspace_id')->nullable()->comment('Used for per-workspace fairness');
+            $table->json('payload')->comment('Arguments needed to rebuild and run the job');
+
+            $table->string('status')->default('queued')->comment('queued, running, completed, failed');
+            $table->smallInteger('attempts')->default(0);
+            $table->smallInteger('max_attempts')->default(1)->comment('Runs allowed, including recoveries');
+
+            // Owning worker process and liveness
+            $table->string('worker_id')->nullable()->comment('host:pid:token of the executor running the job');
+            $table->timestamp('heartbeat_at')->nullable();
+
+            $table->text('error_message')->nullable();
+
+            // Timing
+            $table->timestamp('queued_at')->useCurrent()->comment('Enqueue or requeue time, for wait-time metrics');
+            $table->timestamp('started_at')->nullable();
+            $table->timestamp('finished_at')->nullable();
+
+            $table->timestamps();
+
+            // Indexes for claim, recovery and fairness queries
+            $table->index(['job_type', 'status', 'queued_at']);
+            $table->index(['status', 'heartbeat_at']);
+            $table->index(['workspace_id', 'status']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('pipeline_jobs');
+    }
+};
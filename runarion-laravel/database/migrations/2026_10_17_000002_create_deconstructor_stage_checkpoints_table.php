@@ -0,0 +1,39 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    /**
+     * Run the migrations.
+     *
+     * Stores one row per completed deconstructor stage run. A checkpoint is
+     * valid while its input_hash matches the inputs of the next run (request
+     * parameters plus the versions of upstream checkpoints), which lets an
+     * interrupted or failed pipeline resume without re-running paid stages.
+     */
+    public function up(): void
+    {
+        Schema::create('deconstructor_stage_checkpoints', function (Blueprint $table) {
+            $table->id();
+            $table->ulid('draft_id');
+            $table->string('stage', 8)->comment('1, 2, 3, 4a, 4b, 4c, 5, 6, 7');
+            $table->integer('version')->comment('Increments each time the stage is re-run for the draft');
+            $table->string('input_hash', 64)->comment('sha256 of stage inputs and upstream checkpoint versions');
+            $table->json('result')->nullable()->comment('Stage result returned when the stage is skipped');
+            $table->timestamps();
+
+            $table->foreign('draft_id')->references('id')->on('drafts')->onDelete('cascade');
+            $table->unique(['draft_id', 'stage', 'version']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('deconstructor_stage_checkpoints');
+    }
+};
@@ -0,0 +1,41 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    /**
+     * Run the migrations.
+     *
+     * Caches the partial style of a sample chunk, keyed by a hash of the
+     * chunk text, provider, model, prompt template and generation config.
+     * Re-profiling an author style, or profiling a sample shared between
+     * styles, reuses these rows instead of calling the LLM again.
+     */
+    public function up(): void
+    {
+        Schema::create('author_style_partial_cache', function (Blueprint $table) {
+            $table->id();
+            $table->string('cache_key', 64)->comment('sha256 of chunk text hash, provider, model, prompt version and generation config');
+            $table->ulid('author_sample_id')->nullable()->comment('Sample the chunk was first analyzed from');
+            $table->text('provider');
+            $table->text('model');
+            $table->text('style_text')->comment('LLM partial style response, without the passage title');
+            $table->integer('style_text_token_count');
+            $table->integer('processing_time_ms')->comment('LLM time of the original call');
+            $table->timestamps();
+
+            $table->foreign('author_sample_id')->references('id')->on('author_samples')->nullOnDelete();
+            $table->unique(['cache_key']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('author_style_partial_cache');
+    }
+};
@@ -12,6 +12,7 @@ import json
 import os
 from google import genai
 from google.genai.types import GenerateContentConfig, SafetySetting, HarmCategory, HarmBlockThreshold, ThinkingConfig
+from src.utils.rate_limiter import Priority, get_rate_limiter
 
 advisor = Blueprint("advisor", __name__)
 
@@ -79,6 +80,38 @@ def get_gemini_client():
     return genai.Client(api_key=api_key)
 
 
+def acquire_rate_limit(model_name: str, full_system: str, gemini_history: list, max_tokens: int):
+    """
+    Wait for an advisor call's share of the Gemini rate limits.
+
+    Advisor calls bypass GenerationEngine, so they take their reservation
+    here, ahead of any queued pipeline calls.
+    """
+    limiter = get_rate_limiter()
+    tokens = 0
+    if limiter.limits_tokens("gemini"):
+        history_text = "\n".join(
+            part.get("text", "") for message in gemini_history for part in message.get("parts", [])
+        )
+        tokens = limiter.count_tokens("gemini", model_name, f"{full_system}\n{history_text}") + max_tokens
+    return limiter.acquire("gemini", model_name, os.getenv("GEMINI_API_KEY"), tokens, priority=Priority.INTERACTIVE)
+
+
+def _settle_on_finish(stream, reservation):
+    """Pass a Gemini stream through, settling its reservation with the reported usage."""
+    total_tokens = None
+    try:
+        for chunk in stream:
+            usage = getattr(chunk, "usage_metadata", None)
+            total_tokens = getattr(usage, "total_token_count", None) or total_tokens
+            yield chunk
+    except Exception as e:
+        reservation.settle(error_message=str(e))
+        raise
+    finally:
+        reservation.settle(actual_tokens=total_tokens)
+
+
 @advisor.route("/advisor/chat", methods=["POST"])
 def advisor_chat():
     """
@@ -150,6 +183,7 @@ def advisor_chat():
                 # Stream the response
                 current_app.logger.info(f"Starting Gemini streaming with model: {model_config['model_name']}")
                 
+                reservation = acquire_rate_limit(model_config["model_name"], full_system, gemini_history, actual_max_tokens)
                 stream = client.models.generate_content_stream(
                     model=model_config["model_name"],
                     contents=gemini_history,
@@ -159,7 +193,7 @@ def advisor_chat():
                 total_chars = 0
                 chunk_count = 0
                 
-                for chunk in stream:
+                for chunk in _settle_on_finish(stream, reservation):
                     try:
                         text = None
                         
@@ -280,11 +314,18 @@ def advisor_chat_sync():
             thinking_config=thinking_config,
         )
         
-        response = client.models.generate_content(
-            model=model_config["model_name"],
-            contents=gemini_history,
-            config=gen_config,
-        )
+        reservation = acquire_rate_limit(model_config["model_name"], full_system, gemini_history, max_tokens)
+        try:
+            response = client.models.generate_content(
+                model=model_config["model_name"],
+                contents=gemini_history,
+                config=gen_config,
+            )
+        except Exception as e:
+            reservation.settle(error_message=str(e))
+            raise
+        usage = getattr(response, "usage_metadata", None)
+        reservation.settle(actual_tokens=getattr(usage, "total_token_count", None))
         
         # Extract text from response
         response_text = ""
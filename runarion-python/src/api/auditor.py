@@ -4,12 +4,27 @@ Auditor API - Flask blueprint for manuscript analysis and summarization
 
 from flask import Blueprint, request, jsonify, current_app
 import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
 from typing import Dict, Any, List
 
+from src.utils.progress_events import progress_stream_response, publish_progress
+
 logger = logging.getLogger(__name__)
 
 auditor = Blueprint('auditor', __name__)
 
+# Terminal event of a streamed relationship extraction
+RELATIONSHIP_EXTRACTION_EVENT = 'relationship_extraction'
+
+# Streamed extractions whose state is kept for the fetch and resume routes
+# (oldest evicted first); the state lives in the process running the extraction
+RELATIONSHIP_EXTRACTIONS_KEPT = int(os.getenv('RELATIONSHIP_EXTRACTIONS_KEPT', '64'))
+_extractions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_extractions_lock = threading.Lock()
+
 
 def get_auditor_service():
     """Get AuditorService instance from app config."""
@@ -952,7 +967,8 @@ def extract_relationships():
         "character_ids": [123, 456],  // Optional - vertex IDs to focus on (null = all)
         "chapter_orders": [0, 1, 2],  // Optional - chapters to analyze (null = all)
         "model": "gemini-2.5-flash",
-        "provider": "gemini"
+        "provider": "gemini",
+        "extraction_mode": "per_character"  // Optional - or "batched" (one request per chapter for all characters)
     }
     
     Returns:
@@ -989,6 +1005,7 @@ def extract_relationships():
         model = data.get('model', 'gemini-2.5-flash')
         provider = data.get('provider', 'gemini')
         focus_mode = data.get('focus_mode', 'all')  # 'all', 'selected', or '1-to-1'
+        extraction_mode = data.get('extraction_mode', 'per_character')  # 'per_character' or 'batched'
         
         if not project_id:
             return jsonify({'error': 'project_id required'}), 400
@@ -1009,7 +1026,8 @@ def extract_relationships():
             chapter_orders=chapter_orders,
             model=model,
             provider=provider,
-            focus_mode=focus_mode
+            focus_mode=focus_mode,
+            extraction_mode=extraction_mode
         )
         
         if 'error' in results:
@@ -1038,9 +1056,21 @@ def extract_relationships_v2():
         "chapter_orders": [0, 1, 2],  // Optional - chapters to analyze
         "model": "gemini-2.5-flash",
         "provider": "gemini",
-        "focus_mode": "all" | "selected" | "1-to-1"
+        "focus_mode": "all" | "selected" | "1-to-1",
+        "max_workers": 4,  // Optional - concurrent chapter analyses per pair
+        "stream": false  // Optional - stream results as Server-Sent Events
     }
     
+    With "stream": true the response is a text/event-stream: one
+    chapter_analysis event (source, target, analysis) per chapter as it
+    completes, then a relationship_extraction event whose status is
+    completed or failed and whose result is the body described below.
+    The first event, extraction_started, carries the extraction_id. The
+    stream closes after PROGRESS_STREAM_MAX_SECONDS while the extraction
+    keeps running; fetch its result from
+    GET /auditor/extract-relationships-v2/<extraction_id> or resume the
+    stream from GET /auditor/extract-relationships-v2/<extraction_id>/events.
+    
     Returns:
     {
         "success": true,
@@ -1101,16 +1131,22 @@ def extract_relationships_v2():
         
         sentiment_service = get_sentiment_service()
         
-        results = sentiment_service.extract_relationships_v2(
+        extraction_args = dict(
             project_id=project_id,
             workspace_id=workspace_id,
             character_ids=character_ids,
             chapter_orders=chapter_orders,
             model=model,
             provider=provider,
-            focus_mode=focus_mode
+            focus_mode=focus_mode,
+            max_workers=data.get('max_workers')
         )
         
+        if data.get('stream'):
+            return _stream_relationship_extraction(sentiment_service, extraction_args)
+        
+        results = sentiment_service.extract_relationships_v2(**extraction_args)
+        
         if 'error' in results:
             return jsonify({'error': results['error']}), 400
         
@@ -1121,6 +1157,101 @@ def extract_relationships_v2():
         return jsonify({'error': str(e)}), 500
 
 
+def _stream_relationship_extraction(sentiment_service, extraction_args: Dict[str, Any]):
+    """Run extract_relationships_v2 on a thread and stream its chapter results over SSE."""
+    extraction_id = str(uuid.uuid4())
+    started = {'run_key': extraction_id, 'event': 'extraction_started', 'extraction_id': extraction_id}
+    response = progress_stream_response(
+        [extraction_id], initial_events=[started], is_terminal=_is_terminal_extraction_event
+    )
+    if isinstance(response, tuple):
+        return response  # No stream slot available
+    
+    flask_app = current_app._get_current_object()
+    _record_extraction(extraction_id, status='running')
+    
+    def publish_chapter(source, target, analysis):
+        publish_progress(extraction_id, 'chapter_analysis', source=source, target=target, analysis=analysis)
+    
+    def run():
+        with flask_app.app_context():
+            try:
+                results = sentiment_service.extract_relationships_v2(
+                    **extraction_args, on_chapter_result=publish_chapter
+                )
+                status = 'failed' if 'error' in results else 'completed'
+            except Exception as e:
+                logger.error(f"Streamed relationship extraction failed: {e}", exc_info=True)
+                results, status = {'error': str(e), 'success': False}, 'failed'
+            # Stored before publishing, so a resumed stream that misses the event finds the result
+            _record_extraction(extraction_id, status=status, result=results)
+            publish_progress(extraction_id, RELATIONSHIP_EXTRACTION_EVENT, status=status, result=results)
+    
+    threading.Thread(target=run, name=f"relationship-extraction-{extraction_id[:8]}", daemon=True).start()
+    return response
+
+
+def _record_extraction(extraction_id: str, **state) -> None:
+    with _extractions_lock:
+        _extractions[extraction_id] = {'extraction_id': extraction_id, **state}
+        _extractions.move_to_end(extraction_id)
+        while len(_extractions) > max(1, RELATIONSHIP_EXTRACTIONS_KEPT):
+            _extractions.popitem(last=False)
+
+
+def _get_extraction(extraction_id: str):
+    with _extractions_lock:
+        return _extractions.get(extraction_id)
+
+
+def _is_terminal_extraction_event(event: dict) -> bool:
+    return event.get('event') == RELATIONSHIP_EXTRACTION_EVENT
+
+
+@auditor.route('/auditor/extract-relationships-v2/<extraction_id>', methods=['GET'])
+def get_relationship_extraction(extraction_id: str):
+    """
+    Get the state of a streamed relationship extraction.
+    
+    Returns:
+    {
+        "extraction_id": "uuid",
+        "status": "running" | "completed" | "failed",
+        "result": {...}  // Once finished - the extract-relationships-v2 body
+    }
+    """
+    extraction = _get_extraction(extraction_id)
+    if extraction is None:
+        return jsonify({'error': 'Extraction not found'}), 404
+    return jsonify(extraction), 200
+
+
+@auditor.route('/auditor/extract-relationships-v2/<extraction_id>/events', methods=['GET'])
+def resume_relationship_extraction(extraction_id: str):
+    """
+    Resume the event stream of a streamed relationship extraction.
+    
+    Replays the recent chapter_analysis events and streams the rest; a
+    finished extraction sends its relationship_extraction event at once.
+    """
+    extraction = _get_extraction(extraction_id)
+    if extraction is None:
+        return jsonify({'error': 'Extraction not found'}), 404
+    
+    if extraction['status'] == 'running':
+        initial_events = [{'run_key': extraction_id, 'event': 'extraction_started', 'extraction_id': extraction_id}]
+    else:
+        initial_events = [{
+            'run_key': extraction_id,
+            'event': RELATIONSHIP_EXTRACTION_EVENT,
+            'status': extraction['status'],
+            'result': extraction.get('result'),
+        }]
+    return progress_stream_response(
+        [extraction_id], initial_events=initial_events, is_terminal=_is_terminal_extraction_event
+    )
+
+
 @auditor.route('/auditor/relationship/<int:edge_id>/chapter-analyses', methods=['PUT'])
 def update_chapter_analyses(edge_id: int):
     """
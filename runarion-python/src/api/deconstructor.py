@@ -6,12 +6,13 @@ Handles document upload and pipeline processing requests.
 import json
 import os
 import uuid
-import threading
 from flask import Blueprint, request, current_app
 from werkzeug.utils import secure_filename
 
+from src.models.deconstructor.status import DraftStatus
 from src.services.deconstructor.orchestrator import DeconstructorOrchestrator
 from src.services.generation_engine import GenerationEngine
+from src.services.job_executor import mark_draft_failed, register_job_type, submit_job
 from src.models.request import (
     BaseGenerationRequest,
     CallerInfo,
@@ -20,11 +21,50 @@ from src.models.request import (
 )
 from src.utils.api_response import DeconstructorResponse, validation_error, internal_error, error
 from src.utils.logging_config import get_pipeline_logger
+from src.utils.progress_events import progress_stream_response, progress_timestamp
 
 logger = get_pipeline_logger(__name__)
 
 deconstruct = Blueprint("deconstruct", __name__)
 
+DECONSTRUCT_JOB = 'deconstruct'
+
+
+def _run_deconstruct_job(payload, context):
+    """Run a queued deconstruction pipeline; a retried run resumes from its stage checkpoints."""
+    generation_request = BaseGenerationRequest(**payload['generation_request'])
+    orchestrator = DeconstructorOrchestrator(
+        generation_engine=GenerationEngine(generation_request),
+        db_pool=context.db_pool
+    )
+    if context.is_retry:
+        logger.info("Resuming interrupted deconstruction pipeline", draft_id=payload['draft_id'])
+        run = orchestrator.resume_from_stage
+    else:
+        run = orchestrator.run_pipeline
+
+    run(
+        draft_id=payload['draft_id'],
+        file_name=payload['file_name'],
+        chaptering_mode=payload['chaptering_mode'],
+        target_chapter_length=payload['target_chapter_length'],
+        config=payload['config'],
+    )
+
+
+def _fail_deconstruct_job(payload, error_message, db_pool):
+    mark_draft_failed(db_pool, payload.get('draft_id'), DraftStatus.FAILED.value, error_message)
+
+
+register_job_type(
+    DECONSTRUCT_JOB,
+    _run_deconstruct_job,
+    max_workers=2,
+    max_attempts=2,
+    on_failure=_fail_deconstruct_job
+)
+
+
 @deconstruct.route('/deconstruct', methods=['POST'])
 def start_deconstruction():
     """
@@ -42,6 +82,7 @@ def start_deconstruction():
         "chaptering_mode": "flexible",  // optional: "flexible" or "constrained"
         "target_chapter_length": 2500,  // optional: target words per chapter
         "rewrite_policy": {},           // optional
+        "chunk_pipelining": true,       // optional: run Stages 2+3 per chunk (default: env)
         "generation_config": {}         // optional
     }
     """
@@ -177,28 +218,23 @@ def start_deconstruction():
             generation_config=generation_config,
         )
         
-        # Create generation engine
-        generation_engine = GenerationEngine(generation_request)
+        pipeline_config = {'rewrite_policy': rewrite_policy}
+        if 'chunk_pipelining' in data:
+            pipeline_config['chunk_pipelining'] = bool(data['chunk_pipelining'])
         
-        # Create orchestrator
-        orchestrator = DeconstructorOrchestrator(
-            generation_engine=generation_engine,
-            db_pool=connection_pool
-        )
-        
-        # Start processing in background thread with chaptering parameters
-        processing_thread = threading.Thread(
-            target=orchestrator.run_pipeline,
-            kwargs={
+        # Queue processing on the bounded job executor with chaptering parameters
+        submit_job(
+            DECONSTRUCT_JOB,
+            {
                 'draft_id': draft_id,
                 'file_name': file_name,
                 'chaptering_mode': chaptering_mode,
                 'target_chapter_length': target_chapter_length,
-                'config': {'rewrite_policy': rewrite_policy},
+                'config': pipeline_config,
+                'generation_request': generation_request.model_dump(),
             },
-            daemon=True
+            workspace_id=workspace_id
         )
-        processing_thread.start()
         
         logger.info("Started deconstruction pipeline", draft_id=draft_id)
         
@@ -265,6 +301,68 @@ def get_deconstruction_status(draft_id):
         logger.error("Error getting deconstruction status", error=str(e), draft_id=draft_id)
         return internal_error('Internal server error')
 
+@deconstruct.route('/deconstruct/events/<draft_id>', methods=['GET'])
+def stream_deconstruction_events(draft_id):
+    """
+    Stream pipeline progress as Server-Sent Events.
+
+    Sends the current status once, then stage_start / stage_complete /
+    item_progress / status events as the pipeline publishes them, until
+    the draft completes or fails. Replaces polling /deconstruct/status.
+    """
+    try:
+        user_id = request.args.get('user_id')
+        
+        if not user_id:
+            return validation_error({'user_id': ['user_id is required as query parameter']})
+        
+        connection_pool = current_app.config.get('CONNECTION_POOL')
+        if not connection_pool:
+            return internal_error('Database connection not available')
+        
+        # Taken before the read so replayed terminal events of earlier attempts can be dropped
+        snapshot_time = progress_timestamp()
+        conn = None
+        try:
+            conn = connection_pool.getconn()
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT d.status, d.error_message
+                    FROM drafts d
+                    INNER JOIN workspace_members wm ON d.workspace_id = wm.workspace_id
+                    WHERE d.id = %s AND wm.user_id = %s
+                """, (draft_id, user_id))
+                
+                result = cursor.fetchone()
+                
+                if not result:
+                    return DeconstructorResponse.permission_denied(draft_id)
+                
+                status, error_message = result
+                progress_info = _get_pipeline_progress(cursor, draft_id, status)
+        finally:
+            if conn:
+                connection_pool.putconn(conn)
+        
+        snapshot = {
+            'run_key': draft_id,
+            'event': 'status',
+            'timestamp': snapshot_time,
+            'status': status,
+            'error_message': error_message,
+            'progress': progress_info,
+        }
+        return progress_stream_response([draft_id], [snapshot], _is_terminal_draft_event)
+        
+    except Exception as e:
+        logger.error("Error streaming deconstruction events", error=str(e), draft_id=draft_id)
+        return internal_error('Internal server error')
+
+def _is_terminal_draft_event(event):
+    return event.get('event') == 'status' and event.get('status') in (
+        DraftStatus.COMPLETED.value, DraftStatus.FAILED.value
+    )
+
 def _get_pipeline_progress(cursor, draft_id, status):
     """
     Get detailed progress information for the pipeline.
@@ -294,14 +392,13 @@ def _get_pipeline_progress(cursor, draft_id, status):
     
     # Get count information for completed stages
     try:
-        cursor.execute("SELECT COUNT(*) FROM draft_chunks WHERE draft_id = %s", (draft_id,))
-        chunk_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM scenes WHERE draft_id = %s", (draft_id,))
-        scene_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM plot_issues WHERE draft_id = %s", (draft_id,))
-        issue_count = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM draft_chunks WHERE draft_id = %(draft_id)s),
+                (SELECT COUNT(*) FROM scenes WHERE draft_id = %(draft_id)s),
+                (SELECT COUNT(*) FROM plot_issues WHERE draft_id = %(draft_id)s)
+        """, {'draft_id': draft_id})
+        chunk_count, scene_count, issue_count = cursor.fetchone()
         
         # cursor.execute("SELECT COUNT(*) FROM analysis_reports WHERE draft_id = %s", (draft_id,))
         # report_count = cursor.fetchone()[0]
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 import json
+import os
 import traceback
 from pydantic import ValidationError
 from src.models.request import BaseGenerationRequest
@@ -10,9 +11,20 @@ from src.services.usecase_handler.graph_layout_handler import GraphLayoutHandler
 from src.services.conversation_manager import ConversationManager
 from src.models.response import BaseGenerationResponse
 from src.models.story_generation.prompt_config import PromptConfig
+from src.utils.rate_limiter import Priority, set_request_priority
 
 generate = Blueprint("generate", __name__)
 
+# Most recent conversation messages sent to Gemini as history (0 = full history)
+CONVERSATION_HISTORY_LIMIT = int(os.getenv("CONVERSATION_HISTORY_LIMIT", "0"))
+
+
+@generate.before_request
+def _prioritize_editor_generation():
+    # A user is waiting on these calls; they go ahead of batch pipelines
+    set_request_priority(Priority.INTERACTIVE)
+
+
 USECASE_MAP = {
     "mock" : MockHandler(),
     "story": StoryHandler(),
@@ -201,7 +213,10 @@ def stream_text_route():
                     # Load conversation history (non-blocking)
                     messages = []
                     try:
-                        messages = conversation_manager.load_history(project_id)
+                        messages = conversation_manager.load_history(
+                            project_id,
+                            limit=CONVERSATION_HISTORY_LIMIT or None
+                        )
                     except Exception as e:
                         current_app.logger.warning(f"Failed to load conversation history for project {project_id}: {e}. Using prompt-only mode.")
                         messages = []
@@ -219,14 +234,15 @@ def stream_text_route():
                                     current_app.logger.info(f"Skipping duplicate user prompt for project {project_id}")
                             
                             if should_append:
-                                conversation_manager.append_message(
+                                appended = conversation_manager.append_message(
                                     project_id=project_id,
                                     role="user",
                                     content=user_prompt,
                                     chapter_order=chapter_order
                                 )
-                                # Reload to get updated history
-                                messages = conversation_manager.load_history(project_id)
+                                # Extend the loaded history locally instead of reloading it
+                                if appended:
+                                    messages = messages + [{"role": "user", "content": user_prompt}]
                         except Exception as e:
                             current_app.logger.warning(f"Failed to append message for project {project_id}: {e}. Using current history.")
                             # Continue with existing messages if append fails
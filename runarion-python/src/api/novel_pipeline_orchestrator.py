@@ -24,7 +24,6 @@ Endpoints:
 import json
 import logging
 import os
-import threading
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
@@ -46,6 +45,7 @@ from src.models.request import (
 )
 from src.services.deconstructor.orchestrator import DeconstructorOrchestrator
 from src.services.generation_engine import GenerationEngine
+from src.services.job_executor import mark_draft_failed, register_job_type, submit_job
 from src.services.novel_writer.orchestrator import NovelWriterOrchestrator
 from src.services.style_analyzer import ProfilingStage, SamplingStage, StyleAnalyzerOrchestrator
 from src.utils.api_response import (
@@ -54,11 +54,15 @@ from src.utils.api_response import (
     internal_error,
     validation_error,
 )
+from src.utils.progress_events import progress_stream_response, progress_timestamp, publish_progress
 
 logger = logging.getLogger(__name__)
 
 novel_pipeline = Blueprint("novel_pipeline", __name__)
 
+# Progress event published on every pipeline_runs update
+PIPELINE_RUN_EVENT = 'pipeline_run'
+
 # ---------------------------------------------------------------------------
 # Pydantic request models
 # ---------------------------------------------------------------------------
@@ -75,6 +79,8 @@ class StyleAnalyzerConfig(BaseModel):
     provider: Optional[str] = None
     model: Optional[str] = None
     max_output_tokens: Optional[int] = None
+    max_workers: Optional[int] = None
+    use_partial_style_cache: Optional[bool] = None
     generation_config: dict = Field(default_factory=dict)
     phase_start_delay_seconds: Optional[int] = None
 
@@ -189,6 +195,8 @@ def _build_pipeline_payload(
             "provider": data.style_analyzer_config.provider or data.provider,
             "model": data.style_analyzer_config.model or data.model,
             "max_output_tokens": data.style_analyzer_config.max_output_tokens,
+            "max_workers": data.style_analyzer_config.max_workers,
+            "use_partial_style_cache": data.style_analyzer_config.use_partial_style_cache,
             "generation_config": normalized_style_generation_config,
             "phase_start_delay_seconds": (
                 data.style_analyzer_config.phase_start_delay_seconds
@@ -348,6 +356,10 @@ def _update_pipeline_run(conn, run_id: str, **fields) -> None:
             f"UPDATE pipeline_runs SET {', '.join(sets)} WHERE id = %s",
             vals,
         )
+    publish_progress(
+        run_id, PIPELINE_RUN_EVENT,
+        **{k: v for k, v in fields.items() if k in allowed and k != 'metadata'}
+    )
 
 
 def _get_pipeline_run(conn, run_id: str) -> Optional[dict]:
@@ -517,6 +529,8 @@ def _run_phase_2(author_name: str, file_paths: list,
                     max_output_tokens=style_config.max_output_tokens,
                     generation_config=style_config.generation_config,
                     min_success_partial_style=style_config.min_success_partial_style,
+                    max_workers=style_config.max_workers,
+                    use_partial_style_cache=style_config.use_partial_style_cache,
                 ),
             )
 
@@ -918,6 +932,73 @@ def _orchestrate_pipeline(run_id: str, draft_id: str,
             db_pool.putconn(conn)
 
 
+# ---------------------------------------------------------------------------
+# Background job
+# ---------------------------------------------------------------------------
+
+NOVEL_PIPELINE_JOB = 'novel_pipeline'
+
+
+def _run_novel_pipeline_job(payload: dict, context) -> None:
+    """
+    Run a queued pipeline. A retried run resumes: completed phases are
+    skipped by _claim_phase_execution, phases left 'running' by the dead
+    worker are reset so they can be claimed again.
+    """
+    run_id = payload['run_id']
+    if context.is_retry:
+        conn = context.db_pool.getconn()
+        try:
+            run = _get_pipeline_run(conn, run_id)
+            if run:
+                reset = {
+                    _phase_status_field(phase): 'pending'
+                    for phase in (1, 2, 3)
+                    if run.get(_phase_status_field(phase)) == 'running'
+                }
+                if reset:
+                    logger.info(f"[Pipeline {run_id}] Resuming interrupted run; resetting {sorted(reset)}")
+                    _update_pipeline_run(conn, run_id, **reset)
+                    conn.commit()
+        finally:
+            context.db_pool.putconn(conn)
+
+    _orchestrate_pipeline(
+        run_id=run_id,
+        draft_id=payload['draft_id'],
+        payload=payload['pipeline'],
+        db_pool=context.db_pool,
+        flask_app=current_app._get_current_object(),
+    )
+
+
+def _fail_novel_pipeline_job(payload: dict, error_message: str, db_pool) -> None:
+    conn = db_pool.getconn()
+    try:
+        _update_pipeline_run(
+            conn, payload['run_id'],
+            status='failed',
+            error_message=error_message,
+            completed_at=datetime.now().isoformat(),
+        )
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        logger.error(f"[Pipeline {payload['run_id']}] Failed to mark run as failed: {exc}")
+    finally:
+        db_pool.putconn(conn)
+    mark_draft_failed(db_pool, payload['draft_id'], DraftStatus.PIPELINE_FAILED.value, error_message[:250])
+
+
+register_job_type(
+    NOVEL_PIPELINE_JOB,
+    _run_novel_pipeline_job,
+    max_workers=2,
+    max_attempts=2,
+    on_failure=_fail_novel_pipeline_job,
+)
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -1219,22 +1300,15 @@ def start_novel_pipeline():
         # ------------------------------------------------------------------
         # 6. Kick off background orchestration
         # ------------------------------------------------------------------
-        # Capture the real Flask app object so the background thread can push
-        # its own app context — current_app proxies don't work outside requests.
-        flask_app = current_app._get_current_object()
-
-        thread = threading.Thread(
-            target=_orchestrate_pipeline,
-            kwargs=dict(
-                run_id=run_id,
-                draft_id=draft_id,
-                payload=normalized_payload,
-                db_pool=db_pool,
-                flask_app=flask_app,
-            ),
-            daemon=True,
+        submit_job(
+            NOVEL_PIPELINE_JOB,
+            {
+                'run_id': run_id,
+                'draft_id': draft_id,
+                'pipeline': normalized_payload,
+            },
+            workspace_id=workspace_id,
         )
-        thread.start()
 
         logger.info(
             f"Novel pipeline started: run_id={run_id}, draft_id={draft_id}, "
@@ -1360,6 +1434,74 @@ def get_pipeline_status(run_id: str):
         return internal_error('Internal server error')
 
 
+@novel_pipeline.route('/novel-pipeline/events/<run_id>', methods=['GET'])
+def stream_pipeline_events(run_id: str):
+    """
+    Stream a pipeline run's progress as Server-Sent Events.
+
+    Sends the run's current state once, then pipeline_run events for every
+    phase transition plus the deconstructor's stage and item progress
+    (published under the draft id), until the run completes or fails.
+
+    Query params:
+      user_id (required) — for ownership verification.
+    """
+    try:
+        user_id = request.args.get('user_id')
+        if not user_id:
+            return validation_error({'user_id': ['user_id query parameter is required']})
+
+        db_pool: Optional[SimpleConnectionPool] = current_app.config.get('CONNECTION_POOL')
+        if not db_pool:
+            return internal_error('Database connection pool not configured')
+
+        # Taken before the read so replayed terminal events of earlier attempts can be dropped
+        snapshot_time = progress_timestamp()
+        conn = db_pool.getconn()
+        try:
+            run = _get_pipeline_run(conn, run_id)
+            if not run:
+                return error('Pipeline run not found', error_code='NOT_FOUND', status_code=404)
+
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT 1 FROM workspace_members
+                    WHERE workspace_id = %s AND user_id = %s
+                    LIMIT 1
+                """, (run['workspace_id'], user_id))
+                if not cur.fetchone():
+                    return error('Access denied', error_code='FORBIDDEN', status_code=403)
+            conn.rollback()
+        finally:
+            db_pool.putconn(conn)
+
+        snapshot = {
+            'run_key': run_id,
+            'event': PIPELINE_RUN_EVENT,
+            'timestamp': snapshot_time,
+            'draft_id': run['draft_id'],
+            'status': run['status'],
+            'current_phase': run['current_phase'],
+            'phase_1_status': run['phase_1_status'],
+            'phase_2_status': run['phase_2_status'],
+            'phase_3_status': run['phase_3_status'],
+            'error_message': run['error_message'],
+            'failed_phase': run['failed_phase'],
+            'overall_percentage': _compute_overall_percentage(
+                run['status'], run['phase_1_status'], run['phase_2_status'], run['phase_3_status'],
+            ),
+        }
+        return progress_stream_response([run_id, run['draft_id']], [snapshot], _is_terminal_run_event)
+
+    except Exception as exc:
+        logger.error(f"Error streaming pipeline events for {run_id}: {exc}", exc_info=True)
+        return internal_error('Internal server error')
+
+
+def _is_terminal_run_event(event: dict) -> bool:
+    return event.get('event') == PIPELINE_RUN_EVENT and event.get('status') in ('completed', 'failed')
+
+
 def _compute_overall_percentage(status: str, p1: str, p2: str, p3: str) -> int:
     """
     Compute a rough overall pipeline completion percentage.
@@ -4,12 +4,13 @@ Handles novel generation pipeline requests.
 """
 
 import uuid
-import threading
 import logging
 from flask import Blueprint, request, current_app
 
+from src.models.deconstructor.status import DraftStatus
 from src.services.novel_writer.orchestrator import NovelWriterOrchestrator
 from src.services.generation_engine import GenerationEngine
+from src.services.job_executor import mark_draft_failed, register_job_type, submit_job
 from src.models.request import (
     BaseGenerationRequest,
     CallerInfo,
@@ -22,6 +23,33 @@ logger = logging.getLogger(__name__)
 
 rewrite_novel = Blueprint("rewrite_novel", __name__)
 
+NOVEL_WRITER_JOB = 'novel_writer'
+
+
+def _run_novel_writer_job(payload, context):
+    """Run a queued novel writer pipeline."""
+    pipeline_kwargs = dict(payload)
+    generation_request = BaseGenerationRequest(**pipeline_kwargs.pop('generation_request'))
+    orchestrator = NovelWriterOrchestrator(
+        generation_engine=GenerationEngine(generation_request),
+        db_pool=context.db_pool,
+    )
+    orchestrator.run_pipeline(**pipeline_kwargs)
+
+
+def _fail_novel_writer_job(payload, error_message, db_pool):
+    mark_draft_failed(db_pool, payload.get('draft_id'), DraftStatus.NW_FAILED.value, error_message)
+
+
+# Not retried: a partially written novel is not safe to regenerate over
+register_job_type(
+    NOVEL_WRITER_JOB,
+    _run_novel_writer_job,
+    max_workers=2,
+    max_attempts=1,
+    on_failure=_fail_novel_writer_job,
+)
+
 
 @rewrite_novel.route('/novel-writer/generate', methods=['POST'])
 def start_novel_generation():
@@ -44,6 +72,7 @@ def start_novel_generation():
         "enforce_hard_quality_gate": true,         // optional
         "hard_quality_threshold": 6.0,             // optional
         "rewrite_policy": {},                      // optional
+        "outline_first": true,                     // optional: write chapters in parallel (default: env)
         "generation_config": {}                    // optional
     }
     """
@@ -184,21 +213,18 @@ def start_novel_generation():
             generation_config=generation_config,
         )
 
-        generation_engine = GenerationEngine(generation_request)
         rewrite_policy = rewrite_policy_to_dict(
             request_rewrite_policy or draft_metadata.get('rewrite_policy')
         )
 
-        # Create orchestrator
-        orchestrator = NovelWriterOrchestrator(
-            generation_engine=generation_engine,
-            db_pool=connection_pool,
-        )
+        pipeline_config = {'rewrite_policy': rewrite_policy}
+        if 'outline_first' in data:
+            pipeline_config['outline_first'] = bool(data['outline_first'])
 
-        # Start pipeline in background thread
-        processing_thread = threading.Thread(
-            target=orchestrator.run_pipeline,
-            kwargs={
+        # Queue pipeline on the bounded job executor
+        submit_job(
+            NOVEL_WRITER_JOB,
+            {
                 'draft_id': draft_id,
                 'user_id': user_id,
                 'workspace_id': workspace_id,
@@ -209,13 +235,11 @@ def start_novel_generation():
                 'writing_perspective': writing_perspective,
                 'enforce_hard_quality_gate': enforce_hard_quality_gate,
                 'hard_quality_threshold': hard_quality_threshold,
-                'config': {
-                    'rewrite_policy': rewrite_policy,
-                },
+                'config': pipeline_config,
+                'generation_request': generation_request.model_dump(),
             },
-            daemon=True,
+            workspace_id=workspace_id,
         )
-        processing_thread.start()
 
         logger.info(f"Started novel writer pipeline for draft {draft_id}")
 
@@ -27,6 +27,8 @@ class ConfigData(BaseModel):
     model: Optional[str] = None
     max_output_tokens: Optional[int] = None
     min_success_partial_style: Optional[int | float] = None
+    max_workers: Optional[int] = None
+    use_partial_style_cache: Optional[bool] = None
 
 
 class AuthorStyleRequest(BaseModel):
@@ -116,6 +118,8 @@ def analyze_author_style():
                 max_output_tokens=data.config.max_output_tokens,
                 generation_config=data.generation_config,
                 min_success_partial_style=data.config.min_success_partial_style,
+                max_workers=data.config.max_workers,
+                use_partial_style_cache=data.config.use_partial_style_cache,
             ),
         )
 
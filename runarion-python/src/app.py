@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 import os
 import logging
 import sys
+import psycopg2
 from psycopg2 import pool
 from src.api.generation import generate
 from src.api.deconstructor import deconstruct
@@ -13,6 +14,10 @@ from src.api.novel_pipeline_orchestrator import novel_pipeline
 from src.api.records import records
 from src.api.auditor import auditor
 from src.api.advisor import advisor
+from src.services.graph_database_service import configure_age_session_pools
+from src.services.job_executor import JobExecutor, registered_job_workers
+from src.utils.progress_events import get_progress_bus
+from src.utils.rate_limiter import get_rate_limiter
 
 load_dotenv()
 
@@ -82,7 +87,11 @@ if missing_vars:
 # --- Database Connection Pool ---
 
 try:
-    connection_pool = pool.SimpleConnectionPool(
+    # Threaded: shared by request handlers, pipeline worker threads and the quota manager.
+    # Graph work opens its own AGE session pool per graph on top of this one
+    # (AGE_POOL_MAX_CONN, sized below from the registered job workers);
+    # budget Postgres max_connections for both per process.
+    connection_pool = pool.ThreadedConnectionPool(
         minconn=int(os.getenv('DB_POOL_MIN_CONN', '2')),
         maxconn=int(os.getenv('DB_POOL_MAX_CONN', '50')),
         host=os.getenv('DB_HOST'),
@@ -122,6 +131,34 @@ app.register_blueprint(records, url_prefix='/api')
 app.register_blueprint(auditor, url_prefix='/api')
 app.register_blueprint(advisor, url_prefix='/api')
 
+# --- Background Job Executor ---
+# Started after blueprint registration so every job type is registered.
+
+# AGE session pools must cover the stage workers of every job worker
+configure_age_session_pools(registered_job_workers())
+
+job_executor = None
+if connection_pool:
+    job_executor = JobExecutor(connection_pool, app=app)
+    job_executor.start()
+app.config['JOB_EXECUTOR'] = job_executor
+
+# --- Progress Events ---
+# Relay pipeline progress between worker processes over LISTEN/NOTIFY so
+# SSE streams see runs executing in any process.
+
+if connection_pool:
+    get_progress_bus().attach_database(
+        connection_pool,
+        lambda: psycopg2.connect(
+            host=os.getenv('DB_HOST'),
+            port=os.getenv('DB_PORT'),
+            database=os.getenv('DB_DATABASE'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD')
+        )
+    )
+
 # --- Health Check ---
 
 
@@ -147,6 +184,22 @@ def health_check():
         "database": db_status
     })
 
+# --- Job Metrics ---
+
+
+@app.route('/jobs/metrics', methods=['GET'])
+def job_metrics():
+    if not job_executor:
+        return jsonify({"started": False, "job_types": {}})
+    return jsonify(job_executor.get_metrics())
+
+# --- LLM Rate Limits ---
+
+
+@app.route('/llm/rate-limits', methods=['GET'])
+def llm_rate_limits():
+    return jsonify(get_rate_limiter().stats())
+
 # --- Root Endpoint ---
 
 
@@ -162,7 +215,10 @@ def root():
             "style_analysis": "/api/analyze-style",
             "novel_rewrite": "/api/novel-writer/generate",
             "novel_pipeline": "/api/novel-pipeline/start",
-            "health": "/health"
+            "health": "/health",
+            "job_metrics": "/jobs/metrics",
+            "deconstruct_events": "/api/deconstruct/events/<draft_id>",
+            "novel_pipeline_events": "/api/novel-pipeline/events/<run_id>"
         }
     })
 
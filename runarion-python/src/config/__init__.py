@@ -4,6 +4,6 @@ Contains stage-specific configuration constants and settings.
 """
 
 from .deconstructor_config import Stage3Config
-from .provider_config import ProviderOutputBudgetConfig
+from .provider_config import ProviderOutputBudgetConfig, ProviderConcurrencyConfig
 
-__all__ = ['Stage3Config', 'ProviderOutputBudgetConfig']
\ No newline at end of file
+__all__ = ['Stage3Config', 'ProviderOutputBudgetConfig', 'ProviderConcurrencyConfig']
\ No newline at end of file
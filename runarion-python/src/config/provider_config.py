@@ -1,10 +1,14 @@
 """
-Provider-Aware Output Token Budget Configuration.
+Provider-Aware Output Token Budget and Concurrency Configuration.
 
-Centralized max_output_tokens budgets per provider and task type.
-The GeminiProvider adds thinking_budget ON TOP of these values (unchanged).
+Centralized max_output_tokens budgets per provider and task type, the
+default number of concurrent LLM workers a stage may use per provider, and
+the request/token rate limits the process-wide LLM rate limiter enforces.
+The GeminiProvider adds thinking_budget ON TOP of the budgets (unchanged).
 """
 
+import os
+
 
 class ProviderOutputBudgetConfig:
     """
@@ -76,3 +80,106 @@ class ProviderOutputBudgetConfig:
         """Get all budgets for a specific provider."""
         provider_key = provider.lower().strip()
         return dict(cls._BUDGETS.get(provider_key, cls._DEFAULT_BUDGET))
+
+
+class ProviderConcurrencyConfig:
+    """
+    Provider-specific worker counts for stages that fan LLM calls out to threads.
+
+    Values are the default number of concurrent in-flight requests a single
+    stage may issue. A stage can be overridden per run through its context
+    config (e.g. ``config={"cleaning_workers": 1}`` forces the sequential path).
+    """
+
+    _MAX_WORKERS = {
+        "openai": 4,
+        "gemini": 4,
+        "deepseek": 2,
+        "mock": 4,
+    }
+
+    _DEFAULT_MAX_WORKERS = 2
+
+    # Hard ceiling regardless of overrides, to stay well inside the DB pool
+    # and provider rate limits.
+    MAX_WORKERS_CEILING = 16
+
+    @classmethod
+    def peak_default_workers(cls) -> int:
+        """Largest default worker count of any provider (sizes shared resources such as DB pools)."""
+        return max(cls._DEFAULT_MAX_WORKERS, *cls._MAX_WORKERS.values())
+
+    @classmethod
+    def get_max_workers(cls, provider: str, override=None) -> int:
+        """
+        Resolve the worker count for a provider, honouring an explicit override.
+
+        Args:
+            provider: Provider name (e.g., "openai", "gemini", "deepseek")
+            override: Optional per-run value (int or numeric string); values
+                      < 1 or unparsable fall back to the provider default
+
+        Returns:
+            Number of worker threads, clamped to [1, MAX_WORKERS_CEILING]
+        """
+        workers = None
+        if override is not None:
+            try:
+                workers = int(override)
+            except (TypeError, ValueError):
+                workers = None
+            if workers is not None and workers < 1:
+                workers = None
+
+        if workers is None:
+            provider_key = (provider or "").lower().strip()
+            workers = cls._MAX_WORKERS.get(provider_key, cls._DEFAULT_MAX_WORKERS)
+
+        return max(1, min(workers, cls.MAX_WORKERS_CEILING))
+
+
+class ProviderRateLimitConfig:
+    """
+    Provider-specific rate limits for src.utils.rate_limiter.
+
+    Limits are requests per minute (rpm) and tokens per minute (tpm, input +
+    output) per (provider, model, API key), and apply per process. None means
+    unlimited. Each value can be overridden with LLM_RATE_LIMIT_<PROVIDER>_RPM
+    / _TPM (``0`` disables that limit), e.g. to match a higher usage tier or
+    to split a quota between several worker processes.
+    """
+
+    _LIMITS = {
+        "openai": {"rpm": 500, "tpm": 200_000},
+        "gemini": {"rpm": 1000, "tpm": 1_000_000},
+        "deepseek": {"rpm": 60, "tpm": 200_000},
+        "mock": {"rpm": None, "tpm": None},
+    }
+
+    _DEFAULT_LIMITS = {"rpm": 60, "tpm": 100_000}
+
+    @classmethod
+    def get_limits(cls, provider: str) -> tuple:
+        """
+        Resolve the (rpm, tpm) limits for a provider, honouring env overrides.
+
+        Args:
+            provider: Provider name (e.g., "openai", "gemini", "deepseek")
+
+        Returns:
+            (rpm, tpm) tuple; either may be None for unlimited
+        """
+        provider_key = (provider or "").lower().strip()
+        limits = dict(cls._LIMITS.get(provider_key, cls._DEFAULT_LIMITS))
+
+        for name in ("rpm", "tpm"):
+            override = os.getenv(f"LLM_RATE_LIMIT_{provider_key.upper()}_{name.upper()}")
+            if override is None or not override.strip():
+                continue
+            try:
+                value = int(override)
+            except ValueError:
+                continue
+            limits[name] = value if value > 0 else None
+
+        return limits["rpm"], limits["tpm"]
@@ -7,7 +7,7 @@ from flask import current_app
 
 from src.models.request import BaseGenerationRequest, GenerationConfig
 from src.models.response import BaseGenerationResponse, UsageMetadata, QuotaMetadata
-from src.services.quota_manager import QuotaManager
+from src.services.quota_manager import QuotaManager, get_quota_manager
 from src.utils.tokenizer import TokenizerManager
 
 class BaseProvider(ABC):
@@ -16,21 +16,43 @@ class BaseProvider(ABC):
         self.api_key, self.key_used = self._resolve_api_key()
         self.model = self._resolve_model()
         self.client = None
+        self.quota_manager = self._get_quota_manager()
 
         # Prepare inputs
+        self._bind_request(request)
+
+    def _bind_request(self, request: BaseGenerationRequest, tokenize: bool = True):
+        """
+        Attach a request to this provider: everything request-specific except the client.
+
+        Called from __init__ and by GenerationEngine.with_request(), which reuses
+        a provider copy (and its client) for a new request of the same
+        provider/key/model.
+
+        Args:
+            request: Request to serve
+            tokenize: False when the request's bias/banned tokens are already tokenized
+        """
+        self.request = request
         self.prompt = request.prompt or ""
         self.instruction = self._format_instruction(request.instruction)
-        self.quota_manager = self._get_quota_manager()
         self.remaining_quota = None
         
         # Process tokenization for phrase bias, banned tokens, and stop sequences
-        self._process_tokenization()
+        if tokenize:
+            self._process_tokenization()
 
     @abstractmethod
-    def generate(self, skip_quota: bool = False) -> BaseGenerationResponse:
+    def generate(self, skip_quota: bool = False, defer_quota: bool = False) -> BaseGenerationResponse:
         """
         Generate text in a non-streaming fashion.
         
+        Args:
+            skip_quota: Skip the quota check, charge and generation log
+            defer_quota: With skip_quota, still charge the call through the
+                batched quota decrements (pipeline stages only; a plain
+                skip_quota call is free)
+        
         Returns:
             BaseGenerationResponse: The generated text and metadata.
         """
@@ -47,7 +69,7 @@ class BaseProvider(ABC):
         pass
     
     def _get_quota_manager(self) -> QuotaManager:
-        return QuotaManager()
+        return get_quota_manager()
 
     def _check_quota(self):
         self.remaining_quota = self.quota_manager.check_quota(self.request.caller)
@@ -59,10 +81,29 @@ class BaseProvider(ABC):
             quota_generation_count=quota_generation_count
         )
 
+    def _defer_quota_usage(self, quota_generation_count: int = 1):
+        """Queue a batched quota decrement for a call made with skip_quota=True, defer_quota=True."""
+        try:
+            self.quota_manager.record_usage(self.request.caller, quota_generation_count)
+        except Exception as e:
+            current_app.logger.error(f"Failed to record deferred quota usage: {e}")
+
+    @staticmethod
+    def caller_api_key(request: BaseGenerationRequest) -> Optional[str]:
+        """
+        The caller's own API key for the request's provider, or None.
+
+        Looked up with the provider exactly as given on the request. Shared with
+        GenerationEngine.for_request() so cached engines are keyed by the key
+        the provider actually uses.
+        """
+        key = request.caller.api_keys.get(request.provider)
+        return key.strip() if key and key.strip() else None
+
     def _resolve_api_key(self) -> tuple[str, Literal["own", "default"]]:
-        key = self.request.caller.api_keys.get(self.request.provider)
-        if key and key.strip():
-            return key.strip(), "own"
+        key = self.caller_api_key(self.request)
+        if key:
+            return key, "own"
 
         env_map = {
             "openai": "OPENAI_API_KEY",
@@ -224,7 +265,9 @@ class BaseProvider(ABC):
             truncated_instruction = (self.instruction or "")[:MAX_TEXT_LENGTH]
             truncated_generated_text = (response.text or "")[:MAX_TEXT_LENGTH]
             
-            with self.quota_manager.connection_pool.getconn() as conn:
+            db_pool = self.quota_manager.connection_pool
+            conn = db_pool.getconn()
+            try:
                 with conn.cursor() as cursor:
                     cursor.execute("""
                         INSERT INTO generation_logs (
@@ -272,6 +315,8 @@ class BaseProvider(ABC):
                         response.metadata.processing_time_ms,
                         response.error_message
                     ))
-                    conn.commit()
+                conn.commit()
+            finally:
+                db_pool.putconn(conn)
         except Exception as e:
             current_app.logger.error(f"Failed to log generation to DB: {e}")
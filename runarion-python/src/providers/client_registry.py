@@ -0,0 +1,73 @@
+# providers/client_registry.py
+
+"""
+Process-level registry of provider SDK clients.
+
+genai.Client and OpenAI clients each own an HTTP connection pool, so building
+one per GenerationEngine pays TLS setup to the model API on every engine.
+Providers fetch their client here instead; clients are keyed by
+(provider, API key, model) and reused by every engine with the same key.
+Both SDK clients are safe to share across threads.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+
+class ProviderClientRegistry:
+    # Upper bound on cached clients (distinct provider/key/model combinations)
+    MAX_CLIENTS = 64
+
+    _clients: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+    _lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _key(provider: str, api_key: str, model: str) -> Tuple[str, str, str]:
+        # Hash the API key so raw secrets never appear in keys or stats
+        key_digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+        return (provider.lower(), key_digest, model or "")
+
+    @classmethod
+    def get_or_create(cls, provider: str, api_key: str, model: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached client for (provider, api_key, model), creating it with factory on a miss.
+
+        Args:
+            provider: Provider name (e.g. "gemini")
+            api_key: Resolved API key the client authenticates with
+            model: Resolved model name
+            factory: Zero-argument callable building a new client
+
+        Returns:
+            Shared client instance
+        """
+        key = cls._key(provider, api_key, model)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is not None:
+                cls._clients.move_to_end(key)
+                cls._stats["hits"] += 1
+                return client
+
+            client = factory()
+            cls._clients[key] = client
+            cls._stats["misses"] += 1
+            while len(cls._clients) > cls.MAX_CLIENTS:
+                cls._clients.popitem(last=False)
+            return client
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every cached client (e.g. after rotating API keys)."""
+        with cls._lock:
+            cls._clients.clear()
+            cls._stats.update(hits=0, misses=0)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Return hit/miss counts and the number of cached clients."""
+        with cls._lock:
+            return {**cls._stats, "clients": len(cls._clients)}
@@ -7,6 +7,7 @@ from google import genai
 from google.genai.types import GenerateContentConfig, SafetySetting, HarmCategory, HarmBlockThreshold, ThinkingConfig
 from typing import Dict, Any, Generator, List, Optional
 from src.providers.base_provider import BaseProvider
+from src.providers.client_registry import ProviderClientRegistry
 from src.models.request import BaseGenerationRequest, GenerationConfig
 from src.models.response import BaseGenerationResponse
 
@@ -63,13 +64,18 @@ class GeminiProvider(BaseProvider):
         super().__init__(request)
 
         try:
-            self.client = genai.Client(api_key=self.api_key)
+            self.client = ProviderClientRegistry.get_or_create(
+                "gemini", self.api_key, self.model, lambda: genai.Client(api_key=self.api_key)
+            )
         except Exception as e:
             current_app.logger.error(f"Failed to initialize Gemini client: {e}")
             raise ValueError(f"Failed to initialize Gemini client: {str(e)}")
         
         # Validate the model if it's in our supported list
         self._validate_model()
+    
+    def _bind_request(self, request: BaseGenerationRequest, tokenize: bool = True):
+        super()._bind_request(request, tokenize)
         
         # Conversation history for maintaining context across generations
         # Format: List[Dict[str, Any]] with {"role": "user"|"assistant", "parts": [{"text": "..."}]}
@@ -237,10 +243,15 @@ class GeminiProvider(BaseProvider):
 
         return {k: v for k, v in gemini_kwargs.items() if v is not None}
         
-    def generate(self, skip_quota: bool = False) -> BaseGenerationResponse:
+    def generate(self, skip_quota: bool = False, defer_quota: bool = False) -> BaseGenerationResponse:
         """
         Generate text in a non-streaming fashion.
         
+        Args:
+            skip_quota: Skip the quota check, charge and generation log
+            defer_quota: With skip_quota, still charge the call through the
+                batched quota decrements (pipeline stages)
+        
         Returns:
             BaseGenerationResponse: The generated text and metadata.
         """
@@ -318,9 +329,11 @@ class GeminiProvider(BaseProvider):
 
             processing_time_ms = int((time.time() - start_time) * 1000)
 
-            # Skip quota update if skip_quota is True
+            # Pipeline calls (skip_quota + defer_quota) are charged in batches instead
             if not skip_quota:
                 self._update_quota(quota_generation_count)
+            elif defer_quota:
+                self._defer_quota_usage()
 
             response = self._build_response(
                 generated_text=generated_text,
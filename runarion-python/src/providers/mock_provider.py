@@ -109,13 +109,18 @@ class MockProvider(BaseProvider):
         self.quota_manager = None
         self.remaining_quota = None
 
+    def _bind_request(self, request: BaseGenerationRequest, tokenize: bool = True):
+        # Prompt and instruction are read from the request on every call
+        self.request = request
+        self.remaining_quota = None
+
     def _current_prompt(self) -> str:
         return self.request.prompt or ""
 
     def _current_instruction(self) -> str:
         return self._format_instruction(self.request.instruction)
 
-    def generate(self, skip_quota: bool = False) -> BaseGenerationResponse:
+    def generate(self, skip_quota: bool = False, defer_quota: bool = False) -> BaseGenerationResponse:
         request_id = str(uuid.uuid4())
         try:
             text = self._route_request()
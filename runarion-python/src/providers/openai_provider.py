@@ -7,6 +7,7 @@ from flask import current_app
 from openai import OpenAI
 from typing import Dict, Generator
 from src.providers.base_provider import BaseProvider
+from src.providers.client_registry import ProviderClientRegistry
 from src.models.response import BaseGenerationResponse
 from src.models.request import BaseGenerationRequest, GenerationConfig
 
@@ -15,7 +16,9 @@ class OpenAIProvider(BaseProvider):
         super().__init__(request)
 
         try:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = ProviderClientRegistry.get_or_create(
+                "openai", self.api_key, self.model, lambda: OpenAI(api_key=self.api_key)
+            )
         except Exception as e:
             current_app.logger.error(f"Failed to initialize OpenAI client: {e}")
             raise ValueError(f"Failed to initialize OpenAI client: {str(e)}")
@@ -57,10 +60,15 @@ class OpenAIProvider(BaseProvider):
         
         return {k: v for k, v in openai_kwargs.items() if v is not None}
         
-    def generate(self, skip_quota: bool = False) -> BaseGenerationResponse:
+    def generate(self, skip_quota: bool = False, defer_quota: bool = False) -> BaseGenerationResponse:
         """
         Generate text in a non-streaming fashion.
         
+        Args:
+            skip_quota: Skip the quota check, charge and generation log
+            defer_quota: With skip_quota, still charge the call through the
+                batched quota decrements (pipeline stages)
+        
         Returns:
             BaseGenerationResponse: The generated text and metadata.
         """
@@ -109,9 +117,11 @@ class OpenAIProvider(BaseProvider):
 
             processing_time_ms = int((time.time() - start_time) * 1000)
 
-            # Skip quota update if skip_quota is True
+            # Pipeline calls (skip_quota + defer_quota) are charged in batches instead
             if not skip_quota:
                 self._update_quota(quota_generation_count)
+            elif defer_quota:
+                self._defer_quota_usage()
 
             response = self._build_response(
                 generated_text=generated_text,
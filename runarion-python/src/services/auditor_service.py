@@ -18,7 +18,8 @@ import uuid
 import hashlib
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from src.services.records_manager import RecordsManager
+from src.services.records_manager import RecordsManager, get_entity_cache
+from src.services.chapter_content_resolver import ChapterContentResolver, compute_content_hash
 from src.services.generation_engine import GenerationEngine
 from src.models.request import BaseGenerationRequest, GenerationConfig
 from src.models.quota import QuotaCaller
@@ -41,6 +42,7 @@ class AuditorService:
         """
         self.db_pool = db_pool
         self.records_manager = RecordsManager(db_pool)
+        self.chapter_resolver = ChapterContentResolver(db_pool)
         
         logger.info("AuditorService initialized")
     
@@ -254,9 +256,7 @@ class AuditorService:
     
     def _compute_content_hash(self, content: str) -> str:
         """Compute MD5 hash of content for change detection."""
-        if not content:
-            return ""
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return compute_content_hash(content)
     
     def get_scan_status(self, project_id: str) -> Dict[str, Any]:
         """
@@ -826,7 +826,7 @@ ANALYSIS:"""
                     caller=caller
                 )
                 
-                engine = GenerationEngine(request)
+                engine = GenerationEngine.for_request(request)
                 response = engine.generate(skip_quota=True)
                 
                 if response.success:
@@ -1090,7 +1090,7 @@ ANALYSIS:"""
                 caller=caller
             )
             
-            engine = GenerationEngine(request)
+            engine = GenerationEngine.for_request(request)
             response = engine.generate(skip_quota=True)
             
             if response.success:
@@ -1323,7 +1323,7 @@ ANALYSIS:"""
                 caller=caller
             )
             
-            engine = GenerationEngine(request)
+            engine = GenerationEngine.for_request(request)
             response = engine.generate(skip_quota=True)
             
             if not response.success:
@@ -1661,7 +1661,7 @@ OUTPUT (JSON only):"""
                 caller=caller
             )
             
-            engine = GenerationEngine(request)
+            engine = GenerationEngine.for_request(request)
             response = engine.generate(skip_quota=True)
             
             if not response.success:
@@ -1907,7 +1907,7 @@ IMPORTANT:
                 caller=caller
             )
             
-            engine = GenerationEngine(request)
+            engine = GenerationEngine.for_request(request)
             response = engine.generate(skip_quota=True)
             
             if not response or not response.text:
@@ -2117,7 +2117,7 @@ Return fixes for ALL {len(chapter_issues)} issues.
                     caller=caller
                 )
 
-                engine = GenerationEngine(request)
+                engine = GenerationEngine.for_request(request)
                 response = engine.generate(skip_quota=True)
 
                 if not response or not response.text:
@@ -2355,7 +2355,7 @@ ANALYSIS:"""
                     caller=caller
                 )
                 
-                engine = GenerationEngine(request)
+                engine = GenerationEngine.for_request(request)
                 response = engine.generate(skip_quota=True)
                 
                 if response.success:
@@ -2603,6 +2603,7 @@ ANALYSIS:"""
 
                     # All operations succeeded - commit
                     conn.commit()
+                get_entity_cache().invalidate(project_id)
 
                 logger.info(f"Atomic merge completed: {source_vid} -> {target_vid}")
 
@@ -2646,7 +2647,9 @@ ANALYSIS:"""
         """
         Fetch all chapters for a project with current content from version control.
 
-        Uses direct database access to query project_content and version control tables.
+        Content for every chapter is resolved in one set-based pass by
+        ChapterContentResolver (version control, then content_nodes, then
+        project_content).
 
         Args:
             project_id: Project UUID
@@ -2655,196 +2658,11 @@ ANALYSIS:"""
         Returns:
             List of chapter dictionaries with order, chapter_name, content
         """
-        from src.utils.database_utils import utf8_database_connection
-
-        # Direct database query - fetches chapters with version control content
         try:
-            with utf8_database_connection(self.db_pool, operation_name="get_chapters") as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT content FROM project_content 
-                        WHERE project_id = %s
-                    """, (project_id,))
-                    
-                    result = cursor.fetchone()
-                    if not result or not result[0]:
-                        logger.warning(f"No project_content found for project {project_id}")
-                        return []
-                    
-                    chapters = result[0]
-                    if isinstance(chapters, str):
-                        chapters = json.loads(chapters)
-                    
-                    if not isinstance(chapters, list):
-                        logger.warning(f"Invalid chapters format for project {project_id}")
-                        return []
-                    
-                    # Get current content from version control for each chapter
-                    enriched_chapters = []
-                    chapters_without_content = 0
-                    for chapter in chapters:
-                        chapter_order = chapter.get('order')
-                        chapter_name = chapter.get('chapter_name', f"Chapter {chapter_order}")
-                        chapter_content = chapter.get('content', '')
-                        
-                        if chapter_order is not None:
-                            # Try multiple methods to get content
-                            current_content = None
-                            
-                            # Method 1: Try version control (chapter_states -> content_versions)
-                            current_content = self._get_current_chapter_content(
-                                conn, project_id, chapter_order
-                            )
-                            
-                            # Method 2: Try content_nodes table directly (if version control fails)
-                            if not current_content or len(current_content.strip()) == 0:
-                                current_content = self._get_content_from_nodes(conn, project_id, chapter_order)
-                            
-                            # Method 3: Fallback to project_content.content field
-                            if not current_content or len(current_content.strip()) == 0:
-                                if chapter_content and len(chapter_content.strip()) > 0:
-                                    current_content = chapter_content
-                            
-                            if current_content and len(current_content.strip()) > 0:
-                                chapter['content'] = current_content
-                                logger.info(f"Chapter {chapter_order} ({chapter_name}): Found content ({len(current_content)} chars)")
-                            else:
-                                logger.warning(f"Chapter {chapter_order} ({chapter_name}): No content available from any source")
-                                chapters_without_content += 1
-                        
-                        enriched_chapters.append(chapter)
-                    
-                    # Log summary
-                    chapters_with_content = sum(1 for ch in enriched_chapters if ch.get('content') and len(ch.get('content', '').strip()) > 0)
-                    logger.info(f"Fetched {len(enriched_chapters)} chapters from database for project {project_id}, {chapters_with_content} have content, {chapters_without_content} missing content")
-                    
-                    return enriched_chapters
-                    
+            return self.chapter_resolver.get_chapters(project_id)
         except Exception as e:
             logger.error(f"Failed to fetch chapters from database for project {project_id}: {e}", exc_info=True)
             return []
-
-    def _get_current_chapter_content(self, conn, project_id: str, chapter_order: int) -> Optional[str]:
-        """
-        Get current chapter content from version control.
-        
-        Args:
-            conn: Database connection
-            project_id: Project UUID (ULID string)
-            chapter_order: Chapter order number
-            
-        Returns:
-            Current chapter content, or None if not found
-        """
-        try:
-            with conn.cursor() as cursor:
-                # First, check if chapter_states table exists and has any entries for this project
-                try:
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM chapter_states 
-                        WHERE project_id = %s
-                    """, (project_id,))
-                    total_states = cursor.fetchone()[0]
-                    logger.debug(f"Found {total_states} chapter_states entries for project {project_id}")
-                except Exception as e:
-                    logger.warning(f"Error checking chapter_states table: {e}")
-                    return None
-                
-                # Get current version from chapter_states
-                # Note: project_id and current_node_id are ULIDs stored as strings
-                cursor.execute("""
-                    SELECT cs.current_version_index, cs.current_node_id
-                    FROM chapter_states cs
-                    WHERE cs.project_id = %s AND cs.chapter_order = %s
-                """, (project_id, chapter_order))
-                
-                state = cursor.fetchone()
-                if not state:
-                    logger.info(f"No chapter_states entry for chapter {chapter_order} (project_id: {project_id}) - version control may not be initialized for this chapter")
-                    return None
-                
-                current_version_index, current_node_id = state
-                
-                if not current_node_id:
-                    logger.warning(f"Chapter {chapter_order} has NULL current_node_id in chapter_states")
-                    return None
-                
-                logger.info(f"Found chapter_states for chapter {chapter_order}: node_id={current_node_id}, version_index={current_version_index}")
-                
-                # Get content from content_versions
-                cursor.execute("""
-                    SELECT cv.content
-                    FROM content_versions cv
-                    WHERE cv.node_id = %s AND cv.version_index = %s
-                """, (current_node_id, current_version_index))
-                
-                version = cursor.fetchone()
-                if version and version[0]:
-                    content = version[0]
-                    content_length = len(content) if content else 0
-                    logger.info(f"Retrieved {content_length} chars from version control for chapter {chapter_order}")
-                    return content
-                else:
-                    logger.warning(f"No content_versions entry for chapter {chapter_order} (node_id: {current_node_id}, version_index: {current_version_index})")
-                    # Try to see if any versions exist for this node
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM content_versions 
-                        WHERE node_id = %s
-                    """, (current_node_id,))
-                    count = cursor.fetchone()[0]
-                    logger.debug(f"Found {count} total versions for node_id {current_node_id}")
-                    if count > 0:
-                        # Try to get the latest version
-                        cursor.execute("""
-                            SELECT cv.content, cv.version_index
-                            FROM content_versions cv
-                            WHERE cv.node_id = %s
-                            ORDER BY cv.version_index DESC
-                            LIMIT 1
-                        """, (current_node_id,))
-                        latest = cursor.fetchone()
-                        if latest:
-                            logger.info(f"Using latest version {latest[1]} instead of {current_version_index} for chapter {chapter_order}")
-                            return latest[0]
-                    return None
-                
-        except Exception as e:
-            logger.error(f"Failed to get version control content for chapter {chapter_order}: {e}", exc_info=True)
-            return None
-    
-    def _get_content_from_nodes(self, conn, project_id: str, chapter_order: int) -> Optional[str]:
-        """
-        Alternative method: Get content directly from content_nodes table.
-        
-        Args:
-            conn: Database connection
-            project_id: Project UUID
-            chapter_order: Chapter order number
-            
-        Returns:
-            Chapter content, or None if not found
-        """
-        try:
-            with conn.cursor() as cursor:
-                # Get the current node from chapter_states, then get content from content_nodes
-                cursor.execute("""
-                    SELECT cn.content
-                    FROM chapter_states cs
-                    JOIN content_nodes cn ON cs.current_node_id = cn.id
-                    WHERE cs.project_id = %s AND cs.chapter_order = %s
-                """, (project_id, chapter_order))
-                
-                result = cursor.fetchone()
-                if result and result[0]:
-                    content = result[0]
-                    logger.info(f"Retrieved {len(content)} chars from content_nodes for chapter {chapter_order}")
-                    return content
-                
-                return None
-                
-        except Exception as e:
-            logger.debug(f"Failed to get content from content_nodes for chapter {chapter_order}: {e}")
-            return None
     
     def summarize_chapter_for_record_keeper(
         self,
@@ -2962,7 +2780,7 @@ ANALYSIS:"""
             )
             
             # Generate analysis
-            engine = GenerationEngine(request)
+            engine = GenerationEngine.for_request(request)
             response = engine.generate(skip_quota=True)
             
             if not response.success:
@@ -3342,7 +3160,7 @@ OUTPUT (JSON only):"""
                 )
                 
                 # Generate analysis
-                engine = GenerationEngine(request)
+                engine = GenerationEngine.for_request(request)
                 response = engine.generate(skip_quota=True)
                 
                 if not response.success:
@@ -3783,7 +3601,7 @@ EXTRACTED ENTITIES:"""
                     )
                     
                     # Generate extraction
-                    engine = GenerationEngine(request)
+                    engine = GenerationEngine.for_request(request)
                     response = engine.generate(skip_quota=True)
                     
                     if not response.success:
@@ -0,0 +1,326 @@
+"""
+Chapter Content Resolver
+
+Resolves the current text of every chapter in a project with two queries:
+one for the project_content chapter list and one set-based query over the
+version control tables (chapter_states -> content_versions / content_nodes).
+
+Resolution order per chapter (unchanged from the former per-chapter lookups):
+1. content_versions row at chapter_states.current_version_index, or the
+   latest version of the current node when that row is missing or empty
+2. content_nodes.content of the current node
+3. The content stored inline in project_content
+
+Resolved chapters are kept in a process-wide ChapterSnapshotCache keyed by a
+content hash of the project. The hash is computed server-side, so a cache hit
+costs one query that returns two digests, and edits made outside this service
+are still detected. It covers project_content, the chapter_states pointers
+and the content of the version each chapter resolves to. The version content
+has to be included because content_versions rows are not append-only: the
+editor's VersionControlService::updateCurrentVersion rewrites
+content_versions.content in place, and the table has no updated_at column.
+content_nodes.content is only written when a node is created.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.database_utils import utf8_database_connection
+
+logger = logging.getLogger(__name__)
+
+
+# Current content of every chapter with a chapter_states row.
+# Whitespace-only text counts as missing, matching str.strip() checks.
+RESOLVE_CHAPTER_CONTENT_QUERY = """
+    SELECT resolved.chapter_order,
+           CASE
+               WHEN resolved.version_content ~ '[^[:space:]]' THEN resolved.version_content
+               WHEN resolved.node_content ~ '[^[:space:]]' THEN resolved.node_content
+           END AS content
+    FROM (
+        SELECT cs.chapter_order,
+               CASE
+                   WHEN cv.content <> '' THEN cv.content
+                   ELSE latest.content
+               END AS version_content,
+               cn.content AS node_content
+        FROM chapter_states cs
+        LEFT JOIN content_versions cv
+               ON cv.node_id = cs.current_node_id
+              AND cv.version_index = cs.current_version_index
+        LEFT JOIN LATERAL (
+            SELECT lv.content
+            FROM content_versions lv
+            WHERE lv.node_id = cs.current_node_id
+            ORDER BY lv.version_index DESC
+            LIMIT 1
+        ) latest ON COALESCE(cv.content, '') = ''
+        LEFT JOIN content_nodes cn ON cn.id = cs.current_node_id
+        WHERE cs.project_id = %s
+    ) resolved
+"""
+
+
+# Digest of everything chapter resolution depends on, without shipping any text.
+# Version content is digested (it can be rewritten in place), joined the same
+# way as RESOLVE_CHAPTER_CONTENT_QUERY so the latest version only counts when
+# resolution falls back to it.
+CHAPTER_FINGERPRINT_QUERY = """
+    SELECT md5(pc.content::text),
+           (
+               SELECT md5(string_agg(
+                   concat_ws(':', cs.chapter_order, cs.current_node_id, cs.current_version_index, cs.updated_at,
+                             md5(cv.content), latest.version_index, latest.digest),
+                   ',' ORDER BY cs.chapter_order
+               ))
+               FROM chapter_states cs
+               LEFT JOIN content_versions cv
+                      ON cv.node_id = cs.current_node_id
+                     AND cv.version_index = cs.current_version_index
+               LEFT JOIN LATERAL (
+                   SELECT lv.version_index, md5(lv.content) AS digest
+                   FROM content_versions lv
+                   WHERE lv.node_id = cs.current_node_id
+                   ORDER BY lv.version_index DESC
+                   LIMIT 1
+               ) latest ON COALESCE(cv.content, '') = ''
+               WHERE cs.project_id = pc.project_id
+           )
+    FROM project_content pc
+    WHERE pc.project_id = %s
+"""
+
+
+def compute_content_hash(content: str) -> str:
+    """Compute MD5 hash of content for change detection."""
+    if not content:
+        return ""
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def _has_text(content: Optional[str]) -> bool:
+    return bool(content) and len(content.strip()) > 0
+
+
+def _snapshot_size(chapters: List[Dict[str, Any]]) -> int:
+    size = 0
+    for chapter in chapters:
+        for value in chapter.values():
+            if isinstance(value, str):
+                size += len(value.encode('utf-8'))
+    return size
+
+
+class ChapterSnapshotCache:
+    """
+    LRU cache of resolved chapter lists, bounded by total content bytes.
+
+    Entries are keyed by project and validated against the project's content
+    hash on every read; invalidate() drops a project eagerly after writes
+    made by this service.
+    """
+
+    # Total bytes of chapter text kept across all projects
+    MAX_BYTES = int(os.getenv('CHAPTER_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, List[Dict[str, Any]], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, project_id: str, content_hash: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached chapters if the project's content hash still matches."""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry[0] != content_hash:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(project_id)
+            self._stats["hits"] += 1
+            return [dict(chapter) for chapter in entry[1]]
+
+    def put(self, project_id: str, content_hash: str, chapters: List[Dict[str, Any]]) -> None:
+        """Store a snapshot of the chapters, evicting least recently used projects over budget."""
+        snapshot = [dict(chapter) for chapter in chapters]
+        size = _snapshot_size(snapshot)
+        with self._lock:
+            self._discard(project_id)
+            if size > self.max_bytes:
+                return
+            self._entries[project_id] = (content_hash, snapshot, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted_id = next(iter(self._entries))
+                self._discard(evicted_id)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop the snapshot for one project, or for all projects."""
+        with self._lock:
+            if project_id is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._discard(project_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counts, cached projects and cached bytes."""
+        with self._lock:
+            return {**self._stats, "projects": len(self._entries), "bytes": self._bytes}
+
+    def _discard(self, project_id: str) -> None:
+        entry = self._entries.pop(project_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+_chapter_cache: Optional[ChapterSnapshotCache] = None
+_chapter_cache_lock = threading.Lock()
+
+
+def get_chapter_cache() -> ChapterSnapshotCache:
+    """Return the process-wide chapter snapshot cache shared by all services."""
+    global _chapter_cache
+    with _chapter_cache_lock:
+        if _chapter_cache is None:
+            _chapter_cache = ChapterSnapshotCache()
+        return _chapter_cache
+
+
+class ChapterContentResolver:
+    """Set-based lookup of current chapter content for a project."""
+
+    def __init__(self, db_pool, cache: Optional[ChapterSnapshotCache] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            db_pool: Database connection pool
+            cache: Optional snapshot cache (defaults to the shared process-wide cache)
+        """
+        self.db_pool = db_pool
+        self.cache = cache if cache is not None else get_chapter_cache()
+
+    def get_chapters(self, project_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch all chapters for a project with their current content.
+
+        Served from the snapshot cache while the project's content hash is
+        unchanged.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            List of chapter dictionaries from project_content (order,
+            chapter_name, content, ...) with content replaced by the current
+            version. Returns empty list if the project has no content.
+        """
+        with utf8_database_connection(self.db_pool, operation_name="resolve_chapters") as conn:
+            content_hash = self._fetch_content_hash(conn, project_id)
+            if content_hash:
+                cached = self.cache.get(project_id, content_hash)
+                if cached is not None:
+                    logger.debug(f"Chapter snapshot cache hit for project {project_id}")
+                    return cached
+
+            chapters = self.resolve(conn, project_id)
+            if content_hash and chapters:
+                self.cache.put(project_id, content_hash, chapters)
+            return chapters
+
+    def _fetch_content_hash(self, conn, project_id: str) -> Optional[str]:
+        """Server-side content hash of the project's chapters, or None if unavailable."""
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(CHAPTER_FINGERPRINT_QUERY, (project_id,))
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.debug(f"Chapter content hash unavailable for project {project_id}: {e}")
+            conn.rollback()
+            return None
+
+        if not row or row[0] is None:
+            return None
+        return compute_content_hash(f"{row[0]}:{row[1] or ''}")
+
+    def resolve(self, conn, project_id: str) -> List[Dict[str, Any]]:
+        """
+        Resolve chapters on an existing connection.
+
+        Args:
+            conn: Database connection
+            project_id: Project UUID
+
+        Returns:
+            List of chapter dictionaries, see get_chapters()
+        """
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT content FROM project_content
+                WHERE project_id = %s
+            """, (project_id,))
+
+            result = cursor.fetchone()
+            if not result or not result[0]:
+                logger.warning(f"No project_content found for project {project_id}")
+                return []
+
+            chapters = result[0]
+            if isinstance(chapters, str):
+                chapters = json.loads(chapters)
+
+            if not isinstance(chapters, list):
+                logger.warning(f"Invalid chapters format for project {project_id}")
+                return []
+
+            current_content = self._fetch_current_content(cursor, project_id)
+
+        resolved_chapters = []
+        chapters_without_content = 0
+        for chapter in chapters:
+            chapter_order = chapter.get('order')
+
+            if chapter_order is not None:
+                content = current_content.get(chapter_order)
+                if not _has_text(content):
+                    content = chapter.get('content', '')
+
+                if _has_text(content):
+                    chapter['content'] = content
+                else:
+                    logger.debug(f"Chapter {chapter_order}: No content available from any source")
+                    chapters_without_content += 1
+
+            resolved_chapters.append(chapter)
+
+        logger.info(
+            f"Resolved {len(resolved_chapters)} chapters for project {project_id} "
+            f"({len(current_content)} from version control, {chapters_without_content} missing content)"
+        )
+        return resolved_chapters
+
+    def _fetch_current_content(self, cursor, project_id: str) -> Dict[int, str]:
+        """Map chapter_order -> current version control content for the project."""
+        try:
+            cursor.execute(RESOLVE_CHAPTER_CONTENT_QUERY, (project_id,))
+            rows = cursor.fetchall()
+        except Exception as e:
+            # Version control tables are optional; fall back to project_content
+            logger.warning(f"Failed to resolve version control content for project {project_id}: {e}")
+            cursor.connection.rollback()
+            return {}
+
+        current_content: Dict[int, str] = {}
+        for chapter_order, content in rows:
+            if content is not None and chapter_order not in current_content:
+                current_content[chapter_order] = content
+        return current_content
@@ -0,0 +1,142 @@
+"""
+Character Mention Index
+
+Records which known characters are mentioned in which chapters, so the
+sentiment analyzer can skip per-character extraction calls for chapters
+where the character cannot have an interaction with another known
+character.
+
+A character counts as mentioned when any of its name variants appears as a
+whole word in the chapter text the extraction prompt sees. The variants
+follow SentimentAnalyzerService._match_entity_name, which maps an extracted
+name to an entity when the name contains the entity name or is part of it:
+
+- the full entity name (and every alias from its properties)
+- each significant word of those names ("Yurak" for "Yurak the Barbarian"),
+  using the same minimum length as partial matches in _match_entity_name
+
+Words shared by several characters ("John" in "John Smith" / "John Doe")
+mark all of them as mentioned; the index only has to be conservative.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Set
+
+
+# Shortest entity name fragment _match_entity_name accepts as a partial match
+MIN_ENTITY_MATCH_LENGTH = 3
+
+# Entity properties that hold other names a character goes by
+ALIAS_PROPERTY_KEYS = (
+    'aliases', 'alias', 'nicknames', 'nickname', 'also_known_as',
+    'other_names', 'full_name', 'title', 'titles',
+)
+
+# Connecting words that never identify a character on their own
+_NAME_STOPWORDS = {'the', 'and', 'von', 'van', 'der', 'del', 'de'}
+
+_ALIAS_SEPARATORS = re.compile(r'[,;/|]')
+
+
+def entity_aliases(entity: Dict[str, Any]) -> List[str]:
+    """
+    Collect alias names stored in an entity's properties.
+
+    Args:
+        entity: Entity dict as returned by RecordsManager.get_project_entities
+
+    Returns:
+        Alias strings (without the entity name itself)
+    """
+    properties = entity.get('properties') or {}
+    aliases = []
+    for key in ALIAS_PROPERTY_KEYS:
+        value = properties.get(key)
+        if isinstance(value, str):
+            values = _ALIAS_SEPARATORS.split(value)
+        elif isinstance(value, (list, tuple)):
+            values = [v for v in value if isinstance(v, str)]
+        else:
+            continue
+        aliases.extend(v.strip() for v in values if v and v.strip())
+    return aliases
+
+
+def name_variants(name: str, aliases: Iterable[str] = ()) -> Set[str]:
+    """
+    Lowercase surface forms under which a character can be mentioned.
+
+    Args:
+        name: Entity name
+        aliases: Other names of the entity
+
+    Returns:
+        Full names plus their significant words
+    """
+    variants = set()
+    for full_name in [name, *aliases]:
+        full_name = (full_name or '').lower().strip()
+        if not full_name:
+            continue
+        variants.add(full_name)
+        for word in re.findall(r"[\w'-]+", full_name):
+            word = word.strip("'-")
+            if len(word) >= MIN_ENTITY_MATCH_LENGTH and word not in _NAME_STOPWORDS:
+                variants.add(word)
+    return variants
+
+
+class CharacterMentionIndex:
+    """
+    Characters mentioned per chapter, built once per extraction request.
+    """
+
+    def __init__(self, characters: List[Dict[str, Any]], chapter_texts: Dict[Any, str]):
+        """
+        Build the index.
+
+        Args:
+            characters: Known character entities (dicts with 'name' and 'properties')
+            chapter_texts: Chapter key -> text the extraction prompt will see
+        """
+        patterns = {}
+        for entity in characters:
+            name = entity.get('name')
+            if not name:
+                continue
+            variants = name_variants(name, entity_aliases(entity))
+            if not variants:
+                continue
+            alternation = '|'.join(re.escape(v) for v in sorted(variants, key=len, reverse=True))
+            patterns[name] = re.compile(rf'(?<!\w)(?:{alternation})(?!\w)', re.IGNORECASE)
+
+        self.characters = set(patterns)
+        self._mentioned: Dict[Any, Set[str]] = {}
+        for chapter_key, text in chapter_texts.items():
+            text = text or ''
+            self._mentioned[chapter_key] = {
+                name for name, pattern in patterns.items() if pattern.search(text)
+            }
+
+    def mentioned(self, chapter_key: Any) -> Set[str]:
+        """Names of the characters mentioned in a chapter."""
+        return self._mentioned.get(chapter_key, set())
+
+    def can_interact(self, character_name: str, chapter_key: Any) -> bool:
+        """
+        Whether a chapter mentions the character and at least one other character.
+
+        Characters or chapters the index does not know are never ruled out.
+        """
+        if chapter_key not in self._mentioned or character_name not in self.characters:
+            return True
+        mentioned = self._mentioned[chapter_key]
+        return character_name in mentioned and len(mentioned) > 1
+
+    def stats(self) -> Dict[str, int]:
+        """Mention counts for logging."""
+        return {
+            'characters': len(self.characters),
+            'chapters': len(self._mentioned),
+            'mentions': sum(len(names) for names in self._mentioned.values()),
+        }
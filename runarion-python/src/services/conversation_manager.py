@@ -12,6 +12,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from contextlib import contextmanager
 from src.models.story_generation.prompt_config import PromptConfig
+from src.services.chapter_content_resolver import get_chapter_cache
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +55,72 @@ class ConversationManager:
             if conn:
                 self.db_pool.putconn(conn)
     
-    def load_history(self, project_id: str) -> List[Dict[str, Any]]:
+    def load_history(
+        self,
+        project_id: str,
+        limit: Optional[int] = None,
+        before_index: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Load conversation history for a project, optionally paged from the tail.
+        
+        Without limit/before_index the whole array is returned. Otherwise the
+        array is sliced server-side, so only the requested page crosses the wire.
+        
+        Args:
+            project_id: ULID of the project
+            limit: Optional maximum number of messages (the most recent ones)
+            before_index: Optional exclusive upper bound on message position;
+                pass the first message_index of a page to fetch the page before it
+            
+        Returns:
+            List of message dictionaries in chronological order
+            Returns empty list if no history exists
+        """
+        if limit is None and before_index is None:
+            return self._load_full_history(project_id)
+        
+        if limit is not None and limit <= 0:
+            return []
+        
+        try:
+            with self._get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    query = """
+                        SELECT t.message
+                        FROM project_conversations pc
+                        CROSS JOIN LATERAL jsonb_array_elements(pc.messages) WITH ORDINALITY AS t(message, position)
+                        WHERE pc.project_id = %s
+                    """
+                    params: List[Any] = [project_id]
+                    
+                    if before_index is not None:
+                        query += " AND t.position - 1 < %s"
+                        params.append(before_index)
+                    
+                    query += " ORDER BY t.position DESC"
+                    if limit is not None:
+                        query += " LIMIT %s"
+                        params.append(limit)
+                    
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+                    
+                    messages = []
+                    for (message,) in reversed(rows):
+                        if isinstance(message, str):
+                            message = json.loads(message)
+                        if isinstance(message, dict):
+                            messages.append(message)
+                    return messages
+                    
+        except Exception as e:
+            logger.error(f"Failed to load conversation history page for project {project_id}: {e}")
+            return []
+    
+    def _load_full_history(self, project_id: str) -> List[Dict[str, Any]]:
         """
-        Load conversation history for a project.
+        Load the entire conversation array for a project.
         
         Args:
             project_id: ULID of the project
@@ -105,6 +169,12 @@ class ConversationManager:
         """
         Append a new message to the conversation history.
         
+        The message is sent once and pushed onto the JSONB array server-side
+        (``messages || [message]``); its message_index is the current array
+        length, computed under the row lock taken by the upsert, so concurrent
+        appends get sequential indices and the existing history is never
+        read back into Python.
+        
         Args:
             project_id: ULID of the project
             role: "user" or "assistant"
@@ -122,29 +192,12 @@ class ConversationManager:
         try:
             with self._get_db_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Load existing messages
-                    cursor.execute(
-                        "SELECT messages FROM project_conversations WHERE project_id = %s",
-                        (project_id,)
-                    )
-                    row = cursor.fetchone()
-                    
-                    messages = []
-                    if row and row[0]:
-                        if isinstance(row[0], str):
-                            messages = json.loads(row[0])
-                        else:
-                            messages = row[0] if isinstance(row[0], list) else []
-                    
-                    # Determine next message index
-                    next_index = len(messages)
-                    
-                    # Create new message
+                    # Create new message (index is assigned server-side)
                     new_message = {
                         "role": role,
                         "content": content,
                         "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "message_index": next_index
+                        "message_index": 0
                     }
                     
                     if chapter_id is not None:
@@ -153,18 +206,27 @@ class ConversationManager:
                     if chapter_order is not None:
                         new_message["chapter_order"] = chapter_order
                     
-                    messages.append(new_message)
-                    
-                    # Update or insert conversation record
+                    # Insert a one-element array, or push the element onto the existing array
                     cursor.execute(
                         """
-                        INSERT INTO project_conversations (project_id, messages, updated_at)
-                        VALUES (%s, %s, NOW())
+                        INSERT INTO project_conversations AS pc (project_id, messages, created_at, updated_at)
+                        VALUES (%s, jsonb_build_array(%s::jsonb), NOW(), NOW())
                         ON CONFLICT (project_id)
-                        DO UPDATE SET messages = %s, updated_at = NOW()
+                        DO UPDATE SET
+                            messages = pc.messages || jsonb_build_array(
+                                jsonb_set(
+                                    EXCLUDED.messages -> 0,
+                                    '{message_index}',
+                                    to_jsonb(jsonb_array_length(pc.messages))
+                                )
+                            ),
+                            updated_at = NOW()
+                        RETURNING jsonb_array_length(messages) - 1
                         """,
-                        (project_id, json.dumps(messages), json.dumps(messages))
+                        (project_id, json.dumps(new_message))
                     )
+                    row = cursor.fetchone()
+                    next_index = row[0] if row else None
                     
                     logger.info(f"Appended {role} message to conversation for project {project_id}, index {next_index}")
                     return True
@@ -240,6 +302,10 @@ class ConversationManager:
         except Exception as e:
             logger.error(f"Failed to update chapter content for project {project_id}: {e}")
             return False
+        finally:
+            # Chapter content changed; drop the cached chapter snapshot only after
+            # the write committed, so a concurrent reader cannot re-cache the old one
+            get_chapter_cache().invalidate(project_id)
     
     def to_gemini_format(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -389,6 +455,10 @@ class ConversationManager:
         except Exception as e:
             logger.error(f"Failed to sync conversation for project {project_id}: {e}")
             return False
+        finally:
+            # Editor content may have changed; drop the cached chapter snapshot
+            # only after the sync committed
+            get_chapter_cache().invalidate(project_id)
 
     def initialize_conversation(
         self,
@@ -3,11 +3,13 @@ Base stage interface for the novel deconstruction pipeline.
 Provides consistent method signatures and return types for all stages.
 """
 
+import copy
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 import logging
 from datetime import datetime
-from src.config.provider_config import ProviderOutputBudgetConfig
+from src.config.provider_config import ProviderOutputBudgetConfig, ProviderConcurrencyConfig
+from src.utils.progress_events import ItemProgress
 
 logger = logging.getLogger(__name__)
 
@@ -194,6 +196,49 @@ class BasePipelineStage(ABC):
 
         return budget
 
+    def _get_max_workers(self, context: PipelineStageContext, config_key: str) -> int:
+        """
+        Resolve the number of concurrent LLM workers for this stage.
+
+        Args:
+            context: Stage execution context (``context.config[config_key]`` overrides)
+            config_key: Per-stage override key, e.g. "cleaning_workers"
+
+        Returns:
+            Worker count (1 means the sequential path)
+        """
+        provider = self.generation_engine.request.provider if self.generation_engine else ""
+        return ProviderConcurrencyConfig.get_max_workers(provider, context.config.get(config_key))
+
+    def _fork_for_worker(self) -> 'BasePipelineStage':
+        """
+        Build a shallow copy of this stage bound to its own generation engine.
+
+        Stages mutate ``generation_engine.request`` (prompt, instruction,
+        token budget) per call, so each concurrent worker runs the unchanged
+        stage methods on a copy that owns a forked engine. Everything else
+        (db_pool, prompt templates, logger) is shared read-only.
+
+        Returns:
+            Worker-local stage instance
+        """
+        worker = copy.copy(self)
+        worker.generation_engine = self.generation_engine.fork()
+        return worker
+
+    def _item_progress(self, context: PipelineStageContext, total: int) -> ItemProgress:
+        """
+        Build the per-item progress counter streamed to progress subscribers.
+
+        Args:
+            context: Stage execution context
+            total: Number of items (chunks, scenes) the stage will process
+
+        Returns:
+            Counter; call ``advance()`` as each item finishes
+        """
+        return ItemProgress(context.draft_id, self.stage_name, total)
+
     @abstractmethod
     def _execute_stage(self, context: PipelineStageContext) -> PipelineStageResult:
         """
@@ -0,0 +1,239 @@
+"""
+Stage checkpoints for the novel deconstruction pipeline.
+
+Each completed stage records a versioned row in deconstructor_stage_checkpoints
+keyed by draft and a hash of the stage's inputs. The input hash chains the
+versions of upstream checkpoints, so re-running a stage invalidates every
+stage after it while leaving earlier checkpoints usable.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from src.utils.database_utils import ensure_utf8_json
+
+logger = logging.getLogger(__name__)
+
+
+# Execution order; a checkpoint is only trusted if all earlier stages are
+STAGE_ORDER = ['1', '2', '3', '4a', '4b', '4c', '5', '6', '7']
+
+
+def normalize_stage_key(stage: Any) -> str:
+    """
+    Normalize a stage identifier (1, '4A', 'stage_5') to a STAGE_ORDER key.
+
+    Raises:
+        ValueError: If the stage is unknown
+    """
+    key = str(stage).strip().lower()
+    if key.startswith('stage_'):
+        key = key[len('stage_'):]
+    if key not in STAGE_ORDER:
+        raise ValueError(f"Unknown deconstructor stage '{stage}'. Valid stages are: {STAGE_ORDER}")
+    return key
+
+
+def compute_stage_input_hash(stage: str, inputs: Dict[str, Any],
+                             upstream_versions: Dict[str, Optional[int]]) -> str:
+    """
+    Hash everything a stage's output depends on.
+
+    Args:
+        stage: Stage key
+        inputs: Run parameters (file fingerprint, chaptering settings, config, model)
+        upstream_versions: Checkpoint version of every earlier stage
+
+    Returns:
+        Hex sha256 digest
+    """
+    material = json.dumps(
+        {'stage': stage, 'inputs': inputs, 'upstream': upstream_versions},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class StageCheckpointStore:
+    """Reads and writes deconstructor stage checkpoints."""
+
+    def __init__(self, db_pool):
+        """
+        Initialize the store.
+
+        Args:
+            db_pool: Database connection pool
+        """
+        self.db_pool = db_pool
+
+    def load_latest(self, draft_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the latest checkpoint of every stage for a draft.
+
+        Returns:
+            Mapping of stage key -> {'version', 'input_hash', 'result'}; empty
+            if the draft has none or checkpoints are unavailable
+        """
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT DISTINCT ON (stage) stage, version, input_hash, result
+                    FROM deconstructor_stage_checkpoints
+                    WHERE draft_id = %s
+                    ORDER BY stage, version DESC
+                """, (draft_id,))
+                rows = cursor.fetchall()
+            conn.rollback()  # Read-only; do not hand back an open transaction
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Stage checkpoints unavailable for draft {draft_id}: {e}")
+            return {}
+        finally:
+            self.db_pool.putconn(conn)
+
+        checkpoints = {}
+        for stage, version, input_hash, result in rows:
+            if isinstance(result, str):
+                result = json.loads(result)
+            checkpoints[stage] = {'version': version, 'input_hash': input_hash, 'result': result or {}}
+        return checkpoints
+
+    def save(self, draft_id: str, stage: str, input_hash: str, result: Dict[str, Any]) -> Optional[int]:
+        """
+        Record a completed stage as the next checkpoint version.
+
+        Returns:
+            The new version, or None if the checkpoint could not be written
+            (the pipeline continues without it)
+        """
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO deconstructor_stage_checkpoints
+                        (draft_id, stage, version, input_hash, result, created_at, updated_at)
+                    SELECT %s, %s, COALESCE(MAX(version), 0) + 1, %s, %s, NOW(), NOW()
+                    FROM deconstructor_stage_checkpoints
+                    WHERE draft_id = %s AND stage = %s
+                    RETURNING version
+                """, (draft_id, stage, input_hash, ensure_utf8_json(result), draft_id, stage))
+                version = cursor.fetchone()[0]
+            conn.commit()
+            return version
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Failed to save stage {stage} checkpoint for draft {draft_id}: {e}")
+            return None
+        finally:
+            self.db_pool.putconn(conn)
+
+    def delete(self, draft_id: str) -> int:
+        """
+        Delete all checkpoints of a draft (after its pipeline data was cleaned up).
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM deconstructor_stage_checkpoints WHERE draft_id = %s", (draft_id,)
+                )
+                deleted = cursor.rowcount
+            conn.commit()
+            return deleted
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Failed to delete stage checkpoints for draft {draft_id}: {e}")
+            return 0
+        finally:
+            self.db_pool.putconn(conn)
+
+
+class StageCheckpointRun:
+    """
+    Checkpoint bookkeeping for one pipeline run.
+
+    Only a contiguous prefix of stages is restored: once a stage executes,
+    every later stage executes too, and its input hash reflects the new
+    upstream versions.
+    """
+
+    def __init__(self, store: StageCheckpointStore, draft_id: str, inputs: Dict[str, Any],
+                 resume: bool = False, from_stage: Optional[str] = None):
+        """
+        Initialize the run.
+
+        Args:
+            store: Checkpoint store
+            draft_id: Draft being processed
+            inputs: Run parameters hashed into every stage's input hash
+            resume: Restore stages from valid checkpoints
+            from_stage: Never restore this stage or any later one
+        """
+        self.store = store
+        self.draft_id = draft_id
+        self.inputs = inputs
+        self.resume = resume
+        self.checkpoints = store.load_latest(draft_id) if resume else {}
+        self.stop_index = (
+            STAGE_ORDER.index(normalize_stage_key(from_stage)) if from_stage is not None else len(STAGE_ORDER)
+        )
+        self.versions: Dict[str, Optional[int]] = {}
+        self.restored = []
+        self.executed = []
+        self._restoring = resume
+
+    def input_hash(self, stage: str) -> str:
+        """Input hash of a stage given the checkpoint versions recorded so far."""
+        upstream = {key: self.versions.get(key) for key in STAGE_ORDER[:STAGE_ORDER.index(stage)]}
+        return compute_stage_input_hash(stage, self.inputs, upstream)
+
+    def can_restore(self, stage: str) -> bool:
+        """Whether restore() would return a checkpoint for the stage (no side effects)."""
+        if not self._restoring or STAGE_ORDER.index(stage) >= self.stop_index:
+            return False
+        checkpoint = self.checkpoints.get(stage)
+        return bool(checkpoint) and checkpoint['input_hash'] == self.input_hash(stage)
+
+    def restore(self, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the checkpointed result of a stage if it can be skipped.
+
+        Returns:
+            The stored stage result, or None if the stage must run
+        """
+        if self._restoring and STAGE_ORDER.index(stage) < self.stop_index:
+            checkpoint = self.checkpoints.get(stage)
+            if checkpoint and checkpoint['input_hash'] == self.input_hash(stage):
+                self.versions[stage] = checkpoint['version']
+                self.restored.append(stage)
+                return {
+                    **checkpoint['result'],
+                    'restored_from_checkpoint': True,
+                    'checkpoint_version': checkpoint['version'],
+                }
+        self._restoring = False
+        return None
+
+    def begin(self, stage: str) -> bool:
+        """
+        Mark a stage as executing.
+
+        Returns:
+            True for the first executed stage of a resumed run, whose outputs
+            (and those of every later stage) must be cleared first
+        """
+        first = self.resume and not self.executed
+        self.executed.append(stage)
+        return first
+
+    def complete(self, stage: str, result: Dict[str, Any]) -> None:
+        """Record a successfully executed stage as a new checkpoint version."""
+        if stage in self.restored or not result.get('success', False):
+            return
+        self.versions[stage] = self.store.save(self.draft_id, stage, self.input_hash(stage), result)
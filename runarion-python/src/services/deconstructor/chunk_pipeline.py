@@ -0,0 +1,250 @@
+"""
+Chunk-level pipelining of deconstructor Stages 2 and 3.
+
+In the default mode Stage 3 starts only after Stage 2 has cleaned every
+chunk. Scene detection of a chunk, however, only needs that chunk's cleaned
+text, so ChunkPipeline runs both stages at once: cleaning workers hand each
+cleaned chunk to the detection workers through a bounded queue (which makes
+cleaning wait when detection falls behind), and detection + hydration of a
+chunk starts as soon as it is clean.
+
+Per-chunk work is the stages' own _clean_chunk_task / _detect_chunk_scenes,
+and the results are summarized by the stages' shared summarize methods, so
+the two stage results (and the rows written) match the sequential mode.
+
+Usage:
+    pipeline = ChunkPipeline(cleaning_stage, detection_stage)
+    stage_2_result, stage_3_result = pipeline.run(context)
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from src.utils.database_utils import clean_text_for_database
+from .base_stage import PipelineStageContext, PipelineStageResult
+from .stage_2_cleaning import TextCleaningStage
+from .stage_3_sceneExtract import SceneDetectionStage
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class ChunkPipeline:
+    """
+    Streams chunks through cleaning, then scene detection and hydration.
+    """
+
+    # Cleaned chunks waiting for a detection worker before cleaning blocks
+    QUEUE_SIZE = int(os.getenv('DECONSTRUCTOR_CHUNK_QUEUE_SIZE', '4'))
+
+    def __init__(self, cleaning_stage: TextCleaningStage, detection_stage: SceneDetectionStage):
+        """
+        Initialize the pipeline.
+
+        Args:
+            cleaning_stage: Stage 2 instance
+            detection_stage: Stage 3 instance
+        """
+        self.cleaning_stage = cleaning_stage
+        self.detection_stage = detection_stage
+
+    def run(self, context: PipelineStageContext) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run Stages 2 and 3 for a draft with chunk-level pipelining.
+
+        Args:
+            context: Stage execution context shared by both stages
+
+        Returns:
+            (stage_2_result, stage_3_result) dictionaries; Stage 3 fails
+            without running if Stage 2 fails
+        """
+        cleaning, detection = self.cleaning_stage, self.detection_stage
+        try:
+            chunks = cleaning._get_draft_chunks(context)
+        except Exception as e:
+            stage_2 = PipelineStageResult.error_result(cleaning.stage_name, error=str(e), draft_id=context.draft_id)
+            stage_3 = PipelineStageResult.error_result(
+                detection.stage_name, error=f"Stage 2 failed: {e}", draft_id=context.draft_id
+            )
+            return stage_2.to_dict(), stage_3.to_dict()
+
+        cleaning_workers = cleaning._get_max_workers(context, 'cleaning_workers')
+        detection_workers = detection._get_max_workers(context, 'scene_detection_workers')
+        logger.info(
+            f"Pipelining {len(chunks)} chunks for draft {context.draft_id}: "
+            f"{cleaning_workers} cleaning / {detection_workers} detection worker(s), queue size {self.QUEUE_SIZE}"
+        )
+
+        started = time.perf_counter()
+        clean_results, detection_items, detection_results, detection_errors, first_scene_at = self._stream(
+            context, chunks, cleaning_workers, detection_workers
+        )
+        wall_seconds = round(time.perf_counter() - started, 2)
+
+        try:
+            stage_2 = cleaning._summarize_cleaning_results(context, chunks, clean_results, cleaning_workers)
+        except Exception as e:
+            stage_2 = PipelineStageResult.error_result(cleaning.stage_name, error=str(e), draft_id=context.draft_id)
+
+        if not stage_2.success:
+            stage_3 = PipelineStageResult.error_result(
+                detection.stage_name, error=f"Stage 2 failed: {stage_2.data.get('error')}", draft_id=context.draft_id
+            )
+        elif detection_errors:
+            # Same outcome as run_bounded in Stage 3: the first error in chunk order fails the stage
+            stage_3 = PipelineStageResult.error_result(
+                detection.stage_name, error=str(detection_errors[min(detection_errors)]), draft_id=context.draft_id
+            )
+        elif not detection_items:
+            stage_3 = PipelineStageResult.success_result(
+                detection.stage_name,
+                scenes_extracted=0,
+                scenes_stored=0,
+                chunks_processed=0,
+                message='No chunks to process'
+            )
+        else:
+            try:
+                stage_3 = detection._summarize_chunk_results(
+                    context, detection_items, detection_results, detection_workers
+                )
+            except Exception as e:
+                stage_3 = PipelineStageResult.error_result(detection.stage_name, error=str(e), draft_id=context.draft_id)
+
+        pipelining = {
+            'chunk_pipelining': True,
+            'pipeline_wall_seconds': wall_seconds,
+            'time_to_first_scene_seconds': (
+                round(first_scene_at - started, 2) if first_scene_at is not None else None
+            ),
+        }
+        stage_2.add_data(**pipelining)
+        stage_3.add_data(**pipelining)
+        return stage_2.to_dict(), stage_3.to_dict()
+
+    def _stream(self, context: PipelineStageContext, chunks: List[Tuple[int, int, str]],
+                cleaning_workers: int, detection_workers: int):
+        """
+        Run the cleaning and detection workers until every chunk is through.
+
+        Returns:
+            (clean_results aligned with chunks,
+             detection items as (chunk_number, cleaned_text) in chunk order,
+             detection results aligned with those items,
+             detection errors by item position,
+             perf_counter time the first scenes were detected or None)
+        """
+        cleaning, detection = self.cleaning_stage, self.detection_stage
+        app = current_app._get_current_object() if has_app_context() else None
+
+        clean_results: List[Optional[Tuple]] = [None] * len(chunks)
+        detected: Dict[int, Any] = {}
+        errors: Dict[int, Exception] = {}
+        first_scene_at: List[Optional[float]] = [None]
+        lock = threading.Lock()
+
+        pending: queue.Queue = queue.Queue()
+        for index, chunk in enumerate(chunks):
+            pending.put((index, chunk))
+        cleaned: queue.Queue = queue.Queue(maxsize=max(1, self.QUEUE_SIZE))
+
+        clean_progress = cleaning._item_progress(context, len(chunks))
+        detect_progress = detection._item_progress(context, len(chunks))
+
+        def clean_worker():
+            worker = cleaning._fork_for_worker()
+            while True:
+                try:
+                    index, chunk = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    result = worker._clean_chunk_task(chunk)
+                except Exception as e:
+                    chunk_id, chunk_number, raw_text = chunk
+                    result = (chunk_id, chunk_number, raw_text, str(e), 0.0)
+                clean_results[index] = result
+                clean_progress.advance()
+                try:
+                    # Stage 3 reads what Stage 2 stored, and skips chunks left empty
+                    cleaned_text = clean_text_for_database(result[2])
+                except Exception as e:
+                    # Handed to detection so the chunk fails Stage 3 like a detection error
+                    cleaned.put((index, result[1], e))
+                    continue
+                if cleaned_text and cleaned_text.strip():
+                    cleaned.put((index, result[1], cleaned_text))
+                else:
+                    detect_progress.advance()
+
+        def detect_worker():
+            worker = detection._fork_for_worker()
+            while True:
+                item = cleaned.get()
+                if item is _DONE:
+                    return
+                index, chunk_number, cleaned_text = item
+                if isinstance(cleaned_text, Exception):
+                    logger.error(f"Preparing chunk {chunk_number} for scene detection failed: {cleaned_text}")
+                    with lock:
+                        detected[index] = (chunk_number, '', None)
+                        errors[index] = cleaned_text
+                    detect_progress.advance()
+                    continue
+                with lock:
+                    stage_failed = bool(errors)
+                if stage_failed:
+                    # Stage 3 fails on its first error; skip detection of the chunks still queued
+                    detect_progress.advance()
+                    continue
+                try:
+                    result = worker._detect_chunk_scenes(chunk_number, cleaned_text)
+                    with lock:
+                        detected[index] = (chunk_number, cleaned_text, result)
+                        if result and result[0] and first_scene_at[0] is None:
+                            first_scene_at[0] = time.perf_counter()
+                except Exception as e:
+                    logger.error(f"Scene detection failed for chunk {chunk_number}: {e}")
+                    with lock:
+                        detected[index] = (chunk_number, cleaned_text, None)
+                        errors[index] = e
+                detect_progress.advance()
+
+        def in_app_context(target):
+            def run():
+                with app.app_context() if app is not None else nullcontext():
+                    target()
+            return run
+
+        cleaners = [
+            threading.Thread(target=in_app_context(clean_worker), name=f"chunk-pipeline-clean-{n}", daemon=True)
+            for n in range(max(1, min(cleaning_workers, len(chunks))))
+        ]
+        detectors = [
+            threading.Thread(target=in_app_context(detect_worker), name=f"chunk-pipeline-detect-{n}", daemon=True)
+            for n in range(max(1, detection_workers))
+        ]
+        for thread in cleaners + detectors:
+            thread.start()
+        for thread in cleaners:
+            thread.join()
+        for _ in detectors:
+            cleaned.put(_DONE)
+        for thread in detectors:
+            thread.join()
+
+        # Detection items in chunk order, as Stage 3 would have read them
+        positions = sorted(detected)
+        items = [(detected[i][0], detected[i][1]) for i in positions]
+        results = [detected[i][2] for i in positions]
+        item_errors = {position: errors[i] for position, i in enumerate(positions) if i in errors}
+        return clean_results, items, results, item_errors, first_scene_at[0]
@@ -6,15 +6,19 @@ Coordinates all 7 stages of processing and manages database operations.
 import os
 import traceback
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from contextlib import contextmanager
 
 from src.utils.logging_config import get_pipeline_logger
 from src.utils.database_utils import ensure_utf8_json
+from src.utils.progress_events import publish_progress
 from src.models.deconstructor.status import DraftStatus
 from src.services.graph_database_service import GraphDatabaseService, GraphDatabaseNotAvailableError
 
+from .base_stage import PipelineStageContext
+from .checkpoints import STAGE_ORDER, StageCheckpointRun, StageCheckpointStore, normalize_stage_key
+from .chunk_pipeline import ChunkPipeline
 from .stage_1_ingestion import PDFIngestionStage
 from .stage_2_cleaning import TextCleaningStage
 from .stage_3_sceneExtract import SceneDetectionStage
@@ -27,6 +31,17 @@ from .stage_7_chaptering import ChapteringStage
 
 logger = get_pipeline_logger(__name__)
 
+# Tables written by each stage, cleared (latest stage first) before a resumed
+# run re-executes that stage. Stages 2, 4A and 6 only update rows in place.
+STAGE_OUTPUT_TABLES = [
+    ('7', 'chapters'),
+    ('6', 'final_manuscripts'),
+    ('5', 'plot_issues'),
+    ('4c', 'analysis_reports'),
+    ('3', 'scenes'),
+    ('1', 'draft_chunks'),
+]
+
 class DeconstructorOrchestrator:
     """
     Orchestrates the complete novel deconstruction pipeline.
@@ -43,6 +58,7 @@ class DeconstructorOrchestrator:
         """
         self.generation_engine = generation_engine
         self.db_pool = db_pool
+        self.checkpoints = StageCheckpointStore(db_pool)
         
         # Initialize graph service for cleanup operations
         try:
@@ -70,20 +86,26 @@ class DeconstructorOrchestrator:
                     chaptering_mode: str = 'flexible', target_chapter_length: int = 2500,
                     use_transactions: bool = True, user_id: int = None, 
                     workspace_id: str = None, test_mode: bool = False,
-                    config: Dict[str, Any] = None) -> Dict[str, Any]:
+                    config: Dict[str, Any] = None, resume: bool = False,
+                    from_stage: Optional[str] = None) -> Dict[str, Any]:
         """
         Run the complete deconstruction pipeline.
+
+        Every stage commits its own writes and records a checkpoint; no
+        connection is held across stages.
         
         Args:
             draft_id: UUID of the draft to process
             file_name: Name of the uploaded file
             chaptering_mode: Chaptering approach ('flexible' or 'constrained')
             target_chapter_length: Target word count per chapter
-            use_transactions: Whether to use database transactions for stages
+            use_transactions: Kept for compatibility; stages always commit their own writes
             user_id: User ID executing the pipeline (derived from draft if not provided)
             workspace_id: Workspace ID (derived from draft if not provided)
             test_mode: Whether running in test mode
             config: Configuration parameters for validation and processing
+            resume: Skip leading stages whose checkpoints are still valid
+            from_stage: With resume, re-run from this stage even if its checkpoint is valid
             
         Returns:
             Pipeline execution results
@@ -119,27 +141,17 @@ class DeconstructorOrchestrator:
         # Update draft status to processing
         self._update_draft_status(draft_id, DraftStatus.PROCESSING.value)
 
-        # Initialize cross-stage transaction
-        # Get single connection for entire pipeline (all 7 stages)
-        conn = None
-        pipeline_conn = None
-
         try:
-            conn = self.db_pool.getconn()
-            conn.autocommit = False  # Enable transaction mode
-            pipeline_conn = conn
-            logger.debug(f"Initialized cross-stage transaction for draft {draft_id}")
+            checkpoint_run = StageCheckpointRun(
+                self.checkpoints, draft_id,
+                inputs=self._checkpoint_inputs(file_name, file_path, chaptering_mode, target_chapter_length, config),
+                resume=resume, from_stage=from_stage
+            )
+            stage_kwargs = dict(user_id=user_id, workspace_id=workspace_id, test_mode=test_mode, config=config or {})
+            pipeline_results['restored_stages'] = checkpoint_run.restored
 
             # Stage 1: Ingestion
-            stage_start_time = datetime.now()
-            logger.stage_start("ingestion", draft_id)
-            stage_1_result = self.stages[1].run_with_connection(
-                pipeline_conn, draft_id, file_path,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
-            stage_duration = (datetime.now() - stage_start_time).total_seconds()
-            logger.stage_complete("ingestion", draft_id, duration_seconds=stage_duration)
+            stage_1_result = self._run_stage(checkpoint_run, '1', self.stages[1], draft_id, file_path, **stage_kwargs)
             pipeline_results['stages_completed'].append({
                 'stage': 1,
                 'name': 'ingestion',
@@ -153,11 +165,6 @@ class DeconstructorOrchestrator:
                 error_msg = validation_result.get('error', 'Stage 1 validation failed')
                 logger.error(f"Pipeline stopped at Stage 1: {error_msg}")
 
-                # ROLLBACK cross-stage transaction
-                if pipeline_conn:
-                    pipeline_conn.rollback()
-                    logger.warning(f"✗ Cross-stage transaction rolled back (Stage 1 validation failure)")
-
                 self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_msg)
                 pipeline_results.update({
                     'success': False,
@@ -167,15 +174,21 @@ class DeconstructorOrchestrator:
                 })
                 return pipeline_results
 
+            checkpoint_run.complete('1', stage_1_result)
             self._update_draft_status(draft_id, DraftStatus.STAGE_1_COMPLETE.value)
 
-            # Stage 2: Cleaning
-            logger.info(f"Starting Stage 2: Cleaning for draft {draft_id}")
-            stage_2_result = self.stages[2].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            # Stages 2 and 3 either run one after the other, or (chunk
+            # pipelining) together, each chunk moving on to scene detection
+            # as soon as it is clean.
+            stage_3_result = None
+            if self._chunk_pipelining_enabled(stage_kwargs['config']) and not checkpoint_run.can_restore('2'):
+                logger.info(f"Starting Stages 2+3: Pipelined cleaning and scene detection for draft {draft_id}")
+                stage_2_result, stage_3_result = self._run_chunk_pipeline(checkpoint_run, draft_id, **stage_kwargs)
+            else:
+                # Stage 2: Cleaning
+                logger.info(f"Starting Stage 2: Cleaning for draft {draft_id}")
+                stage_2_result = self._run_stage(checkpoint_run, '2', self.stages[2], draft_id, **stage_kwargs)
+            checkpoint_run.complete('2', stage_2_result)
             self._update_draft_status(draft_id, DraftStatus.STAGE_2_COMPLETE.value)
             pipeline_results['stages_completed'].append({
                 'stage': 2,
@@ -186,12 +199,9 @@ class DeconstructorOrchestrator:
             logger.info(f"Stage 2 completed for draft {draft_id}")
 
             # Stage 3: Scene Detection
-            logger.info(f"Starting Stage 3: Scene Detection for draft {draft_id}")
-            stage_3_result = self.stages[3].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            if stage_3_result is None:
+                logger.info(f"Starting Stage 3: Scene Detection for draft {draft_id}")
+                stage_3_result = self._run_stage(checkpoint_run, '3', self.stages[3], draft_id, **stage_kwargs)
             pipeline_results['stages_completed'].append({
                 'stage': 3,
                 'name': 'scene_detection',
@@ -205,11 +215,6 @@ class DeconstructorOrchestrator:
                 error_msg = validation_result.get('error', 'Stage 3 validation failed')
                 logger.error(f"Pipeline stopped at Stage 3: {error_msg}")
 
-                # ROLLBACK cross-stage transaction
-                if pipeline_conn:
-                    pipeline_conn.rollback()
-                    logger.warning(f"✗ Cross-stage transaction rolled back (Stage 3 validation failure)")
-
                 self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_msg)
                 pipeline_results.update({
                     'success': False,
@@ -219,6 +224,7 @@ class DeconstructorOrchestrator:
                 })
                 return pipeline_results
 
+            checkpoint_run.complete('3', stage_3_result)
             self._update_draft_status(draft_id, DraftStatus.STAGE_3_COMPLETE.value)
             logger.info(f"Stage 3 completed and validated for draft {draft_id}")
 
@@ -226,11 +232,7 @@ class DeconstructorOrchestrator:
             logger.info(f"Starting Stage 4: Deep Analysis for draft {draft_id}")
             #
             # Stage 4A: Scene-by-scene analysis (chaptering params from metadata)
-            stage_4a_result = self.stages[4]['a'].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            stage_4a_result = self._run_stage(checkpoint_run, '4a', self.stages[4]['a'], draft_id, **stage_kwargs)
             pipeline_results['stages_completed'].append({
                 'stage': '4a',
                 'name': 'scene_analysis',
@@ -238,26 +240,40 @@ class DeconstructorOrchestrator:
                 'result': stage_4a_result
             })
 
+            # Validate Stage 4A before paying for 4B/4C
+            if stage_4a_result.get('failed_analyses', 0) > 0:
+                error_msg = (
+                    f"Stage 4A failed to analyze {stage_4a_result['failed_analyses']} scenes. "
+                    f"Possible causes: truncated AI responses, parsing failures, or insufficient tokens. "
+                    f"Successfully analyzed: {stage_4a_result.get('scenes_analyzed', 0)}"
+                )
+                logger.error(error_msg)
+                self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_msg)
+                return {
+                    'success': False,
+                    'draft_id': draft_id,
+                    'error': error_msg,
+                    'stage_failed': '4a',
+                    'processing_time_seconds': (datetime.now() - start_time).total_seconds(),
+                    'stages_completed': pipeline_results['stages_completed']
+                }
+
+            checkpoint_run.complete('4a', stage_4a_result)
+
             # Stage 4B: Graph analysis (chaptering params from metadata)
-            stage_4b_result = self.stages[4]['b'].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            stage_4b_result = self._run_stage(checkpoint_run, '4b', self.stages[4]['b'], draft_id, **stage_kwargs)
             pipeline_results['stages_completed'].append({
                 'stage': '4b',
                 'name': 'graph_analysis',
                 'completed_at': datetime.now().isoformat(),
                 'result': stage_4b_result
             })
+            checkpoint_run.complete('4b', stage_4b_result)
             #
 
             # Stage 4C: Comprehensive reporting
-            stage_4c_result = self.stages[4]['c'].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            stage_4c_result = self._run_stage(checkpoint_run, '4c', self.stages[4]['c'], draft_id, **stage_kwargs)
+            checkpoint_run.complete('4c', stage_4c_result)
             self._update_draft_status(draft_id, DraftStatus.STAGE_4_COMPLETE.value)
             pipeline_results['stages_completed'].append({
                 'stage': '4c',
@@ -268,25 +284,6 @@ class DeconstructorOrchestrator:
             logger.info(f"Stage 4 Deep Analysis completed for draft {draft_id}")
 
             # Validate Stage 4 results
-            # Stage 4A validation
-            if stage_4a_result.get('failed_analyses', 0) > 0:
-                error_msg = (
-                    f"Stage 4A failed to analyze {stage_4a_result['failed_analyses']} scenes. "
-                    f"Possible causes: truncated AI responses, parsing failures, or insufficient tokens. "
-                    f"Successfully analyzed: {stage_4a_result.get('scenes_analyzed', 0)}"
-                )
-                logger.error(error_msg)
-                pipeline_conn.rollback()
-                self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_msg)
-                return {
-                    'success': False,
-                    'draft_id': draft_id,
-                    'error': error_msg,
-                    'stage_failed': '4a',
-                    'processing_time_seconds': (datetime.now() - start_time).total_seconds(),
-                    'stages_completed': pipeline_results['stages_completed']
-                }
-
             # Stage 4B validation (if AGE enabled)
             if stage_4b_result.get('entities_created', 0) == 0 and stage_4b_result.get('skipped') is False:
                 # Only fail if graph analysis was attempted but produced no entities
@@ -299,11 +296,7 @@ class DeconstructorOrchestrator:
 
             # Stage 5: Coherence Check
             logger.info(f"Starting Stage 5: Coherence Check for draft {draft_id}")
-            stage_5_result = self.stages[5].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            stage_5_result = self._run_stage(checkpoint_run, '5', self.stages[5], draft_id, **stage_kwargs)
             self._update_draft_status(draft_id, DraftStatus.STAGE_5_COMPLETE.value)
             pipeline_results['stages_completed'].append({
                 'stage': 5,
@@ -321,7 +314,6 @@ class DeconstructorOrchestrator:
                     f"Possible causes: truncated AI responses, parsing failures, or database errors."
                 )
                 logger.error(error_msg)
-                pipeline_conn.rollback()
                 self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_msg)
                 return {
                     'success': False,
@@ -331,14 +323,12 @@ class DeconstructorOrchestrator:
                     'processing_time_seconds': (datetime.now() - start_time).total_seconds(),
                     'stages_completed': pipeline_results['stages_completed']
                 }
+            checkpoint_run.complete('5', stage_5_result)
 
             # Stage 6: Enhancement
             logger.info(f"Starting Stage 6: Enhancement for draft {draft_id}")
-            stage_6_result = self.stages[6].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            stage_6_result = self._run_stage(checkpoint_run, '6', self.stages[6], draft_id, **stage_kwargs)
+            checkpoint_run.complete('6', stage_6_result)
             self._update_draft_status(draft_id, DraftStatus.STAGE_6_COMPLETE.value)
             pipeline_results['stages_completed'].append({
                 'stage': 6,
@@ -350,11 +340,7 @@ class DeconstructorOrchestrator:
 
             # Stage 7: Chaptering
             logger.info(f"Starting Stage 7: Chaptering for draft {draft_id}")
-            stage_7_result = self.stages[7].run_with_connection(
-                pipeline_conn, draft_id,
-                user_id=user_id, workspace_id=workspace_id,
-                test_mode=test_mode, config=config or {}
-            )
+            stage_7_result = self._run_stage(checkpoint_run, '7', self.stages[7], draft_id, **stage_kwargs)
             pipeline_results['stages_completed'].append({
                 'stage': 7,
                 'name': 'chaptering',
@@ -374,11 +360,6 @@ class DeconstructorOrchestrator:
                 print(f"❌ VALIDATION FAILED: {error_msg}")
                 logger.error(f"Pipeline stopped at Stage 7: {error_msg}")
 
-                # ROLLBACK cross-stage transaction
-                if pipeline_conn:
-                    pipeline_conn.rollback()
-                    logger.warning(f"✗ Cross-stage transaction rolled back (Stage 7 validation failure)")
-
                 self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_msg)
                 pipeline_results.update({
                     'success': False,
@@ -389,6 +370,7 @@ class DeconstructorOrchestrator:
                 return pipeline_results
 
             print(f"✅ VALIDATION PASSED - Stage 7 validated successfully")
+            checkpoint_run.complete('7', stage_7_result)
             logger.info(f"Stage 7 completed and validated for draft {draft_id}")
 
             # Validate pipeline success by checking all stage results
@@ -400,10 +382,6 @@ class DeconstructorOrchestrator:
 
             # COMMIT or ROLLBACK based on validation
             if pipeline_success:
-                if pipeline_conn:
-                    pipeline_conn.commit()
-                    logger.info(f"✓ Cross-stage transaction committed for draft {draft_id}")
-
                 # Monitor finish_reason across all stages to detect token limit issues
                 truncation_warnings = []
                 for stage_info in pipeline_results.get('stages_completed', []):
@@ -428,11 +406,7 @@ class DeconstructorOrchestrator:
                 )
                 logger.pipeline_complete(draft_id, duration_seconds=processing_time)
             else:
-                # Pipeline failed validation - rollback everything
-                if pipeline_conn:
-                    pipeline_conn.rollback()
-                    logger.warning(f"✗ Cross-stage transaction rolled back (pipeline validation failure)")
-
+                # Pipeline failed validation; completed stages keep their checkpoints
                 # Collect failed stage information
                 failed_stages = [
                     s for s in pipeline_results['stages_completed']
@@ -470,11 +444,6 @@ class DeconstructorOrchestrator:
             logger.pipeline_failed(draft_id, error=error_message)
             logger.debug("Full traceback", traceback=error_trace)
 
-            # ROLLBACK cross-stage transaction on exception
-            if pipeline_conn:
-                pipeline_conn.rollback()
-                logger.error(f"✗ Cross-stage transaction rolled back due to exception")
-
             # Update draft status to failed
             self._update_draft_status(draft_id, DraftStatus.FAILED.value, error_message=error_message)
 
@@ -487,13 +456,171 @@ class DeconstructorOrchestrator:
             return pipeline_results
 
         finally:
-            # Return connection to pool
-            if conn:
-                self.db_pool.putconn(conn)
-
             # Clear logging context
             logger.clear_context()
 
+    def resume_from_stage(self, draft_id: str, file_name: str, stage: Optional[Any] = None,
+                          **kwargs) -> Dict[str, Any]:
+        """
+        Resume a deconstruction run from its stage checkpoints.
+
+        Leading stages whose checkpoints still match the run's inputs are
+        skipped; the first stage without one (or ``stage``, if given) and
+        every stage after it are re-run.
+
+        Args:
+            draft_id: UUID of the draft to process
+            file_name: Name of the uploaded file
+            stage: Optional stage to re-run from (1, 2, 3, '4a', '4b', '4c', 5, 6, 7)
+            **kwargs: Remaining run_pipeline arguments
+
+        Returns:
+            Pipeline execution results
+
+        Raises:
+            ValueError: If the stage is unknown
+        """
+        from_stage = normalize_stage_key(stage) if stage is not None else None
+        return self.run_pipeline(draft_id, file_name, resume=True, from_stage=from_stage, **kwargs)
+
+    def _run_stage(self, checkpoint_run: StageCheckpointRun, stage_key: str, stage,
+                   draft_id: str, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Run one stage on its own pooled connections, or restore it from its checkpoint.
+
+        Args:
+            checkpoint_run: Checkpoint bookkeeping of this run
+            stage_key: Stage key ('1' ... '7')
+            stage: Stage instance
+            draft_id: UUID of the draft
+            *args, **kwargs: Passed to the stage's run_with_connection()
+
+        Returns:
+            Stage result dictionary
+        """
+        stage_name = getattr(stage, 'stage_name', stage_key)
+        restored = checkpoint_run.restore(stage_key)
+        if restored is not None:
+            logger.info(
+                f"Stage {stage_key} restored from checkpoint v{restored['checkpoint_version']} for draft {draft_id}"
+            )
+            logger.stage_complete(stage_name, draft_id, stage=stage_key, restored_from_checkpoint=True)
+            return restored
+
+        if checkpoint_run.begin(stage_key):
+            self._reset_stage_outputs(draft_id, stage_key)
+
+        logger.stage_start(stage_name, draft_id, stage=stage_key)
+        stage_start_time = time.time()
+        # No shared connection: each stage write borrows one from the pool
+        result = stage.run_with_connection(None, draft_id, *args, **kwargs)
+        duration = round(time.time() - stage_start_time, 2)
+        if result.get('success', False):
+            logger.stage_complete(stage_name, draft_id, duration_seconds=duration, stage=stage_key)
+        else:
+            logger.stage_failed(stage_name, draft_id, error=result.get('error'), stage=stage_key)
+        return result
+
+    def _chunk_pipelining_enabled(self, config: Dict[str, Any]) -> bool:
+        """Whether Stages 2 and 3 run as a chunk pipeline (config 'chunk_pipelining' or env)."""
+        enabled = config.get('chunk_pipelining')
+        if enabled is None:
+            enabled = os.getenv('DECONSTRUCTOR_CHUNK_PIPELINING', 'false')
+        if isinstance(enabled, str):
+            enabled = enabled.strip().lower() in ('1', 'true', 'yes', 'on')
+        return bool(enabled)
+
+    def _run_chunk_pipeline(self, checkpoint_run: StageCheckpointRun, draft_id: str,
+                            **kwargs) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run Stages 2 and 3 together with chunk-level pipelining.
+
+        Only used when Stage 2 cannot be restored from its checkpoint, so both
+        stages execute (and, on a resumed run, their outputs are reset first).
+
+        Args:
+            checkpoint_run: Checkpoint bookkeeping of this run
+            draft_id: UUID of the draft
+            **kwargs: Stage context parameters (user_id, workspace_id, test_mode, config)
+
+        Returns:
+            (stage_2_result, stage_3_result) dictionaries
+        """
+        cleaning_stage, detection_stage = self.stages[2], self.stages[3]
+        checkpoint_run.restore('2')
+        if checkpoint_run.begin('2'):
+            self._reset_stage_outputs(draft_id, '2')
+        checkpoint_run.begin('3')
+
+        stage_names = {'2': getattr(cleaning_stage, 'stage_name', '2'), '3': getattr(detection_stage, 'stage_name', '3')}
+        for stage_key, stage_name in stage_names.items():
+            logger.stage_start(stage_name, draft_id, stage=stage_key, chunk_pipelining=True)
+
+        context = PipelineStageContext(draft_id=draft_id, **kwargs)
+        results = ChunkPipeline(cleaning_stage, detection_stage).run(context)
+
+        for (stage_key, stage_name), result in zip(stage_names.items(), results):
+            if result.get('success', False):
+                logger.stage_complete(
+                    stage_name, draft_id, duration_seconds=result.get('pipeline_wall_seconds'), stage=stage_key
+                )
+            else:
+                logger.stage_failed(stage_name, draft_id, error=result.get('error'), stage=stage_key)
+        return results
+
+    def _checkpoint_inputs(self, file_name: str, file_path: str, chaptering_mode: str,
+                           target_chapter_length: int, config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run parameters that stage outputs depend on, for checkpoint input hashes."""
+        try:
+            stat = os.stat(file_path)
+            file_fingerprint = {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+        except OSError:
+            file_fingerprint = None
+
+        request = getattr(self.generation_engine, 'request', None)
+        return {
+            'file_name': file_name,
+            'file': file_fingerprint,
+            'chaptering_mode': chaptering_mode,
+            'target_chapter_length': target_chapter_length,
+            'config': config or {},
+            'provider': getattr(request, 'provider', None),
+            'model': getattr(request, 'model', None),
+        }
+
+    def _reset_stage_outputs(self, draft_id: str, from_stage: str) -> None:
+        """
+        Delete what a stage and every later stage wrote, so a resumed run
+        does not duplicate partial output of the interrupted attempt.
+
+        Args:
+            draft_id: UUID of the draft
+            from_stage: First stage that will be re-executed
+        """
+        from_index = STAGE_ORDER.index(from_stage)
+        if from_index <= STAGE_ORDER.index('4b') and self.graph_service:
+            try:
+                self.graph_service.cleanup_draft_data(draft_id)
+            except Exception as e:
+                logger.warning(f"Could not clean graph data before resuming draft {draft_id}: {e}")
+
+        tables = [table for stage, table in STAGE_OUTPUT_TABLES if STAGE_ORDER.index(stage) >= from_index]
+        if not tables:
+            return
+
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                for table in tables:
+                    cursor.execute(f"DELETE FROM {table} WHERE draft_id = %s", (draft_id,))
+            conn.commit()
+            logger.info(f"Cleared {', '.join(tables)} before resuming draft {draft_id} at stage {from_stage}")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_pool.putconn(conn)
+
     def _execute_stage_with_retry(self, stage, stage_number: str, draft_id: str, *args,
                                  user_id: int = None, workspace_id: str = None, 
                                  test_mode: bool = False, config: Dict[str, Any] = None,
@@ -1002,6 +1129,7 @@ class DeconstructorOrchestrator:
                 conn.commit()
             
             logger.debug(f"Updated draft {draft_id} status to {status}")
+            publish_progress(draft_id, 'status', status=status, error_message=error_message)
             
         except Exception as e:
             logger.error(f"Failed to update draft status: {e}")
@@ -1077,32 +1205,15 @@ class DeconstructorOrchestrator:
         details = {}
         
         try:
-            # Count chunks
-            cursor.execute("SELECT COUNT(*) FROM draft_chunks WHERE draft_id = %s", (draft_id,))
-            details['chunks_created'] = cursor.fetchone()[0]
-            
-            # Count scenes
-            cursor.execute("SELECT COUNT(*) FROM scenes WHERE draft_id = %s", (draft_id,))
-            details['scenes_extracted'] = cursor.fetchone()[0]
-            
-            # Count analyzed scenes
             cursor.execute("""
-                SELECT COUNT(*) FROM scenes 
-                WHERE draft_id = %s AND analysis_json IS NOT NULL
-            """, (draft_id,))
-            details['scenes_analyzed'] = cursor.fetchone()[0]
-            
-            # Count plot issues
-            cursor.execute("SELECT COUNT(*) FROM plot_issues WHERE draft_id = %s", (draft_id,))
-            details['plot_issues_found'] = cursor.fetchone()[0]
-            
-            # # Count analysis reports
-            # cursor.execute("SELECT COUNT(*) FROM analysis_reports WHERE draft_id = %s", (draft_id,))
-            # details['analysis_reports_generated'] = cursor.fetchone()[0]
-            # 
-            # # Count chapters
-            # cursor.execute("SELECT COUNT(*) FROM chapters WHERE draft_id = %s", (draft_id,))
-            # details['chapters_created'] = cursor.fetchone()[0]
+                SELECT
+                    (SELECT COUNT(*) FROM draft_chunks WHERE draft_id = %(draft_id)s),
+                    (SELECT COUNT(*) FROM scenes WHERE draft_id = %(draft_id)s),
+                    (SELECT COUNT(*) FROM scenes WHERE draft_id = %(draft_id)s AND analysis_json IS NOT NULL),
+                    (SELECT COUNT(*) FROM plot_issues WHERE draft_id = %(draft_id)s)
+            """, {'draft_id': draft_id})
+            (details['chunks_created'], details['scenes_extracted'],
+             details['scenes_analyzed'], details['plot_issues_found']) = cursor.fetchone()
             
         except Exception as e:
             logger.warning(f"Could not get all progress details: {e}")
@@ -1127,6 +1238,9 @@ class DeconstructorOrchestrator:
             'success': False,
             'error': None
         }
+
+        # Checkpoints describe stage output that is about to be removed
+        cleanup_stats['checkpoints_deleted'] = self.checkpoints.delete(draft_id)
         
         conn = None
         try:
@@ -5,12 +5,15 @@ Processes raw text chunks through AI cleaning to improve quality.
 
 import json
 import logging
-from typing import Dict, Any, List, Tuple
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from .prompt_template import DeconstructorPrompts
 from src.utils.database_utils import clean_text_for_database
 from .base_stage import BasePipelineStage, PipelineStageResult, PipelineStageContext
 from src.config.deconstructor_config import Stage3Config
 from src.utils.llm_retry import call_llm_with_retry
+from src.utils.concurrency import run_bounded
+from src.utils.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -57,39 +60,23 @@ class TextCleaningStage(BasePipelineStage):
                     message='No chunks to process'
                 )
             
-            # Process each chunk through AI cleaning
-            cleaned_chunks = []
-            failed_chunks = []
-            
-            for chunk_id, chunk_number, raw_text in chunks:
-                try:
-                    cleaned_text = self._clean_text_chunk(raw_text)
-                    cleaned_chunks.append((chunk_id, cleaned_text))
-                    
-                    self.logger.debug(f"Cleaned chunk {chunk_number} for draft {draft_id}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to clean chunk {chunk_number}: {e}")
-                    failed_chunks.append((chunk_id, chunk_number, str(e)))
-                    # Use original text as fallback
-                    cleaned_chunks.append((chunk_id, raw_text))
-            
-            # Update chunks in database
-            updated_count = self._update_cleaned_chunks(context, cleaned_chunks)
-            
-            return PipelineStageResult.success_result(
-                self.stage_name,
-                chunks_processed=len(chunks),
-                chunks_cleaned=len(cleaned_chunks) - len(failed_chunks),
-                chunks_updated=updated_count,
-                failed_chunks=len(failed_chunks),
-                failures=failed_chunks if failed_chunks else None,
-                execution_metadata={
-                    'actual_provider': self.generation_engine.request.provider,
-                    'actual_model': self.generation_engine.request.model,
-                    'api_calls_made': len(chunks) > 0
-                }
+            # Process chunks through AI cleaning (bounded concurrency, ordered results)
+            max_workers = self._get_max_workers(context, 'cleaning_workers')
+            self.logger.info(
+                f"Cleaning {len(chunks)} chunks for draft {draft_id} with {max_workers} worker(s)"
             )
+
+            progress = self._item_progress(context, len(chunks))
+            chunk_results = run_bounded(
+                lambda chunk, worker: (worker or self)._clean_chunk_task(chunk),
+                chunks,
+                max_workers,
+                worker_state_factory=self._fork_for_worker,
+                on_result=lambda index, result: progress.advance(),
+                thread_name_prefix="stage2-clean",
+            )
+
+            return self._summarize_cleaning_results(context, chunks, chunk_results, max_workers)
             
         except Exception as e:
             return PipelineStageResult.error_result(
@@ -103,6 +90,56 @@ class TextCleaningStage(BasePipelineStage):
                 }
             )
     
+    def _summarize_cleaning_results(self, context: PipelineStageContext, chunks: List[Tuple[int, int, str]],
+                                    chunk_results: List[Tuple[int, int, str, Optional[str], float]],
+                                    max_workers: int) -> PipelineStageResult:
+        """
+        Store and summarize the per-chunk cleaning results.
+        
+        Shared by _execute_stage and the orchestrator's chunk pipeline.
+        
+        Args:
+            context: Stage execution context
+            chunks: (chunk_id, chunk_number, raw_text) tuples
+            chunk_results: _clean_chunk_task() results aligned with chunks
+            max_workers: Cleaning worker count (reported in the result)
+            
+        Returns:
+            PipelineStageResult of the stage
+        """
+        cleaned_chunks = []
+        failed_chunks = []
+        chunk_latencies = []
+
+        for chunk_id, chunk_number, cleaned_text, error, latency in chunk_results:
+            cleaned_chunks.append((chunk_id, cleaned_text))
+            if error is not None:
+                failed_chunks.append((chunk_id, chunk_number, error))
+            chunk_latencies.append({
+                'chunk_number': chunk_number,
+                'latency_seconds': round(latency, 3),
+                'failed': error is not None
+            })
+        
+        # Update chunks in database
+        updated_count = self._update_cleaned_chunks(context, cleaned_chunks)
+        
+        return PipelineStageResult.success_result(
+            self.stage_name,
+            chunks_processed=len(chunks),
+            chunks_cleaned=len(cleaned_chunks) - len(failed_chunks),
+            chunks_updated=updated_count,
+            failed_chunks=len(failed_chunks),
+            failures=failed_chunks if failed_chunks else None,
+            max_workers=max_workers,
+            chunk_latencies=chunk_latencies,
+            execution_metadata={
+                'actual_provider': self.generation_engine.request.provider,
+                'actual_model': self.generation_engine.request.model,
+                'api_calls_made': len(chunks) > 0
+            }
+        )
+    
     def run(self, draft_id: str) -> Dict[str, Any]:
         """
         Execute Stage 2 with legacy interface (backward compatibility).
@@ -115,6 +152,28 @@ class TextCleaningStage(BasePipelineStage):
         """
         return super().run(draft_id)
     
+    def _clean_chunk_task(self, chunk: Tuple[int, int, str]) -> Tuple[int, int, str, Optional[str], float]:
+        """
+        Clean one chunk, falling back to its raw text on failure.
+        
+        Args:
+            chunk: (chunk_id, chunk_number, raw_text) tuple
+            
+        Returns:
+            (chunk_id, chunk_number, cleaned_text, error_or_None, latency_seconds)
+        """
+        chunk_id, chunk_number, raw_text = chunk
+        started = time.perf_counter()
+        
+        try:
+            cleaned_text = self._clean_text_chunk(raw_text)
+            self.logger.debug(f"Cleaned chunk {chunk_number}")
+            return chunk_id, chunk_number, cleaned_text, None, time.perf_counter() - started
+        except Exception as e:
+            self.logger.error(f"Failed to clean chunk {chunk_number}: {e}")
+            # Use original text as fallback
+            return chunk_id, chunk_number, raw_text, str(e), time.perf_counter() - started
+    
     def _get_draft_chunks(self, context: PipelineStageContext) -> List[Tuple[int, int, str]]:
         """
         Retrieve all chunks for a draft from the database with UTF-8 safety.
@@ -178,7 +237,7 @@ class TextCleaningStage(BasePipelineStage):
                 
                 # Generate cleaned text (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -192,7 +251,7 @@ class TextCleaningStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
 
                 if response.success:
@@ -221,12 +280,13 @@ class TextCleaningStage(BasePipelineStage):
                     error_msg_str = response.error_message or ''
                     if attempt < max_retries:
                         delay = Stage3Config.parse_rate_limit_delay(error_msg_str)
-                        if delay > 0:
+                        # With the rate limiter on, the key is already paused and the retry waits there
+                        if delay > 0 and not get_rate_limiter().enabled:
                             logger.warning(
                                 f"AI generation rate-limited (attempt {attempt + 1}/{max_retries + 1}), "
                                 f"sleeping {delay:.1f}s before retry"
                             )
-                            import time as _time; _time.sleep(delay)
+                            time.sleep(delay)
                         else:
                             logger.warning(f"AI generation failed (attempt {attempt + 1}/{max_retries + 1}): {error_msg_str}, retrying...")
                         continue
@@ -237,12 +297,12 @@ class TextCleaningStage(BasePipelineStage):
             except Exception as e:
                 if attempt < max_retries:
                     delay = Stage3Config.parse_rate_limit_delay(str(e))
-                    if delay > 0:
+                    if delay > 0 and not get_rate_limiter().enabled:
                         logger.warning(
                             f"Error cleaning text chunk rate-limited (attempt {attempt + 1}/{max_retries + 1}), "
                             f"sleeping {delay:.1f}s before retry"
                         )
-                        import time as _time; _time.sleep(delay)
+                        time.sleep(delay)
                     else:
                         logger.warning(f"Error cleaning text chunk (attempt {attempt + 1}/{max_retries + 1}): {e}, retrying...")
                     continue
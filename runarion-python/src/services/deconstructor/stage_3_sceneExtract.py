@@ -12,6 +12,8 @@ from src.utils.database_utils import clean_text_for_database
 from src.utils.json_response_parser import parse_scene_detection_response, JSONResponseParser
 from src.config.deconstructor_config import Stage3Config
 from src.utils.llm_retry import call_llm_with_retry
+from src.utils.concurrency import run_bounded
+from src.utils.rate_limiter import get_rate_limiter
 from .base_stage import BasePipelineStage, PipelineStageResult, PipelineStageContext
 
 logger = logging.getLogger(__name__)
@@ -60,82 +62,146 @@ class SceneDetectionStage(BasePipelineStage):
             
             self.logger.info(f"Processing {len(chunk_data)} chunks for draft {draft_id}")
             
-            # Process each chunk individually
-            all_scenes = []
-            current_scene_number = 1
-            chunks_processed = 0
-            total_text_length = 0
-
-            # Accumulate hydration stats across chunks
-            total_hydration_stats = {
-                'attempted': 0,
-                'succeeded': 0,
-                'failed': 0,
-                'success_rate': 1.0
-            }
-
-            for chunk_number, cleaned_text in chunk_data:
-                if not cleaned_text.strip():
-                    self.logger.warning(f"Skipping empty chunk {chunk_number}")
-                    continue
-
-                self.logger.info(f"Processing chunk {chunk_number} ({len(cleaned_text)} characters)")
-                total_text_length += len(cleaned_text)
-
-                # Process this chunk to extract a source-faithful scene band
-                chunk_scenes = self._process_chunk(chunk_number, cleaned_text, current_scene_number)
+            # Detect and hydrate scenes per chunk (bounded concurrency). Each chunk
+            # is numbered locally from 1; global numbering is a post-pass in chunk
+            # order so the result is identical for any worker count.
+            max_workers = self._get_max_workers(context, 'scene_detection_workers')
+            self.logger.info(f"Detecting scenes with {max_workers} worker(s)")
+
+            progress = self._item_progress(context, len(chunk_data))
+            chunk_results = run_bounded(
+                lambda chunk, worker: (worker or self)._detect_chunk_scenes(*chunk),
+                chunk_data,
+                max_workers,
+                worker_state_factory=self._fork_for_worker,
+                on_result=lambda index, result: progress.advance(),
+                thread_name_prefix="stage3-scenes",
+                # A chunk failing its hydration check fails the stage; skip the chunks not yet sent
+                cancel_on_error=True,
+            )
 
-                if chunk_scenes:
-                    # Hydrate scene content from original chunk using markers when content is truncated/missing
-                    hydrated, hydration_result = self._hydrate_scene_contents_from_markers(cleaned_text, chunk_scenes)
+            return self._summarize_chunk_results(context, chunk_data, chunk_results, max_workers)
+            
+        except Exception as e:
+            return PipelineStageResult.error_result(
+                self.stage_name,
+                error=str(e),
+                draft_id=draft_id
+            )
+    
+    def _summarize_chunk_results(self, context: PipelineStageContext, chunk_data: List[Tuple[int, str]],
+                                 chunk_results: List[Any], max_workers: int) -> PipelineStageResult:
+        """
+        Number, store and summarize the per-chunk detection results.
+        
+        Shared by _execute_stage and the orchestrator's chunk pipeline, which
+        produces the same per-chunk results while cleaning is still running.
+        
+        Args:
+            context: Stage execution context
+            chunk_data: (chunk_number, cleaned_text) tuples in chunk order
+            chunk_results: _detect_chunk_scenes() results aligned with chunk_data
+            max_workers: Detection worker count (reported in the result)
+            
+        Returns:
+            PipelineStageResult of the stage
+        """
+        all_scenes = []
+        current_scene_number = 1
+        chunks_processed = 0
+        total_text_length = 0
+
+        # Accumulate hydration stats across chunks
+        total_hydration_stats = {
+            'attempted': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'success_rate': 1.0
+        }
 
-                    # Accumulate hydration stats
-                    total_hydration_stats['attempted'] += hydration_result['attempted']
-                    total_hydration_stats['succeeded'] += hydration_result['succeeded']
-                    total_hydration_stats['failed'] += hydration_result['failed']
+        for (chunk_number, cleaned_text), chunk_result in zip(chunk_data, chunk_results):
+            if chunk_result is None:
+                continue
 
-                    all_scenes.extend(hydrated)
-                    current_scene_number += len(chunk_scenes)
-                    self.logger.info(f"Chunk {chunk_number}: Successfully extracted {len(chunk_scenes)} scenes")
-                else:
-                    self.logger.warning(f"Chunk {chunk_number}: No scenes extracted")
+            chunk_scenes, hydration_result = chunk_result
+            total_text_length += len(cleaned_text)
 
-                chunks_processed += 1
+            if chunk_scenes:
+                total_hydration_stats['attempted'] += hydration_result['attempted']
+                total_hydration_stats['succeeded'] += hydration_result['succeeded']
+                total_hydration_stats['failed'] += hydration_result['failed']
 
-            # Calculate overall hydration success rate
-            if total_hydration_stats['attempted'] > 0:
-                total_hydration_stats['success_rate'] = total_hydration_stats['succeeded'] / total_hydration_stats['attempted']
-            
-            if not all_scenes:
-                return PipelineStageResult.success_result(
-                    self.stage_name,
-                    scenes_extracted=0,
-                    scenes_stored=0,
-                    chunks_processed=chunks_processed,
-                    message='No scenes detected across all chunks'
+                self.logger.info(
+                    f"Chunk {chunk_number}: numbering {len(chunk_scenes)} scenes from scene {current_scene_number}"
                 )
-            
-            # Store all scenes in database
-            scenes_stored = self._store_scenes_in_database(context, all_scenes)
+                all_scenes.extend(self._apply_global_scene_numbering(chunk_scenes, current_scene_number))
+                current_scene_number += len(chunk_scenes)
+
+            chunks_processed += 1
 
+        # Calculate overall hydration success rate
+        if total_hydration_stats['attempted'] > 0:
+            total_hydration_stats['success_rate'] = total_hydration_stats['succeeded'] / total_hydration_stats['attempted']
+        
+        if not all_scenes:
             return PipelineStageResult.success_result(
                 self.stage_name,
-                scenes_extracted=len(all_scenes),
-                scenes_stored=scenes_stored,
+                scenes_extracted=0,
+                scenes_stored=0,
                 chunks_processed=chunks_processed,
-                total_text_length=total_text_length,
-                avg_scene_length=sum(len(scene.get('content', '')) for scene in all_scenes) // len(all_scenes) if all_scenes else 0,
-                scenes_per_chunk=len(all_scenes) / chunks_processed if chunks_processed > 0 else 0,
-                hydration_stats=total_hydration_stats  # Include hydration quality stats
+                message='No scenes detected across all chunks'
             )
+        
+        # Store all scenes in database
+        scenes_stored = self._store_scenes_in_database(context, all_scenes)
+
+        return PipelineStageResult.success_result(
+            self.stage_name,
+            scenes_extracted=len(all_scenes),
+            scenes_stored=scenes_stored,
+            chunks_processed=chunks_processed,
+            total_text_length=total_text_length,
+            avg_scene_length=sum(len(scene.get('content', '')) for scene in all_scenes) // len(all_scenes) if all_scenes else 0,
+            scenes_per_chunk=len(all_scenes) / chunks_processed if chunks_processed > 0 else 0,
+            hydration_stats=total_hydration_stats,  # Include hydration quality stats
+            max_workers=max_workers
+        )
+
+    def _detect_chunk_scenes(self, chunk_number: int, cleaned_text: str):
+        """
+        Detect and hydrate the scenes of a single chunk.
+        
+        Scenes are numbered locally from 1; the caller applies global numbering
+        in chunk order once every chunk has finished.
+        
+        Args:
+            chunk_number: Number of the chunk being processed
+            cleaned_text: Cleaned text content of the chunk
             
-        except Exception as e:
-            return PipelineStageResult.error_result(
-                self.stage_name,
-                error=str(e),
-                draft_id=draft_id
-            )
-    
+        Returns:
+            (hydrated_scenes, hydration_stats) tuple, or None for an empty chunk
+            
+        Raises:
+            ValueError: If hydration quality for the chunk is too low
+        """
+        if not cleaned_text.strip():
+            self.logger.warning(f"Skipping empty chunk {chunk_number}")
+            return None
+
+        self.logger.info(f"Processing chunk {chunk_number} ({len(cleaned_text)} characters)")
+
+        # Process this chunk to extract a source-faithful scene band
+        chunk_scenes = self._process_chunk(chunk_number, cleaned_text, 1)
+
+        if not chunk_scenes:
+            self.logger.warning(f"Chunk {chunk_number}: No scenes extracted")
+            return [], None
+
+        # Hydrate scene content from original chunk using markers when content is truncated/missing
+        hydrated, hydration_result = self._hydrate_scene_contents_from_markers(cleaned_text, chunk_scenes)
+        self.logger.info(f"Chunk {chunk_number}: Successfully extracted {len(chunk_scenes)} scenes")
+        return hydrated, hydration_result
+
     def _call_api_with_retry(self, max_retries: int = None, base_delay: float = None, rate_limit_delay: float = None) -> Any:
         """
         Call the generation API with exponential backoff retry logic and rate limiting.
@@ -156,8 +222,9 @@ class SceneDetectionStage(BasePipelineStage):
         if rate_limit_delay is None:
             rate_limit_delay = Stage3Config.RETRY_RATE_LIMIT_DELAY
         
-        # Add a small delay before any API call to prevent overwhelming the service
-        time.sleep(rate_limit_delay)
+        # Pace calls to avoid overwhelming the service, unless the rate limiter already does
+        if not get_rate_limiter().enabled:
+            time.sleep(rate_limit_delay)
         
         for attempt in range(max_retries + 1):
             try:
@@ -165,7 +232,7 @@ class SceneDetectionStage(BasePipelineStage):
                 # exponential backoff; the scene-count loop above handles the
                 # case where we got a valid response but the wrong scene count.
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -179,7 +246,7 @@ class SceneDetectionStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
 
                 # Return on success or non-retryable errors
@@ -320,7 +387,8 @@ class SceneDetectionStage(BasePipelineStage):
         Returns:
             List of scene dictionaries with global scene numbering
         """
-        self.logger.info(f"Processing chunk {chunk_number} for scene extraction (starting from scene {starting_scene_number})")
+        # Chunks are detected concurrently and numbered locally; the global start is logged when numbering
+        self.logger.info(f"Processing chunk {chunk_number} for scene extraction")
         scene_band = self._get_scene_count_band(cleaned_text)
         best_scenes = []
         best_distance = None
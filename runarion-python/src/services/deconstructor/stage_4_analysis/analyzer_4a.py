@@ -5,8 +5,13 @@ Performs detailed analysis of individual scenes for plot, character, and themati
 
 import json
 import logging
+import os
 from typing import Dict, Any, List, Tuple
+
+from psycopg2.extras import execute_values
+
 from ..prompt_template import DeconstructorPrompts
+from src.utils.concurrency import run_bounded
 from src.utils.database_utils import ensure_utf8_json
 from src.utils.llm_retry import call_llm_with_retry
 from src.utils.json_response_parser import parse_scene_analysis_response
@@ -19,6 +24,9 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
     Stage 4A of the deconstruction pipeline.
     Analyzes each scene individually for literary elements and plot significance.
     """
+
+    # Scene analyses written per UPDATE statement
+    UPDATE_BATCH_SIZE = int(os.getenv('SCENE_ANALYSIS_UPDATE_BATCH_SIZE', '25'))
     
     def __init__(self, db_pool, generation_engine):
         """
@@ -61,28 +69,50 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
                     message='No scenes to analyze'
                 )
             
+            # Analyze scenes with bounded concurrency; finished analyses are
+            # written back in batches from the calling thread as they complete.
+            max_workers = self._get_max_workers(context, 'scene_analysis_workers')
+            self.logger.info(f"Analyzing {len(scenes)} scenes with {max_workers} worker(s)")
+
             analyzed_scenes = 0
             failed_analyses = []
-            
-            for scene in scenes:
-                scene_id, scene_number, title, setting, characters, content = scene
-                
+            pending_updates = []
+            progress = self._item_progress(context, len(scenes))
+
+            def flush_updates():
+                nonlocal analyzed_scenes
+                if not pending_updates:
+                    return
+                batch = list(pending_updates)
+                pending_updates.clear()
                 try:
-                    # Analyze this scene
-                    analysis_result = self._analyze_single_scene(scene_id, scene_number, title, setting, characters, content)
-                    
-                    if analysis_result:
-                        # Update scene with analysis
-                        self._update_scene_analysis(context, scene_id, analysis_result)
-                        analyzed_scenes += 1
-                        self.logger.debug(f"Analyzed scene {scene_number} successfully")
-                    else:
-                        self.logger.warning(f"Scene {scene_number} analysis returned empty result")
-                        failed_analyses.append(scene_number)
-                        
+                    self._update_scene_analyses(context, [(scene_id, analysis) for scene_id, _, analysis in batch])
+                    analyzed_scenes += len(batch)
                 except Exception as e:
-                    self.logger.error(f"Failed to analyze scene {scene_number}: {e}")
+                    self.logger.error(f"Failed to store analyses for {len(batch)} scenes: {e}")
+                    failed_analyses.extend(scene_number for _, scene_number, _ in batch)
+
+            def on_scene_analyzed(index, analysis_result):
+                scene_id, scene_number = scenes[index][0], scenes[index][1]
+                if analysis_result:
+                    pending_updates.append((scene_id, scene_number, analysis_result))
+                    self.logger.debug(f"Analyzed scene {scene_number} successfully")
+                    if len(pending_updates) >= self.UPDATE_BATCH_SIZE:
+                        flush_updates()
+                else:
                     failed_analyses.append(scene_number)
+                progress.advance(failed=len(failed_analyses))
+
+            run_bounded(
+                lambda scene, worker: (worker or self)._analyze_scene_task(scene),
+                scenes,
+                max_workers,
+                worker_state_factory=self._fork_for_worker,
+                on_result=on_scene_analyzed,
+                thread_name_prefix="stage4a-scenes",
+            )
+            flush_updates()
+            failed_analyses.sort()
             
             # Update draft graph metadata after successful analysis
             if analyzed_scenes > 0:
@@ -95,7 +125,8 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
                 failed_analyses=len(failed_analyses),
                 failed_scene_numbers=failed_analyses if failed_analyses else None,
                 chaptering_mode=chaptering_mode,
-                target_chapter_length=target_length
+                target_chapter_length=target_length,
+                max_workers=max_workers
             )
             
         except Exception as e:
@@ -152,6 +183,26 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
             self.logger.error(f"Failed to retrieve scenes for draft {draft_id}: {e}")
             raise
     
+    def _analyze_scene_task(self, scene: Tuple) -> Dict[str, Any]:
+        """
+        Analyze one scene row; runs on a worker thread.
+
+        Args:
+            scene: Scene tuple from _get_draft_scenes
+
+        Returns:
+            Analysis data dictionary (empty on failure)
+        """
+        scene_id, scene_number, title, setting, characters, content = scene
+        try:
+            analysis_result = self._analyze_single_scene(scene_id, scene_number, title, setting, characters, content)
+            if not analysis_result:
+                self.logger.warning(f"Scene {scene_number} analysis returned empty result")
+            return analysis_result
+        except Exception as e:
+            self.logger.error(f"Failed to analyze scene {scene_number}: {e}")
+            return {}
+
     def _analyze_single_scene(self, scene_id: int, scene_number: int, title: str, setting: str,
                              characters: str, content: str) -> Dict[str, Any]:
         """
@@ -210,7 +261,7 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
             try:
                 # Generate analysis (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -224,7 +275,7 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -276,33 +327,47 @@ class SceneBySceneAnalysisStage(BasePipelineStage):
     
     def _update_scene_analysis(self, context: PipelineStageContext, scene_id: int, analysis_data: Dict[str, Any]) -> None:
         """
-        Update the scene with analysis data and graph flags using UTF-8 safety.
+        Update a single scene with analysis data and graph flags.
         
         Args:
             context: Stage execution context
             scene_id: Scene database ID
             analysis_data: Analysis results
         """
+        self._update_scene_analyses(context, [(scene_id, analysis_data)])
+    
+    def _update_scene_analyses(self, context: PipelineStageContext, updates: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Update a batch of scenes with analysis data and graph flags in one statement, using UTF-8 safety.
+        
+        Args:
+            context: Stage execution context
+            updates: (scene_id, analysis_data) pairs
+        """
+        if not updates:
+            return
+        
         try:
             db_connection = self.get_database_connection(context)
             with db_connection as conn:
                 cursor = conn.cursor()
                 
                 # Ensure UTF-8 safe JSON encoding
-                analysis_json = ensure_utf8_json(analysis_data)
+                rows = [(scene_id, ensure_utf8_json(analysis_data)) for scene_id, analysis_data in updates]
                 
-                cursor.execute("""
+                execute_values(cursor, """
                     UPDATE scenes 
-                    SET analysis_json = %s,
+                    SET analysis_json = v.analysis_json,
                         graph_analyzed = true,
                         graph_last_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (analysis_json, scene_id))
+                    FROM (VALUES %s) AS v(id, analysis_json)
+                    WHERE scenes.id = v.id
+                """, rows, template="(%s, %s::json)", page_size=len(rows))
                 
                 conn.commit()
             
         except Exception as e:
-            self.logger.error(f"Failed to update scene analysis for scene {scene_id}: {e}")
+            self.logger.error(f"Failed to update scene analysis for scenes {[scene_id for scene_id, _ in updates]}: {e}")
             raise
     
     def _update_draft_graph_metadata(self, context: PipelineStageContext) -> None:
@@ -6,6 +6,7 @@ Builds knowledge graph using Apache AGE to map character relationships and story
 import json
 import logging
 import os
+import re
 from typing import Dict, Any, List, Tuple, Optional
 from ..prompt_template import DeconstructorPrompts
 from src.utils.json_response_parser import parse_graph_analysis_response
@@ -213,7 +214,7 @@ class ProgressiveGraphAnalysisStage(BasePipelineStage):
             try:
                 # Generate graph analysis (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -227,7 +228,7 @@ class ProgressiveGraphAnalysisStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -254,108 +255,86 @@ class ProgressiveGraphAnalysisStage(BasePipelineStage):
     def _store_graph_data(self, context: PipelineStageContext, graph_data: Dict[str, Any]) -> Tuple[int, int]:
         """
         Store entities and relationships using Apache AGE (AGE-first architecture).
+        
+        The whole batch is written through GraphDatabaseService.store_graph_batch:
+        one AGE session and one commit per scene batch instead of one per item.
         """
         draft_id = context.draft_id
-        entities_created = 0
-        relationships_created = 0
-        created_entities = set()  # Track successfully created entities
         
         try:
-            # Create vertices for each entity type
+            # Collect valid vertices for each entity type
+            vertices = []
             for entity_type, entities in [
                 ('Character', graph_data.get('characters', [])),
                 ('Location', graph_data.get('locations', [])),
                 ('Item', graph_data.get('objects', []))
             ]:
                 for entity in entities:
-                    try:
-                        # Validate entity name is present and non-empty
-                        entity_name = entity.get('name', '').strip()
-                        if not entity_name or len(entity_name) < 1:
-                            self.logger.warning(f"Skipping {entity_type} entity with empty/invalid name: {entity}")
-                            continue
+                    # Validate entity name is present and non-empty
+                    entity_name = (entity.get('name') or '').strip()
+                    if not entity_name:
+                        self.logger.warning(f"Skipping {entity_type} entity with empty/invalid name: {entity}")
+                        continue
 
-                        # Allow entities with special characters like "V.S." or "Unnamed Baby"
-                        # Only filter out truly problematic names (e.g., only punctuation)
-                        import re
-                        if not re.search(r'[a-zA-Z0-9]', entity_name):
-                            self.logger.warning(f"Skipping {entity_type} entity with no alphanumeric characters: '{entity_name}'")
-                            continue
+                    # Allow entities with special characters like "V.S." or "Unnamed Baby"
+                    # Only filter out truly problematic names (e.g., only punctuation)
+                    if not re.search(r'[a-zA-Z0-9]', entity_name):
+                        self.logger.warning(f"Skipping {entity_type} entity with no alphanumeric characters: '{entity_name}'")
+                        continue
 
+                    vertices.append({
+                        'name': entity_name,
+                        'entity_type': entity_type,
                         # Extract properties (excluding name and type)
-                        properties = {k: v for k, v in entity.items() if k not in ['name', 'type']}
-
-                        # Create vertex using AGE graph database
-                        vertex_id = self.graph_service.create_vertex(
-                            draft_id=draft_id,
-                            entity_name=entity_name,
-                            entity_type=entity_type,
-                            properties=properties
-                        )
-
-                        if vertex_id:
-                            entities_created += 1
-                            created_entities.add(entity_name)  # Track successful creation
-                            self.logger.debug(f"Created AGE vertex {vertex_id}: {entity_name} ({entity_type})")
-                        else:
-                            self.logger.warning(f"Failed to create {entity_type} vertex '{entity_name}': No vertex ID returned")
-
-                    except GraphDatabaseNotAvailableError as e:
-                        self.logger.error(f"AGE graph database not available: {e}")
-                        raise
-                    except Exception as e:
-                        self.logger.error(f"Failed to create {entity_type} vertex '{entity.get('name', 'UNKNOWN')}': {e}")
-                        # Continue with other entities instead of failing completely
+                        'properties': {k: v for k, v in entity.items() if k not in ['name', 'type']}
+                    })
             
-            # Create relationships only for entities that were successfully created
+            # Vertices and relationships share one transaction, so every valid entity
+            # will exist when the relationships are matched
+            valid_entities = {vertex['name'] for vertex in vertices}
+            relationships = []
             for relationship in graph_data.get('relationships', []):
-                try:
-                    source_name = relationship['source']
-                    target_name = relationship['target']
-                    rel_type = relationship['relationship']
-                    
-                    # Validate that both entities exist before creating relationship
-                    if source_name not in created_entities:
-                        self.logger.warning(f"Skipping relationship: source entity '{source_name}' was not created")
-                        continue
-                    if target_name not in created_entities:
-                        self.logger.warning(f"Skipping relationship: target entity '{target_name}' was not created")
-                        continue
-                    
-                    # Build relationship properties
-                    rel_props = {
+                source_name = relationship.get('source')
+                target_name = relationship.get('target')
+                rel_type = relationship.get('relationship')
+                
+                if not rel_type:
+                    self.logger.warning(f"Skipping relationship without a type: {relationship}")
+                    continue
+                
+                # Validate that both entities exist before creating relationship
+                if source_name not in valid_entities:
+                    self.logger.warning(f"Skipping relationship: source entity '{source_name}' was not created")
+                    continue
+                if target_name not in valid_entities:
+                    self.logger.warning(f"Skipping relationship: target entity '{target_name}' was not created")
+                    continue
+                
+                relationships.append({
+                    'source': source_name,
+                    'target': target_name,
+                    'relationship_type': rel_type,
+                    'properties': {
                         'context': relationship.get('context', ''),
                         'emotional_tone': relationship.get('emotional_tone', 'neutral')
                     }
-                    
-                    # Create relationship using AGE graph database
-                    edge_id = self.graph_service.create_relationship(
-                        draft_id=draft_id,
-                        source_name=source_name,
-                        target_name=target_name,
-                        relationship_type=rel_type,
-                        properties=rel_props
-                    )
-                    
-                    if edge_id:
-                        relationships_created += 1
-                        self.logger.debug(f"Created AGE relationship {edge_id}: {source_name} -{rel_type}-> {target_name}")
-                    else:
-                        self.logger.warning(f"Failed to create relationship {source_name} -{rel_type}-> {target_name}: No edge ID returned")
-                        
-                except GraphDatabaseNotAvailableError as e:
-                    self.logger.error(f"AGE graph database not available: {e}")
-                    raise
-                except Exception as e:
-                    self.logger.error(f"Failed to create relationship {source_name} -{rel_type}-> {target_name}: {e}")
-                    # Continue with other relationships instead of failing completely
+                })
+            
+            vertex_ids, edge_ids = self.graph_service.store_graph_batch(
+                draft_id, vertices=vertices, relationships=relationships
+            )
+            
+            entities_created = sum(1 for vertex_id in vertex_ids if vertex_id is not None)
+            # Unmatched or failed rows are logged by the graph service and come back as None
+            relationships_created = sum(1 for edge_id in edge_ids if edge_id is not None)
             
             # Log the results
             self.logger.info(f"AGE graph data stored: {entities_created} entities, {relationships_created} relationships")
             
             return entities_created, relationships_created
             
-        except GraphDatabaseNotAvailableError:
+        except GraphDatabaseNotAvailableError as e:
+            self.logger.error(f"AGE graph database not available: {e}")
             raise  # Re-raise to fail the entire stage
         except Exception as e:
             self.logger.error(f"Failed to store graph data: {e}")
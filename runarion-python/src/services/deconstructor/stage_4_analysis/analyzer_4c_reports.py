@@ -6,10 +6,13 @@ Generates detailed analysis reports for major story elements.
 import json
 import logging
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from collections import Counter
+
+from psycopg2.extras import execute_values
 from ulid import ULID
 from ..prompt_template import DeconstructorPrompts
+from src.utils.concurrency import run_bounded
 from src.utils.database_utils import clean_text_for_database, ensure_utf8_json
 from src.utils.llm_retry import call_llm_with_retry
 from ..base_stage import BasePipelineStage, PipelineStageResult, PipelineStageContext
@@ -83,84 +86,43 @@ class ComprehensiveReportingStage(BasePipelineStage):
             major_settings = self._identify_major_settings(scenes_data)
             plot_threads = self._identify_plot_threads(scenes_data)
             
-            reports_generated = 0
+            # Every per-element report only reads scenes_data / graph_data, so
+            # they are generated concurrently; results keep the job order.
+            report_jobs = self._plan_report_jobs(
+                scenes_data, graph_data, major_characters, major_themes, major_settings, plot_threads
+            )
+            max_workers = self._get_max_workers(context, 'reporting_workers')
+            self.logger.info(f"Generating {len(report_jobs)} reports with {max_workers} worker(s)")
+            
+            progress = self._item_progress(context, len(report_jobs))
+            generated = run_bounded(
+                lambda job, worker: (worker or self)._generate_report_task(job),
+                report_jobs,
+                max_workers,
+                worker_state_factory=self._fork_for_worker,
+                on_result=lambda index, report: progress.advance(),
+                thread_name_prefix="stage4c-reports",
+            )
+            reports = [
+                (report_type, report_subject, report)
+                for (report_type, report_subject, _, _), report in zip(report_jobs, generated)
+                if report
+            ]
             
-            # Generate character reports with graph relationships
-            for character_name in major_characters:
-                try:
-                    character_data = self._extract_character_data(character_name, scenes_data, graph_data)
-                    report = self._generate_character_report(character_name, character_data)
-                    
-                    if report:
-                        self._store_analysis_report(context, 'CHARACTER_ARC', character_name, report)
-                        reports_generated += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to generate character report for {character_name}: {e}")
-            
-            # Generate theme reports
-            for theme in major_themes[:5]:  # Limit to top 5 themes
-                try:
-                    theme_data = self._extract_theme_data(theme, scenes_data)
-                    report = self._generate_theme_report(theme, theme_data)
-                    
-                    if report:
-                        self._store_analysis_report(context, 'THEME_ANALYSIS', theme, report)
-                        reports_generated += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to generate theme report for {theme}: {e}")
-            
-            # Generate setting reports
-            for setting in major_settings[:5]:  # Limit to top 5 settings
-                try:
-                    setting_data = self._extract_setting_data(setting, scenes_data)
-                    report = self._generate_setting_report(setting, setting_data)
-                    
-                    if report:
-                        self._store_analysis_report(context, 'SETTING_ANALYSIS', setting, report)
-                        reports_generated += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to generate setting report for {setting}: {e}")
-            
-            # Generate plot thread reports
-            for i, plot_thread in enumerate(plot_threads[:3]):  # Limit to top 3 plot threads
-                try:
-                    report = self._generate_plot_thread_report(plot_thread, scenes_data)
-                    
-                    if report:
-                        thread_name = f"plot_thread_{i+1}"
-                        self._store_analysis_report(context, 'PLOT_THREAD', thread_name, report)
-                        reports_generated += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to generate plot thread report {i+1}: {e}")
-            
-            # Generate relationship analysis using graph data
-            if graph_data and graph_data.get('relationships'):
-                try:
-                    relationship_report = self._generate_relationship_report(graph_data, scenes_data)
-                    if relationship_report:
-                        self._store_analysis_report(context, 'RELATIONSHIP_ANALYSIS', 'character_relationships', relationship_report)
-                        reports_generated += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to generate relationship report: {e}")
-            
-            # Generate comprehensive narrative overview
+            # Generate comprehensive narrative overview (needs the aggregate lists)
             try:
                 narrative_report = self._generate_narrative_report(
                     scenes_data, major_characters, major_themes, 
                     major_settings, plot_threads, graph_data
                 )
                 if narrative_report:
-                    self._store_analysis_report(context, 'NARRATIVE_OVERVIEW', 'story_overview', narrative_report)
-                    reports_generated += 1
+                    reports.append(('NARRATIVE_OVERVIEW', 'story_overview', narrative_report))
                     
             except Exception as e:
                 self.logger.error(f"Failed to generate narrative report: {e}")
             
+            reports_generated = self._store_analysis_reports(context, reports)
+            
             self.logger.info(f"Stage 4C completed for draft {draft_id}: {reports_generated} reports generated")
             
             return PipelineStageResult.success_result(
@@ -173,7 +135,8 @@ class ComprehensiveReportingStage(BasePipelineStage):
                 graph_data_available=bool(graph_data),
                 reports_generated=reports_generated,
                 chaptering_mode=chaptering_mode,
-                target_chapter_length=target_chapter_length
+                target_chapter_length=target_chapter_length,
+                max_workers=max_workers
             )
             
         except Exception as e:
@@ -197,6 +160,54 @@ class ComprehensiveReportingStage(BasePipelineStage):
         """
         return super().run(draft_id)
     
+    def _plan_report_jobs(self, scenes_data: List[Dict[str, Any]], graph_data: Optional[Dict[str, Any]],
+                          major_characters: List[str], major_themes: List[str],
+                          major_settings: List[str], plot_threads: List[Dict[str, Any]]) -> List[Tuple]:
+        """
+        List the independent reports to generate.
+        
+        Returns:
+            (report_type, report_subject, label, generate) tuples, where
+            generate(stage) builds the report on the given (worker) stage
+        """
+        jobs = []
+        
+        # Character reports with graph relationships
+        for character_name in major_characters:
+            jobs.append(('CHARACTER_ARC', character_name, f"character report for {character_name}",
+                         lambda stage, name=character_name: stage._generate_character_report(
+                             name, stage._extract_character_data(name, scenes_data, graph_data))))
+        
+        for theme in major_themes[:5]:  # Limit to top 5 themes
+            jobs.append(('THEME_ANALYSIS', theme, f"theme report for {theme}",
+                         lambda stage, theme=theme: stage._generate_theme_report(
+                             theme, stage._extract_theme_data(theme, scenes_data))))
+        
+        for setting in major_settings[:5]:  # Limit to top 5 settings
+            jobs.append(('SETTING_ANALYSIS', setting, f"setting report for {setting}",
+                         lambda stage, setting=setting: stage._generate_setting_report(
+                             setting, stage._extract_setting_data(setting, scenes_data))))
+        
+        for i, plot_thread in enumerate(plot_threads[:3]):  # Limit to top 3 plot threads
+            jobs.append(('PLOT_THREAD', f"plot_thread_{i+1}", f"plot thread report {i+1}",
+                         lambda stage, thread=plot_thread: stage._generate_plot_thread_report(thread, scenes_data)))
+        
+        # Relationship analysis using graph data
+        if graph_data and graph_data.get('relationships'):
+            jobs.append(('RELATIONSHIP_ANALYSIS', 'character_relationships', "relationship report",
+                         lambda stage: stage._generate_relationship_report(graph_data, scenes_data)))
+        
+        return jobs
+    
+    def _generate_report_task(self, job: Tuple) -> Optional[Dict[str, Any]]:
+        """Generate one planned report; runs on a worker thread."""
+        report_type, report_subject, label, generate = job
+        try:
+            return generate(self)
+        except Exception as e:
+            self.logger.error(f"Failed to generate {label}: {e}")
+            return None
+    
     def _update_chaptering_metadata(self, draft_id: str, chaptering_mode: str, target_chapter_length: int) -> None:
         """
         Update draft metadata with chaptering parameters for downstream stages.
@@ -475,7 +486,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
             try:
                 # Generate report (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -489,7 +500,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -631,7 +642,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
             try:
                 # Generate report (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -645,7 +656,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -693,7 +704,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
             try:
                 # Generate report (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -707,7 +718,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -757,7 +768,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
             try:
                 # Generate report (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -771,7 +782,7 @@ class ComprehensiveReportingStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -921,34 +932,78 @@ class ComprehensiveReportingStage(BasePipelineStage):
     
     def _store_analysis_report(self, context: PipelineStageContext, report_type: str, report_subject: str, 
                              report_content: Dict[str, Any]) -> None:
-        """Store an analysis report in the database with UTF-8 safety and dynamic values."""
+        """Store a single analysis report in the database."""
+        self._store_analysis_reports(context, [(report_type, report_subject, report_content)])
+    
+    def _store_analysis_reports(self, context: PipelineStageContext, reports: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+        """
+        Store analysis reports in the database with one bulk upsert, using UTF-8 safety and dynamic values.
+        
+        If the bulk upsert fails, each report is upserted on its own so one bad
+        row does not throw away the whole round of generated reports; reports
+        that still fail are logged and skipped.
+        
+        Args:
+            context: Stage execution context
+            reports: (report_type, report_subject, report_content) tuples
+            
+        Returns:
+            Number of reports stored
+        """
         draft_id = context.draft_id
         
-        try:
-            db_connection = self.get_database_connection(context)
-            with db_connection as conn:
-                cursor = conn.cursor()
-                
-                # Ensure UTF-8 safe JSON encoding and text cleaning
+        if not reports:
+            return 0
+        
+        # Get dynamic values from context
+        user_id = context.get_user_id(self.db_pool)
+        
+        # Ensure UTF-8 safe JSON encoding and text cleaning. Rows are keyed
+        # like the ON CONFLICT target, since one INSERT cannot update the
+        # same row twice.
+        rows = {}
+        for report_type, report_subject, report_content in reports:
+            try:
                 safe_subject = clean_text_for_database(report_subject)
-                content_json = ensure_utf8_json(report_content)
-                
-                # Get dynamic values from context
-                user_id = context.get_user_id(self.db_pool)
-                report_id = str(ULID())
-                
-                cursor.execute("""
+                rows[(report_type, safe_subject)] = (
+                    str(ULID()), draft_id, report_type, safe_subject, ensure_utf8_json(report_content), user_id
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to prepare {report_type} report for {report_subject}: {e}")
+        
+        try:
+            self._upsert_report_rows(context, list(rows.values()))
+            self.logger.debug(f"Stored {len(rows)} analysis reports for draft {draft_id} (user_id: {user_id}, UTF-8 safe)")
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"Bulk store of {len(rows)} analysis reports failed, storing them one by one: {e}")
+        
+        stored = 0
+        for (report_type, safe_subject), row in rows.items():
+            try:
+                self._upsert_report_rows(context, [row])
+                stored += 1
+            except Exception as e:
+                self.logger.error(f"Failed to store {report_type} report for {safe_subject}: {e}")
+        
+        self.logger.debug(f"Stored {stored}/{len(rows)} analysis reports for draft {draft_id} individually")
+        return stored
+    
+    def _upsert_report_rows(self, context: PipelineStageContext, rows: List[Tuple]) -> None:
+        """Upsert prepared analysis_reports rows in one statement and commit."""
+        db_connection = self.get_database_connection(context)
+        with db_connection as conn:
+            cursor = conn.cursor()
+            try:
+                execute_values(cursor, """
                     INSERT INTO analysis_reports (id, draft_id, report_type, report_subject, content_json, generated_at, generated_by)
-                    VALUES (%s, %s, %s, %s, %s, NOW(), %s)
+                    VALUES %s
                     ON CONFLICT (draft_id, report_type, report_subject) DO UPDATE SET
                     content_json = EXCLUDED.content_json,
                     generated_at = NOW(),
                     generated_by = EXCLUDED.generated_by
-                """, (report_id, draft_id, report_type, safe_subject, content_json, user_id))
-                
+                """, rows, template="(%s, %s, %s, %s, %s, NOW(), %s)", page_size=len(rows))
                 conn.commit()
-                self.logger.debug(f"Stored analysis report {report_type}:{safe_subject} for draft {draft_id} (user_id: {user_id}, UTF-8 safe)")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to store analysis report: {e}")
-            raise
+            except Exception:
+                conn.rollback()
+                raise
@@ -621,7 +621,7 @@ class CoherenceCheckStage(BasePipelineStage):
             try:
                 # Generate coherence analysis (with transient-error retry)
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -635,7 +635,7 @@ class CoherenceCheckStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
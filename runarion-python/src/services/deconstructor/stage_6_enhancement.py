@@ -12,6 +12,7 @@ from ulid import ULID
 from .prompt_template import DeconstructorPrompts
 from .base_stage import BasePipelineStage, PipelineStageResult, PipelineStageContext
 from src.utils.llm_retry import call_llm_with_retry
+from src.utils.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +69,7 @@ class EnhancementStage(BasePipelineStage):
             # Track enhancement progress
             enhanced_scenes = 0
             failed_enhancements = []
+            progress = self._item_progress(context, len(scenes_data['scenes']))
             
             # Process each scene for enhancement
             for scene in scenes_data['scenes']:
@@ -90,6 +92,7 @@ class EnhancementStage(BasePipelineStage):
                 except Exception as e:
                     self.logger.error(f"Failed to enhance scene {scene['scene_number']}: {e}")
                     failed_enhancements.append(scene['scene_number'])
+                progress.advance(failed=len(failed_enhancements))
             
             # Generate final manuscript from enhanced scenes
             final_manuscript = self._generate_final_manuscript(scenes_data['scenes'])
@@ -700,18 +703,19 @@ class EnhancementStage(BasePipelineStage):
         """
         import time
         
-        # Small delay before first call to avoid bursts
-        try:
-            time.sleep(rate_limit_delay)
-        except Exception:
-            pass
+        # Small delay before first call to avoid bursts, unless the rate limiter paces calls
+        if not get_rate_limiter().enabled:
+            try:
+                time.sleep(rate_limit_delay)
+            except Exception:
+                pass
         
         for attempt in range(max_retries + 1):
             try:
                 # call_llm_with_retry handles transient 503/429 errors; the
                 # outer loop handles validation-level retries (content too short).
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Check if response was truncated due to token limit
@@ -725,7 +729,7 @@ class EnhancementStage(BasePipelineStage):
                     )
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
 
                 return response
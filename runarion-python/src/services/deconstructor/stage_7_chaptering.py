@@ -330,7 +330,7 @@ class ChapteringStage(BasePipelineStage):
                 # Wrap with transient-error retry even though token requirement
                 # is low — a 503 spike would still cause a needless failure.
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
             finally:
                 # Reset to avoid leaking into subsequent plain-text stages
@@ -1174,7 +1174,7 @@ Respond with only the title, no quotes or explanation."""
             self.generation_engine.request.generation_config.max_output_tokens = self._get_output_budget("short_text")
             
             response = call_llm_with_retry(
-                lambda: self.generation_engine.generate(skip_quota=True)
+                lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
             )
 
             if response.success:
@@ -1,7 +1,10 @@
 # services/generation_engine.py
 
+import copy
+import threading
 import time
-from typing import Type, Generator
+from collections import OrderedDict
+from typing import Optional, Tuple, Type, Generator
 from src.models.request import BaseGenerationRequest
 from src.models.response import BaseGenerationResponse
 from src.providers.openai_provider import OpenAIProvider
@@ -9,6 +12,7 @@ from src.providers.gemini_provider import GeminiProvider
 from src.providers.mock_provider import MockProvider
 # from src.providers.deepseek_provider import DeepSeekProvider  # to be implemented
 from src.providers.base_provider import BaseProvider
+from src.utils.rate_limiter import RateLimitReservation, get_rate_limiter
 
 
 class GenerationEngine:
@@ -19,10 +23,16 @@ class GenerationEngine:
         # "deepseek": DeepSeekProvider,
     }
 
+    # Template engines keyed by (provider, api key, model); see for_request()
+    ENGINE_CACHE_SIZE = 32
+    _engine_cache: "OrderedDict[Tuple[str, Optional[str], Optional[str]], GenerationEngine]" = OrderedDict()
+    _engine_cache_lock = threading.Lock()
+
     @classmethod
     def register_provider(cls, name: str, provider_cls: Type[BaseProvider]):
         """Allow dynamic registration of new providers at runtime."""
         cls._provider_registry[name.lower()] = provider_cls
+        cls.clear_cache()
 
     def __init__(self, request: BaseGenerationRequest):
         self.start_time = time.time()
@@ -30,6 +40,64 @@ class GenerationEngine:
         self.provider_name = request.provider.lower()
         self.provider_instance = self._get_provider_instance()
 
+    @classmethod
+    def for_request(cls, request: BaseGenerationRequest) -> "GenerationEngine":
+        """
+        Get an engine for request, reusing a cached engine's provider setup.
+
+        The first request for a (provider, api key, model) builds a full engine
+        and keeps it as a template; later requests get template.with_request(),
+        which skips key/model resolution and client construction. Templates are
+        never handed out, so returned engines can be mutated freely.
+        """
+        # Key by the provider as given and the key the provider resolves from it:
+        # providers look up the caller's key and env fallbacks case-sensitively,
+        # so "Gemini" and "gemini" requests must not share a template
+        api_key = BaseProvider.caller_api_key(request)
+        model = (request.model or "").strip() or None
+        key = (request.provider, api_key, model)
+
+        with cls._engine_cache_lock:
+            template = cls._engine_cache.get(key)
+            if template is not None:
+                cls._engine_cache.move_to_end(key)
+
+        if template is not None:
+            return template.with_request(request)
+
+        engine = cls(request)
+        # Template keeps a private (already tokenized) copy so it never shares a request with a caller
+        template = engine.with_request(request.model_copy(deep=True), tokenize=False)
+        with cls._engine_cache_lock:
+            cls._engine_cache[key] = template
+            while len(cls._engine_cache) > cls.ENGINE_CACHE_SIZE:
+                cls._engine_cache.popitem(last=False)
+        return engine
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached template engines."""
+        with cls._engine_cache_lock:
+            cls._engine_cache.clear()
+
+    def with_request(self, request: BaseGenerationRequest, tokenize: bool = True) -> "GenerationEngine":
+        """
+        Build an engine for another request with this engine's provider, key and model.
+
+        Only the request-specific provider state (prompt, instruction,
+        tokenized bias) is rebuilt; the provider client is shared.
+
+        Args:
+            request: Request for the new engine (same provider/key/model)
+            tokenize: False when the request's bias/banned tokens are already tokenized
+        """
+        engine = copy.copy(self)
+        engine.start_time = time.time()
+        engine.request = request
+        engine.provider_instance = copy.copy(self.provider_instance)
+        engine.provider_instance._bind_request(request, tokenize=tokenize)
+        return engine
+
     def _get_provider_instance(self) -> BaseProvider:
         try:
             provider_cls = self._provider_registry[self.provider_name]
@@ -39,21 +107,69 @@ class GenerationEngine:
         except Exception as e:
             raise RuntimeError(f"Failed to instantiate provider '{self.provider_name}': {e}")
 
-    def generate(self, skip_quota: bool = False) -> BaseGenerationResponse:
-        return self.provider_instance.generate(skip_quota=skip_quota)
+    def fork(self) -> "GenerationEngine":
+        """
+        Build an independent engine for use on another thread.
+
+        The request is deep-copied so per-call mutation (prompt, instruction,
+        token budget) is not shared. Providers snapshot the system instruction
+        at construction, so the fork inherits this engine's snapshot to behave
+        exactly like calls made on this engine.
+        """
+        # The request's bias/banned tokens were already tokenized by this engine
+        forked = self.with_request(self.request.model_copy(deep=True), tokenize=False)
+        if hasattr(self.provider_instance, "instruction"):
+            forked.provider_instance.instruction = self.provider_instance.instruction
+        return forked
+
+    def _output_token_budget(self) -> int:
+        config = self.request.generation_config
+        return config.max_output_tokens + (config.thinking_budget or 0)
+
+    def _acquire_rate_limit(self) -> RateLimitReservation:
+        """
+        Wait for this call's share of the provider's rate limits.
+
+        The call is charged its prompt tokens plus the full output budget;
+        the reservation is settled with the real usage afterwards.
+        """
+        limiter = get_rate_limiter()
+        model = getattr(self.provider_instance, "model", None) or self.request.model
+        tokens = 0
+        if limiter.limits_tokens(self.provider_name):
+            instruction = getattr(self.provider_instance, "instruction", None) or self.request.instruction
+            text = f"{instruction or ''}\n{self.request.prompt or ''}"
+            tokens = limiter.count_tokens(self.provider_name, model, text) + self._output_token_budget()
+        return limiter.acquire(
+            self.provider_name, model, getattr(self.provider_instance, "api_key", None), tokens
+        )
+
+    def generate(self, skip_quota: bool = False, defer_quota: bool = False) -> BaseGenerationResponse:
+        reservation = self._acquire_rate_limit()
+        try:
+            response = self.provider_instance.generate(skip_quota=skip_quota, defer_quota=defer_quota)
+        except Exception as e:
+            reservation.settle(error_message=str(e))
+            raise
+        reservation.settle(response)
+        return response
 
     
     def stream(self) -> Generator[str, None, None]:
         print(f"Starting stream for session {self.request.caller.session_id} with provider {self.provider_name}...")
+        reservation = self._acquire_rate_limit()
+        streamed_chars = 0
         try:
             # Stream from the provider
             chunk_index = 0
             for chunk in self.provider_instance.generate_stream():
                 if chunk:
                     if chunk.startswith("Error:"):
+                        reservation.settle(error_message=chunk)
                         yield chunk
                         return
                     else:
+                        streamed_chars += len(chunk)
                         yield chunk
                         chunk_index += 1
             
@@ -62,4 +178,9 @@ class GenerationEngine:
             print(f"Stream with session {self.request.caller.session_id} completed in {elapsed_time:.2f} seconds, generated {chunk_index} chunks.")
 
         except Exception as e:
+            reservation.settle(error_message=str(e))
             yield f"Error: {str(e)}"
+        finally:
+            # Streams report no usage; charge the prompt plus what was streamed (~4 chars/token)
+            reservation.settle(actual_tokens=max(0, reservation.tokens - self._output_token_budget())
+                               + streamed_chars // 4)
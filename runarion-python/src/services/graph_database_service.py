@@ -9,20 +9,312 @@ Key principles:
 - Fail fast: Clear error messages when AGE is not available
 - Session-level AGE initialization for perfect isolation
 - Simplified architecture with single code path
+- Pinned AGE sessions: a dedicated pool whose connections are initialized once
 """
 
 import os
 import json
 import logging
-from typing import Dict, Any, List, Tuple, Optional
+import threading
+import time
+from typing import Dict, Any, List, Tuple, Optional, Callable
 from contextlib import contextmanager
 
+import psycopg2
+from psycopg2 import extensions as pg_extensions
+from psycopg2.pool import AbstractConnectionPool, PoolError, ThreadedConnectionPool
+
+from src.config.provider_config import ProviderConcurrencyConfig
+
 logger = logging.getLogger(__name__)
 
 class GraphDatabaseNotAvailableError(Exception):
     """Raised when Apache AGE is required but not available."""
     pass
 
+class AgeSessionConnection(pg_extensions.connection):
+    """psycopg2 connection flagged once its AGE session has been initialized."""
+    age_session_ready = False
+
+
+class AgeSessionPool(ThreadedConnectionPool):
+    """
+    Thread-safe pool of connections pinned to an AGE session.
+    
+    Every new connection runs the ``configure`` hook exactly once (LOAD 'age',
+    search_path, graph check) and is flagged ``age_session_ready``; checkouts
+    never re-initialize it or restore search_path. Idle connections are kept
+    up to maxconn so the session setup is not thrown away on return.
+    
+    When all maxconn sessions are checked out, getconn() waits up to
+    ``checkout_timeout`` seconds for one to be returned instead of failing.
+    """
+    
+    # Seconds getconn() waits for a session when the pool is exhausted
+    CHECKOUT_TIMEOUT_SECONDS = float(os.getenv('AGE_POOL_CHECKOUT_TIMEOUT_SECONDS', '30'))
+    
+    def __init__(self, minconn: int, maxconn: int, *args,
+                 configure: Optional[Callable[[Any], None]] = None,
+                 checkout_timeout: Optional[float] = None, **kwargs):
+        self._configure = configure
+        self.checkout_timeout = self.CHECKOUT_TIMEOUT_SECONDS if checkout_timeout is None else checkout_timeout
+        self._returned = threading.Condition()
+        self._returns = 0
+        self._metrics_lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'initializations': 0, 'init_failures': 0, 'waits': 0}
+        kwargs.setdefault('connection_factory', AgeSessionConnection)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        # psycopg2 closes returned connections once minconn are idle; keep all pinned sessions warm
+        self.minconn = self.maxconn
+    
+    def _count(self, metric: str) -> None:
+        with self._metrics_lock:
+            self._metrics[metric] += 1
+    
+    def _connect(self, key=None):
+        """Create a connection, run the configure hook once, then register it."""
+        conn = psycopg2.connect(*self._args, **self._kwargs)
+        try:
+            if self._configure:
+                self._configure(conn)
+            conn.age_session_ready = True
+        except Exception:
+            self._count('init_failures')
+            conn.close()
+            raise
+        self._count('initializations')
+        
+        if key is not None:
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+        else:
+            self._pool.append(conn)
+        return conn
+    
+    def getconn(self, key=None):
+        """Check out a session, waiting up to checkout_timeout while the pool is exhausted."""
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+        while True:
+            with self._returned:
+                returns = self._returns
+            try:
+                return super().getconn(key)
+            except PoolError as e:
+                remaining = deadline - time.monotonic()
+                if self.closed or 'exhausted' not in str(e) or remaining <= 0:
+                    raise
+            if not waited:
+                waited = True
+                self._count('waits')
+            with self._returned:
+                # Skip the wait if a session came back since the failed attempt
+                if self._returns == returns:
+                    self._returned.wait(remaining)
+    
+    def putconn(self, conn=None, key=None, close=False):
+        """Return a session and wake one checkout waiting for it."""
+        super().putconn(conn, key, close)
+        with self._returned:
+            self._returns += 1
+            self._returned.notify()
+    
+    def _getconn(self, key=None):
+        """Record a hit when an idle pinned session is reused, a miss otherwise."""
+        hit = bool(self._pool) and key not in self._used
+        conn = super()._getconn(key)
+        self._count('hits' if hit else 'misses')
+        return conn
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return checkout hit/miss counts, session init counts and current pool occupancy."""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        checkouts = metrics['hits'] + metrics['misses']
+        metrics.update({
+            'hit_rate': metrics['hits'] / checkouts if checkouts else 0.0,
+            'idle': len(self._pool),
+            'in_use': len(self._used),
+            'maxconn': self.maxconn,
+        })
+        return metrics
+
+
+# Process-wide AGE session pools, keyed by (source pool id, graph name)
+_age_session_pools: Dict[Tuple[int, str], AgeSessionPool] = {}
+_age_session_pools_lock = threading.Lock()
+
+
+class AgeSessionSetupError(Exception):
+    """Raised by bootstrap_age_session with the setup phase that failed."""
+    
+    def __init__(self, phase: str, error: Exception):
+        super().__init__(f"{phase}: {error}")
+        self.phase = phase
+        self.error = error
+
+
+def bootstrap_age_session(cursor, graph_name: str) -> Dict[str, Any]:
+    """
+    Set up AGE on a session: LOAD 'age', put ag_catalog on the search_path,
+    check the extension version and create the graph if it does not exist.
+    
+    The single bootstrap used by pinned AgeSessionPool connections and by
+    per-checkout initialization, so the two paths cannot drift. On failure
+    the original search_path is restored (best effort).
+    
+    Args:
+        cursor: Cursor of the session to set up
+        graph_name: AGE graph to ensure
+        
+    Returns:
+        Dict with 'original_search_path', 'version' and 'graph_exists'
+        (whether the graph existed before this call)
+        
+    Raises:
+        AgeSessionSetupError: With the phase that failed (READ_SEARCH_PATH,
+            LOAD_AGE, SET_SEARCH_PATH, AGE_VERSION_CHECK, GRAPH_SETUP)
+    """
+    phase = 'READ_SEARCH_PATH'
+    original_search_path = None
+    try:
+        cursor.execute("SELECT current_setting('search_path')")
+        original_search_path = cursor.fetchone()[0]
+        
+        # CRITICAL: Load AGE extension first - required for all AGE operations
+        phase = 'LOAD_AGE'
+        cursor.execute("LOAD 'age'")
+        
+        # Session-scoped search path (cannot use parameter binding with SET)
+        phase = 'SET_SEARCH_PATH'
+        cursor.execute(f"SET search_path = ag_catalog, {original_search_path}")
+        
+        phase = 'AGE_VERSION_CHECK'
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'age'")
+        version_result = cursor.fetchone()
+        if not version_result:
+            raise Exception("AGE extension not found in pg_extension")
+        version = version_result[0]
+        
+        phase = 'GRAPH_SETUP'
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM ag_catalog.ag_graph WHERE name = %s)", (graph_name,))
+        graph_exists = cursor.fetchone()[0]
+        if not graph_exists:
+            cursor.execute("SELECT ag_catalog.create_graph(%s)", (graph_name,))
+            logger.info(f"Created new AGE graph: {graph_name}")
+    except Exception as e:
+        if original_search_path is not None:
+            try:
+                cursor.execute(f"SET search_path = {original_search_path}")
+            except Exception:
+                pass  # Ignore restoration errors
+        raise AgeSessionSetupError(phase, e) from e
+    
+    return {
+        'original_search_path': original_search_path,
+        'version': version,
+        'graph_exists': graph_exists,
+    }
+
+
+def _configure_age_session(conn, graph_name: str) -> None:
+    """configure hook for AgeSessionPool: set up AGE once for the session's lifetime."""
+    with conn.cursor() as cursor:
+        bootstrap_age_session(cursor, graph_name)
+    # SET is transactional; commit so a later rollback cannot undo the session setup
+    conn.commit()
+
+
+# Sessions reserved for request threads (records, auditor) besides pipeline jobs
+AGE_POOL_REQUEST_CONN = int(os.getenv('AGE_POOL_REQUEST_CONN', '4'))
+
+# Pipeline job workers per process, set by configure_age_session_pools()
+_age_pool_job_workers = 1
+
+
+def configure_age_session_pools(job_workers: int) -> None:
+    """
+    Size AGE session pools for the job workers this process runs.
+    
+    Called once the job types are registered (see app.py) with the total of
+    their worker counts, JOB_WORKERS_<TYPE> overrides included. Pools created
+    afterwards use the new size; without a call, one job worker is assumed
+    (standalone scripts running a single pipeline).
+    
+    Args:
+        job_workers: Job worker threads per process across all job types
+    """
+    global _age_pool_job_workers
+    _age_pool_job_workers = max(1, job_workers)
+
+
+def default_age_pool_max_conn(job_workers: Optional[int] = None) -> int:
+    """
+    Default maximum connections of each AGE session pool (AGE_POOL_MAX_CONN overrides).
+    
+    Every job worker runs one pipeline, which fans stage work out to at most
+    the largest provider default worker count plus its own thread; request
+    threads get AGE_POOL_REQUEST_CONN on top. With the stock registrations
+    (three job types with 2 workers each) this is 6 * (4 + 1) + 4 = 34.
+    
+    Args:
+        job_workers: Job workers per process; defaults to the configured total
+        
+    Returns:
+        Maximum connections per AGE session pool
+    """
+    if job_workers is None:
+        job_workers = _age_pool_job_workers
+    return job_workers * (ProviderConcurrencyConfig.peak_default_workers() + 1) + AGE_POOL_REQUEST_CONN
+
+
+def get_age_session_pool(db_pool, graph_name: str) -> Optional[AgeSessionPool]:
+    """
+    Get (or lazily create) the shared AGE session pool for a database pool.
+    
+    The AGE pool connects with the same parameters as ``db_pool`` but is a
+    separate pool: every process holds up to AGE_POOL_MAX_CONN (default
+    default_age_pool_max_conn()) extra Postgres connections per graph on top
+    of DB_POOL_MAX_CONN, which the server's max_connections must allow for.
+    A checkout that finds the pool exhausted waits for a returned session
+    (AGE_POOL_CHECKOUT_TIMEOUT_SECONDS) rather than failing the stage.
+    
+    Returns None when ``db_pool`` is not a psycopg2 pool (callers then fall
+    back to per-checkout session initialization) or when the pool cannot be
+    created.
+    
+    Args:
+        db_pool: psycopg2 connection pool whose connection parameters are reused
+        graph_name: AGE graph ensured by the configure hook
+        
+    Returns:
+        Shared AgeSessionPool, or None
+    """
+    if isinstance(db_pool, AgeSessionPool):
+        return db_pool
+    if not isinstance(db_pool, AbstractConnectionPool):
+        return None
+    
+    key = (id(db_pool), graph_name)
+    with _age_session_pools_lock:
+        age_pool = _age_session_pools.get(key)
+        if age_pool is None or age_pool.closed:
+            try:
+                age_pool = AgeSessionPool(
+                    int(os.getenv('AGE_POOL_MIN_CONN', '1')),
+                    int(os.getenv('AGE_POOL_MAX_CONN', str(default_age_pool_max_conn()))),
+                    *db_pool._args,
+                    configure=lambda conn: _configure_age_session(conn, graph_name),
+                    **db_pool._kwargs
+                )
+            except Exception as e:
+                logger.warning(f"AGE session pool unavailable, falling back to per-checkout initialization: {e}")
+                return None
+            _age_session_pools[key] = age_pool
+            logger.info(f"AGE session pool created for graph {graph_name} (max {age_pool.maxconn} connections)")
+        return age_pool
+
+
 class GraphDatabaseService:
     """
     Apache AGE graph database service with AGE-first architecture.
@@ -31,6 +323,9 @@ class GraphDatabaseService:
     No fallback mechanisms - operations fail fast if AGE is unavailable.
     """
     
+    # Maximum UNWIND rows per Cypher statement in bulk writes
+    BULK_WRITE_BATCH_SIZE = 200
+    
     def __init__(self, db_pool):
         """
         Initialize the graph database service.
@@ -55,6 +350,9 @@ class GraphDatabaseService:
         # Validate AGE availability on initialization
         self._validate_age_setup()
         
+        # Shared pool of pinned AGE sessions (None for non-psycopg2 pools)
+        self.age_pool = get_age_session_pool(db_pool, self.graph_name)
+        
         logger.info(f"GraphDatabaseService initialized with AGE-first architecture for graph: {self.graph_name}")
     
     def _escape_cypher_string(self, text: str) -> str:
@@ -297,40 +595,13 @@ class GraphDatabaseService:
             True if initialization successful, False otherwise
         """
         try:
-            # Store original search path for restoration if needed
-            cursor.execute("SELECT current_setting('search_path')")
-            original_search_path = cursor.fetchone()[0]
-            
-            # CRITICAL: Load AGE extension first - required for all AGE operations
-            cursor.execute("LOAD 'age'")
-            
-            # Set search path for this session only (cannot use parameter binding with SET)
-            cursor.execute(f"SET search_path = ag_catalog, {original_search_path}")
-            
-            # Test AGE functionality using correct version check method
-            cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'age'")
-            version_result = cursor.fetchone()
-            version = version_result[0] if version_result else 'unknown'
-            
-            # Verify graph exists or create it
-            cursor.execute("SELECT EXISTS (SELECT 1 FROM ag_catalog.ag_graph WHERE name = %s)", (self.graph_name,))
-            graph_exists = cursor.fetchone()[0]
-            
-            if not graph_exists:
-                cursor.execute("SELECT ag_catalog.create_graph(%s)", (self.graph_name,))
-                logger.info(f"Created new AGE graph: {self.graph_name}")
-            
-            logger.debug(f"AGE session initialized successfully, version: {version}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize AGE session: {e}")
-            # Try to restore original search path on error
-            try:
-                cursor.execute(f"SET search_path = {original_search_path}")
-            except:
-                pass  # Ignore restoration errors
+            result = bootstrap_age_session(cursor, self.graph_name)
+        except AgeSessionSetupError as e:
+            logger.error(f"Failed to initialize AGE session: {e.error}")
             return False
+        
+        logger.debug(f"AGE session initialized successfully, version: {result['version']}")
+        return True
     
     def _initialize_age_session_with_diagnostics(self, cursor) -> Dict[str, Any]:
         """
@@ -342,85 +613,31 @@ class GraphDatabaseService:
         Returns:
             Dict with 'success' boolean and 'error' details if failed
         """
+        messages = {
+            'READ_SEARCH_PATH': "Unexpected error during AGE session initialization",
+            'LOAD_AGE': "Failed to load AGE library",
+            'SET_SEARCH_PATH': "Failed to set search path",
+            'AGE_VERSION_CHECK': "Failed to access AGE extension version",
+            'GRAPH_SETUP': "Failed to setup graph",
+        }
         try:
-            # Store original search path for restoration if needed
-            cursor.execute("SELECT current_setting('search_path')")
-            original_search_path = cursor.fetchone()[0]
-            
-            # CRITICAL: Load AGE extension first - this is where most failures occur
-            try:
-                cursor.execute("LOAD 'age'")
-            except Exception as load_error:
-                return {
-                    'success': False,
-                    'error': load_error,
-                    'phase': 'LOAD_AGE',
-                    'message': f"Failed to load AGE library: {load_error}"
-                }
-            
-            # Set search path for this session only
-            try:
-                cursor.execute(f"SET search_path = ag_catalog, {original_search_path}")
-            except Exception as path_error:
-                return {
-                    'success': False,
-                    'error': path_error,
-                    'phase': 'SET_SEARCH_PATH',
-                    'message': f"Failed to set search path: {path_error}"
-                }
-            
-            # Test AGE functionality using correct version check method
-            try:
-                cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'age'")
-                version_result = cursor.fetchone()
-                if not version_result:
-                    raise Exception("AGE extension not found in pg_extension")
-                version = version_result[0]
-            except Exception as version_error:
-                return {
-                    'success': False,
-                    'error': version_error,
-                    'phase': 'AGE_VERSION_CHECK',
-                    'message': f"Failed to access AGE extension version: {version_error}"
-                }
-            
-            # Verify graph exists or create it
-            try:
-                cursor.execute("SELECT EXISTS (SELECT 1 FROM ag_catalog.ag_graph WHERE name = %s)", (self.graph_name,))
-                graph_exists = cursor.fetchone()[0]
-                
-                if not graph_exists:
-                    cursor.execute("SELECT ag_catalog.create_graph(%s)", (self.graph_name,))
-                    logger.info(f"Created new AGE graph: {self.graph_name}")
-            except Exception as graph_error:
-                return {
-                    'success': False,
-                    'error': graph_error,
-                    'phase': 'GRAPH_SETUP',
-                    'message': f"Failed to setup graph: {graph_error}"
-                }
-            
-            logger.debug(f"AGE session initialized successfully, version: {version}")
-            return {
-                'success': True,
-                'version': version,
-                'graph_name': self.graph_name,
-                'graph_exists': graph_exists
-            }
-            
-        except Exception as e:
-            # Try to restore original search path on error
-            try:
-                cursor.execute(f"SET search_path = {original_search_path}")
-            except:
-                pass  # Ignore restoration errors
-                
+            result = bootstrap_age_session(cursor, self.graph_name)
+        except AgeSessionSetupError as e:
+            phase = e.phase if e.phase != 'READ_SEARCH_PATH' else 'UNEXPECTED_ERROR'
             return {
                 'success': False,
-                'error': e,
-                'phase': 'UNEXPECTED_ERROR',
-                'message': f"Unexpected error during AGE session initialization: {e}"
+                'error': e.error,
+                'phase': phase,
+                'message': f"{messages[e.phase]}: {e.error}"
             }
+        
+        logger.debug(f"AGE session initialized successfully, version: {result['version']}")
+        return {
+            'success': True,
+            'version': result['version'],
+            'graph_name': self.graph_name,
+            'graph_exists': result['graph_exists']
+        }
     
     @contextmanager
     def get_age_connection(self):
@@ -428,12 +645,20 @@ class GraphDatabaseService:
         Context manager for database connections with AGE session initialized.
         Includes retry logic for connection pool exhaustion.
         
+        Uses a pinned session from the shared AgeSessionPool when available;
+        otherwise initializes (and afterwards restores) the session per checkout.
+        
         Yields:
             Database connection with AGE session configured
             
         Raises:
             GraphDatabaseNotAvailableError: If AGE session initialization fails
         """
+        if self.age_pool is not None:
+            with self._pinned_age_connection() as conn:
+                yield conn
+            return
+        
         conn = None
         original_search_path = None
         max_retries = 3
@@ -503,6 +728,54 @@ class GraphDatabaseService:
             if conn:
                 self.db_pool.putconn(conn)
     
+    @contextmanager
+    def _pinned_age_connection(self):
+        """
+        Check out an already-initialized AGE session from the shared pool.
+        
+        No LOAD/search_path round trips and no restore on exit. Uncommitted work
+        is rolled back before the connection goes back to the pool.
+        
+        Yields:
+            Database connection with AGE session configured
+            
+        Raises:
+            GraphDatabaseNotAvailableError: If no session can be checked out
+                within the pool's checkout timeout
+        """
+        try:
+            # Blocks up to the pool's checkout_timeout while every session is in use
+            conn = self.age_pool.getconn()
+        except Exception as pool_error:
+            raise GraphDatabaseNotAvailableError(
+                f"Failed to check out AGE session: {pool_error}"
+            ) from pool_error
+        
+        try:
+            if not getattr(conn, 'age_session_ready', False):
+                # Defensive: connection did not go through the configure hook
+                _configure_age_session(conn, self.graph_name)
+                conn.age_session_ready = True
+            yield conn
+        finally:
+            close = bool(conn.closed)
+            if not close and conn.info.transaction_status != pg_extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except Exception as e:
+                    logger.warning(f"Discarding AGE session that failed to roll back: {e}")
+                    close = True  # Broken session; do not hand it out again
+            self.age_pool.putconn(conn, close=close)
+    
+    def get_session_pool_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get hit/miss and initialization metrics for the pinned AGE session pool.
+        
+        Returns:
+            Metrics dictionary, or None when the per-checkout fallback is in use
+        """
+        return self.age_pool.get_metrics() if self.age_pool is not None else None
+    
     def create_vertex(self, draft_id: str, entity_name: str, entity_type: str, 
                      properties: Dict[str, Any] = None) -> int:
         """
@@ -526,20 +799,7 @@ class GraphDatabaseService:
         try:
             with self.get_age_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Safely escape inputs for Cypher
-                    safe_draft_id = self._escape_cypher_string(draft_id)
-                    safe_entity_name = self._escape_cypher_string(entity_name)
-                    safe_properties = self._prepare_agtype_properties(properties)
-                    
-                    # AGE 1.6 requires literal dollar-quoted strings - build complete SQL with escaping
-                    sql_query = f"""
-                        SELECT vertex_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$ 
-                        CREATE (n:{entity_type} {{draft_id: '{safe_draft_id}', name: '{safe_entity_name}', properties: {safe_properties}}}) 
-                        RETURN id(n) 
-                        $$) AS (vertex_id agtype)
-                    """
-                    
-                    cursor.execute(sql_query)
+                    cursor.execute(self._vertex_create_query(draft_id, entity_name, entity_type, properties))
                     
                     result = cursor.fetchone()
                     if not result:
@@ -590,27 +850,9 @@ class GraphDatabaseService:
         try:
             with self.get_age_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Safely escape inputs for Cypher
-                    safe_draft_id = self._escape_cypher_string(draft_id)
-                    safe_source_name = self._escape_cypher_string(source_name)
-                    safe_target_name = self._escape_cypher_string(target_name)
-                    safe_properties = self._prepare_agtype_properties(properties)
-                    
-                    # AGE 1.6 requires literal dollar-quoted strings - build complete SQL with escaping
-                    # Note: AGE relationship properties use object notation {prop: value}, not string notation
-                    # Normalize relationship type to valid AGE label identifier (uppercase, underscores, no special chars)
-                    safe_relationship_type = self._normalize_relationship_type(relationship_type)
-                    
-                    sql_query = f"""
-                        SELECT edge_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$
-                        MATCH (a {{draft_id: '{safe_draft_id}', name: '{safe_source_name}'}})
-                        MATCH (b {{draft_id: '{safe_draft_id}', name: '{safe_target_name}'}})
-                        CREATE (a)-[r:{safe_relationship_type} {safe_properties}]->(b)
-                        RETURN id(r)
-                        $$) AS (edge_id agtype)
-                    """
-                    
-                    cursor.execute(sql_query)
+                    cursor.execute(self._relationship_create_query(
+                        draft_id, source_name, target_name, relationship_type, properties
+                    ))
                     
                     result = cursor.fetchone()
                     if not result:
@@ -631,6 +873,274 @@ class GraphDatabaseService:
                 f"Failed to create relationship {source_name} -{relationship_type}-> {target_name}: {e}"
             ) from e
     
+    def _vertex_create_query(self, draft_id: str, entity_name: str, entity_type: str,
+                             properties: Dict[str, Any]) -> str:
+        """Build the single-vertex CREATE statement used by create_vertex and the bulk fallback."""
+        # Safely escape inputs for Cypher
+        safe_draft_id = self._escape_cypher_string(draft_id)
+        safe_entity_name = self._escape_cypher_string(entity_name)
+        safe_properties = self._prepare_agtype_properties(properties)
+        
+        # AGE 1.6 requires literal dollar-quoted strings - build complete SQL with escaping
+        return f"""
+            SELECT vertex_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$ 
+            CREATE (n:{entity_type} {{draft_id: '{safe_draft_id}', name: '{safe_entity_name}', properties: {safe_properties}}}) 
+            RETURN id(n) 
+            $$) AS (vertex_id agtype)
+        """
+    
+    def _relationship_create_query(self, draft_id: str, source_name: str, target_name: str,
+                                   relationship_type: str, properties: Dict[str, Any]) -> str:
+        """Build the single-edge MATCH/CREATE statement used by create_relationship and the bulk fallback."""
+        # Safely escape inputs for Cypher
+        safe_draft_id = self._escape_cypher_string(draft_id)
+        safe_source_name = self._escape_cypher_string(source_name)
+        safe_target_name = self._escape_cypher_string(target_name)
+        safe_properties = self._prepare_agtype_properties(properties)
+        
+        # AGE 1.6 requires literal dollar-quoted strings - build complete SQL with escaping
+        # Note: AGE relationship properties use object notation {prop: value}, not string notation
+        # Normalize relationship type to valid AGE label identifier (uppercase, underscores, no special chars)
+        safe_relationship_type = self._normalize_relationship_type(relationship_type)
+        
+        return f"""
+            SELECT edge_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$
+            MATCH (a {{draft_id: '{safe_draft_id}', name: '{safe_source_name}'}})
+            MATCH (b {{draft_id: '{safe_draft_id}', name: '{safe_target_name}'}})
+            CREATE (a)-[r:{safe_relationship_type} {safe_properties}]->(b)
+            RETURN id(r)
+            $$) AS (edge_id agtype)
+        """
+    
+    def create_vertices_bulk(self, draft_id: str, vertices: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Create many vertices on one AGE session in a single transaction.
+        
+        Args:
+            draft_id: UUID of the draft
+            vertices: List of dicts with 'name', 'entity_type' and optional 'properties'
+            
+        Returns:
+            AGE vertex IDs aligned with ``vertices`` (None where the vertex could not be created)
+            
+        Raises:
+            GraphDatabaseNotAvailableError: If the AGE session fails (nothing is committed)
+        """
+        vertex_ids, _ = self.store_graph_batch(draft_id, vertices=vertices)
+        return vertex_ids
+    
+    def create_relationships_bulk(self, draft_id: str, relationships: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Create many relationships on one AGE session in a single transaction.
+        
+        Args:
+            draft_id: UUID of the draft
+            relationships: List of dicts with 'source', 'target', 'relationship_type'
+                and optional 'properties' / 'scene_id'
+            
+        Returns:
+            AGE edge IDs aligned with ``relationships`` (None where an endpoint was
+            not matched or the edge could not be created; both are logged)
+            
+        Raises:
+            GraphDatabaseNotAvailableError: If the AGE session fails (nothing is committed)
+        """
+        _, edge_ids = self.store_graph_batch(draft_id, relationships=relationships)
+        return edge_ids
+    
+    def store_graph_batch(self, draft_id: str, vertices: List[Dict[str, Any]] = None,
+                          relationships: List[Dict[str, Any]] = None) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+        """
+        Create vertices, then relationships, on one AGE session in one transaction.
+        
+        Rows are sent as UNWIND lists grouped by label (and, for relationships, by
+        property key set), at most BULK_WRITE_BATCH_SIZE rows per statement, so a
+        batch costs one connection checkout and one commit instead of one per item.
+        Relationships can reference vertices created in the same call.
+        
+        Each statement runs under a savepoint. If one fails, its rows are retried
+        one at a time with the single-item create_vertex/create_relationship
+        statements, so a bad row only loses itself; failed and unmatched rows
+        are logged and come back as None.
+        
+        Args:
+            draft_id: UUID of the draft
+            vertices: Vertex specs, see create_vertices_bulk
+            relationships: Relationship specs, see create_relationships_bulk
+            
+        Returns:
+            Tuple of (vertex IDs, edge IDs), each aligned with its input list
+            
+        Raises:
+            GraphDatabaseNotAvailableError: If the AGE session fails (nothing is committed)
+        """
+        vertices = vertices or []
+        relationships = relationships or []
+        if not vertices and not relationships:
+            return [], []
+        
+        try:
+            with self.get_age_connection() as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        vertex_ids = self._create_vertices_on_cursor(cursor, draft_id, vertices)
+                        edge_ids = self._create_relationships_on_cursor(cursor, draft_id, relationships)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            
+            logger.debug(
+                f"AGE bulk write for draft {draft_id}: "
+                f"{sum(1 for v in vertex_ids if v is not None)}/{len(vertices)} vertices, "
+                f"{sum(1 for e in edge_ids if e is not None)}/{len(relationships)} relationships"
+            )
+            return vertex_ids, edge_ids
+            
+        except GraphDatabaseNotAvailableError:
+            raise
+        except Exception as e:
+            raise GraphDatabaseNotAvailableError(
+                f"Failed to bulk-write graph data for draft {draft_id} "
+                f"({len(vertices)} vertices, {len(relationships)} relationships): {e}"
+            ) from e
+    
+    def _run_bulk_statement(self, cursor, sql_query: str,
+                            fallback: List[Tuple[int, str, str]]) -> Dict[int, Any]:
+        """
+        Run one UNWIND statement under a savepoint, falling back to per-row statements.
+        
+        Args:
+            cursor: AGE-initialized cursor
+            sql_query: UNWIND statement returning (idx, id) rows
+            fallback: (idx, single-row statement, description) for every row of the statement
+            
+        Returns:
+            Created IDs by row index; rows that matched nothing or failed are missing
+        """
+        created: Dict[int, Any] = {}
+        cursor.execute("SAVEPOINT graph_bulk_write")
+        try:
+            cursor.execute(sql_query)
+            for idx, created_id in cursor.fetchall():
+                # Duplicate endpoint names match several vertices; keep the first like create_relationship
+                created.setdefault(int(idx), created_id)
+            cursor.execute("RELEASE SAVEPOINT graph_bulk_write")
+            return created
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT graph_bulk_write")
+            logger.warning(f"AGE bulk statement failed, retrying its {len(fallback)} rows one by one: {e}")
+        
+        for idx, row_query, description in fallback:
+            cursor.execute("SAVEPOINT graph_bulk_row")
+            try:
+                cursor.execute(row_query)
+                result = cursor.fetchone()
+                if result:
+                    created[idx] = result[0]
+                cursor.execute("RELEASE SAVEPOINT graph_bulk_row")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT graph_bulk_row")
+                logger.error(f"Failed to create {description}: {e}")
+        return created
+    
+    def _create_vertices_on_cursor(self, cursor, draft_id: str,
+                                   vertices: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """Run grouped UNWIND CREATE statements for vertices on an AGE-initialized cursor."""
+        safe_draft_id = self._escape_cypher_string(draft_id)
+        
+        by_label: Dict[str, List[Tuple[int, str]]] = {}
+        for idx, vertex in enumerate(vertices):
+            safe_name = self._escape_cypher_string(vertex['name'])
+            safe_properties = self._prepare_agtype_properties(vertex.get('properties') or {})
+            by_label.setdefault(vertex['entity_type'], []).append(
+                (idx, f"{{idx: {idx}, name: '{safe_name}', properties: {safe_properties}}}")
+            )
+        
+        vertex_ids: List[Optional[int]] = [None] * len(vertices)
+        for entity_type, rows in by_label.items():
+            for start in range(0, len(rows), self.BULK_WRITE_BATCH_SIZE):
+                batch = rows[start:start + self.BULK_WRITE_BATCH_SIZE]
+                row_list = ", ".join(row for _, row in batch)
+                sql_query = f"""
+                    SELECT idx::integer, vertex_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$
+                    UNWIND [{row_list}] AS row
+                    CREATE (n:{entity_type} {{draft_id: '{safe_draft_id}', name: row.name, properties: row.properties}})
+                    RETURN row.idx, id(n)
+                    $$) AS (idx agtype, vertex_id agtype)
+                """
+                fallback = [
+                    (idx, self._vertex_create_query(
+                        draft_id, vertices[idx]['name'], entity_type, vertices[idx].get('properties') or {}
+                    ), f"vertex {vertices[idx]['name']} ({entity_type})")
+                    for idx, _ in batch
+                ]
+                for idx, vertex_id in self._run_bulk_statement(cursor, sql_query, fallback).items():
+                    vertex_ids[idx] = vertex_id
+        
+        return vertex_ids
+    
+    def _create_relationships_on_cursor(self, cursor, draft_id: str,
+                                        relationships: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """Run grouped UNWIND MATCH/CREATE statements for edges on an AGE-initialized cursor."""
+        safe_draft_id = self._escape_cypher_string(draft_id)
+        
+        # Edge labels and property keys cannot be parameterised per row, so group on both
+        groups: Dict[Tuple[str, Tuple[str, ...]], List[Tuple[int, str]]] = {}
+        edge_properties_by_idx: List[Dict[str, Any]] = []
+        for idx, relationship in enumerate(relationships):
+            properties = dict(relationship.get('properties') or {})
+            if relationship.get('scene_id') is not None:
+                properties['scene_id'] = relationship['scene_id']
+            edge_properties_by_idx.append(properties)
+            safe_relationship_type = self._normalize_relationship_type(relationship['relationship_type'])
+            property_keys = tuple(dict.fromkeys(self._sanitize_property_key(k) for k in properties))
+            safe_source_name = self._escape_cypher_string(relationship['source'])
+            safe_target_name = self._escape_cypher_string(relationship['target'])
+            groups.setdefault((safe_relationship_type, property_keys), []).append((
+                idx,
+                f"{{idx: {idx}, source: '{safe_source_name}', target: '{safe_target_name}', "
+                f"props: {self._prepare_agtype_properties(properties)}}}"
+            ))
+        
+        edge_ids: List[Optional[int]] = [None] * len(relationships)
+        for (safe_relationship_type, property_keys), rows in groups.items():
+            edge_properties = (
+                " {" + ", ".join(f"{key}: row.props.{key}" for key in property_keys) + "}"
+                if property_keys else ""
+            )
+            for start in range(0, len(rows), self.BULK_WRITE_BATCH_SIZE):
+                batch = rows[start:start + self.BULK_WRITE_BATCH_SIZE]
+                row_list = ", ".join(row for _, row in batch)
+                # Endpoint names are row values, so match them in WHERE rather than in the property map
+                sql_query = f"""
+                    SELECT idx::integer, edge_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$
+                    UNWIND [{row_list}] AS row
+                    MATCH (a {{draft_id: '{safe_draft_id}'}}) WHERE a.name = row.source
+                    MATCH (b {{draft_id: '{safe_draft_id}'}}) WHERE b.name = row.target
+                    CREATE (a)-[r:{safe_relationship_type}{edge_properties}]->(b)
+                    RETURN row.idx, id(r)
+                    $$) AS (idx agtype, edge_id agtype)
+                """
+                fallback = []
+                for idx, _ in batch:
+                    relationship = relationships[idx]
+                    fallback.append((idx, self._relationship_create_query(
+                        draft_id, relationship['source'], relationship['target'],
+                        relationship['relationship_type'], edge_properties_by_idx[idx]
+                    ), f"relationship {relationship['source']} -{safe_relationship_type}-> {relationship['target']}"))
+                for idx, edge_id in self._run_bulk_statement(cursor, sql_query, fallback).items():
+                    edge_ids[idx] = edge_id
+        
+        for relationship, edge_id in zip(relationships, edge_ids):
+            if edge_id is None:
+                logger.warning(
+                    f"No edge created for {relationship['source']} -{relationship['relationship_type']}-> "
+                    f"{relationship['target']} in draft {draft_id}: endpoint not matched or create failed"
+                )
+        
+        return edge_ids
+    
     def cleanup_draft_data(self, draft_id: str) -> int:
         """
         Clean up graph data for a draft using Apache AGE.
@@ -963,6 +1473,7 @@ class GraphDatabaseService:
                 'age_version': version,
                 'graph_name': self.graph_name,
                 'graph_exists': graph_exists,
+                'session_pool': self.get_session_pool_metrics(),
                 'status': 'healthy'
             }
             
@@ -0,0 +1,603 @@
+"""
+Durable, bounded background job executor.
+
+Long-running pipeline runs (deconstructor, novel writer, full novel pipeline)
+are stored as rows in the pipeline_jobs table and executed by a fixed number
+of worker threads per job type, instead of one unbounded daemon thread per
+request.
+
+- Job types are registered with register_job_type(). A handler rebuilds
+  everything it needs from the job's JSON payload, so any process can run it.
+- Workers claim jobs with FOR UPDATE SKIP LOCKED, preferring workspaces with
+  the fewest running jobs of that type (per-workspace fairness); several
+  gunicorn processes can therefore share one queue.
+- Running jobs are heartbeated. Jobs whose owner stopped heartbeating (e.g. a
+  gunicorn restart) are requeued while attempts remain, otherwise marked
+  failed and reported to the job type's on_failure hook. Recovery runs at
+  startup and on every heartbeat.
+- get_metrics() reports queue depth, wait times and worker utilisation.
+
+Usage:
+    from src.services.job_executor import register_job_type, submit_job
+
+    register_job_type('deconstruct', _run_deconstruct_job, max_workers=2)
+    job_id = submit_job('deconstruct', payload, workspace_id=workspace_id)
+
+Worker counts can be overridden per job type with JOB_WORKERS_<JOB_TYPE>
+(e.g. JOB_WORKERS_DECONSTRUCT=4); they apply per process.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import ulid as ulid_lib
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+JobHandler = Callable[[Dict[str, Any], "JobContext"], Any]
+FailureHook = Callable[[Dict[str, Any], str, Any], None]
+
+
+@dataclass
+class JobType:
+    """A registered kind of background job."""
+    name: str
+    handler: JobHandler
+    max_workers: int = 2
+    max_attempts: int = 1
+    on_failure: Optional[FailureHook] = None
+
+
+@dataclass
+class JobContext:
+    """Execution details passed to a job handler."""
+    job_id: Optional[str]
+    job_type: str
+    attempt: int
+    workspace_id: Optional[str]
+    db_pool: Any
+
+    @property
+    def is_retry(self) -> bool:
+        """True when a previous run of this job was interrupted."""
+        return self.attempt > 1
+
+
+_job_types: Dict[str, JobType] = {}
+
+
+def register_job_type(
+    name: str,
+    handler: JobHandler,
+    max_workers: int = 2,
+    max_attempts: int = 1,
+    on_failure: Optional[FailureHook] = None
+) -> JobType:
+    """
+    Register a job type with the process-wide registry.
+
+    Args:
+        name: Job type name stored in pipeline_jobs.job_type
+        handler: Callable(payload, context) running the job
+        max_workers: Worker threads per process (JOB_WORKERS_<NAME> overrides)
+        max_attempts: Runs allowed including recoveries after a worker died
+        on_failure: Optional callable(payload, error_message, db_pool) invoked
+            when a job fails or is abandoned after its last attempt
+
+    Returns:
+        The registered JobType
+    """
+    workers = int(os.getenv(f"JOB_WORKERS_{name.upper()}", str(max_workers)))
+    job_type = JobType(
+        name=name,
+        handler=handler,
+        max_workers=workers,
+        max_attempts=max(1, max_attempts),
+        on_failure=on_failure
+    )
+    _job_types[name] = job_type
+    return job_type
+
+
+def registered_job_workers() -> int:
+    """Total worker threads per process across all registered job types."""
+    return sum(job_type.max_workers for job_type in _job_types.values())
+
+
+def mark_draft_failed(db_pool, draft_id: str, status: str, error_message: str) -> None:
+    """
+    Mark a draft as failed; shared by the on_failure hooks of draft pipelines.
+
+    Args:
+        db_pool: Database connection pool
+        draft_id: Draft whose run failed
+        status: Failed status value for the pipeline (e.g. "failed", "nw_failed")
+        error_message: Error shown to the user
+    """
+    if not draft_id:
+        return
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                UPDATE drafts
+                SET status = %s, error_message = %s, processing_completed_at = NOW(), updated_at = NOW()
+                WHERE id = %s
+            """, (status, error_message, draft_id))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Failed to mark draft {draft_id} as {status}: {e}")
+    finally:
+        db_pool.putconn(conn)
+
+
+# Next queued job of a type, preferring workspaces with the fewest running jobs
+CLAIM_JOB_QUERY = """
+    UPDATE pipeline_jobs
+    SET status = 'running',
+        worker_id = %s,
+        attempts = attempts + 1,
+        started_at = NOW(),
+        heartbeat_at = NOW(),
+        updated_at = NOW()
+    WHERE id = (
+        SELECT q.id
+        FROM pipeline_jobs q
+        WHERE q.job_type = %s AND q.status = 'queued'
+        ORDER BY (
+            SELECT COUNT(*)
+            FROM pipeline_jobs r
+            WHERE r.job_type = q.job_type
+              AND r.status = 'running'
+              AND r.workspace_id IS NOT DISTINCT FROM q.workspace_id
+        ), q.queued_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, payload, workspace_id, attempts, EXTRACT(EPOCH FROM (NOW() - queued_at))
+"""
+
+# Running jobs whose owner stopped heartbeating: requeue or give up
+RECOVER_JOBS_QUERY = """
+    UPDATE pipeline_jobs
+    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        queued_at = CASE WHEN attempts < max_attempts THEN NOW() ELSE queued_at END,
+        finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE NOW() END,
+        error_message = 'Worker ' || COALESCE(worker_id, 'unknown') || ' stopped responding',
+        worker_id = NULL,
+        updated_at = NOW()
+    WHERE status = 'running'
+      AND heartbeat_at < NOW() - make_interval(secs => %s)
+    RETURNING id, job_type, status, payload, error_message
+"""
+
+
+class JobExecutor:
+    """Runs registered job types from the pipeline_jobs table with bounded worker threads."""
+
+    # Seconds an idle worker waits before polling for jobs submitted by other processes
+    POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '5'))
+    # Seconds between heartbeats (and orphan recovery sweeps)
+    HEARTBEAT_INTERVAL_SECONDS = float(os.getenv('JOB_HEARTBEAT_INTERVAL_SECONDS', '30'))
+    # A running job without a heartbeat for this long is considered orphaned
+    STALE_AFTER_SECONDS = float(os.getenv('JOB_STALE_AFTER_SECONDS', '180'))
+
+    def __init__(self, db_pool, app=None, job_types: Optional[Dict[str, JobType]] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            db_pool: Database connection pool (thread-safe)
+            app: Optional Flask app; handlers run inside its app context
+            job_types: Job types to serve (defaults to the process-wide registry)
+        """
+        self.db_pool = db_pool
+        self.app = app
+        self.job_types = job_types if job_types is not None else _job_types
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake: Dict[str, threading.Event] = {}
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._started = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def start(self) -> bool:
+        """
+        Recover orphaned jobs, then start worker and heartbeat threads.
+
+        Returns:
+            False if the pipeline_jobs table is not available; submit_job()
+            then keeps starting jobs on plain threads.
+        """
+        if not self._table_available():
+            logger.warning("pipeline_jobs table not found; background jobs will run unqueued")
+            return False
+
+        with self._lock:
+            if self._started:
+                return True
+            self._started = True
+            for name in self.job_types:
+                self._wake[name] = threading.Event()
+                self._stats[name] = {
+                    'claimed': 0, 'completed': 0, 'failed': 0,
+                    'wait_seconds_total': 0.0, 'wait_seconds_max': 0.0
+                }
+
+        self.recover_orphaned_jobs()
+
+        for job_type in self.job_types.values():
+            for index in range(job_type.max_workers):
+                self._spawn(self._worker_loop, f"job-{job_type.name}-{index}", job_type)
+        self._spawn(self._heartbeat_loop, "job-heartbeat")
+
+        logger.info(
+            f"Job executor {self.worker_id} started: "
+            + ", ".join(f"{jt.name}={jt.max_workers}" for jt in self.job_types.values())
+        )
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop claiming jobs and wait briefly for idle workers to exit."""
+        self._stop.set()
+        for wake in self._wake.values():
+            wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def submit(self, job_type: str, payload: Dict[str, Any], workspace_id: Optional[str] = None) -> str:
+        """
+        Enqueue a job.
+
+        Args:
+            job_type: Registered job type name
+            payload: JSON-serializable arguments for the handler
+            workspace_id: Workspace used for fairness between tenants
+
+        Returns:
+            The new job id
+
+        Raises:
+            ValueError: If the job type is not registered
+        """
+        spec = self.job_types.get(job_type)
+        if spec is None:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job_id = str(ulid_lib.ULID())
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO pipeline_jobs
+                    (id, job_type, workspace_id, payload, status, attempts, max_attempts, queued_at, created_at, updated_at)
+                    VALUES (%s, %s, %s, %s, 'queued', 0, %s, NOW(), NOW(), NOW())
+                """, (job_id, job_type, workspace_id, json.dumps(payload), spec.max_attempts))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_pool.putconn(conn)
+
+        wake = self._wake.get(job_type)
+        if wake:
+            wake.set()
+        logger.info(f"Queued {job_type} job {job_id} (workspace {workspace_id})")
+        return job_id
+
+    def recover_orphaned_jobs(self) -> int:
+        """
+        Requeue (or fail, once attempts are exhausted) running jobs whose worker stopped heartbeating.
+
+        Returns:
+            Number of jobs recovered
+        """
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(RECOVER_JOBS_QUERY, (self.STALE_AFTER_SECONDS,))
+                rows = cursor.fetchall()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Failed to recover orphaned jobs: {e}")
+            return 0
+        finally:
+            self.db_pool.putconn(conn)
+
+        for job_id, job_type_name, status, payload, error_message in rows:
+            if status == 'queued':
+                logger.warning(f"Requeued orphaned {job_type_name} job {job_id}: {error_message}")
+                wake = self._wake.get(job_type_name)
+                if wake:
+                    wake.set()
+            else:
+                logger.error(f"Abandoned orphaned {job_type_name} job {job_id} after its last attempt: {error_message}")
+                spec = self.job_types.get(job_type_name)
+                if spec:
+                    self._notify_failure(spec, self._load_payload(payload), error_message)
+        return len(rows)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Return queue depth, wait times and worker utilisation per job type.
+
+        Queue depth and running counts come from the table (all processes);
+        claim/wait statistics and running_here are for this process.
+        """
+        with self._lock:
+            job_types = {}
+            for name, spec in self.job_types.items():
+                stats = self._stats.get(name, {})
+                claimed = stats.get('claimed', 0)
+                job_types[name] = {
+                    'workers': spec.max_workers,
+                    'running_here': sum(1 for job_type in self._running.values() if job_type == name),
+                    'claimed': int(claimed),
+                    'completed': int(stats.get('completed', 0)),
+                    'failed': int(stats.get('failed', 0)),
+                    'avg_wait_seconds': round(stats.get('wait_seconds_total', 0.0) / claimed, 3) if claimed else 0.0,
+                    'max_wait_seconds': round(stats.get('wait_seconds_max', 0.0), 3),
+                    'queue_depth': 0,
+                    'queued_workspaces': 0,
+                    'running': 0,
+                    'oldest_queued_seconds': 0.0,
+                }
+
+        metrics: Dict[str, Any] = {'worker_id': self.worker_id, 'started': self._started, 'job_types': job_types}
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT job_type,
+                           COUNT(*) FILTER (WHERE status = 'queued'),
+                           COUNT(DISTINCT workspace_id) FILTER (WHERE status = 'queued'),
+                           COUNT(*) FILTER (WHERE status = 'running'),
+                           EXTRACT(EPOCH FROM (NOW() - MIN(queued_at) FILTER (WHERE status = 'queued')))
+                    FROM pipeline_jobs
+                    WHERE status IN ('queued', 'running')
+                    GROUP BY job_type
+                """)
+                rows = cursor.fetchall()
+            conn.rollback()  # Read-only; do not hand back an open transaction
+        except Exception as e:
+            conn.rollback()
+            metrics['error'] = str(e)
+            rows = []
+        finally:
+            self.db_pool.putconn(conn)
+
+        for name, queued, queued_workspaces, running, oldest in rows:
+            entry = job_types.setdefault(name, {})
+            entry.update(
+                queue_depth=int(queued or 0),
+                queued_workspaces=int(queued_workspaces or 0),
+                running=int(running or 0),
+                oldest_queued_seconds=round(float(oldest or 0.0), 3),
+            )
+        return metrics
+
+    # ------------------------------------------------------------------
+    # Worker internals
+    # ------------------------------------------------------------------
+
+    def _table_available(self) -> bool:
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('pipeline_jobs') IS NOT NULL")
+                row = cursor.fetchone()
+            conn.rollback()
+            return bool(row and row[0])
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Could not check for the pipeline_jobs table: {e}")
+            return False
+        finally:
+            self.db_pool.putconn(conn)
+
+    def _spawn(self, target, name: str, *args) -> None:
+        # Daemon threads: a dying process abandons its jobs to orphan recovery
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _worker_loop(self, job_type: JobType) -> None:
+        wake = self._wake[job_type.name]
+        while not self._stop.is_set():
+            job = self._claim(job_type)
+            if job is None:
+                wake.wait(self.POLL_INTERVAL_SECONDS)
+                wake.clear()
+                continue
+            self._execute(job_type, job)
+
+    def _claim(self, job_type: JobType) -> Optional[Dict[str, Any]]:
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(CLAIM_JOB_QUERY, (self.worker_id, job_type.name))
+                row = cursor.fetchone()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Failed to claim {job_type.name} job: {e}")
+            return None
+        finally:
+            self.db_pool.putconn(conn)
+
+        if not row:
+            return None
+
+        job_id, payload, workspace_id, attempts, wait_seconds = row
+        wait_seconds = float(wait_seconds or 0.0)
+        with self._lock:
+            self._running[job_id] = job_type.name
+            stats = self._stats[job_type.name]
+            stats['claimed'] += 1
+            stats['wait_seconds_total'] += wait_seconds
+            stats['wait_seconds_max'] = max(stats['wait_seconds_max'], wait_seconds)
+
+        logger.info(f"Claimed {job_type.name} job {job_id} (attempt {attempts}, waited {wait_seconds:.1f}s)")
+        return {
+            'id': job_id,
+            'payload': self._load_payload(payload),
+            'workspace_id': workspace_id,
+            'attempts': attempts,
+        }
+
+    def _execute(self, job_type: JobType, job: Dict[str, Any]) -> None:
+        context = JobContext(
+            job_id=job['id'],
+            job_type=job_type.name,
+            attempt=job['attempts'],
+            workspace_id=job['workspace_id'],
+            db_pool=self.db_pool
+        )
+        error_message = None
+        try:
+            if self.app is not None:
+                with self.app.app_context():
+                    job_type.handler(job['payload'], context)
+            else:
+                job_type.handler(job['payload'], context)
+        except Exception as e:
+            error_message = str(e) or e.__class__.__name__
+            logger.error(f"{job_type.name} job {job['id']} failed: {error_message}", exc_info=True)
+        finally:
+            with self._lock:
+                self._running.pop(job['id'], None)
+                self._stats[job_type.name]['failed' if error_message else 'completed'] += 1
+
+        self._finish(job['id'], error_message)
+        if error_message:
+            self._notify_failure(job_type, job['payload'], error_message)
+
+    def _finish(self, job_id: str, error_message: Optional[str]) -> None:
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                # Only the owning worker may finish a job; a requeued job belongs to someone else
+                cursor.execute("""
+                    UPDATE pipeline_jobs
+                    SET status = %s, error_message = %s, finished_at = NOW(), updated_at = NOW()
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                """, ('failed' if error_message else 'completed', error_message, job_id, self.worker_id))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Failed to record completion of job {job_id}: {e}")
+        finally:
+            self.db_pool.putconn(conn)
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.HEARTBEAT_INTERVAL_SECONDS):
+            self._heartbeat()
+            self.recover_orphaned_jobs()
+
+    def _heartbeat(self) -> None:
+        with self._lock:
+            job_ids = list(self._running)
+        if not job_ids:
+            return
+
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE pipeline_jobs
+                    SET heartbeat_at = NOW()
+                    WHERE id = ANY(%s) AND worker_id = %s
+                """, (job_ids, self.worker_id))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Failed to heartbeat {len(job_ids)} running jobs: {e}")
+        finally:
+            self.db_pool.putconn(conn)
+
+    def _notify_failure(self, job_type: JobType, payload: Dict[str, Any], error_message: str) -> None:
+        if job_type.on_failure is None:
+            return
+        try:
+            if self.app is not None:
+                with self.app.app_context():
+                    job_type.on_failure(payload, error_message, self.db_pool)
+            else:
+                job_type.on_failure(payload, error_message, self.db_pool)
+        except Exception as e:
+            logger.error(f"on_failure hook for {job_type.name} failed: {e}")
+
+    @staticmethod
+    def _load_payload(payload: Any) -> Dict[str, Any]:
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        return payload if isinstance(payload, dict) else {}
+
+
+def submit_job(job_type: str, payload: Dict[str, Any], workspace_id: Optional[str] = None) -> Optional[str]:
+    """
+    Enqueue a job on the app's JOB_EXECUTOR.
+
+    If no executor is running (e.g. the pipeline_jobs migration has not been
+    applied) the job runs on a daemon thread as before, so starting a
+    pipeline never fails because of the queue.
+
+    Args:
+        job_type: Registered job type name
+        payload: JSON-serializable arguments for the handler
+        workspace_id: Workspace used for fairness between tenants
+
+    Returns:
+        The job id, or None when the job was started without the queue
+    """
+    executor = current_app.config.get('JOB_EXECUTOR') if has_app_context() else None
+    if executor is not None and executor.started:
+        try:
+            return executor.submit(job_type, payload, workspace_id=workspace_id)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning(f"Job queue unavailable, starting {job_type} job on a thread: {e}")
+
+    spec = _job_types.get(job_type)
+    if spec is None:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    db_pool = current_app.config.get('CONNECTION_POOL') if has_app_context() else None
+    flask_app = current_app._get_current_object() if has_app_context() else None
+    context = JobContext(job_id=None, job_type=job_type, attempt=1, workspace_id=workspace_id, db_pool=db_pool)
+
+    def _run_unqueued():
+        try:
+            if flask_app is not None:
+                with flask_app.app_context():
+                    spec.handler(payload, context)
+            else:
+                spec.handler(payload, context)
+        except Exception as e:
+            logger.error(f"{job_type} job failed: {e}", exc_info=True)
+            if spec.on_failure and db_pool is not None:
+                try:
+                    spec.on_failure(payload, str(e) or e.__class__.__name__, db_pool)
+                except Exception as hook_error:
+                    logger.error(f"on_failure hook for {job_type} failed: {hook_error}")
+
+    threading.Thread(target=_run_unqueued, name=f"job-{job_type}-unqueued", daemon=True).start()
+    return None
@@ -6,9 +6,12 @@ Independent from the deconstructor's base_stage - tailored for novel generation.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
+import copy
 import logging
 from datetime import datetime
 
+from src.config.provider_config import ProviderConcurrencyConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -150,6 +153,34 @@ class BasePipelineStage(ABC):
         self.generation_engine = generation_engine
         self.logger = logging.getLogger(f"{__name__}.{stage_name}")
 
+    def _get_max_workers(self, context: PipelineStageContext, config_key: str) -> int:
+        """
+        Resolve the number of concurrent LLM workers for this stage.
+
+        Args:
+            context: Stage execution context (``context.config[config_key]`` overrides)
+            config_key: Per-stage override key, e.g. "chapter_workers"
+
+        Returns:
+            Worker count (1 means the sequential path)
+        """
+        provider = self.generation_engine.request.provider if self.generation_engine else ""
+        return ProviderConcurrencyConfig.get_max_workers(provider, context.config.get(config_key))
+
+    def _fork_for_worker(self) -> 'BasePipelineStage':
+        """
+        Build a shallow copy of this stage bound to its own generation engine.
+
+        Stages mutate ``generation_engine.request`` per call, so concurrent
+        workers run the stage methods on a copy owning a forked engine.
+
+        Returns:
+            Worker-local stage instance
+        """
+        worker = copy.copy(self)
+        worker.generation_engine = self.generation_engine.fork()
+        return worker
+
     @abstractmethod
     def _execute_stage(self, context: PipelineStageContext) -> PipelineStageResult:
         """
@@ -97,6 +97,9 @@ class EntityProfilingStage(BasePipelineStage):
             self._merge_character_profiles(story_context)
             self._merge_location_profiles(story_context)
 
+            # Index scenes, chapters and plot threads once for the later stages
+            story_context.build_indexes()
+
             # Validate minimum requirements
             if not story_context.scenes:
                 return PipelineStageResult.error_result(
@@ -297,11 +297,17 @@ class NovelWriterOrchestrator:
     ) -> Dict[str, Any]:
         """
         Build fallback/degradation telemetry and deterministic gate outcomes for metadata.
+
+        Per-chapter lists are ordered by chapter number, whatever order the
+        (concurrent) quality stages produced them in.
         """
+        def _by_chapter(entries):
+            return sorted(entries or [], key=lambda entry: entry.get('chapter', 0))
+
         telemetry = {
             'hard_gate_enabled': hard_gate_enabled,
             'hard_gate_threshold': hard_threshold,
-            'hard_gate_failures': gate_failures,
+            'hard_gate_failures': _by_chapter(gate_failures),
             'hard_gate_passed': len(gate_failures) == 0 if hard_gate_enabled else None,
             'prose_generation': {
                 'chapters_generated': None,
@@ -330,12 +336,18 @@ class NovelWriterOrchestrator:
             if not stage_result:
                 return {}
             data = stage_result.to_dict()
+            gate_outcomes = data.get('deterministic_gate_outcomes')
+            if isinstance(gate_outcomes, dict):
+                gate_outcomes = {
+                    **gate_outcomes,
+                    'chapters_failing': _by_chapter(gate_outcomes.get('chapters_failing')),
+                }
             return {
                 'chapters_assessed': data.get('chapters_assessed'),
                 'chapters_needing_improvement': data.get('chapters_needing_improvement'),
                 'average_score': data.get('average_score'),
                 'degradation_report': data.get('degradation_report'),
-                'deterministic_gate_outcomes': data.get('deterministic_gate_outcomes'),
+                'deterministic_gate_outcomes': gate_outcomes,
                 'deterministic_summary': data.get('deterministic_summary'),
             }
 
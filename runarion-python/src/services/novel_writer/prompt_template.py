@@ -74,6 +74,28 @@ CHAPTER CONTENT:
 
 SUMMARY:"""
 
+    @staticmethod
+    def get_continuity_reconciliation_prompt() -> str:
+        return """Chapter {chapter_number} was written in parallel with Chapter {previous_chapter_number}, against a planned outline instead of the finished previous chapter. Check that its opening follows on from how Chapter {previous_chapter_number} actually ends.
+
+CHAPTER {previous_chapter_number} SUMMARY:
+{previous_summary}
+
+END OF CHAPTER {previous_chapter_number}:
+{previous_ending}
+
+OPENING OF CHAPTER {chapter_number}:
+{chapter_opening}
+
+Look only for continuity breaks: contradicted facts, characters in the wrong place or state, repeated events, or references to things that did not happen. Differences in style or pacing are not breaks.
+
+Return JSON only:
+{{
+  "consistent": true or false,
+  "issues": ["short description of each break"],
+  "revised_opening": "the opening rewritten to fix the breaks (same length, voice and events), or empty when consistent"
+}}"""
+
     @staticmethod
     def get_quality_assessment_prompt() -> str:
         return """You are a policy-aware chapter assessor. Evaluate this chapter against 14 dimensions using the rewrite policy and structural requirements, not generic literary defaults.
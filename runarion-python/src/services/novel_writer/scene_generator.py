@@ -2,15 +2,26 @@
 Stage 2: Prose Generation for the novel writer pipeline.
 Generates full novel prose chapter-by-chapter using scene data, entity profiles,
 author style, and LLM generation.
+
+By default chapters are written in order, each against the summaries of the
+chapters generated before it. In outline-first mode (config 'outline_first'
+or NOVEL_WRITER_OUTLINE_FIRST) every chapter is first given a planned
+summary built from its source scenes and plot threads; chapters are then
+written concurrently against those planned summaries, and a continuity pass
+checks each chapter's opening against the actual end of the chapter before
+it, rewriting openings that contradict it.
 """
 
+import json
+import os
 import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base_stage import BasePipelineStage, PipelineStageContext, PipelineStageResult
 from .story_context import StoryContext, GeneratedChapter
 from .prompt_template import NovelWriterPrompts
+from src.utils.concurrency import run_bounded
 from src.utils.llm_retry import call_llm_with_retry
 
 logger = logging.getLogger(__name__)
@@ -24,6 +35,9 @@ class ProseGenerationStage(BasePipelineStage):
     Produces: Populated story_context.generated_chapters
     """
 
+    # Characters of a chapter's ending / the next chapter's opening compared by the continuity pass
+    CONTINUITY_EXCERPT_CHARS = int(os.getenv('NOVEL_WRITER_CONTINUITY_EXCERPT_CHARS', '2000'))
+
     def __init__(self, db_pool, generation_engine):
         super().__init__(db_pool, "ProseGenerationStage", generation_engine)
 
@@ -35,6 +49,9 @@ class ProseGenerationStage(BasePipelineStage):
                 error="StoryContext not found. Stage 1 must complete first."
             )
 
+        if self._outline_first_enabled(context.config):
+            return self._execute_outline_first(context, story_context)
+
         draft_id = context.draft_id
         target_chapter_length = context.config.get('target_chapter_length', 2500)
         total_chapters = story_context.get_total_chapter_count()
@@ -50,54 +67,22 @@ class ProseGenerationStage(BasePipelineStage):
             self.logger.info(f"Generating chapter {chapter_number}/{total_chapters}: {chapter_title}")
 
             try:
-                # Get context for this chapter
-                chapter_context = story_context.get_chapter_context(chapter_number)
-                if not chapter_context:
-                    self.logger.warning(f"No context available for chapter {chapter_number}, using fallback")
-                    chapters_failed += 1
-                    self._store_fallback_chapter(story_context, chapter, chapter_number, chapter_title)
-                    continue
-
-                # Build the generation prompt
-                prompt = self._build_generation_prompt(
-                    story_context, chapter_context, chapter_number,
-                    chapter_title, total_chapters, target_chapter_length
+                generated = self._write_chapter(
+                    story_context, chapter_idx, chapter, total_chapters, target_chapter_length
                 )
-
-                # Generate chapter prose
-                chapter_content = self._generate_chapter(prompt, target_chapter_length)
-
-                if not chapter_content:
-                    self.logger.warning(f"Generation failed for chapter {chapter_number}, using fallback")
+                if generated is None:
                     chapters_failed += 1
                     self._store_fallback_chapter(story_context, chapter, chapter_number, chapter_title)
                     continue
 
-                word_count = len(chapter_content.split())
-
-                # Generate chapter summary for continuity
-                summary = self._generate_chapter_summary(chapter_content, chapter_number)
-
-                # Determine source scenes
-                start_scene = chapter.get('start_scene', 0)
-                end_scene = chapter.get('end_scene', 0)
-                source_scenes = list(range(start_scene, end_scene + 1))
-
                 # Store generated chapter
-                story_context.generated_chapters[chapter_number] = GeneratedChapter(
-                    chapter_number=chapter_number,
-                    title=chapter_title,
-                    content=chapter_content,
-                    word_count=word_count,
-                    summary=summary,
-                    source_scenes=source_scenes,
-                )
+                story_context.generated_chapters[chapter_number] = generated
 
                 chapters_generated += 1
-                total_words += word_count
+                total_words += generated.word_count
 
                 self.logger.info(
-                    f"Chapter {chapter_number} generated: {word_count} words"
+                    f"Chapter {chapter_number} generated: {generated.word_count} words"
                 )
 
                 # Update draft metadata with progress
@@ -112,7 +97,11 @@ class ProseGenerationStage(BasePipelineStage):
                 chapters_failed += 1
                 self._store_fallback_chapter(story_context, chapter, chapter_number, chapter_title)
 
-        # Validate: at least 80% of chapters must generate
+        return self._summarize_generation(chapters_generated, chapters_failed, total_chapters, total_words)
+
+    def _summarize_generation(self, chapters_generated: int, chapters_failed: int,
+                              total_chapters: int, total_words: int) -> PipelineStageResult:
+        """Build the stage result; at least 80% of chapters must generate."""
         success_rate = chapters_generated / max(total_chapters, 1)
         if success_rate < 0.8:
             return PipelineStageResult.error_result(
@@ -134,6 +123,260 @@ class ProseGenerationStage(BasePipelineStage):
             total_words=total_words,
         )
 
+    def _write_chapter(self, story_context: StoryContext, chapter_idx: int, chapter: Dict[str, Any],
+                       total_chapters: int, target_chapter_length: int,
+                       planned: bool = False) -> Optional[GeneratedChapter]:
+        """
+        Generate one chapter's prose and summary.
+
+        Args:
+            story_context: Story context
+            chapter_idx: Position of the chapter in story_context.chapters
+            chapter: Chapter dict
+            total_chapters: Number of chapters in the draft
+            target_chapter_length: Target word count
+            planned: Write against planned (not generated) previous summaries
+
+        Returns:
+            GeneratedChapter, or None when the chapter needs the fallback
+        """
+        chapter_number = chapter.get('chapter_number', chapter_idx + 1)
+        chapter_title = chapter.get('title', f'Chapter {chapter_number}')
+
+        # Get context for this chapter
+        chapter_context = story_context.get_chapter_context(chapter_number, planned=planned)
+        if not chapter_context:
+            self.logger.warning(f"No context available for chapter {chapter_number}, using fallback")
+            return None
+
+        # Build the generation prompt
+        prompt = self._build_generation_prompt(
+            story_context, chapter_context, chapter_number,
+            chapter_title, total_chapters, target_chapter_length
+        )
+
+        # Generate chapter prose
+        chapter_content = self._generate_chapter(prompt, target_chapter_length)
+
+        if not chapter_content:
+            self.logger.warning(f"Generation failed for chapter {chapter_number}, using fallback")
+            return None
+
+        # Generate chapter summary for continuity
+        summary = self._generate_chapter_summary(chapter_content, chapter_number)
+
+        # Determine source scenes
+        start_scene = chapter.get('start_scene', 0)
+        end_scene = chapter.get('end_scene', 0)
+
+        return GeneratedChapter(
+            chapter_number=chapter_number,
+            title=chapter_title,
+            content=chapter_content,
+            word_count=len(chapter_content.split()),
+            summary=summary,
+            source_scenes=list(range(start_scene, end_scene + 1)),
+        )
+
+    def _outline_first_enabled(self, config: Dict[str, Any]) -> bool:
+        """Whether chapters are written outline-first (config 'outline_first' or env)."""
+        enabled = config.get('outline_first')
+        if enabled is None:
+            enabled = os.getenv('NOVEL_WRITER_OUTLINE_FIRST', 'false')
+        if isinstance(enabled, str):
+            enabled = enabled.strip().lower() in ('1', 'true', 'yes', 'on')
+        return bool(enabled)
+
+    def _execute_outline_first(self, context: PipelineStageContext,
+                               story_context: StoryContext) -> PipelineStageResult:
+        """Plan every chapter, write them concurrently, then reconcile continuity."""
+        draft_id = context.draft_id
+        target_chapter_length = context.config.get('target_chapter_length', 2500)
+        total_chapters = story_context.get_total_chapter_count()
+        max_workers = self._get_max_workers(context, 'chapter_workers')
+
+        story_context.build_planned_summaries()
+        self.logger.info(
+            f"Outline-first generation of {total_chapters} chapters with {max_workers} worker(s)"
+        )
+
+        chapters = list(enumerate(story_context.chapters))
+        counts = {'generated': 0, 'failed': 0, 'words': 0}
+        fallback_chapters = set()
+
+        def write(item, worker):
+            chapter_idx, chapter = item
+            try:
+                return (worker or self)._write_chapter(
+                    story_context, chapter_idx, chapter, total_chapters, target_chapter_length, planned=True
+                )
+            except Exception as e:
+                self.logger.error(f"Error generating chapter {chapter.get('chapter_number', chapter_idx + 1)}: {e}")
+                return None
+
+        def store(index, generated):
+            chapter_idx, chapter = chapters[index]
+            chapter_number = chapter.get('chapter_number', chapter_idx + 1)
+            if generated is None:
+                counts['failed'] += 1
+                fallback_chapters.add(chapter_number)
+                self._store_fallback_chapter(
+                    story_context, chapter, chapter_number, chapter.get('title', f'Chapter {chapter_number}')
+                )
+                return
+
+            story_context.generated_chapters[chapter_number] = generated
+            counts['generated'] += 1
+            counts['words'] += generated.word_count
+            self.logger.info(f"Chapter {chapter_number} generated: {generated.word_count} words")
+            try:
+                self.update_draft_metadata(draft_id, {
+                    'nw_chapters_generated': counts['generated'],
+                    'nw_total_chapters': total_chapters,
+                    'nw_total_words': counts['words'],
+                })
+            except Exception as e:
+                self.logger.warning(f"Could not record progress for chapter {chapter_number}: {e}")
+
+        run_bounded(
+            write,
+            chapters,
+            max_workers,
+            worker_state_factory=self._fork_for_worker,
+            on_result=store,
+            thread_name_prefix="nw-chapter",
+        )
+
+        checks, revisions = self._reconcile_continuity(story_context, fallback_chapters, max_workers)
+        total_words = sum(
+            story_context.generated_chapters[number].word_count
+            for number in story_context.generated_chapters if number not in fallback_chapters
+        )
+
+        result = self._summarize_generation(counts['generated'], counts['failed'], total_chapters, total_words)
+        return result.add_data(
+            outline_first=True,
+            chapter_workers=max_workers,
+            continuity_checks=checks,
+            continuity_revisions=revisions,
+        )
+
+    def _reconcile_continuity(self, story_context: StoryContext, fallback_chapters: set,
+                              max_workers: int) -> Tuple[int, int]:
+        """
+        Check each generated chapter's opening against the chapter before it.
+
+        Chapters whose opening contradicts the actual end of the previous
+        chapter get the opening rewritten. Revisions are applied once every
+        check has finished, so each check sees the chapters as generated.
+
+        Returns:
+            (continuity checks made, chapters revised)
+        """
+        generated = story_context.generated_chapters
+        pairs = [
+            (generated[number - 1], generated[number])
+            for number in sorted(generated)
+            if number - 1 in generated and not {number - 1, number} & fallback_chapters
+        ]
+        if not pairs:
+            return 0, 0
+
+        def check(pair, worker):
+            previous, current = pair
+            try:
+                return (worker or self)._check_continuity(previous, current)
+            except Exception as e:
+                self.logger.warning(f"Continuity check failed for chapter {current.chapter_number}: {e}")
+                return None
+
+        revised_openings = run_bounded(
+            check,
+            pairs,
+            max_workers,
+            worker_state_factory=self._fork_for_worker,
+            thread_name_prefix="nw-continuity",
+        )
+
+        revisions = 0
+        for (_, chapter), revised_opening in zip(pairs, revised_openings):
+            if not revised_opening:
+                continue
+            _, rest = self._split_opening(chapter.content)
+            chapter.content = f"{revised_opening}\n\n{rest}" if rest else revised_opening
+            chapter.word_count = len(chapter.content.split())
+            revisions += 1
+
+        self.logger.info(f"Continuity pass: {revisions}/{len(pairs)} chapter openings revised")
+        return len(pairs), revisions
+
+    def _split_opening(self, content: str) -> Tuple[str, str]:
+        """Split chapter content into whole opening paragraphs (~CONTINUITY_EXCERPT_CHARS) and the rest."""
+        paragraphs = content.split('\n\n')
+        opening: List[str] = []
+        length = 0
+        while paragraphs and (not opening or length + len(paragraphs[0]) <= self.CONTINUITY_EXCERPT_CHARS):
+            paragraph = paragraphs.pop(0)
+            opening.append(paragraph)
+            length += len(paragraph) + 2
+        return '\n\n'.join(opening), '\n\n'.join(paragraphs)
+
+    def _check_continuity(self, previous: GeneratedChapter, current: GeneratedChapter) -> Optional[str]:
+        """
+        Ask the LLM whether a chapter's opening follows on from the previous chapter.
+
+        Returns:
+            The revised opening when there are continuity breaks, else None
+        """
+        opening, _ = self._split_opening(current.content)
+        prompt = NovelWriterPrompts.get_continuity_reconciliation_prompt().format(
+            previous_chapter_number=previous.chapter_number,
+            previous_summary=previous.summary,
+            previous_ending=previous.content[-self.CONTINUITY_EXCERPT_CHARS:],
+            chapter_number=current.chapter_number,
+            chapter_opening=opening,
+        )
+
+        self.generation_engine.request.prompt = prompt
+        self.generation_engine.request.instruction = "Check chapter continuity and return JSON only."
+        # Room for a rewritten opening (~4 characters per token) plus the issue list
+        self.generation_engine.request.generation_config.max_output_tokens = max(1000, len(opening) // 2)
+
+        response = call_llm_with_retry(
+            lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
+        )
+        if not response.success:
+            self.logger.warning(f"Continuity check failed for chapter {current.chapter_number}")
+            return None
+
+        result = self._parse_json_object(response.text)
+        if not result or result.get('consistent', True) is not False:
+            return None
+
+        revised_opening = str(result.get('revised_opening') or '').strip()
+        # A much shorter opening would drop source events; keep the original
+        if len(revised_opening) < len(opening) * 0.5:
+            self.logger.warning(f"Discarding unusable continuity revision for chapter {current.chapter_number}")
+            return None
+
+        self.logger.info(
+            f"Revising opening of chapter {current.chapter_number}: {'; '.join(map(str, result.get('issues') or []))}"
+        )
+        return revised_opening
+
+    def _parse_json_object(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON object from an LLM response, tolerating code fences and surrounding text."""
+        text = (response_text or '').strip()
+        start = text.find('{')
+        end = text.rfind('}')
+        if start == -1 or end == -1:
+            return None
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+
     def _build_generation_prompt(self, story_context: StoryContext,
                                   chapter_context: Dict[str, Any],
                                   chapter_number: int, chapter_title: str,
@@ -285,7 +528,7 @@ class ProseGenerationStage(BasePipelineStage):
                 self.generation_engine.request.generation_config.max_output_tokens = max_output_tokens
 
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
                 # Handle truncation
@@ -298,7 +541,7 @@ class ProseGenerationStage(BasePipelineStage):
                     max_output_tokens = new_limit
                     self.generation_engine.request.generation_config.max_output_tokens = new_limit
                     response = call_llm_with_retry(
-                        lambda: self.generation_engine.generate(skip_quota=True)
+                        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                     )
 
                 if response.success:
@@ -347,7 +590,7 @@ class ProseGenerationStage(BasePipelineStage):
             self.generation_engine.request.generation_config.max_output_tokens = 500
 
             response = call_llm_with_retry(
-                lambda: self.generation_engine.generate(skip_quota=True)
+                lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
             )
 
             if response.success:
@@ -370,11 +613,10 @@ class ProseGenerationStage(BasePipelineStage):
 
         # Concatenate enhanced content from scenes
         parts = []
-        for scene in story_context.scenes:
-            if start_scene <= scene.get('scene_number', 0) <= end_scene:
-                content = scene.get('enhanced_content') or scene.get('original_content', '')
-                if content:
-                    parts.append(content)
+        for scene in story_context.get_scenes_in_range(start_scene, end_scene):
+            content = scene.get('enhanced_content') or scene.get('original_content', '')
+            if content:
+                parts.append(content)
 
         fallback_content = "\n\n".join(parts) if parts else f"[Chapter {chapter_number} generation failed]"
         word_count = len(fallback_content.split())
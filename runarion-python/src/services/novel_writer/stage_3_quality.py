@@ -1,6 +1,8 @@
 """
 Stage 3: Quality Assessment for the novel writer pipeline.
 Evaluates each generated chapter against quality dimensions using LLM scoring.
+Chapters are assessed concurrently (config 'assessment_workers') and the
+results are aggregated in chapter order.
 """
 
 import json
@@ -11,6 +13,7 @@ from typing import Dict, Any, List
 from .base_stage import BasePipelineStage, PipelineStageContext, PipelineStageResult
 from .story_context import StoryContext
 from .prompt_template import NovelWriterPrompts
+from src.utils.concurrency import run_bounded
 from src.utils.llm_retry import call_llm_with_retry
 
 logger = logging.getLogger(__name__)
@@ -93,95 +96,47 @@ class QualityAssessmentStage(BasePipelineStage):
         }
         hard_dimension_failures = []
 
-        for chapter_number, chapter in sorted(story_context.generated_chapters.items()):
-            self.logger.info(
-                f"Assessing chapter {chapter_number}: {chapter.title}"
-            )
+        chapters = sorted(story_context.generated_chapters.items())
+        max_workers = self._get_max_workers(context, 'assessment_workers')
+        self.logger.info(f"Assessing {len(chapters)} chapters with {max_workers} worker(s)")
 
-            try:
-                assessment = self._assess_chapter(
-                    story_context, chapter, chapter_number
-                )
-
-                if assessment:
-                    deterministic_checks = self._run_deterministic_checks(
-                        story_context,
-                        chapter_number,
-                        chapter.content,
-                        getattr(story_context, 'writing_perspective', 'third_person_limited')
-                    )
-                    blend_report = self._blend_deterministic_scores(assessment, deterministic_checks)
-
-                    for dim in blend_report.get('downgraded_dimensions', []):
-                        if dim in deterministic_downgrades:
-                            deterministic_downgrades[dim] += 1
-
-                    overall_score = assessment.get('overall_score', 0)
-                    needs_improvement = overall_score < quality_threshold
-
-                    assessment['needs_improvement'] = needs_improvement
-                    assessment['chapter_number'] = chapter_number
-                    assessment['chapter_title'] = chapter.title
-                    assessment['deterministic_checks'] = deterministic_checks
-                    assessment['deterministic_blend'] = blend_report
-
-                    failed_hard_dimensions = [
-                        dim for dim in HARD_DIMENSIONS
-                        if float((assessment.get('scores') or {}).get(dim, 0.0)) < quality_threshold
-                    ]
-                    if failed_hard_dimensions:
-                        hard_dimension_failures.append({
-                            'chapter': chapter_number,
-                            'failed_dimensions': failed_hard_dimensions,
-                        })
-
-                    assessments[chapter_number] = assessment
-                    chapters_assessed += 1
-                    total_score += overall_score
-
-                    if needs_improvement:
-                        chapters_needing_improvement += 1
-
-                    self.logger.info(
-                        f"Chapter {chapter_number} score: {overall_score:.1f} "
-                        f"({'needs improvement' if needs_improvement else 'passed'})"
-                    )
-                else:
-                    # Assessment failed - flag for improvement by default
-                    assessments[chapter_number] = {
-                        'chapter_number': chapter_number,
-                        'chapter_title': chapter.title,
-                        'needs_improvement': True,
-                        'overall_score': 0,
-                        'scores': {},
-                        'feedback': {},
-                        'top_issues': ['Assessment failed - defaulting to improvement required'],
-                        'assessment_error': True,
-                    }
-                    chapters_assessed += 1
-                    chapters_needing_improvement += 1
-                    llm_assessment_failures += 1
-                    fallback_improvement_defaults += 1
-                    self.logger.warning(
-                        f"Assessment failed for chapter {chapter_number}, flagged for improvement"
-                    )
-
-            except Exception as e:
-                self.logger.error(f"Error assessing chapter {chapter_number}: {e}")
-                assessments[chapter_number] = {
-                    'chapter_number': chapter_number,
-                    'chapter_title': chapter.title,
-                    'needs_improvement': True,
-                    'overall_score': 0,
-                    'scores': {},
-                    'feedback': {},
-                    'top_issues': [f'Assessment error: {str(e)}'],
-                    'assessment_error': True,
-                }
-                chapters_assessed += 1
+        chapter_assessments = run_bounded(
+            lambda item, worker: (worker or self)._assess_chapter_task(
+                story_context, item[0], item[1], quality_threshold
+            ),
+            chapters,
+            max_workers,
+            worker_state_factory=self._fork_for_worker,
+            thread_name_prefix="nw-assess",
+        )
+
+        # Aggregate in chapter order so results never depend on completion order
+        for (chapter_number, _), assessment in zip(chapters, chapter_assessments):
+            assessments[chapter_number] = assessment
+            chapters_assessed += 1
+            if assessment.get('needs_improvement'):
                 chapters_needing_improvement += 1
+
+            if assessment.get('assessment_error'):
                 llm_assessment_failures += 1
                 fallback_improvement_defaults += 1
+                continue
+
+            for dim in assessment['deterministic_blend'].get('downgraded_dimensions', []):
+                if dim in deterministic_downgrades:
+                    deterministic_downgrades[dim] += 1
+
+            failed_hard_dimensions = [
+                dim for dim in HARD_DIMENSIONS
+                if float((assessment.get('scores') or {}).get(dim, 0.0)) < quality_threshold
+            ]
+            if failed_hard_dimensions:
+                hard_dimension_failures.append({
+                    'chapter': chapter_number,
+                    'failed_dimensions': failed_hard_dimensions,
+                })
+
+            total_score += assessment.get('overall_score', 0)
 
         # Store assessments in context for Stage 4
         context.set('quality_assessments', assessments)
@@ -216,8 +171,78 @@ class QualityAssessmentStage(BasePipelineStage):
             degradation_report=degradation_report,
             deterministic_gate_outcomes=deterministic_gate_outcomes,
             deterministic_summary=deterministic_summary,
+            assessment_workers=max_workers,
         )
 
+    def _assess_chapter_task(self, story_context: StoryContext, chapter_number: int,
+                             chapter, quality_threshold: float) -> Dict[str, Any]:
+        """
+        Assess one chapter: LLM scores blended with the deterministic checks.
+
+        Returns:
+            Assessment dict; chapters whose assessment failed are flagged for
+            improvement and marked with 'assessment_error'
+        """
+        self.logger.info(
+            f"Assessing chapter {chapter_number}: {chapter.title}"
+        )
+
+        try:
+            assessment = self._assess_chapter(
+                story_context, chapter, chapter_number
+            )
+        except Exception as e:
+            self.logger.error(f"Error assessing chapter {chapter_number}: {e}")
+            return self._failed_assessment(chapter_number, chapter, f'Assessment error: {str(e)}')
+
+        if not assessment:
+            self.logger.warning(
+                f"Assessment failed for chapter {chapter_number}, flagged for improvement"
+            )
+            return self._failed_assessment(
+                chapter_number, chapter, 'Assessment failed - defaulting to improvement required'
+            )
+
+        try:
+            deterministic_checks = self._run_deterministic_checks(
+                story_context,
+                chapter_number,
+                chapter.content,
+                getattr(story_context, 'writing_perspective', 'third_person_limited')
+            )
+            blend_report = self._blend_deterministic_scores(assessment, deterministic_checks)
+        except Exception as e:
+            self.logger.error(f"Error assessing chapter {chapter_number}: {e}")
+            return self._failed_assessment(chapter_number, chapter, f'Assessment error: {str(e)}')
+
+        overall_score = assessment.get('overall_score', 0)
+        needs_improvement = overall_score < quality_threshold
+
+        assessment['needs_improvement'] = needs_improvement
+        assessment['chapter_number'] = chapter_number
+        assessment['chapter_title'] = chapter.title
+        assessment['deterministic_checks'] = deterministic_checks
+        assessment['deterministic_blend'] = blend_report
+
+        self.logger.info(
+            f"Chapter {chapter_number} score: {overall_score:.1f} "
+            f"({'needs improvement' if needs_improvement else 'passed'})"
+        )
+        return assessment
+
+    def _failed_assessment(self, chapter_number: int, chapter, issue: str) -> Dict[str, Any]:
+        """Assessment used when a chapter could not be assessed; flags it for improvement."""
+        return {
+            'chapter_number': chapter_number,
+            'chapter_title': chapter.title,
+            'needs_improvement': True,
+            'overall_score': 0,
+            'scores': {},
+            'feedback': {},
+            'top_issues': [issue],
+            'assessment_error': True,
+        }
+
     def _assess_chapter(self, story_context: StoryContext,
                         chapter, chapter_number: int) -> Dict[str, Any]:
         """Assess a single chapter's quality using LLM."""
@@ -259,7 +284,7 @@ class QualityAssessmentStage(BasePipelineStage):
             self.generation_engine.request.generation_config.max_output_tokens = 2000
 
             response = call_llm_with_retry(
-                lambda: self.generation_engine.generate(skip_quota=True)
+                lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
             )
 
             if not response.success:
@@ -516,10 +541,7 @@ class QualityAssessmentStage(BasePipelineStage):
         covered = 0
 
         for scene_num in chapter.source_scenes:
-            scene = next(
-                (s for s in story_context.scenes if s.get('scene_number') == scene_num),
-                None,
-            )
+            scene = story_context.get_scene(scene_num)
             if not scene:
                 continue
 
@@ -713,10 +735,7 @@ class QualityAssessmentStage(BasePipelineStage):
         """Build a checklist of scenes that should be covered in the chapter."""
         parts = []
         for scene_num in chapter.source_scenes:
-            scene = next(
-                (s for s in story_context.scenes if s.get('scene_number') == scene_num),
-                None
-            )
+            scene = story_context.get_scene(scene_num)
             if scene:
                 title = scene.get('title', f'Scene {scene_num}')
                 summary = scene.get('summary', '')[:150]
@@ -1,16 +1,19 @@
 """
 Stage 4: Scene Improvement for the novel writer pipeline.
 Iteratively improves flagged chapters based on quality assessment feedback.
+Flagged chapters are improved concurrently (config 'improvement_workers');
+the passes of one chapter stay sequential.
 """
 
 import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base_stage import BasePipelineStage, PipelineStageContext, PipelineStageResult
 from .story_context import StoryContext, GeneratedChapter
 from .prompt_template import NovelWriterPrompts
 from .stage_3_quality import DIMENSION_WEIGHTS, ALL_DIMENSIONS
+from src.utils.concurrency import run_bounded
 from src.utils.llm_retry import call_llm_with_retry
 
 logger = logging.getLogger(__name__)
@@ -96,103 +99,129 @@ class SceneImprovementStage(BasePipelineStage):
         total_passes = 0
         improvement_details = []
 
-        for chapter_number, assessment in sorted(chapters_to_improve.items()):
-            chapter = story_context.generated_chapters.get(chapter_number)
-            if not chapter:
-                self.logger.warning(f"Chapter {chapter_number} not found in generated chapters")
+        flagged = sorted(chapters_to_improve.items())
+        max_workers = self._get_max_workers(context, 'improvement_workers')
+        outcomes = run_bounded(
+            lambda item, worker: (worker or self)._improve_chapter_task(
+                story_context, item[0], item[1], max_passes
+            ),
+            flagged,
+            max_workers,
+            worker_state_factory=self._fork_for_worker,
+            thread_name_prefix="nw-improve",
+        )
+
+        # Apply in chapter order so details never depend on completion order
+        for (chapter_number, _), (detail, improved_chapter) in zip(flagged, outcomes):
+            if detail is None:
                 chapters_failed += 1
                 continue
 
-            original_score = assessment.get('overall_score', 0)
-            self.logger.info(
-                f"Improving chapter {chapter_number} (score: {original_score:.1f})"
-            )
+            total_passes += detail['passes_used']
+            improvement_details.append(detail)
+            if improved_chapter is not None:
+                story_context.generated_chapters[chapter_number] = improved_chapter
+                chapters_improved += 1
+            else:
+                chapters_failed += 1
 
-            improved = False
-            current_content = chapter.content
-            current_score = original_score
-            passes_used = 0
+        return PipelineStageResult.success_result(
+            self.stage_name,
+            chapters_improved=chapters_improved,
+            chapters_failed=chapters_failed,
+            total_passes=total_passes,
+            improvement_details=improvement_details,
+            improvement_workers=max_workers,
+        )
 
-            for pass_num in range(max_passes):
-                passes_used += 1
-                total_passes += 1
+    def _improve_chapter_task(self, story_context: StoryContext, chapter_number: int,
+                              assessment: Dict[str, Any],
+                              max_passes: int) -> Tuple[Optional[Dict[str, Any]], Optional[GeneratedChapter]]:
+        """
+        Run up to max_passes improvement passes on one chapter.
 
-                try:
-                    improved_content = self._improve_chapter(
-                        story_context, current_content,
-                        assessment, chapter_number
-                    )
+        Passes stop at the first one that fails or does not raise the score.
 
-                    if not improved_content:
-                        self.logger.warning(
-                            f"Improvement pass {pass_num + 1} failed for chapter {chapter_number}"
-                        )
-                        break
+        Returns:
+            (improvement detail, improved chapter or None); the detail is None
+            when the chapter is missing from the generated chapters
+        """
+        chapter = story_context.generated_chapters.get(chapter_number)
+        if not chapter:
+            self.logger.warning(f"Chapter {chapter_number} not found in generated chapters")
+            return None, None
 
-                    # Lightweight re-assessment (check overall score)
-                    new_score = self._quick_score_check(
-                        improved_content, story_context
-                    )
+        original_score = assessment.get('overall_score', 0)
+        self.logger.info(
+            f"Improving chapter {chapter_number} (score: {original_score:.1f})"
+        )
 
-                    self.logger.info(
-                        f"Chapter {chapter_number} pass {pass_num + 1}: "
-                        f"{current_score:.1f} -> {new_score:.1f}"
-                    )
+        improved = False
+        current_content = chapter.content
+        current_score = original_score
+        passes_used = 0
 
-                    if new_score > current_score:
-                        current_content = improved_content
-                        current_score = new_score
-                        improved = True
-                    else:
-                        self.logger.info(
-                            f"Score did not improve for chapter {chapter_number} "
-                            f"on pass {pass_num + 1}, keeping previous version"
-                        )
-                        break
-
-                except Exception as e:
-                    self.logger.error(
-                        f"Improvement error for chapter {chapter_number} "
-                        f"pass {pass_num + 1}: {e}"
+        for pass_num in range(max_passes):
+            passes_used += 1
+
+            try:
+                improved_content = self._improve_chapter(
+                    story_context, current_content,
+                    assessment, chapter_number
+                )
+
+                if not improved_content:
+                    self.logger.warning(
+                        f"Improvement pass {pass_num + 1} failed for chapter {chapter_number}"
                     )
                     break
 
-            if improved:
-                # Update the generated chapter with improved content
-                word_count = len(current_content.split())
-                story_context.generated_chapters[chapter_number] = GeneratedChapter(
-                    chapter_number=chapter_number,
-                    title=chapter.title,
-                    content=current_content,
-                    word_count=word_count,
-                    summary=chapter.summary,
-                    source_scenes=chapter.source_scenes,
+                # Lightweight re-assessment (check overall score)
+                new_score = self._quick_score_check(
+                    improved_content, story_context
                 )
-                chapters_improved += 1
 
-                improvement_details.append({
-                    'chapter': chapter_number,
-                    'original_score': original_score,
-                    'final_score': current_score,
-                    'passes_used': passes_used,
-                    'improved': True,
-                })
-            else:
-                chapters_failed += 1
-                improvement_details.append({
-                    'chapter': chapter_number,
-                    'original_score': original_score,
-                    'final_score': current_score,
-                    'passes_used': passes_used,
-                    'improved': False,
-                })
+                self.logger.info(
+                    f"Chapter {chapter_number} pass {pass_num + 1}: "
+                    f"{current_score:.1f} -> {new_score:.1f}"
+                )
 
-        return PipelineStageResult.success_result(
-            self.stage_name,
-            chapters_improved=chapters_improved,
-            chapters_failed=chapters_failed,
-            total_passes=total_passes,
-            improvement_details=improvement_details,
+                if new_score > current_score:
+                    current_content = improved_content
+                    current_score = new_score
+                    improved = True
+                else:
+                    self.logger.info(
+                        f"Score did not improve for chapter {chapter_number} "
+                        f"on pass {pass_num + 1}, keeping previous version"
+                    )
+                    break
+
+            except Exception as e:
+                self.logger.error(
+                    f"Improvement error for chapter {chapter_number} "
+                    f"pass {pass_num + 1}: {e}"
+                )
+                break
+
+        detail = {
+            'chapter': chapter_number,
+            'original_score': original_score,
+            'final_score': current_score,
+            'passes_used': passes_used,
+            'improved': improved,
+        }
+        if not improved:
+            return detail, None
+
+        # Replace the generated chapter with the improved content
+        return detail, GeneratedChapter(
+            chapter_number=chapter_number,
+            title=chapter.title,
+            content=current_content,
+            word_count=len(current_content.split()),
+            summary=chapter.summary,
+            source_scenes=chapter.source_scenes,
         )
 
     def _improve_chapter(self, story_context: StoryContext,
@@ -303,7 +332,7 @@ class SceneImprovementStage(BasePipelineStage):
             self.generation_engine.request.generation_config.max_output_tokens = max_output_tokens
 
             response = call_llm_with_retry(
-                lambda: self.generation_engine.generate(skip_quota=True)
+                lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
             )
 
             # Handle truncation
@@ -315,7 +344,7 @@ class SceneImprovementStage(BasePipelineStage):
                 )
                 self.generation_engine.request.generation_config.max_output_tokens = new_limit
                 response = call_llm_with_retry(
-                    lambda: self.generation_engine.generate(skip_quota=True)
+                    lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
                 )
 
             if response.success:
@@ -359,7 +388,7 @@ class SceneImprovementStage(BasePipelineStage):
             self.generation_engine.request.generation_config.max_output_tokens = 50
 
             response = call_llm_with_retry(
-                lambda: self.generation_engine.generate(skip_quota=True)
+                lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
             )
 
             if response.success:
@@ -99,10 +99,7 @@ class ManuscriptAssemblyStage(BasePipelineStage):
             word_count = len(cleaned_content.split())
 
             # Get source chapter data from deconstructor
-            source_chapter = next(
-                (c for c in story_context.chapters if c.get('chapter_number') == chapter_number),
-                {}
-            )
+            source_chapter = story_context.get_chapter(chapter_number) or {}
 
             start_scene = source_chapter.get('start_scene', 0)
             end_scene = source_chapter.get('end_scene', 0)
@@ -6,11 +6,13 @@ into a unified data structure for prose generation.
 Rebuilt from database tables each pipeline run - not persisted.
 """
 
+import json
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterProfile:
     """Merged character profile from analysis reports, graph data, and scene analysis."""
     name: str
@@ -24,7 +26,7 @@ class CharacterProfile:
     graph_properties: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationProfile:
     """Merged location profile from analysis reports and graph data."""
     name: str
@@ -35,7 +37,7 @@ class LocationProfile:
     graph_properties: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedChapter:
     """Holds a generated chapter's content and metadata during pipeline execution."""
     chapter_number: int
@@ -59,6 +61,11 @@ class StoryContext:
     - Apache AGE graph (character/location/relationship vertices)
 
     Consumed by Stages 2-5 for generation, assessment, and assembly.
+
+    Scene, chapter, character and plot-thread lookups go through indexes
+    built once by build_indexes(). They are rebuilt automatically when the
+    scenes, chapters or plot_threads lists are replaced or grow; call
+    build_indexes() again after editing those lists in place.
     """
 
     def __init__(self):
@@ -87,13 +94,133 @@ class StoryContext:
 
         # Built during Stage 2 (Prose Generation)
         self.generated_chapters: Dict[int, GeneratedChapter] = {}
+        # Outline-first mode: planned summaries chapters are written against
+        self.planned_summaries: Dict[int, str] = {}
+
+        # Lookup indexes, see build_indexes()
+        self._indexed_lists: Optional[Tuple] = None
+        self._scenes_by_number: Dict[int, Dict[str, Any]] = {}
+        self._scene_numbers: List[int] = []
+        self._ordered_scenes: List[Dict[str, Any]] = []
+        self._chapters_by_number: Dict[int, Dict[str, Any]] = {}
+        self._character_scenes: Dict[str, List[int]] = {}
+        self._thread_scene_numbers: List[int] = []
+        self._thread_scene_threads: List[int] = []
+        self._unscoped_threads: List[int] = []
+
+    def build_indexes(self) -> None:
+        """
+        Build the scene-number, chapter-number, character-to-scene and
+        scene-to-thread indexes.
 
-    def get_chapter_context(self, chapter_number: int) -> Dict[str, Any]:
+        Plot thread content_json is parsed here once, so thread lookups never
+        re-parse it. Called by EntityProfilingStage after loading; other
+        lookups build the indexes on first use.
+        """
+        ordered = sorted(self.scenes, key=self._scene_number)
+        scenes_by_number: Dict[int, Dict[str, Any]] = {}
+        character_scenes: Dict[str, List[int]] = {}
+        for scene in ordered:
+            scene_number = self._scene_number(scene)
+            scenes_by_number.setdefault(scene_number, scene)
+            characters = scene.get('characters', [])
+            if isinstance(characters, str):
+                characters = [characters]
+            for name in characters or []:
+                if name and isinstance(name, str):
+                    scenes = character_scenes.setdefault(name, [])
+                    if not scenes or scenes[-1] != scene_number:
+                        scenes.append(scene_number)
+
+        chapters_by_number: Dict[int, Dict[str, Any]] = {}
+        for chapter in self.chapters:
+            chapters_by_number.setdefault(chapter.get('chapter_number'), chapter)
+
+        thread_scenes: List[Tuple[int, int]] = []
+        unscoped: List[int] = []
+        for thread_idx, thread in enumerate(self.plot_threads):
+            scene_numbers = self._parse_thread_scenes(thread)
+            if not scene_numbers:
+                unscoped.append(thread_idx)
+            thread_scenes.extend((number, thread_idx) for number in scene_numbers)
+        thread_scenes.sort()
+
+        self._ordered_scenes = ordered
+        self._scene_numbers = [self._scene_number(scene) for scene in ordered]
+        self._scenes_by_number = scenes_by_number
+        self._character_scenes = character_scenes
+        self._chapters_by_number = chapters_by_number
+        self._thread_scene_numbers = [number for number, _ in thread_scenes]
+        self._thread_scene_threads = [thread_idx for _, thread_idx in thread_scenes]
+        self._unscoped_threads = unscoped
+        self._indexed_lists = self._index_key()
+
+    def _index_key(self) -> Tuple:
+        # Holding the lists themselves keeps their ids from being reused
+        return (
+            self.scenes, len(self.scenes),
+            self.chapters, len(self.chapters),
+            self.plot_threads, len(self.plot_threads),
+        )
+
+    def _ensure_indexes(self) -> None:
+        indexed, current = self._indexed_lists, self._index_key()
+        if (indexed is None or indexed[1::2] != current[1::2]
+                or any(old is not new for old, new in zip(indexed[0::2], current[0::2]))):
+            self.build_indexes()
+
+    @staticmethod
+    def _scene_number(scene: Dict[str, Any]) -> int:
+        return scene.get('scene_number') or 0
+
+    @staticmethod
+    def _parse_thread_scenes(thread: Dict[str, Any]) -> List[int]:
+        """Scene numbers a plot thread mentions, parsed from its content_json."""
+        content = thread.get('content_json', {})
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+            except (json.JSONDecodeError, TypeError):
+                content = {}
+        scenes = content.get('scenes', []) if isinstance(content, dict) else []
+        numbers = []
+        for scene in scenes if isinstance(scenes, list) else []:
+            try:
+                numbers.append(int(scene))
+            except (TypeError, ValueError):
+                continue
+        return numbers
+
+    def get_scene(self, scene_number: int) -> Optional[Dict[str, Any]]:
+        """Get a scene by its scene number, or None if it is not loaded."""
+        self._ensure_indexes()
+        return self._scenes_by_number.get(scene_number)
+
+    def get_scenes_in_range(self, start_scene: int, end_scene: int) -> List[Dict[str, Any]]:
+        """Get the scenes numbered start_scene..end_scene (inclusive), in scene order."""
+        self._ensure_indexes()
+        low = bisect_left(self._scene_numbers, start_scene)
+        high = bisect_right(self._scene_numbers, end_scene)
+        return self._ordered_scenes[low:high]
+
+    def get_chapter(self, chapter_number: int) -> Optional[Dict[str, Any]]:
+        """Get a deconstructor chapter by its chapter number, or None."""
+        self._ensure_indexes()
+        return self._chapters_by_number.get(chapter_number)
+
+    def get_character_scenes(self, name: str) -> List[int]:
+        """Get the numbers of the scenes a character appears in, in scene order."""
+        self._ensure_indexes()
+        return list(self._character_scenes.get(name, []))
+
+    def get_chapter_context(self, chapter_number: int, planned: bool = False) -> Dict[str, Any]:
         """
         Get all context needed for generating a specific chapter.
 
         Returns a dict with scenes, character profiles, location profiles,
         previous chapter summaries, active plot threads, and chapter position info.
+        With planned=True the previous summaries come from planned_summaries
+        instead of the generated chapters, so chapters can be written in any order.
         """
         if not self.chapters:
             return {}
@@ -107,10 +234,7 @@ class StoryContext:
         end_scene = chapter.get('end_scene', start_scene)
 
         # Scenes for this chapter
-        chapter_scenes = [
-            s for s in self.scenes
-            if start_scene <= s.get('scene_number', 0) <= end_scene
-        ]
+        chapter_scenes = self.get_scenes_in_range(start_scene, end_scene)
 
         # Characters appearing in these scenes
         chapter_character_names = set()
@@ -140,17 +264,29 @@ class StoryContext:
             if name in self.location_profiles
         }
 
-        # Previous chapter summaries for continuity (last 3)
+        # Previous chapter summaries for continuity (last 3), walking back
+        # from this chapter instead of sorting every summary
         prev_summaries = []
-        for prev_num in sorted(self.generated_chapters.keys()):
-            if prev_num < chapter_number:
+        source = self.planned_summaries if planned else self.generated_chapters
+        for prev_num in range(chapter_number - 1, 0, -1):
+            if len(prev_summaries) == 3 or len(prev_summaries) == len(source):
+                break
+            if prev_num not in source:
+                continue
+            if planned:
+                prev_summaries.append({
+                    'chapter': prev_num,
+                    'title': self.chapters[prev_num - 1].get('title', f'Chapter {prev_num}'),
+                    'summary': self.planned_summaries[prev_num]
+                })
+            else:
                 gc = self.generated_chapters[prev_num]
                 prev_summaries.append({
                     'chapter': prev_num,
                     'title': gc.title,
                     'summary': gc.summary
                 })
-        prev_summaries = prev_summaries[-3:]
+        prev_summaries.reverse()
 
         # Active plot threads in scene range
         active_threads = self._get_active_threads(start_scene, end_scene)
@@ -170,22 +306,54 @@ class StoryContext:
             }
         }
 
+    def build_planned_summaries(self, max_length: int = 800) -> Dict[int, str]:
+        """
+        Plan a summary of every chapter from its source scenes and plot threads.
+
+        Built without LLM calls from the deconstructor's scene summaries (or
+        titles) and the analysis reports' plot threads, for outline-first
+        prose generation.
+
+        Args:
+            max_length: Maximum characters per planned summary
+
+        Returns:
+            Chapter number -> planned summary (also stored on planned_summaries)
+        """
+        self.planned_summaries = {}
+        for chapter_idx, chapter in enumerate(self.chapters):
+            chapter_number = chapter_idx + 1
+            start_scene = chapter.get('start_scene', 1)
+            end_scene = chapter.get('end_scene', start_scene)
+
+            events = []
+            for scene in self.get_scenes_in_range(start_scene, end_scene):
+                event = (scene.get('summary') or scene.get('title') or '').strip()
+                if event:
+                    events.append(event if event.endswith(('.', '!', '?')) else f"{event}.")
+            summary = " ".join(events) or f"Scenes {start_scene}-{end_scene}."
+
+            threads = [
+                thread.get('report_subject') for thread in self._get_active_threads(start_scene, end_scene)
+                if thread.get('report_subject')
+            ]
+            if threads:
+                summary += f" Plot threads: {', '.join(threads[:3])}."
+
+            if len(summary) > max_length:
+                summary = summary[:max_length].rsplit(' ', 1)[0] + "..."
+            self.planned_summaries[chapter_number] = summary
+        return self.planned_summaries
+
     def _get_active_threads(self, start_scene: int, end_scene: int) -> List[Dict[str, Any]]:
         """Get plot threads active in the given scene range."""
-        active = []
-        for thread in self.plot_threads:
-            content = thread.get('content_json', {})
-            if isinstance(content, str):
-                import json
-                try:
-                    content = json.loads(content)
-                except (json.JSONDecodeError, TypeError):
-                    content = {}
-            # Include thread if it mentions scenes in our range or has no scene data
-            thread_scenes = content.get('scenes', [])
-            if not thread_scenes or any(start_scene <= s <= end_scene for s in thread_scenes):
-                active.append(thread)
-        return active
+        self._ensure_indexes()
+        # Include thread if it mentions scenes in our range or has no scene data
+        low = bisect_left(self._thread_scene_numbers, start_scene)
+        high = bisect_right(self._thread_scene_numbers, end_scene)
+        thread_indexes = set(self._thread_scene_threads[low:high])
+        thread_indexes.update(self._unscoped_threads)
+        return [self.plot_threads[idx] for idx in sorted(thread_indexes)]
 
     def get_all_character_names(self) -> List[str]:
         """Get all character names from profiles."""
@@ -1,80 +1,260 @@
+"""
+Workspace quota checks and decrements.
+
+A single process-wide QuotaManager (see get_quota_manager) serves every
+provider instance. It borrows connections from the app's CONNECTION_POOL when
+running inside a Flask app context and otherwise from one lazily created
+fallback pool, so building a GenerationEngine never opens new connections.
+
+- check_quota() caches each workspace's (is_active, quota) row for a short TTL.
+- update_quota() applies a guarded atomic decrement and refreshes the cache.
+- record_usage() queues decrements for pipeline calls made with
+  skip_quota=True, defer_quota=True and flushes them in batches (by count, by age, and at interpreter exit).
+"""
+
+import atexit
+import logging
 import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from flask import current_app, has_app_context
 from psycopg2 import pool
+
 from src.models.request import CallerInfo
 
+logger = logging.getLogger(__name__)
+
+_fallback_pool = None
+_fallback_pool_lock = threading.Lock()
+
+
+def _get_fallback_pool():
+    """Process-wide pool for callers running outside a Flask app context."""
+    global _fallback_pool
+    with _fallback_pool_lock:
+        if _fallback_pool is None or _fallback_pool.closed:
+            _fallback_pool = pool.ThreadedConnectionPool(
+                minconn=1,
+                maxconn=int(os.getenv('QUOTA_POOL_MAX_CONN', '10')),
+                host=os.getenv('DB_HOST'),
+                port=os.getenv('DB_PORT'),
+                database=os.getenv('DB_DATABASE'),
+                user=os.getenv('DB_USER'),
+                password=os.getenv('DB_PASSWORD')
+            )
+        return _fallback_pool
+
 
 class QuotaManager:
-    def __init__(self):
-        self.connection_pool = self._get_db_connection()
-
-    def _get_db_connection(self):
-        return pool.SimpleConnectionPool(
-            minconn=1,
-            maxconn=10,
-            host=os.getenv('DB_HOST'),
-            port=os.getenv('DB_PORT'),
-            database=os.getenv('DB_DATABASE'),
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD')
-        )
+    # Seconds a workspace quota row is served from cache
+    CACHE_TTL_SECONDS = float(os.getenv('QUOTA_CACHE_TTL_SECONDS', '5'))
+    # Deferred (skip_quota) usage is flushed once a workspace reaches this many calls...
+    USAGE_FLUSH_THRESHOLD = int(os.getenv('QUOTA_USAGE_FLUSH_THRESHOLD', '20'))
+    # ...or once the oldest pending call is this many seconds old
+    USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv('QUOTA_USAGE_FLUSH_INTERVAL_SECONDS', '10'))
+
+    def __init__(self, connection_pool=None):
+        self._connection_pool = connection_pool
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, Tuple[bool, Optional[int]]]] = {}
+        self._pending_usage: Dict[str, int] = {}
+        self._pending_since: Optional[float] = None
+
+    @property
+    def connection_pool(self):
+        """Explicit pool if given, else the app's CONNECTION_POOL, else the shared fallback pool."""
+        if self._connection_pool is not None:
+            return self._connection_pool
+        if has_app_context():
+            app_pool = current_app.config.get('CONNECTION_POOL')
+            if app_pool is not None:
+                return app_pool
+        return _get_fallback_pool()
+
+    def _get_workspace_row(self, workspace_id: str) -> Tuple[bool, Optional[int]]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(workspace_id)
+            if cached and now - cached[0] < self.CACHE_TTL_SECONDS:
+                return cached[1]
+
+        db_pool = self.connection_pool
+        conn = db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT is_active, quota FROM workspaces WHERE id = %s",
+                    (workspace_id,)
+                )
+                row = cursor.fetchone()
+            conn.rollback()  # Read-only; do not hand back an open transaction
+        finally:
+            db_pool.putconn(conn)
+
+        if not row:
+            raise ValueError("Workspace not found")
+
+        with self._lock:
+            self._cache[workspace_id] = (time.monotonic(), (row[0], row[1]))
+        return row[0], row[1]
+
+    def _set_cached_quota(self, workspace_id: str, quota: int) -> None:
+        with self._lock:
+            cached = self._cache.get(workspace_id)
+            if cached:
+                self._cache[workspace_id] = (cached[0], (cached[1][0], quota))
+
+    def invalidate(self, workspace_id: Optional[str] = None) -> None:
+        """Drop the cached quota for one workspace, or for all workspaces."""
+        with self._lock:
+            if workspace_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(workspace_id, None)
 
     def check_quota(self, caller: CallerInfo) -> int:
         """
-        Fetch current quota for a workspace.
+        Fetch current quota for a workspace (served from cache for CACHE_TTL_SECONDS).
         """
         try:
-            conn = self.connection_pool.getconn()
-            try:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        "SELECT is_active, quota FROM workspaces WHERE id = %s",
-                        (caller.workspace_id,)
-                    )
-                    row = cursor.fetchone()
-                    if not row:
-                        raise ValueError("Workspace not found")
-
-                    is_active, quota = row
-                    if not is_active:
-                        raise ValueError("Workspace is inactive")
-                    if quota is None or quota <= 0:
-                        raise ValueError("No quota remaining")
-
-                    return quota
-            finally:
-                self.connection_pool.putconn(conn)
+            is_active, quota = self._get_workspace_row(caller.workspace_id)
+            if not is_active:
+                raise ValueError("Workspace is inactive")
+            if quota is None or quota <= 0:
+                raise ValueError("No quota remaining")
+            return quota
         except Exception as e:
             raise ValueError(f"Quota fetch failed: {str(e)}")
 
     def update_quota(self, caller: CallerInfo, expected_quota: int, quota_generation_count: int = 1) -> None:
         """
-        Atomically decrements the quota using optimistic locking.
-        Fails if the current quota is not equal to expected_quota.
+        Atomically decrements the quota.
+
+        expected_quota may come from the cache, so it is only used as a
+        precheck; the UPDATE itself guards against going below zero.
         """
         try:
-            conn = self.connection_pool.getconn()
+            if expected_quota is not None and expected_quota - quota_generation_count < 0:
+                raise ValueError("Insufficient quota")
+
+            db_pool = self.connection_pool
+            conn = db_pool.getconn()
             try:
                 with conn.cursor() as cursor:
-                    new_quota = expected_quota - quota_generation_count
-                    if new_quota < 0:
-                        raise ValueError("Insufficient quota")
-
-                    # Optimistic update using WHERE quota = expected_quota
                     cursor.execute(
                         """
                         UPDATE workspaces
-                        SET quota = %s, updated_at = NOW()
-                        WHERE id = %s AND quota = %s
+                        SET quota = quota - %s, updated_at = NOW()
+                        WHERE id = %s AND quota >= %s
+                        RETURNING quota
                         """,
-                        (new_quota, caller.workspace_id, expected_quota)
+                        (quota_generation_count, caller.workspace_id, quota_generation_count)
                     )
-
-                    if cursor.rowcount == 0:
-                        raise ValueError(
-                            "Quota update failed due to concurrent modification")
+                    row = cursor.fetchone()
+                    if not row:
+                        conn.rollback()
+                        self.invalidate(caller.workspace_id)
+                        raise ValueError("Insufficient quota")
 
                     conn.commit()
             finally:
-                self.connection_pool.putconn(conn)
+                db_pool.putconn(conn)
+
+            self._set_cached_quota(caller.workspace_id, row[0])
         except Exception as e:
             raise RuntimeError(f"Failed to update quota: {str(e)}")
+
+    def record_usage(self, caller: CallerInfo, quota_generation_count: int = 1) -> None:
+        """
+        Queue a quota decrement for a call made with skip_quota=True, defer_quota=True.
+
+        Decrements are applied in batches by flush_usage(); a pipeline call
+        never blocks or fails on quota accounting.
+        """
+        if quota_generation_count <= 0 or not caller.workspace_id:
+            return
+
+        with self._lock:
+            pending = self._pending_usage.get(caller.workspace_id, 0) + quota_generation_count
+            self._pending_usage[caller.workspace_id] = pending
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            due = (
+                pending >= self.USAGE_FLUSH_THRESHOLD
+                or time.monotonic() - self._pending_since >= self.USAGE_FLUSH_INTERVAL_SECONDS
+            )
+
+        if due:
+            self.flush_usage()
+
+    def flush_usage(self) -> int:
+        """
+        Apply all queued decrements in one transaction (clamped at zero).
+
+        Returns:
+            Number of generations charged. On failure the usage is re-queued.
+        """
+        with self._lock:
+            pending, self._pending_usage = self._pending_usage, {}
+            self._pending_since = None
+        if not pending:
+            return 0
+
+        try:
+            db_pool = self.connection_pool
+            conn = db_pool.getconn()
+            try:
+                with conn.cursor() as cursor:
+                    remaining = {}
+                    for workspace_id, count in pending.items():
+                        cursor.execute(
+                            """
+                            UPDATE workspaces
+                            SET quota = GREATEST(quota - %s, 0), updated_at = NOW()
+                            WHERE id = %s
+                            RETURNING quota
+                            """,
+                            (count, workspace_id)
+                        )
+                        row = cursor.fetchone()
+                        if row:
+                            remaining[workspace_id] = row[0]
+                conn.commit()
+            finally:
+                db_pool.putconn(conn)
+        except Exception as e:
+            logger.error(f"Failed to flush deferred quota usage: {e}")
+            with self._lock:
+                for workspace_id, count in pending.items():
+                    self._pending_usage[workspace_id] = self._pending_usage.get(workspace_id, 0) + count
+                if self._pending_since is None:
+                    self._pending_since = time.monotonic()
+            return 0
+
+        for workspace_id, quota in remaining.items():
+            self._set_cached_quota(workspace_id, quota)
+        return sum(pending.values())
+
+
+_quota_manager: Optional[QuotaManager] = None
+_quota_manager_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    """Return the process-wide QuotaManager shared by all providers."""
+    global _quota_manager
+    with _quota_manager_lock:
+        if _quota_manager is None:
+            _quota_manager = QuotaManager()
+            atexit.register(_flush_at_exit)
+        return _quota_manager
+
+
+def _flush_at_exit() -> None:
+    if _quota_manager is not None:
+        try:
+            _quota_manager.flush_usage()
+        except Exception:
+            pass
@@ -7,17 +7,113 @@ This service handles:
 - Custom entity type management (creates vertex labels in AGE)
 - Custom relationship type management (creates edge labels in AGE)
 - Metadata record creation in novel_graph_vertices/edges tables
+- Typed entity queries backed by a process-wide vertex cache
 """
 
+import copy
 import logging
 import json
+import os
 import re
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from src.services.graph_database_service import GraphDatabaseService, GraphDatabaseNotAvailableError
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_entity_type(entity_type: str) -> str:
+    """Normalize entity types for comparison: case, underscores and hyphens."""
+    return entity_type.lower().replace('_', ' ').replace('-', ' ')
+
+
+@dataclass(frozen=True)
+class EntityRecord:
+    """Compact entity returned by RecordsManager.query_entities."""
+    vertex_id: int
+    name: Any
+    type: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+    created_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Legacy dict shape returned by get_project_entities."""
+        entity = {
+            'vertex_id': str(self.vertex_id),  # Convert to string to avoid JS precision loss
+            'name': self.name,
+            'properties': copy.deepcopy(self.properties),
+            'type': self.type
+        }
+        if self.created_at:
+            entity['created_at'] = self.created_at
+        return entity
+
+
+class EntityVertexCache:
+    """
+    Parsed graph vertices (name, properties) per project.
+
+    Each vertex is stored with the novel_graph_vertices.updated_at it was
+    read at; readers compare against the current metadata row, so writes
+    from other processes are picked up. RecordsManager also drops a
+    project's vertices on create/update/delete.
+    """
+
+    # Projects kept in the cache (least recently used are evicted)
+    MAX_PROJECTS = int(os.getenv('ENTITY_CACHE_MAX_PROJECTS', '128'))
+
+    def __init__(self, max_projects: Optional[int] = None):
+        self.max_projects = self.MAX_PROJECTS if max_projects is None else max_projects
+        self._projects: "OrderedDict[str, Dict[int, Tuple[Any, Any, Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, project_id: str, versions: Dict[int, Any]) -> Dict[int, Tuple[Any, Dict[str, Any]]]:
+        """Return (name, properties) for vertices whose cached updated_at matches versions."""
+        with self._lock:
+            vertices = self._projects.get(project_id)
+            if vertices is None:
+                return {}
+            self._projects.move_to_end(project_id)
+            hits = {}
+            for vertex_id, updated_at in versions.items():
+                cached = vertices.get(vertex_id)
+                if cached is not None and cached[0] == updated_at:
+                    hits[vertex_id] = (cached[1], cached[2])
+            return hits
+
+    def put_many(self, project_id: str, entries: Dict[int, Tuple[Any, Any, Dict[str, Any]]]) -> None:
+        """Store (updated_at, name, properties) per vertex_id for a project."""
+        with self._lock:
+            vertices = self._projects.setdefault(project_id, {})
+            vertices.update(entries)
+            self._projects.move_to_end(project_id)
+            while len(self._projects) > self.max_projects:
+                self._projects.popitem(last=False)
+
+    def invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop cached vertices for one project, or for all projects."""
+        with self._lock:
+            if project_id is None:
+                self._projects.clear()
+            else:
+                self._projects.pop(project_id, None)
+
+
+_entity_cache: Optional[EntityVertexCache] = None
+_entity_cache_lock = threading.Lock()
+
+
+def get_entity_cache() -> EntityVertexCache:
+    """Return the process-wide entity vertex cache shared by all RecordsManager instances."""
+    global _entity_cache
+    with _entity_cache_lock:
+        if _entity_cache is None:
+            _entity_cache = EntityVertexCache()
+        return _entity_cache
+
+
 class RecordsManager:
     """
     Records Manager service for manual entity and relationship management.
@@ -220,6 +316,7 @@ class RecordsManager:
                 vertex_label=vertex_label,
                 properties=properties
             )
+            get_entity_cache().invalidate(project_id)
             
             logger.info(f"Created entity: {entity_name} ({entity_type}) with vertex_id: {vertex_id}")
             return vertex_id
@@ -385,6 +482,7 @@ class RecordsManager:
 
                     # 3. BOTH succeeded - now commit (single transaction)
                     conn.commit()
+            get_entity_cache().invalidate(project_id)
 
             # Connection returned to pool by context manager
             logger.info(f"Updated entity vertex_id: {vertex_id}")
@@ -502,6 +600,9 @@ class RecordsManager:
         
         logger.info(f"Delete entity: vertex_id={vertex_id}, project_id={project_id}, graph_draft_id={graph_draft_id}")
         
+        # Any delete path below changes the entity set
+        get_entity_cache().invalidate(project_id)
+        
         # First, check if vertex exists in metadata table (source of truth)
         vertex_exists_in_metadata = False
         conn = None
@@ -683,6 +784,9 @@ class RecordsManager:
             if conn:
                 self.db_pool.putconn(conn)
     
+    # Vertex ids per Cypher IN-list; larger fetches scan the draft once instead
+    VERTEX_FETCH_BATCH_SIZE = 500
+
     def get_project_entities(
         self,
         project_id: str,
@@ -698,150 +802,160 @@ class RecordsManager:
         Returns:
             List of entity dictionaries
         """
-        graph_draft_id = self._project_id_to_draft_id(project_id)
+        entity_types = [entity_type] if entity_type else None
+        return [entity.to_dict() for entity in self.query_entities(project_id, entity_types)]
+    
+    def query_entities(
+        self,
+        project_id: str,
+        entity_types: Optional[Iterable[str]] = None
+    ) -> List[EntityRecord]:
+        """
+        Typed, filtered entity query.
+        
+        The type filter runs in SQL against novel_graph_vertices first; only
+        the matching vertices are then read from the graph, and only those
+        whose metadata changed since they were last cached.
         
-        logger.debug(f"Getting entities for project {project_id}, entity_type: {entity_type}, draft_id: {graph_draft_id}")
+        Args:
+            project_id: Project UUID
+            entity_types: Optional entity types to include (compared ignoring
+                case, underscores and hyphens). Interactions are never included.
+            
+        Returns:
+            List of EntityRecord ordered by vertex_id
+        """
+        normalized_types = sorted({_normalize_entity_type(t) for t in entity_types}) if entity_types else None
+        cache = get_entity_cache()
         
         try:
             with self.graph_service.get_age_connection() as conn:
                 with conn.cursor() as cursor:
-                    safe_draft_id = self.graph_service._escape_cypher_string(graph_draft_id)
-                    
-                    # Always fetch ALL entities from graph, then filter by metadata type
-                    # The vertex label in AGE may not match entity_type stored in metadata
-                    # IMPORTANT: Cast vertex_id to bigint to ensure consistent parsing
-                    logger.debug(f"Querying all entities for project (will filter by type={entity_type} from metadata)")
-                    sql_query = f"""
-                        SELECT v_name, v_props, v_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$
-                        MATCH (v {{draft_id: '{safe_draft_id}'}})
-                        WHERE v.name IS NOT NULL
-                        RETURN v.name, v.properties, id(v)
-                        $$) AS (v_name agtype, v_props agtype, v_id agtype)
+                    query = """
+                        SELECT vertex_id, entity_type, created_at, updated_at
+                        FROM novel_graph_vertices
+                        WHERE project_id = %s AND deleted_at IS NULL
+                        AND lower(entity_type) <> 'interaction'
                     """
+                    params: List[Any] = [project_id]
+                    if normalized_types:
+                        query += " AND lower(translate(entity_type, '_-', '  ')) = ANY(%s)"
+                        params.append(normalized_types)
+                    query += " ORDER BY vertex_id"
+                    cursor.execute(query, params)
                     
-                    cursor.execute(sql_query)
-                    results = cursor.fetchall()
-                    
-                    # Get entity types from metadata table
-                    vertex_ids = []
-                    entities_dict = {}
-                    seen_vertex_ids = set()  # Track seen vertex_ids to prevent duplicates
-                    for row in results:
-                        if row and len(row) >= 3:
-                            try:
-                                # Parse vertex_id from agtype - can be int, string, or JSON
-                                raw_vertex_id = row[2]
-                                vertex_id = None
-                                if raw_vertex_id is not None:
-                                    if isinstance(raw_vertex_id, (int, float)):
-                                        vertex_id = int(raw_vertex_id)
-                                    elif isinstance(raw_vertex_id, str):
-                                        # Try JSON parsing first (agtype often returns JSON strings)
-                                        try:
-                                            parsed = json.loads(raw_vertex_id)
-                                            vertex_id = int(parsed)
-                                        except (json.JSONDecodeError, ValueError, TypeError):
-                                            # Try extracting number from string
-                                            import re
-                                            numbers = re.findall(r'\d+', raw_vertex_id)
-                                            if numbers:
-                                                vertex_id = int(numbers[0])
-                                    else:
-                                        vertex_id = int(raw_vertex_id)
-                                
-                                if vertex_id:
-                                    # Skip if we've already seen this vertex_id (prevent duplicates)
-                                    if vertex_id in seen_vertex_ids:
-                                        logger.warning(f"Duplicate vertex_id {vertex_id} found in query results, skipping")
-                                        continue
-                                    
-                                    seen_vertex_ids.add(vertex_id)
-                                    vertex_ids.append(vertex_id)
-                                    name = json.loads(str(row[0])) if isinstance(row[0], str) else row[0]
-                                    props = json.loads(str(row[1])) if isinstance(row[1], str) else (row[1] if isinstance(row[1], dict) else {})
-                                    # Ensure properties is a dict and preserve all keys including _settings
-                                    if not isinstance(props, dict):
-                                        props = {}
-                                    
-                                    # If _settings is a JSON string (from AGE storage), parse it
-                                    if '_settings' in props and isinstance(props['_settings'], str):
-                                        try:
-                                            props['_settings'] = json.loads(props['_settings'])
-                                        except (json.JSONDecodeError, TypeError):
-                                            logger.warning(f"Failed to parse _settings JSON for entity {vertex_id}")
-                                    
-                                    # If _summaries is a JSON string (from AGE storage), parse it
-                                    if '_summaries' in props and isinstance(props['_summaries'], str):
-                                        try:
-                                            props['_summaries'] = json.loads(props['_summaries'])
-                                        except (json.JSONDecodeError, TypeError):
-                                            logger.warning(f"Failed to parse _summaries JSON for entity {vertex_id}")
-                                    
-                                    entities_dict[vertex_id] = {
-                                        'vertex_id': str(vertex_id),  # Convert to string to avoid JS precision loss
-                                        'name': name,
-                                        'properties': props
-                                    }
-                                    # Debug: log if _settings is present
-                                    if '_settings' in props:
-                                        logger.debug(f"Entity {vertex_id} has _settings: {type(props.get('_settings'))} - {props.get('_settings')}")
-                            except Exception as e:
-                                logger.warning(f"Error processing entity row: {e}, row: {row}")
-                                pass
-                    
-                    # Fetch entity types and created_at from metadata - use the same connection to avoid pool exhaustion
-                    # IMPORTANT: Only include entities that exist in metadata (exclude deleted/soft-deleted)
-                    if vertex_ids:
-                        try:
-                            with conn.cursor() as meta_cursor:
-                                placeholders = ','.join(['%s'] * len(vertex_ids))
-                                meta_cursor.execute(f"""
-                                    SELECT vertex_id, entity_type, created_at 
-                                    FROM novel_graph_vertices
-                                    WHERE project_id = %s AND vertex_id IN ({placeholders})
-                                    AND deleted_at IS NULL
-                                """, [project_id] + vertex_ids)
-                                meta_results = meta_cursor.fetchall()
-                                for meta_row in meta_results:
-                                    meta_vertex_id, meta_entity_type, created_at = meta_row
-                                    if meta_vertex_id in entities_dict:
-                                        entities_dict[meta_vertex_id]['type'] = meta_entity_type
-                                        if created_at:
-                                            entities_dict[meta_vertex_id]['created_at'] = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
-                        except Exception as e:
-                            logger.warning(f"Failed to fetch entity types from metadata: {e}")
-                    
-                    # Only return entities that have metadata (exclude orphaned graph vertices)
-                    # This ensures consistency - if metadata was deleted, entity should not appear
-                    # Also exclude 'interaction' type - those are stored separately
-                    # Filter by entity_type if specified (based on metadata, not graph label)
-                    entities = []
-                    for vertex_id, entity_data in entities_dict.items():
-                        # Only include if we have metadata for it (entity_type was set from metadata query)
-                        if 'type' in entity_data:
-                            # Exclude interaction entities from regular entity list - they have their own view
-                            if entity_data['type'].lower() == 'interaction':
-                                continue
-                            # Apply entity_type filter based on metadata type (not graph label)
-                            if entity_type:
-                                # Normalize for comparison: handle underscores, spaces, and case
-                                normalized_filter = entity_type.lower().replace('_', ' ').replace('-', ' ')
-                                normalized_type = entity_data['type'].lower().replace('_', ' ').replace('-', ' ')
-                                if normalized_filter != normalized_type:
-                                    continue
-                            entities.append(entity_data)
-                        else:
-                            logger.warning(f"Excluding orphaned vertex {vertex_id} - exists in graph but not in metadata")
-                    
-                    logger.info(f"Retrieved {len(entities)} entities for project {project_id} (entity_type filter: {entity_type}, filtered from {len(entities_dict)} graph vertices)")
-                    if entity_type and len(entities) == 0:
-                        logger.warning(f"No entities found for entity_type '{entity_type}'")
-                    return entities
+                    metadata = OrderedDict()
+                    for vertex_id, meta_entity_type, created_at, updated_at in cursor.fetchall():
+                        metadata.setdefault(int(vertex_id), (meta_entity_type, created_at, updated_at))
+                    
+                    if not metadata:
+                        if entity_types:
+                            logger.debug(f"No entities found for entity_types {entity_types}")
+                        return []
+                    
+                    versions = {vertex_id: meta[2] for vertex_id, meta in metadata.items()}
+                    vertices = cache.get_many(project_id, versions)
+                    stale_ids = [vertex_id for vertex_id in metadata if vertex_id not in vertices]
+                    
+                    if stale_ids:
+                        # Cold, unfiltered loads read the whole draft in one scan
+                        full_scan = not normalized_types and len(stale_ids) == len(metadata)
+                        fetched = self._fetch_entity_vertices(cursor, project_id, stale_ids, full_scan=full_scan)
+                        cache.put_many(project_id, {
+                            vertex_id: (versions[vertex_id], name, props)
+                            for vertex_id, (name, props) in fetched.items()
+                        })
+                        vertices.update(fetched)
+            
+            entities = []
+            for vertex_id, (meta_entity_type, created_at, _updated_at) in metadata.items():
+                vertex = vertices.get(vertex_id)
+                if vertex is None:
+                    # Metadata without a named graph vertex is not a visible entity
+                    continue
+                entities.append(EntityRecord(
+                    vertex_id=vertex_id,
+                    name=vertex[0],
+                    type=meta_entity_type,
+                    properties=vertex[1],
+                    created_at=created_at.isoformat() if hasattr(created_at, 'isoformat') else (str(created_at) if created_at else None)
+                ))
+            
+            logger.info(
+                f"Retrieved {len(entities)} entities for project {project_id} "
+                f"(entity_types filter: {entity_types}, {len(stale_ids)} vertices read from graph)"
+            )
+            return entities
                     
         except Exception as e:
             logger.error(f"Failed to get entities for project {project_id}: {e}", exc_info=True)
             return []
     
+    def _fetch_entity_vertices(
+        self,
+        cursor,
+        project_id: str,
+        vertex_ids: List[int],
+        full_scan: bool = False
+    ) -> Dict[int, Tuple[Any, Dict[str, Any]]]:
+        """
+        Read name and parsed properties for the given vertices from the graph.
+        
+        Args:
+            cursor: Cursor on an AGE-enabled connection
+            project_id: Project UUID
+            vertex_ids: AGE vertex IDs to read
+            full_scan: Scan the whole draft once instead of batched id lookups
+            
+        Returns:
+            Dict of vertex_id -> (name, properties)
+        """
+        safe_draft_id = self.graph_service._escape_cypher_string(self._project_id_to_draft_id(project_id))
+        wanted = set(vertex_ids)
+        
+        if full_scan or len(vertex_ids) > self.VERTEX_FETCH_BATCH_SIZE:
+            id_filters = [""]
+        else:
+            id_filters = [
+                f" AND id(v) IN [{', '.join(str(vertex_id) for vertex_id in vertex_ids[i:i + self.VERTEX_FETCH_BATCH_SIZE])}]"
+                for i in range(0, len(vertex_ids), self.VERTEX_FETCH_BATCH_SIZE)
+            ]
+        
+        vertices = {}
+        for id_filter in id_filters:
+            # IMPORTANT: Cast vertex_id to bigint to ensure consistent parsing
+            cursor.execute(f"""
+                SELECT v_name, v_props, v_id::bigint FROM ag_catalog.cypher('{self.graph_name}', $$
+                MATCH (v {{draft_id: '{safe_draft_id}'}})
+                WHERE v.name IS NOT NULL{id_filter}
+                RETURN v.name, v.properties, id(v)
+                $$) AS (v_name agtype, v_props agtype, v_id agtype)
+            """)
+            for row in cursor.fetchall():
+                try:
+                    vertex_id = self._parse_agtype_vertex_id(row[2])
+                    if not vertex_id or vertex_id not in wanted or vertex_id in vertices:
+                        continue
+                    name = json.loads(str(row[0])) if isinstance(row[0], str) else row[0]
+                    vertices[vertex_id] = (name, self._parse_entity_properties(row[1], vertex_id))
+                except Exception as e:
+                    logger.warning(f"Error processing entity row: {e}, row: {row}")
+        return vertices
+    
+    def _parse_entity_properties(self, raw_props: Any, vertex_id: int) -> Dict[str, Any]:
+        """Decode agtype properties, including JSON-encoded _settings/_summaries."""
+        props = json.loads(str(raw_props)) if isinstance(raw_props, str) else (raw_props if isinstance(raw_props, dict) else {})
+        if not isinstance(props, dict):
+            return {}
+        
+        for key in ('_settings', '_summaries'):
+            if key in props and isinstance(props[key], str):
+                try:
+                    props[key] = json.loads(props[key])
+                except (json.JSONDecodeError, TypeError):
+                    logger.warning(f"Failed to parse {key} JSON for entity {vertex_id}")
+        return props
+    
     def create_relationship(
         self,
         project_id: str,
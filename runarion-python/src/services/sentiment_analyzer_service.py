@@ -11,19 +11,36 @@ This service handles:
 
 import logging
 import json
+import os
 import uuid
 import re
 import time
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from src.config.provider_config import ProviderConcurrencyConfig
 from src.services.records_manager import RecordsManager
+from src.services.chapter_content_resolver import ChapterContentResolver
+from src.services.character_mention_index import CharacterMentionIndex, MIN_ENTITY_MATCH_LENGTH
 from src.services.generation_engine import GenerationEngine
 from src.models.request import BaseGenerationRequest, GenerationConfig
 from src.models.quota import QuotaCaller
+from src.utils.concurrency import run_bounded
 from src.utils.json_response_parser import JSONResponseParser
+from src.utils.token_counter import CHARS_PER_TOKEN_ESTIMATE, TokenCounter
 
 logger = logging.getLogger(__name__)
 
+# Chapter text sent with each single-character extraction prompt
+SINGLE_CHARACTER_CONTENT_LIMIT = 15000
+
+# Output token limit of relationship extraction requests
+EXTRACTION_MAX_OUTPUT_TOKENS = 8192
+
+# Batched extraction: output reserved per focus character (up to 10 interactions)
+# and the prompt + reserved output budget of one request
+BATCH_OUTPUT_TOKENS_PER_CHARACTER = int(os.getenv('RELATIONSHIP_BATCH_OUTPUT_TOKENS_PER_CHARACTER', '1200'))
+BATCH_REQUEST_TOKEN_BUDGET = int(os.getenv('RELATIONSHIP_BATCH_REQUEST_TOKEN_BUDGET', '32000'))
+
 
 class SentimentAnalyzerService:
     """
@@ -40,6 +57,7 @@ class SentimentAnalyzerService:
         """
         self.db_pool = db_pool
         self.records_manager = RecordsManager(db_pool)
+        self.chapter_resolver = ChapterContentResolver(db_pool)
         
         logger.info("SentimentAnalyzerService initialized")
     
@@ -82,7 +100,7 @@ class SentimentAnalyzerService:
         """Create a GenerationEngine instance for AI calls."""
         generation_config = GenerationConfig(
             temperature=0.3,  # Lower temperature for more consistent extraction
-            max_output_tokens=8192  # Increased to handle chapters with many interactions
+            max_output_tokens=EXTRACTION_MAX_OUTPUT_TOKENS  # Increased to handle chapters with many interactions
         )
         
         base_request = BaseGenerationRequest(
@@ -94,7 +112,7 @@ class SentimentAnalyzerService:
             caller=caller  # caller must be in the request, not separate
         )
         
-        return GenerationEngine(base_request)
+        return GenerationEngine.for_request(base_request)
     
     # =========================================================================
     # SENTIMENT CALCULATION
@@ -349,12 +367,22 @@ Return JSON only:
         target_character: str,
         chapters: List[Dict[str, Any]],
         model: str = "gemini-2.5-flash",
-        provider: str = "gemini"
+        provider: str = "gemini",
+        max_workers: Optional[int] = None,
+        on_chapter_result: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Analyze how source_character engages with target_character across chapters.
         
         This is the NEW simpler approach - one analysis per chapter, not micro-interactions.
+        Chapters are analyzed concurrently (bounded by ProviderConcurrencyConfig, or
+        max_workers when given); chapter_analyses keeps the input chapter order.
+        
+        Args:
+            max_workers: Optional override of the provider's worker count (1 = sequential)
+            on_chapter_result: Optional callback receiving each chapter analysis as soon
+                               as it completes (completion order), for streaming partial
+                               results to the caller
         
         Returns:
             {
@@ -367,8 +395,6 @@ Return JSON only:
         """
         logger.info(f"analyze_relationship_by_chapters called: {source_character} → {target_character}, chapters_count={len(chapters) if chapters else 0}")
         
-        chapter_analyses = []
-        
         if not chapters:
             logger.warning(f"No chapters provided for {source_character} → {target_character}")
             return {
@@ -380,12 +406,12 @@ Return JSON only:
                 'error': 'No chapters provided for analysis'
             }
         
-        logger.info(f"Starting chapter loop with {len(chapters)} chapters")
+        workers = ProviderConcurrencyConfig.get_max_workers(provider, max_workers)
+        logger.info(f"Analyzing {len(chapters)} chapters with {workers} worker(s)")
         
-        for idx, chapter in enumerate(chapters):
+        def analyze(indexed_chapter):
+            idx, chapter = indexed_chapter
             try:
-                logger.info(f"Processing chapter {idx + 1}/{len(chapters)}")
-                
                 # Ensure chapter numbers are 1-based (some systems use 0-based indexing)
                 raw_order = chapter.get('order', 0)
                 # Fix: Convert string order to int if needed
@@ -404,9 +430,9 @@ Return JSON only:
             
                 if not chapter_content or not chapter_content.strip():
                     logger.warning(f"Skipping {chapter_name} - no content")
-                    continue
+                    return None
                 
-                # Analyze this chapter
+                # Analyze this chapter (429s are retried with backoff inside)
                 analysis = self._analyze_single_chapter(
                     project_id=project_id,
                     workspace_id=workspace_id,
@@ -420,17 +446,31 @@ Return JSON only:
                 )
                 
                 if analysis:
-                    chapter_analyses.append(analysis)
                     logger.info(f"  ✓ {chapter_name} analysis successful: score={analysis.get('sentiment_score', '?')}")
                 else:
                     logger.warning(f"  ✗ {chapter_name} analysis returned None/empty")
-                
-                # Rate limiting delay between chapter analyses to avoid 429 errors
-                # Even paid tier has per-minute request limits
-                time.sleep(1.5)  # 1.5 second delay between each chapter analysis
+                return analysis
                 
             except Exception as chapter_error:
                 logger.error(f"Error processing chapter {idx}: {chapter_error}", exc_info=True)
+                return None
+        
+        def report(index, analysis):
+            if analysis and on_chapter_result:
+                try:
+                    on_chapter_result(analysis)
+                except Exception as callback_error:
+                    logger.warning(f"on_chapter_result callback failed: {callback_error}")
+        
+        # Results come back in chapter order regardless of completion order
+        results = run_bounded(
+            analyze,
+            list(enumerate(chapters)),
+            max_workers=workers,
+            on_result=report,
+            thread_name_prefix="relationship-chapters",
+        )
+        chapter_analyses = [analysis for analysis in results if analysis]
         
         if not chapter_analyses:
             return {
@@ -685,7 +725,9 @@ Return JSON only:
         chapter_orders: Optional[List[int]] = None,
         model: str = "gemini-2.5-flash",
         provider: str = "gemini",
-        focus_mode: str = "all"  # 'all', 'selected', or '1-to-1'
+        focus_mode: str = "all",  # 'all', 'selected', or '1-to-1'
+        max_workers: Optional[int] = None,
+        on_chapter_result: Optional[Callable[[str, str, Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         NEW V2: Extract relationships using chapter-based analysis.
@@ -695,6 +737,11 @@ Return JSON only:
         - 'selected': Analyze selected characters with all others
         - '1-to-1': Analyze exactly 2 characters (both directions)
         
+        Pairs are analyzed one after another; the chapters of each pair fan out
+        through analyze_relationship_by_chapters (max_workers overrides the
+        provider's worker count). on_chapter_result(source, target, analysis)
+        is called as each chapter analysis completes.
+        
         Returns chapter-by-chapter analysis for each relationship.
         """
         try:
@@ -793,7 +840,12 @@ Return JSON only:
                     target_character=target,
                     chapters=chapters_to_process,
                     model=model,
-                    provider=provider
+                    provider=provider,
+                    max_workers=max_workers,
+                    on_chapter_result=(
+                        (lambda analysis, source=source, target=target: on_chapter_result(source, target, analysis))
+                        if on_chapter_result else None
+                    )
                 )
                 
                 if result.get('success'):
@@ -801,10 +853,6 @@ Return JSON only:
                     
                     # Store relationship in database
                     self._store_relationship_v2(project_id, workspace_id, result, model, provider)
-                
-                # Rate limiting delay between character pairs to avoid 429 errors
-                # This is on top of the per-chapter delays
-                time.sleep(2)  # 2 second delay between each character pair analysis
             
             logger.info(f"=== V2 EXTRACTION COMPLETE ===")
             logger.info(f"Relationships analyzed: {len(relationships)}")
@@ -1179,6 +1227,47 @@ RULES:
 - Quote actual text for evidence (30+ chars)
 - Only meaningful interactions, skip trivial ones
 
+Return JSON only:
+{{"interactions": [{{
+  "source_character": "exact name from list",
+  "target_character": "exact name from list",
+  "interaction_type": "ONE WORD from list above",
+  "sentiment_score": <number>,
+  "sentiment_reasoning": "brief explanation",
+  "context": "what happens",
+  "text_evidence": "quote from text"
+}}]}}"""
+    
+    def _get_multi_character_prompt(self) -> str:
+        """Get prompt for extracting interactions for SEVERAL focus characters in one request."""
+        return """Extract up to 10 interactions for EACH focus character in this chapter.
+
+FOCUS CHARACTERS:
+{focus_characters}
+
+CHAPTER: {chapter_name}
+CONTENT:
+{chapter_content}
+
+KNOWN CHARACTERS (use EXACT names):
+{known_characters}
+
+INTERACTION TYPE - USE ONLY ONE OF THESE EXACT WORDS:
+WARNS, THANKS, MOCKS, PROTECTS, COMFORTS, ARGUES, SUPPORTS, QUESTIONS, REASSURES, TEASES, IGNORES, THREATENS, HELPS, CRITICIZES, AGREES, DISAGREES, TRUSTS, DOUBTS
+
+SENTIMENT SCORE (-100 to +100):
+- Friendly/supportive: +20 to +60
+- Hostile/negative: -20 to -60  
+- Neutral: -10 to +10
+- Avoid +100 or -100 unless truly extreme
+
+RULES:
+- Every interaction must involve at least one FOCUS CHARACTER
+- Both characters MUST be from the KNOWN CHARACTERS list
+- Report each interaction once, even if both characters are focus characters
+- Quote actual text for evidence (30+ chars)
+- Only meaningful interactions, skip trivial ones
+
 Return JSON only:
 {{"interactions": [{{
   "source_character": "exact name from list",
@@ -1224,7 +1313,7 @@ Return JSON only:
     
     def get_chapters(self, project_id: str, workspace_id: str = None) -> List[Dict[str, Any]]:
         """
-        Get chapters for a project using direct database access.
+        Get chapters for a project with current content from version control.
 
         Args:
             project_id: Project UUID
@@ -1233,51 +1322,20 @@ Return JSON only:
         Returns:
             List of chapter dictionaries with order, chapter_name, content
         """
-        # Direct database query - fetches chapters from project_content table
-        conn = None
         try:
-            conn = self.db_pool.getconn()
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT content FROM project_content 
-                    WHERE project_id = %s
-                """, (project_id,))
-                
-                result = cursor.fetchone()
-                if not result or not result[0]:
-                    logger.warning(f"No project_content found for project {project_id}")
-                    return []
-                
-                chapters = result[0]
-                if isinstance(chapters, str):
-                    chapters = json.loads(chapters)
-                
-                if not isinstance(chapters, list):
-                    logger.warning(f"Invalid chapters format for project {project_id}")
-                    return []
-                
-                # Enrich chapters with order and content
-                enriched_chapters = []
-                for chapter in chapters:
-                    chapter_order = chapter.get('order')
-                    chapter_name = chapter.get('chapter_name', f"Chapter {chapter_order}")
-                    chapter_content = chapter.get('content', '')
-                    
-                    enriched_chapters.append({
-                        'order': chapter_order,
-                        'chapter_name': chapter_name,
-                        'content': chapter_content
-                    })
-                
-                logger.info(f"Retrieved {len(enriched_chapters)} chapters from project_content")
-                return enriched_chapters
-                
+            chapters = self.chapter_resolver.get_chapters(project_id)
         except Exception as e:
             logger.error(f"Failed to get chapters: {e}")
             return []
-        finally:
-            if conn:
-                self.db_pool.putconn(conn)
+        
+        return [
+            {
+                'order': chapter.get('order'),
+                'chapter_name': chapter.get('chapter_name', f"Chapter {chapter.get('order')}"),
+                'content': chapter.get('content', '')
+            }
+            for chapter in chapters
+        ]
     
     def get_existing_characters(self, project_id: str) -> List[Dict[str, Any]]:
         """Get existing character entities for context."""
@@ -1300,7 +1358,8 @@ Return JSON only:
         chapter_orders: Optional[List[int]] = None,  # None = all chapters
         model: str = "gemini-2.5-flash",
         provider: str = "gemini",
-        focus_mode: str = "all"  # 'all', 'selected', or '1-to-1'
+        focus_mode: str = "all",  # 'all', 'selected', or '1-to-1'
+        extraction_mode: str = "per_character"  # 'per_character' or 'batched'
     ) -> Dict[str, Any]:
         """
         Extract relationships using ONE CHARACTER AT A TIME approach.
@@ -1308,6 +1367,10 @@ Return JSON only:
         DECONSTRUCTOR PATTERN: Process each character individually to keep
         AI responses small and parseable. This prevents token limit issues.
         
+        With extraction_mode='batched' (ALL/SELECTED modes) each chapter is
+        sent once for all focus characters instead, split into the fewest
+        requests whose prompt and reserved output fit the token budget.
+        
         Args:
             project_id: Project UUID
             workspace_id: Workspace UUID
@@ -1316,11 +1379,15 @@ Return JSON only:
             model: AI model to use
             provider: AI provider
             focus_mode: 'all' (all characters), 'selected' (specific set), or '1-to-1' (exactly 2 characters, only their mutual interactions)
+            extraction_mode: 'per_character' (one request per character and chapter) or 'batched' (one request per chapter and character batch)
             
         Returns:
             Dictionary with extracted interactions, aggregated relationships, and processing info
         """
         try:
+            if extraction_mode not in ('per_character', 'batched'):
+                return {'error': f"Invalid extraction_mode '{extraction_mode}'. Use 'per_character' or 'batched'."}
+            
             # Get chapters
             all_chapters = self.get_chapters(project_id, workspace_id)
             
@@ -1365,6 +1432,7 @@ Return JSON only:
             
             logger.info(f"=== EXTRACTION START ===")
             logger.info(f"Focus mode: {focus_mode}")
+            logger.info(f"Extraction mode: {extraction_mode}")
             logger.info(f"Processing {len(characters_to_process)} characters across {len(chapters_to_process)} chapters")
             logger.info(f"Characters: {characters_to_process}")
             
@@ -1439,53 +1507,84 @@ Return JSON only:
                 logger.info(f"=== DECONSTRUCTOR PATTERN ===")
                 character_results = []
                 
-                for character_name in characters_to_process:
-                    logger.info(f"--- Processing character: {character_name} ---")
-                    character_interactions = []
-                    
-                    for chapter in chapters_to_process:
-                        # Always convert 0-indexed order to 1-indexed chapter number
-                        raw_order = chapter.get('order', 0)
-                        chapter_number = raw_order + 1
-                        chapter_name = chapter.get('chapter_name', f"Chapter {chapter_number}")
-                        chapter_content = chapter.get('content', '')
-                        
-                        if not chapter_content or not chapter_content.strip():
-                            continue
+                # Get all character names for AI context
+                all_character_names = [c.get('name') for c in existing_characters if c.get('name')]
+                
+                # Interactions need two known characters in the text the prompt sees,
+                # so skip chapters where this character has nobody to interact with
+                mention_index = CharacterMentionIndex(existing_characters, {
+                    chapter.get('order', 0) + 1: (chapter.get('content') or '')[:SINGLE_CHARACTER_CONTENT_LIMIT]
+                    for chapter in chapters_to_process
+                })
+                logger.info(f"Character mention index: {mention_index.stats()}")
+                
+                if extraction_mode == 'batched':
+                    character_results = self._extract_relationships_batched(
+                        project_id=project_id,
+                        workspace_id=workspace_id,
+                        characters_to_process=characters_to_process,
+                        chapters_to_process=chapters_to_process,
+                        all_character_names=all_character_names,
+                        mention_index=mention_index,
+                        model=model,
+                        provider=provider,
+                        seen_interactions=seen_interactions,
+                        all_interactions=all_interactions
+                    )
+                else:
+                    for character_name in characters_to_process:
+                        logger.info(f"--- Processing character: {character_name} ---")
+                        character_interactions = []
+                        chapters_skipped = 0
                         
-                        # Get all character names for AI context
-                        all_character_names = [c.get('name') for c in existing_characters if c.get('name')]
+                        for chapter in chapters_to_process:
+                            # Always convert 0-indexed order to 1-indexed chapter number
+                            raw_order = chapter.get('order', 0)
+                            chapter_number = raw_order + 1
+                            chapter_name = chapter.get('chapter_name', f"Chapter {chapter_number}")
+                            chapter_content = chapter.get('content', '')
+                            
+                            if not chapter_content or not chapter_content.strip():
+                                continue
+                            
+                            if not mention_index.can_interact(character_name, chapter_number):
+                                chapters_skipped += 1
+                                continue
+                            
+                            result = self._extract_single_character_interactions(
+                                project_id=project_id,
+                                workspace_id=workspace_id,
+                                character_name=character_name,
+                                chapter_name=chapter_name,
+                                chapter_number=chapter_number,
+                                chapter_content=chapter_content,
+                                model=model,
+                                provider=provider,
+                                known_characters=all_character_names
+                            )
+                            
+                            if result.get('interactions'):
+                                for interaction in result['interactions']:
+                                    key = (
+                                        interaction.get('source_character', '').lower(),
+                                        interaction.get('target_character', '').lower(),
+                                        chapter_number,
+                                        interaction.get('interaction_type', '')
+                                    )
+                                    if key not in seen_interactions:
+                                        seen_interactions.add(key)
+                                        character_interactions.append(interaction)
                         
-                        result = self._extract_single_character_interactions(
-                            project_id=project_id,
-                            workspace_id=workspace_id,
-                            character_name=character_name,
-                            chapter_name=chapter_name,
-                            chapter_number=chapter_number,
-                            chapter_content=chapter_content,
-                            model=model,
-                            provider=provider,
-                            known_characters=all_character_names
+                        all_interactions.extend(character_interactions)
+                        character_results.append({
+                            'character': character_name,
+                            'interactions_found': len(character_interactions),
+                            'chapters_skipped': chapters_skipped
+                        })
+                        logger.info(
+                            f"Found {len(character_interactions)} interactions for {character_name} "
+                            f"({chapters_skipped} chapters without co-mentioned characters skipped)"
                         )
-                        
-                        if result.get('interactions'):
-                            for interaction in result['interactions']:
-                                key = (
-                                    interaction.get('source_character', '').lower(),
-                                    interaction.get('target_character', '').lower(),
-                                    chapter_number,
-                                    interaction.get('interaction_type', '')
-                                )
-                                if key not in seen_interactions:
-                                    seen_interactions.add(key)
-                                    character_interactions.append(interaction)
-                    
-                    all_interactions.extend(character_interactions)
-                    character_results.append({
-                        'character': character_name,
-                        'interactions_found': len(character_interactions)
-                    })
-                    logger.info(f"Found {len(character_interactions)} interactions for {character_name}")
             
             # Aggregate interactions into relationships
             aggregated_relationships = self._aggregate_interactions_to_relationships(
@@ -1508,13 +1607,200 @@ Return JSON only:
                 'total_interactions': len(all_interactions),
                 'interactions': all_interactions,
                 'relationships': aggregated_relationships,
-                'model_used': model
+                'model_used': model,
+                'extraction_mode': extraction_mode
             }
             
         except Exception as e:
             logger.error(f"Error in extract_relationships: {e}", exc_info=True)
             return {'error': str(e)}
     
+    def _extract_relationships_batched(
+        self,
+        project_id: str,
+        workspace_id: str,
+        characters_to_process: List[str],
+        chapters_to_process: List[Dict[str, Any]],
+        all_character_names: List[str],
+        mention_index: CharacterMentionIndex,
+        model: str,
+        provider: str,
+        seen_interactions: set,
+        all_interactions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract interactions chapter by chapter for all focus characters at once.
+        
+        New interactions are appended to all_interactions (deduplicated through
+        seen_interactions, as in the per-character loop).
+        
+        Returns:
+            Per-character results (interactions involving the character, chapters skipped)
+        """
+        try:
+            token_counter = TokenCounter(provider, model)
+            count_tokens = token_counter.safe_count
+        except Exception as e:
+            logger.warning(f"Token counter unavailable for {provider}/{model}: {e}; estimating from characters")
+            count_tokens = lambda text: len(text) // CHARS_PER_TOKEN_ESTIMATE
+        
+        found = {name: 0 for name in characters_to_process}
+        skipped = {name: 0 for name in characters_to_process}
+        requests_made = 0
+        
+        for chapter in chapters_to_process:
+            # Always convert 0-indexed order to 1-indexed chapter number
+            chapter_number = chapter.get('order', 0) + 1
+            chapter_name = chapter.get('chapter_name', f"Chapter {chapter_number}")
+            chapter_content = chapter.get('content', '')
+            
+            if not chapter_content or not chapter_content.strip():
+                continue
+            
+            focus = []
+            for name in characters_to_process:
+                if mention_index.can_interact(name, chapter_number):
+                    focus.append(name)
+                else:
+                    skipped[name] += 1
+            if not focus:
+                continue
+            
+            base_prompt_tokens = count_tokens(self._get_multi_character_prompt().format(
+                focus_characters="",
+                chapter_name=chapter_name,
+                chapter_content=chapter_content[:SINGLE_CHARACTER_CONTENT_LIMIT],
+                known_characters=", ".join(all_character_names)
+            ))
+            batches = self._plan_character_batches(focus, base_prompt_tokens, count_tokens)
+            logger.info(f"{chapter_name}: {len(focus)} focus characters in {len(batches)} request(s)")
+            
+            for batch in batches:
+                requests_made += 1
+                result = self._extract_multi_character_interactions(
+                    project_id=project_id,
+                    workspace_id=workspace_id,
+                    character_names=batch,
+                    chapter_name=chapter_name,
+                    chapter_number=chapter_number,
+                    chapter_content=chapter_content,
+                    model=model,
+                    provider=provider,
+                    known_characters=all_character_names
+                )
+                
+                for interaction in result.get('interactions', []):
+                    key = (
+                        interaction.get('source_character', '').lower(),
+                        interaction.get('target_character', '').lower(),
+                        chapter_number,
+                        interaction.get('interaction_type', '')
+                    )
+                    if key in seen_interactions:
+                        continue
+                    seen_interactions.add(key)
+                    all_interactions.append(interaction)
+                    involved = {
+                        self._match_entity_name(interaction.get('source_character', ''), batch),
+                        self._match_entity_name(interaction.get('target_character', ''), batch),
+                    }
+                    for name in involved - {None}:
+                        found[name] += 1
+        
+        logger.info(
+            f"Batched extraction: {requests_made} requests for {len(characters_to_process)} characters "
+            f"across {len(chapters_to_process)} chapters"
+        )
+        return [
+            {'character': name, 'interactions_found': found[name], 'chapters_skipped': skipped[name]}
+            for name in characters_to_process
+        ]
+    
+    def _plan_character_batches(self, characters: List[str], base_prompt_tokens: int,
+                                count_tokens) -> List[List[str]]:
+        """
+        Split focus characters into the fewest requests that fit the token budget.
+        
+        Each request must keep its reserved output (BATCH_OUTPUT_TOKENS_PER_CHARACTER
+        per character) within EXTRACTION_MAX_OUTPUT_TOKENS, and its prompt plus
+        reserved output within BATCH_REQUEST_TOKEN_BUDGET. A character that does
+        not fit on its own still gets a request.
+        
+        Args:
+            characters: Focus character names
+            base_prompt_tokens: Prompt tokens without the focus list
+            count_tokens: Callable returning the token count of a text
+            
+        Returns:
+            Character batches in input order
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = base_prompt_tokens
+        for name in characters:
+            cost = count_tokens(f"- {name}\n") + BATCH_OUTPUT_TOKENS_PER_CHARACTER
+            fits = (
+                (len(current) + 1) * BATCH_OUTPUT_TOKENS_PER_CHARACTER <= EXTRACTION_MAX_OUTPUT_TOKENS
+                and current_tokens + cost <= BATCH_REQUEST_TOKEN_BUDGET
+            )
+            if current and not fits:
+                batches.append(current)
+                current, current_tokens = [], base_prompt_tokens
+            current.append(name)
+            current_tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _extract_multi_character_interactions(
+        self,
+        project_id: str,
+        workspace_id: str,
+        character_names: List[str],
+        chapter_name: str,
+        chapter_number: int,
+        chapter_content: str,
+        model: str,
+        provider: str,
+        known_characters: List[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract interactions for SEVERAL focus characters from one chapter in one request.
+        
+        Uses the same chapter text, parsing and quality gates as
+        _extract_single_character_interactions.
+        """
+        label = f"{len(character_names)} characters in {chapter_name}"
+        try:
+            caller = self._create_caller(project_id, workspace_id)
+            engine = self._get_generation_engine(model, provider, caller)
+            
+            engine.request.prompt = self._get_multi_character_prompt().format(
+                focus_characters="\n".join(f"- {name}" for name in character_names),
+                chapter_name=chapter_name,
+                chapter_content=chapter_content[:SINGLE_CHARACTER_CONTENT_LIMIT],
+                known_characters=", ".join(known_characters) if known_characters else "Unknown"
+            )
+            engine.request.instruction = "Extract interactions for every focus character. Return JSON only."
+            
+            response = engine.generate(skip_quota=True)
+            
+            if not response.success:
+                logger.warning(f"AI failed for {label}: {response.error_message}")
+                return {'interactions': []}
+            
+            interactions_data = self._parse_interactions_response(response.text, label)
+            processed = self._process_interactions(
+                project_id, interactions_data, known_characters, chapter_name, chapter_number
+            )
+            
+            logger.info(f"Extracted {len(processed)} interactions for {label}")
+            return {'interactions': processed}
+            
+        except Exception as e:
+            logger.error(f"Error extracting for {label}: {e}")
+            return {'interactions': []}
+    
     def _extract_single_character_interactions(
         self,
         project_id: str,
@@ -1543,7 +1829,7 @@ Return JSON only:
             prompt = self._get_single_character_prompt().format(
                 character_name=character_name,
                 chapter_name=chapter_name,
-                chapter_content=chapter_content[:15000],  # Limit content per request
+                chapter_content=chapter_content[:SINGLE_CHARACTER_CONTENT_LIMIT],  # Limit content per request
                 known_characters=known_chars_str
             )
             
@@ -1556,181 +1842,220 @@ Return JSON only:
                 logger.warning(f"AI failed for {character_name} in {chapter_name}: {response.error_message}")
                 return {'interactions': []}
             
-            # Simple, aggressive JSON extraction
-            response_text = response.text.strip()
-            
-            # Remove markdown
-            response_text = re.sub(r'```json\s*', '', response_text)
-            response_text = re.sub(r'```\s*', '', response_text)
-            
-            # Fix encoding issues
-            response_text = response_text.replace('"', '"').replace('"', '"')
-            response_text = response_text.replace(''', "'").replace(''', "'")
-            response_text = re.sub(r'ΓÇ[£¥öô]', '"', response_text)
-            response_text = re.sub(r'ΓÇÖ', "'", response_text)
-            
-            # Find JSON - try object first, then array
-            json_text = None
-            interactions_data = []
-            
-            # Try to find object format {"interactions": [...]}
-            obj_match = re.search(r'\{[\s\S]*"interactions"[\s\S]*\}', response_text)
-            # Try to find array format [{...}, {...}]
-            arr_match = re.search(r'\[[\s\S]*\]', response_text)
-            
-            if obj_match:
-                json_text = obj_match.group()
-            elif arr_match:
-                # AI returned array directly - wrap it
-                json_text = '{"interactions": ' + arr_match.group() + '}'
-                logger.info(f"Converted array format to object format for {character_name}")
+            interactions_data = self._parse_interactions_response(
+                response.text, f"{character_name} in {chapter_name}"
+            )
+            processed = self._process_interactions(
+                project_id, interactions_data, known_characters, chapter_name, chapter_number
+            )
             
-            # Handle truncated/missing JSON - try to salvage
-            if not json_text:
-                logger.warning(f"No JSON found for {character_name} in {chapter_name}")
-                return {'interactions': []}
+            logger.info(f"Extracted {len(processed)} interactions for {character_name} from {chapter_name}")
+            return {'interactions': processed}
             
-            # Check for truncation (unbalanced braces)
-            if json_text.count('{') != json_text.count('}'):
-                logger.warning(f"Truncated JSON for {character_name} in {chapter_name}, attempting salvage")
-                # Find last complete interaction object
-                last_complete = json_text.rfind('},')
-                if last_complete > 0:
-                    json_text = json_text[:last_complete + 1] + ']}'
-                    logger.info(f"Salvaged truncated JSON for {character_name}")
+        except Exception as e:
+            logger.error(f"Error extracting for {character_name}: {e}")
+            return {'interactions': []}
+    
+    def _parse_interactions_response(self, response_text: str, label: str) -> List[Dict[str, Any]]:
+        """
+        Parse the interactions JSON of an extraction response, salvaging truncated output.
+        
+        Args:
+            response_text: Raw model output
+            label: Description of the request for log messages
             
-            # Try to parse
-            try:
-                parsed = json.loads(json_text)
-                # Handle both formats: {"interactions": [...]} or direct list
-                if isinstance(parsed, list):
-                    interactions_data = parsed
-                else:
-                    interactions_data = parsed.get('interactions', [])
-                logger.info(f"Parsed {len(interactions_data)} interactions for {character_name} from {chapter_name}")
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON parse failed for {character_name}: {e}, trying salvage")
-                # Try to find last complete interaction and rebuild
-                last_complete = json_text.rfind('},')
-                if last_complete > 0:
-                    salvaged = json_text[:last_complete + 1] + ']}'
-                    try:
-                        parsed = json.loads(salvaged)
-                        if isinstance(parsed, list):
-                            interactions_data = parsed
-                        else:
-                            interactions_data = parsed.get('interactions', [])
-                        logger.info(f"Salvaged {len(interactions_data)} interactions after truncation repair")
-                    except json.JSONDecodeError:
-                        # Final fallback to JSONResponseParser
-                        parsed, _ = JSONResponseParser.parse_response(json_text, "dict", {})
-                        interactions_data = parsed.get('interactions', []) if isinstance(parsed, dict) else parsed
-                else:
-                    # Final fallback to JSONResponseParser  
+        Returns:
+            Raw interaction dicts (empty if nothing could be parsed)
+        """
+        # Simple, aggressive JSON extraction
+        response_text = response_text.strip()
+        
+        # Remove markdown
+        response_text = re.sub(r'```json\s*', '', response_text)
+        response_text = re.sub(r'```\s*', '', response_text)
+        
+        # Fix encoding issues
+        response_text = response_text.replace('"', '"').replace('"', '"')
+        response_text = response_text.replace(''', "'").replace(''', "'")
+        response_text = re.sub(r'ΓÇ[£¥öô]', '"', response_text)
+        response_text = re.sub(r'ΓÇÖ', "'", response_text)
+        
+        # Find JSON - try object first, then array
+        json_text = None
+        interactions_data = []
+        
+        # Try to find object format {"interactions": [...]}
+        obj_match = re.search(r'\{[\s\S]*"interactions"[\s\S]*\}', response_text)
+        # Try to find array format [{...}, {...}]
+        arr_match = re.search(r'\[[\s\S]*\]', response_text)
+        
+        if obj_match:
+            json_text = obj_match.group()
+        elif arr_match:
+            # AI returned array directly - wrap it
+            json_text = '{"interactions": ' + arr_match.group() + '}'
+            logger.info(f"Converted array format to object format for {label}")
+        
+        # Handle truncated/missing JSON - try to salvage
+        if not json_text:
+            logger.warning(f"No JSON found for {label}")
+            return []
+        
+        # Check for truncation (unbalanced braces)
+        if json_text.count('{') != json_text.count('}'):
+            logger.warning(f"Truncated JSON for {label}, attempting salvage")
+            # Find last complete interaction object
+            last_complete = json_text.rfind('},')
+            if last_complete > 0:
+                json_text = json_text[:last_complete + 1] + ']}'
+                logger.info(f"Salvaged truncated JSON for {label}")
+        
+        # Try to parse
+        try:
+            parsed = json.loads(json_text)
+            # Handle both formats: {"interactions": [...]} or direct list
+            if isinstance(parsed, list):
+                interactions_data = parsed
+            else:
+                interactions_data = parsed.get('interactions', [])
+            logger.info(f"Parsed {len(interactions_data)} interactions for {label}")
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON parse failed for {label}: {e}, trying salvage")
+            # Try to find last complete interaction and rebuild
+            last_complete = json_text.rfind('},')
+            if last_complete > 0:
+                salvaged = json_text[:last_complete + 1] + ']}'
+                try:
+                    parsed = json.loads(salvaged)
+                    if isinstance(parsed, list):
+                        interactions_data = parsed
+                    else:
+                        interactions_data = parsed.get('interactions', [])
+                    logger.info(f"Salvaged {len(interactions_data)} interactions after truncation repair")
+                except json.JSONDecodeError:
+                    # Final fallback to JSONResponseParser
                     parsed, _ = JSONResponseParser.parse_response(json_text, "dict", {})
                     interactions_data = parsed.get('interactions', []) if isinstance(parsed, dict) else parsed
+            else:
+                # Final fallback to JSONResponseParser  
+                parsed, _ = JSONResponseParser.parse_response(json_text, "dict", {})
+                interactions_data = parsed.get('interactions', []) if isinstance(parsed, dict) else parsed
+        
+        return interactions_data
             
-            # Process interactions with quality validation
-            processed = []
-            known_chars_lower = [c.lower().strip() for c in known_characters] if known_characters else []
-            
-            for i in interactions_data:
-                source = i.get('source_character', '').strip()
-                target = i.get('target_character', '').strip()
-                
-                if not source or not target:
-                    continue
-                
-                # QUALITY GATE 1: Validate characters are from known list
-                if known_chars_lower:
-                    source_valid = any(source.lower() in kc or kc in source.lower() for kc in known_chars_lower)
-                    target_valid = any(target.lower() in kc or kc in target.lower() for kc in known_chars_lower)
-                    if not source_valid or not target_valid:
-                        logger.debug(f"Skipping interaction - characters not in known list: {source} -> {target}")
-                        continue
-                
-                # QUALITY GATE 2: Require substantial text evidence
-                text_evidence = i.get('text_evidence', '').strip()
-                if len(text_evidence) < 20:
-                    logger.debug(f"Skipping interaction - evidence too short ({len(text_evidence)} chars): {source} -> {target}")
+    def _process_interactions(
+        self,
+        project_id: str,
+        interactions_data: List[Dict[str, Any]],
+        known_characters: Optional[List[str]],
+        chapter_name: str,
+        chapter_number: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate, score and store extracted interactions.
+        
+        Interactions between characters outside known_characters or with
+        less than 20 characters of text evidence are dropped.
+        
+        Returns:
+            Processed interactions (with vertex_id when stored in the graph)
+        """
+        # Process interactions with quality validation
+        processed = []
+        known_chars_lower = [c.lower().strip() for c in known_characters] if known_characters else []
+        
+        for i in interactions_data:
+            source = i.get('source_character', '').strip()
+            target = i.get('target_character', '').strip()
+        
+            if not source or not target:
+                continue
+        
+            # QUALITY GATE 1: Validate characters are from known list
+            if known_chars_lower:
+                source_valid = any(source.lower() in kc or kc in source.lower() for kc in known_chars_lower)
+                target_valid = any(target.lower() in kc or kc in target.lower() for kc in known_chars_lower)
+                if not source_valid or not target_valid:
+                    logger.debug(f"Skipping interaction - characters not in known list: {source} -> {target}")
                     continue
-                
-                # USE AI-PROVIDED SENTIMENT SCORE DIRECTLY (new approach)
-                # Fall back to formula-based calculation only if AI didn't provide a score
-                ai_sentiment = i.get('sentiment_score')
-                ai_reasoning = i.get('sentiment_reasoning', '')
-                
-                if ai_sentiment is not None:
-                    # Use AI's direct assessment - it understands context better
-                    try:
-                        sentiment = int(ai_sentiment)
-                        sentiment = max(-100, min(100, sentiment))  # Clamp to valid range
-                        reasons = [ai_reasoning] if ai_reasoning else [f"AI scored: {sentiment}"]
-                    except (ValueError, TypeError):
-                        # AI returned invalid score, fall back to formula
-                        sentiment, reasons = self.calculate_sentiment_score(
-                            emotional_tone=i.get('emotional_tone', 'neutral'),
-                            context=i.get('context', ''),
-                            relationship_type=i.get('interaction_type', '')
-                        )
-                else:
-                    # Legacy: Calculate sentiment using formula (backward compatibility)
+        
+            # QUALITY GATE 2: Require substantial text evidence
+            text_evidence = i.get('text_evidence', '').strip()
+            if len(text_evidence) < 20:
+                logger.debug(f"Skipping interaction - evidence too short ({len(text_evidence)} chars): {source} -> {target}")
+                continue
+        
+            # USE AI-PROVIDED SENTIMENT SCORE DIRECTLY (new approach)
+            # Fall back to formula-based calculation only if AI didn't provide a score
+            ai_sentiment = i.get('sentiment_score')
+            ai_reasoning = i.get('sentiment_reasoning', '')
+        
+            if ai_sentiment is not None:
+                # Use AI's direct assessment - it understands context better
+                try:
+                    sentiment = int(ai_sentiment)
+                    sentiment = max(-100, min(100, sentiment))  # Clamp to valid range
+                    reasons = [ai_reasoning] if ai_reasoning else [f"AI scored: {sentiment}"]
+                except (ValueError, TypeError):
+                    # AI returned invalid score, fall back to formula
                     sentiment, reasons = self.calculate_sentiment_score(
                         emotional_tone=i.get('emotional_tone', 'neutral'),
                         context=i.get('context', ''),
                         relationship_type=i.get('interaction_type', '')
                     )
-                
-                # Derive emotional_tone from sentiment if not provided
-                emotional_tone = i.get('emotional_tone', '')
-                if not emotional_tone:
-                    emotional_tone = self._sentiment_to_tone(sentiment)
-                
-                interaction = {
-                    'source_character': source,
-                    'target_character': target,
-                    'chapter_number': chapter_number,
-                    'chapter_name': chapter_name,
-                    'interaction_type': i.get('interaction_type', 'INTERACTS').upper(),
-                    'emotional_tone': emotional_tone,
-                    'sentiment_modifier': sentiment,
-                    'sentiment_reasoning': ai_reasoning,
-                    'context': i.get('context', ''),
-                    'text_evidence': text_evidence[:200]  # Limit evidence length
-                }
-                
-                # Try to store in graph
-                try:
-                    vertex_id = self.records_manager.create_interaction(
-                        project_id=project_id,
-                        source_character=source,
-                        target_character=target,
-                        chapter_number=chapter_number,
-                        chapter_name=chapter_name,
-                        interaction_type=interaction['interaction_type'],
-                        emotional_tone=interaction['emotional_tone'],
-                        sentiment_modifier=sentiment,
-                        context=interaction['context'],
-                        text_evidence=interaction['text_evidence'],
-                        properties={
-                            'sentiment_reasons': reasons,
-                            'sentiment_reasoning': ai_reasoning,
-                            'ai_scored': ai_sentiment is not None
-                        }
-                    )
-                    interaction['vertex_id'] = vertex_id
-                except Exception as e:
-                    logger.warning(f"Could not store interaction: {e}")
-                
-                processed.append(interaction)
-            
-            logger.info(f"Extracted {len(processed)} interactions for {character_name} from {chapter_name}")
-            return {'interactions': processed}
-            
-        except Exception as e:
-            logger.error(f"Error extracting for {character_name}: {e}")
-            return {'interactions': []}
-    
+            else:
+                # Legacy: Calculate sentiment using formula (backward compatibility)
+                sentiment, reasons = self.calculate_sentiment_score(
+                    emotional_tone=i.get('emotional_tone', 'neutral'),
+                    context=i.get('context', ''),
+                    relationship_type=i.get('interaction_type', '')
+                )
+        
+            # Derive emotional_tone from sentiment if not provided
+            emotional_tone = i.get('emotional_tone', '')
+            if not emotional_tone:
+                emotional_tone = self._sentiment_to_tone(sentiment)
+        
+            interaction = {
+                'source_character': source,
+                'target_character': target,
+                'chapter_number': chapter_number,
+                'chapter_name': chapter_name,
+                'interaction_type': i.get('interaction_type', 'INTERACTS').upper(),
+                'emotional_tone': emotional_tone,
+                'sentiment_modifier': sentiment,
+                'sentiment_reasoning': ai_reasoning,
+                'context': i.get('context', ''),
+                'text_evidence': text_evidence[:200]  # Limit evidence length
+            }
+        
+            # Try to store in graph
+            try:
+                vertex_id = self.records_manager.create_interaction(
+                    project_id=project_id,
+                    source_character=source,
+                    target_character=target,
+                    chapter_number=chapter_number,
+                    chapter_name=chapter_name,
+                    interaction_type=interaction['interaction_type'],
+                    emotional_tone=interaction['emotional_tone'],
+                    sentiment_modifier=sentiment,
+                    context=interaction['context'],
+                    text_evidence=interaction['text_evidence'],
+                    properties={
+                        'sentiment_reasons': reasons,
+                        'sentiment_reasoning': ai_reasoning,
+                        'ai_scored': ai_sentiment is not None
+                    }
+                )
+                interaction['vertex_id'] = vertex_id
+            except Exception as e:
+                logger.warning(f"Could not store interaction: {e}")
+        
+            processed.append(interaction)
+        
+        return processed
+        
     def _extract_1to1_interactions(
         self,
         project_id: str,
@@ -2153,7 +2478,7 @@ Return JSON only:
         for entity in known_entities:
             entity_lower = entity.lower()
             # Only match if it's a significant portion (avoid matching single letters)
-            if len(entity_lower) >= 3 and entity_lower in extracted_lower:
+            if len(entity_lower) >= MIN_ENTITY_MATCH_LENGTH and entity_lower in extracted_lower:
                 return entity
         
         # NOTE: First-word matching removed - too many false positives
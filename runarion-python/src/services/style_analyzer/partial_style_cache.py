@@ -0,0 +1,160 @@
+"""
+Content-addressed cache of partial author styles.
+
+A partial style depends only on the chunk text, the provider and model, the
+partial style prompt and the generation config, so it is stored in
+author_style_partial_cache under a hash of exactly those inputs. Re-profiling
+an author style after adding a sample then only calls the LLM for the chunks
+of the new sample.
+
+The cache is best effort: if the table is unavailable, lookups return nothing
+and writes are skipped, and profiling calls the LLM as before.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Optional, TypedDict
+
+from src.utils.database_utils import clean_text_for_database, utf8_database_connection
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPartialStyle(TypedDict):
+    text: str  # LLM response, without the passage title
+    token: int  # number of tokens in the text
+    processing_time_ms: int  # LLM time of the call that produced it
+
+
+def compute_partial_style_cache_key(
+    chunk_text: str,
+    provider: str,
+    model: str,
+    prompt_version: str,
+    generation_config: dict[str, Any],
+) -> str:
+    """
+    Hash everything a partial style depends on.
+
+    Args:
+        chunk_text (str): Raw text of the chunk.
+        provider (str): LLM provider.
+        model (str): LLM model.
+        prompt_version (str): Version of the partial style prompt template.
+        generation_config (dict[str, Any]): Generation config of the LLM call.
+
+    Returns:
+        str: Hex sha256 digest.
+    """
+    material = json.dumps(
+        {
+            "chunk": hashlib.sha256(chunk_text.encode("utf-8")).hexdigest(),
+            "provider": provider,
+            "model": model,
+            "prompt": prompt_version,
+            "generation_config": generation_config,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class PartialStyleCache:
+    """Reads and writes cached partial styles."""
+
+    def __init__(self, db_pool):
+        """
+        Initialize the cache.
+
+        Args:
+            db_pool: Database connection pool.
+        """
+        self.db_pool = db_pool
+
+    def get_many(self, cache_keys: list[str]) -> dict[str, CachedPartialStyle]:
+        """
+        Look up cached partial styles in one query.
+
+        Args:
+            cache_keys (list[str]): Cache keys to look up.
+
+        Returns:
+            dict[str, CachedPartialStyle]: Cached styles by key; keys without
+            a cached style are missing.
+        """
+        if not cache_keys:
+            return {}
+        try:
+            with utf8_database_connection(self.db_pool) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT cache_key, style_text, style_text_token_count, processing_time_ms
+                        FROM author_style_partial_cache
+                        WHERE cache_key = ANY(%s)
+                        """,
+                        (list(set(cache_keys)),),
+                    )
+                    rows = cursor.fetchall()
+                conn.rollback()  # Read-only; do not hand back an open transaction
+        except Exception as e:
+            logger.warning(f"Partial style cache unavailable: {e}")
+            return {}
+
+        return {
+            key: CachedPartialStyle(text=text, token=token, processing_time_ms=processing_time_ms)
+            for key, text, token, processing_time_ms in rows
+        }
+
+    def put(
+        self,
+        cache_key: str,
+        author_sample_id: Optional[str],
+        provider: str,
+        model: str,
+        style: CachedPartialStyle,
+    ) -> bool:
+        """
+        Store a partial style; an existing row with the same key is kept.
+
+        Args:
+            cache_key (str): Cache key of the partial style.
+            author_sample_id (Optional[str]): Sample the chunk belongs to.
+            provider (str): LLM provider.
+            model (str): LLM model.
+            style (CachedPartialStyle): The partial style to cache.
+
+        Returns:
+            bool: Whether the style was written.
+        """
+        try:
+            with utf8_database_connection(self.db_pool) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        INSERT INTO author_style_partial_cache (
+                            cache_key, author_sample_id, provider, model,
+                            style_text, style_text_token_count, processing_time_ms,
+                            created_at, updated_at
+                        )
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+                        ON CONFLICT (cache_key) DO NOTHING
+                        """,
+                        (
+                            cache_key,
+                            author_sample_id,
+                            provider,
+                            model,
+                            clean_text_for_database(style["text"]),
+                            style["token"],
+                            style["processing_time_ms"],
+                        ),
+                    )
+                    written = cursor.rowcount > 0
+                conn.commit()
+            return written
+        except Exception as e:
+            logger.warning(f"Failed to cache partial style {cache_key[:12]}: {e}")
+            return False
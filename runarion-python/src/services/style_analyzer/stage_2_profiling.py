@@ -1,9 +1,10 @@
+import hashlib
 import json
 import logging
 import os
-from math import ceil
 from typing import Literal, Optional, TypedDict
 
+from src.config.provider_config import ProviderConcurrencyConfig
 from src.models.request import BaseGenerationRequest, CallerInfo, GenerationConfig
 from src.models.response import BaseGenerationResponse
 from src.models.style_analyzer import AuthorStyle
@@ -11,11 +12,17 @@ from psycopg2.pool import SimpleConnectionPool
 from pydantic import ValidationError
 from src.services.generation_engine import GenerationEngine
 from ulid import ULID
+from src.utils.concurrency import run_bounded
 from src.utils.database_utils import clean_text_for_database, utf8_database_connection
 from src.utils.llm_retry import call_llm_with_retry
 from src.utils.document_processor import ChunkWithStart, DocumentProcessor
 from src.utils.json_response_parser import JSONResponseParser, ResponseFormat
 
+from .partial_style_cache import (
+    CachedPartialStyle,
+    PartialStyleCache,
+    compute_partial_style_cache_key,
+)
 from .prompt_template import (
     COMBINED_AUTHOR_STYLE,
     INPUT_CONTENT,
@@ -25,6 +32,11 @@ from .prompt_template import (
 
 logger = logging.getLogger(__name__)
 
+# Changes whenever the partial style prompt changes, invalidating cached partial styles
+PARTIAL_STYLE_PROMPT_VERSION = hashlib.sha256(
+    (INPUT_CONTENT + PARTIAL_AUTHOR_STYLE).encode("utf-8")
+).hexdigest()[:16]
+
 
 class SimpleAuthorSample(TypedDict):
     id: str
@@ -57,6 +69,11 @@ class ProfilingStage:
     This stage processes the samples collected in the Sampling Stage to analyze the author style and store the results.
     """
 
+    # Reuse partial styles of chunks analyzed before with the same model and settings
+    PARTIAL_STYLE_CACHE_ENABLED = os.getenv(
+        "STYLE_ANALYZER_PARTIAL_STYLE_CACHE", "true"
+    ).lower() in ("1", "true", "yes", "on")
+
     def __init__(
         self,
         db_pool: SimpleConnectionPool,
@@ -65,6 +82,8 @@ class ProfilingStage:
         max_output_tokens: Optional[int] = 2000,
         generation_config: Optional[dict] = None,
         min_success_partial_style: Optional[int | float] = 0.5,
+        max_workers: Optional[int] = None,
+        use_partial_style_cache: Optional[bool] = None,
     ):
         """
         Initialize the profiling stage with document processor and generation configuration.
@@ -76,6 +95,8 @@ class ProfilingStage:
             max_output_tokens (Optional[int]): Maximum number of output tokens for the document processor.
             generation_config (Optional[dict]): Override configuration for LLM generation.
             min_success_partial_style (Optional[int | float]): Minimum successful partial styles to proceed with combined style analysis, float means ratio, int means count.
+            max_workers (Optional[int]): Concurrent LLM calls for partial and combined styles, defaults to the provider's worker count.
+            use_partial_style_cache (Optional[bool]): Whether to reuse cached partial styles, defaults to STYLE_ANALYZER_PARTIAL_STYLE_CACHE.
         """
         self.db_pool = db_pool
         self.min_success_partial_style = (
@@ -84,6 +105,14 @@ class ProfilingStage:
 
         self._provider = provider if provider else "gemini"
         self._model = model if model else "gemini-2.5-flash"
+        self.max_workers = ProviderConcurrencyConfig.get_max_workers(
+            self._provider, max_workers
+        )
+        if use_partial_style_cache is None:
+            use_partial_style_cache = self.PARTIAL_STYLE_CACHE_ENABLED
+        self.partial_style_cache = (
+            PartialStyleCache(db_pool) if use_partial_style_cache else None
+        )
 
         default_generation_config = {
             "temperature": 0.7,
@@ -295,31 +324,80 @@ class ProfilingStage:
                 style_chunks.append(style_chunk)
         return style_chunks
 
+    def _partial_style_cache_key(self, chunk: StyleChunk) -> str:
+        """
+        Builds the partial style cache key of a chunk.
+
+        Args:
+            chunk (StyleChunk): The chunk to analyze.
+
+        Returns:
+            str: The cache key.
+        """
+        return compute_partial_style_cache_key(
+            chunk["raw_text"],
+            self._provider,
+            self._model,
+            PARTIAL_STYLE_PROMPT_VERSION,
+            self.generation_config.model_dump(),
+        )
+
     def _handle_partial_style(
-        self, author_style_id: str, chunk: StyleChunk, caller: CallerInfo
+        self,
+        author_style_id: str,
+        chunk: StyleChunk,
+        caller: CallerInfo,
+        cache_key: Optional[str] = None,
+        cached: Optional[CachedPartialStyle] = None,
     ) -> StyleWithId:
         """
         Performs style analysis for a single chunk and stores the result.
+        A cached partial style is reused instead of calling the LLM,
+        and a new successful partial style is cached under cache_key.
 
         Args:
             author_style_id (str): The ID of the author style.
             chunk (StyleChunk): The chunk to analyze.
             caller (CallerInfo): Information about the caller.
+            cache_key (Optional[str]): Cache key of the chunk, None to skip caching.
+            cached (Optional[CachedPartialStyle]): Cached partial style of the chunk, if any.
 
         Returns:
             StyleWithId: The analyzed style.
         """
+        # title is useful for next LLM calls
+        title = f"PASSAGE {chunk['chunk_number']} from FILE {chunk['sample_name']}\n\n"
+
+        if cached:
+            style = Style(
+                text=title + cached["text"],
+                token=cached["token"],
+                processing_time_ms=0,
+                chunk=chunk,
+                ref_style_ids=None,
+            )
+            return self._store_style_chunk(author_style_id, style, None)
+
         response = self._call_llm(chunk["raw_text"], "partial", caller)
 
         if response.success:
-            # title is useful for next LLM calls
-            title = (
-                f"PASSAGE {chunk['chunk_number']} from FILE {chunk['sample_name']}\n\n"
-            )
             text = title + response.text
             token = response.metadata.output_tokens
             error_text = None
 
+            if cache_key and self.partial_style_cache:
+                self.partial_style_cache.put(
+                    cache_key,
+                    chunk["sample_id"],
+                    self._provider,
+                    self._model,
+                    CachedPartialStyle(
+                        text=response.text,
+                        token=token,
+                        processing_time_ms=response.metadata.processing_time_ms,
+                    ),
+                )
+
         else:
             text = ""
             token = -1
@@ -344,100 +422,133 @@ class ProfilingStage:
 
         return style_with_id
 
-    def _handle_combined_style(
+    def _group_styles(self, styles: list[StyleWithId]) -> list[list[StyleWithId]]:
+        """
+        Splits styles into consecutive groups that each fit in one combined style prompt.
+        Group size is measured with the TokenCounter against the chunk token limit.
+        A group always takes at least two styles, so every round of combining shrinks the list.
+
+        Args:
+            styles (list[StyleWithId]): List of styles to group.
+
+        Returns:
+            list[list[StyleWithId]]: The groups, in the order of the styles.
+        """
+        token_counter = self.document_processor.token_counter
+        token_limit = self.document_processor.chunk_token_limit
+
+        groups: list[list[StyleWithId]] = []
+        group: list[StyleWithId] = []
+        group_token = 0
+        for style in styles:
+            # styles are joined with blank lines in the prompt
+            token = token_counter.safe_count(style["text"] + "\n\n")
+            if len(group) >= 2 and group_token + token > token_limit:
+                groups.append(group)
+                group, group_token = [], 0
+            group.append(style)
+            group_token += token
+        if group:
+            groups.append(group)
+        return groups
+
+    def _combine_styles(
         self,
         author_style_id: str,
         styles: list[StyleWithId],
         caller: CallerInfo,
-        recursion_depth: int = 0,
     ) -> StyleWithId:
         """
-        Combines multiple styles into a single style.
-        When the styles are too many, they are split and processed recursively.
+        Combines a group of styles that fits in one prompt and stores the result.
 
         Args:
             author_style_id (str): The ID of the author style.
             styles (list[StyleWithId]): List of styles to combine.
             caller (CallerInfo): Information about the caller.
-            recursion_depth (int): Current recursion depth.
 
         Returns:
             StyleWithId: The combined style.
         """
-        if recursion_depth > 5:
-            error_text = "Recursion depth exceeded while combining styles"
-            logger.error(error_text)
-            raise RuntimeError(error_text)
+        response = self._call_llm(
+            "\n\n".join([s["text"] for s in styles]), "combined", caller
+        )
 
-        # recursion base case 1:
-        # if there is only one style, return it directly
-        if len(styles) == 1:
-            return styles[0]
+        if response.success:
+            # title can be useful for next LLM calls
+            title = "Analyzed Author Style from Multiple (but possibly not all) PASSAGEs and FILEs\n\n"
+            text = title + response.text
+            token = response.metadata.output_tokens
+            error_text = None
 
-        total_token = sum(s["token"] for s in styles)
+        else:
+            text = ""
+            token = -1
+            error_text = f"LLM call to obtain combined style failed: {response.error_message}"
+            logger.error(error_text)
 
-        # recursion base case 2:
-        # if the total token count is within the limit,
-        # perform combined style analysis and store the result
-        if total_token < self.document_processor.chunk_token_limit:
-            response = self._call_llm(
-                "\n\n".join([s["text"] for s in styles]), "combined", caller
-            )
+        style = Style(
+            text=text,
+            token=token,
+            processing_time_ms=response.metadata.processing_time_ms,
+            chunk=None,
+            ref_style_ids=[s["id"] for s in styles],
+        )
 
-            if response.success:
-                # title can be useful for next LLM calls
-                title = "Analyzed Author Style from Multiple (but possibly not all) PASSAGEs and FILEs\n\n"
-                text = title + response.text
-                token = response.metadata.output_tokens
-                error_text = None
+        style_with_id = self._store_style_chunk(
+            author_style_id,
+            style,
+            error_text,
+        )
 
-            else:
-                text = ""
-                token = -1
-                error_text = f"LLM call to obtain combined style failed: {response.error_message}"
-                logger.error(error_text)
+        if error_text:
+            raise RuntimeError(error_text)
 
-            style = Style(
-                text=text,
-                token=token,
-                processing_time_ms=response.metadata.processing_time_ms,
-                chunk=None,
-                ref_style_ids=[s["id"] for s in styles],
-            )
+        return style_with_id
 
-            style_with_id = self._store_style_chunk(
-                author_style_id,
-                style,
-                error_text,
-            )
+    def _handle_combined_style(
+        self,
+        author_style_id: str,
+        styles: list[StyleWithId],
+        caller: CallerInfo,
+    ) -> StyleWithId:
+        """
+        Combines multiple styles into a single style with a map-reduce tree.
+        Each round groups the styles by token budget and combines the groups concurrently,
+        until one style remains.
 
-            if error_text:
-                raise RuntimeError(error_text)
+        Args:
+            author_style_id (str): The ID of the author style.
+            styles (list[StyleWithId]): List of styles to combine.
+            caller (CallerInfo): Information about the caller.
 
-            return style_with_id
+        Returns:
+            StyleWithId: The combined style.
+        """
+        if not styles:
+            error_text = "No styles to combine"
+            logger.error(error_text)
+            raise RuntimeError(error_text)
 
-        # otherwise:
-        # split the styles, handle each split, and merge the results into reduced_styles
-        # splitting example: split 22 into 4 -> [6, 6, 5, 5]
-        n_splits = ceil(total_token / self.document_processor.chunk_token_limit)
-        style_base_count = len(styles) // n_splits
-        style_remainder = len(styles) % n_splits
-        reduced_styles: list[StyleWithId] = []
-        for i in range(n_splits):
-            start = i * style_base_count + min(i, style_remainder)
-            end = start + style_base_count + (1 if i < style_remainder else 0)
-            combined_style = self._handle_combined_style(
-                author_style_id,
-                styles[start:end],
-                caller,
-                recursion_depth=recursion_depth + 1,
-            )  # this call here should reach the base case
-            reduced_styles.append(combined_style)
-
-        # recursively handle the reduced_styles
-        return self._handle_combined_style(
-            author_style_id, reduced_styles, caller, recursion_depth=recursion_depth + 1
-        )
+        level = 0
+        while len(styles) > 1:
+            groups = self._group_styles(styles)
+            logger.info(
+                f"Combining {len(styles)} styles in {len(groups)} group(s) at level {level}"
+            )
+            # a style left alone in its group moves up to the next level as is
+            styles = run_bounded(
+                lambda group: (
+                    group[0]
+                    if len(group) == 1
+                    else self._combine_styles(author_style_id, group, caller)
+                ),
+                groups,
+                max_workers=self.max_workers,
+                thread_name_prefix="style-combine",
+            )
+            level += 1
+
+        return styles[0]
 
     def _handle_structured_style(
         self, combined_style: StyleWithId, caller: CallerInfo
@@ -589,10 +700,23 @@ class ProfilingStage:
         samples = self._get_samples(author_style_id)
         chunks = self._chunk_samples(samples)
 
-        partial_styles = [
-            self._handle_partial_style(author_style_id, chunk, caller)
-            for chunk in chunks
-        ]
+        cache_keys: list[Optional[str]] = [None] * len(chunks)
+        cached: dict[str, CachedPartialStyle] = {}
+        if self.partial_style_cache:
+            cache_keys = [self._partial_style_cache_key(chunk) for chunk in chunks]
+            cached = self.partial_style_cache.get_many(cache_keys)
+            logger.info(
+                f"Reusing {sum(1 for key in cache_keys if key in cached)} of {len(chunks)} cached partial styles"
+            )
+
+        partial_styles = run_bounded(
+            lambda item: self._handle_partial_style(
+                author_style_id, item[0], caller, item[1], cached.get(item[1])
+            ),
+            list(zip(chunks, cache_keys)),
+            max_workers=self.max_workers,
+            thread_name_prefix="style-partial",
+        )
 
         success_count = sum(1 for s in partial_styles if s["token"] > 0)
         if isinstance(self.min_success_partial_style, int):
@@ -604,8 +728,9 @@ class ProfilingStage:
             logger.error(error_text)
             raise RuntimeError(error_text)
 
+        # failed partial styles have no text to contribute
         combined_style = self._handle_combined_style(
-            author_style_id, partial_styles, caller
+            author_style_id, [s for s in partial_styles if s["token"] > 0], caller
         )
 
         structured_style = self._handle_structured_style(combined_style, caller)
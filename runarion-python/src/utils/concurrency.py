@@ -0,0 +1,134 @@
+"""
+Bounded-concurrency helper for fanning independent LLM calls out to threads.
+
+Provides run_bounded(), which applies a function to every item with at most
+``max_workers`` threads and returns the results in input order. Pipeline
+stages use it for per-chunk / per-scene / per-chapter work whose items do not
+depend on each other.
+
+Usage:
+    from src.utils.concurrency import run_bounded
+
+    results = run_bounded(
+        lambda chunk, worker: (worker or self)._clean_chunk_task(chunk),
+        chunks,
+        max_workers=4,
+        worker_state_factory=self._fork_for_worker,
+    )
+
+Notes:
+    - With ``max_workers <= 1`` (or a single item) everything runs inline in
+      the calling thread and ``worker_state_factory`` is never invoked, so the
+      sequential path behaves exactly like a plain ``for`` loop.
+    - Providers log through ``flask.current_app``; the caller's app context
+      (if any) is pushed inside every worker task, and the caller's LLM
+      rate-limit priority is carried over to the workers.
+    - ``worker_state_factory`` is called lazily, once per worker thread. Use it
+      for per-thread resources that must not be shared, such as a stage copy
+      owning its own GenerationEngine (whose request is mutated per call).
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Any, Callable, List, Optional, Sequence
+
+from flask import current_app, has_app_context
+
+from src.utils.rate_limiter import current_priority, llm_priority
+
+logger = logging.getLogger(__name__)
+
+
+def run_bounded(
+    func: Callable,
+    items: Sequence[Any],
+    max_workers: int,
+    *,
+    worker_state_factory: Optional[Callable[[], Any]] = None,
+    on_result: Optional[Callable[[int, Any], None]] = None,
+    thread_name_prefix: str = "runarion-worker",
+    cancel_on_error: bool = False,
+) -> List[Any]:
+    """
+    Apply func to every item with bounded concurrency, preserving input order.
+
+    Args:
+        func:                 Callable invoked as ``func(item)``, or
+                              ``func(item, state)`` when worker_state_factory
+                              is given (state is None on the inline path).
+        items:                Items to process.
+        max_workers:          Upper bound on concurrent worker threads.
+        worker_state_factory: Optional zero-argument callable producing
+                              per-thread state (created once per worker).
+        on_result:            Optional callback ``on_result(index, result)``
+                              invoked in the calling thread as each item
+                              completes (completion order, not input order).
+        thread_name_prefix:   Prefix for worker thread names (log readability).
+        cancel_on_error:      Cancel the items not yet started once one item
+                              raises, as the inline path stops at the first
+                              error. Use when any error fails the whole call.
+
+    Returns:
+        List of results aligned with ``items``.
+
+    Raises:
+        The first exception raised by func (in input order), after all
+        submitted work has finished (or been cancelled, with cancel_on_error).
+        Callers that need per-item fallback should catch inside func.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    with_state = worker_state_factory is not None
+
+    if max_workers <= 1 or len(items) == 1:
+        results = []
+        for index, item in enumerate(items):
+            result = func(item, None) if with_state else func(item)
+            if on_result:
+                on_result(index, result)
+            results.append(result)
+        return results
+
+    app = current_app._get_current_object() if has_app_context() else None
+    priority = current_priority()
+    local = threading.local()
+
+    def _task(item):
+        with app.app_context() if app is not None else nullcontext(), llm_priority(priority):
+            if not with_state:
+                return func(item)
+            if not hasattr(local, "state"):
+                local.state = worker_state_factory()
+            return func(item, local.state)
+
+    workers = min(max_workers, len(items))
+    results: List[Any] = [None] * len(items)
+    errors: dict = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as executor:
+        futures = {executor.submit(_task, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            index = futures[future]
+            if future.cancelled():
+                continue
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                errors[index] = e
+                if cancel_on_error:
+                    for pending in futures:
+                        pending.cancel()
+                continue
+            if on_result:
+                on_result(index, results[index])
+
+    if errors:
+        first_index = min(errors)
+        logger.error(f"run_bounded: {len(errors)}/{len(items)} item(s) raised; first at index {first_index}")
+        raise errors[first_index]
+
+    return results
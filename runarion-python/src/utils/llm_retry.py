@@ -10,7 +10,7 @@ Usage:
     from src.utils.llm_retry import call_llm_with_retry
 
     response = call_llm_with_retry(
-        lambda: self.generation_engine.generate(skip_quota=True)
+        lambda: self.generation_engine.generate(skip_quota=True, defer_quota=True)
     )
 
 The wrapper is transparent to the caller — it always returns a
@@ -20,10 +20,11 @@ logic in each stage are completely unaffected.
 
 import logging
 import random
-import re
 import time
 from typing import Callable
 
+from src.utils.rate_limiter import get_rate_limiter, is_rate_limit_error, parse_retry_after
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -62,9 +63,8 @@ def _parse_retry_after(error_message: str, cap: float) -> float:
     Returns the prescribed value + 2s safety margin, capped at cap.
     Returns 0.0 if no hint found.
     """
-    match = re.search(r'retry in ([\d.]+)s', str(error_message))
-    if match:
-        prescribed = float(match.group(1))
+    prescribed = parse_retry_after(error_message)
+    if prescribed > 0:
         return min(prescribed + 2.0, cap)
     return 0.0
 
@@ -109,6 +109,11 @@ def call_llm_with_retry(
           attempt — no unnecessary delay.
         - Gemini's "Please retry in Xs." hint is honoured for 429 responses
           and takes precedence over the exponential-backoff calculation.
+        - While the process-wide rate limiter is enabled, 429 retries only
+          sleep the jitter: GenerationEngine has already paused the key's
+          bucket for the prescribed window (or, without a hint, for a pause
+          that doubles with each consecutive 429 on the key), and the retry
+          waits there.
         - If generate_fn() raises an exception (which providers normally
           don't — they return error responses), the exception propagates
           unchanged so nothing is silently swallowed.
@@ -139,7 +144,10 @@ def call_llm_with_retry(
 
         # Calculate sleep duration
         prescribed = _parse_retry_after(error_msg, max_delay)
-        if prescribed > 0:
+        if is_rate_limit_error(error_msg) and get_rate_limiter().enabled:
+            # The engine paused this key's bucket; the retry waits in the limiter
+            sleep_secs = 0.0
+        elif prescribed > 0:
             sleep_secs = prescribed
         else:
             sleep_secs = min(base_delay * (2 ** attempt), max_delay)
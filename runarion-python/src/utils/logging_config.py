@@ -9,6 +9,8 @@ import sys
 from datetime import datetime, timezone
 from typing import Dict, Any
 
+from src.utils.progress_events import publish_progress
+
 
 class StructuredFormatter(logging.Formatter):
     """
@@ -60,6 +62,9 @@ class StructuredFormatter(logging.Formatter):
 class PipelineLogger:
     """
     Specialized logger for pipeline operations with structured context.
+
+    Stage and pipeline lifecycle events are also published to the progress
+    event bus under the draft id, for the progress streaming endpoints.
     """
     
     def __init__(self, logger_name: str):
@@ -108,6 +113,7 @@ class PipelineLogger:
             draft_id=draft_id,
             **kwargs
         )
+        publish_progress(draft_id, "stage_start", stage_name=stage_name, **kwargs)
     
     def stage_complete(self, stage_name: str, draft_id: str, duration_seconds: float = None, **kwargs):
         """Log stage completion with standardized format."""
@@ -119,6 +125,7 @@ class PipelineLogger:
             duration_seconds=duration_seconds,
             **kwargs
         )
+        publish_progress(draft_id, "stage_complete", stage_name=stage_name, duration_seconds=duration_seconds, **kwargs)
     
     def stage_retry(self, stage_name: str, draft_id: str, attempt: int, max_attempts: int, error: str = None, **kwargs):
         """Log stage retry with standardized format."""
@@ -132,6 +139,7 @@ class PipelineLogger:
             error=error,
             **kwargs
         )
+        publish_progress(draft_id, "stage_retry", stage_name=stage_name, attempt=attempt, max_attempts=max_attempts, error=error, **kwargs)
     
     def stage_failed(self, stage_name: str, draft_id: str, error: str = None, **kwargs):
         """Log stage failure with standardized format."""
@@ -143,6 +151,7 @@ class PipelineLogger:
             error=error,
             **kwargs
         )
+        publish_progress(draft_id, "stage_failed", stage_name=stage_name, error=error, **kwargs)
     
     def pipeline_start(self, draft_id: str, **kwargs):
         """Log pipeline start with standardized format."""
@@ -152,6 +161,7 @@ class PipelineLogger:
             draft_id=draft_id,
             **kwargs
         )
+        publish_progress(draft_id, "pipeline_start", **kwargs)
     
     def pipeline_complete(self, draft_id: str, duration_seconds: float = None, **kwargs):
         """Log pipeline completion with standardized format."""
@@ -162,6 +172,7 @@ class PipelineLogger:
             duration_seconds=duration_seconds,
             **kwargs
         )
+        publish_progress(draft_id, "pipeline_complete", duration_seconds=duration_seconds, **kwargs)
     
     def pipeline_failed(self, draft_id: str, error: str = None, **kwargs):
         """Log pipeline failure with standardized format."""
@@ -172,6 +183,7 @@ class PipelineLogger:
             error=error,
             **kwargs
         )
+        publish_progress(draft_id, "pipeline_failed", error=error, **kwargs)
 
 
 def configure_logging(log_level: str = "INFO", output_format: str = "structured"):
@@ -0,0 +1,438 @@
+"""
+Push-based pipeline progress events.
+
+PipelineLogger and the pipeline orchestrators publish stage, status and
+per-item progress events keyed by run (draft id or pipeline run id); the
+Server-Sent Events endpoints subscribe to the runs they stream.
+
+Events are delivered to subscribers in the publishing process immediately.
+Once attach_database() is called they are also relayed to the other service
+processes through Postgres NOTIFY on PROGRESS_CHANNEL, so a browser
+connected to one gunicorn worker sees a pipeline running in another.
+
+Usage:
+    from src.utils.progress_events import publish_progress, get_progress_bus
+
+    publish_progress(draft_id, 'item_progress', stage_name='cleaning', completed=3, total=40)
+
+    subscription = get_progress_bus().subscribe([draft_id])
+    event = subscription.get(timeout=15)
+"""
+
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from flask import Response, stream_with_context
+
+from src.utils.api_response import error
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_CHANNEL = 'pipeline_progress'
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+
+class ProgressSubscription:
+    """Queue of events for a set of runs, consumed by one stream."""
+
+    # Events buffered for a slow consumer before the oldest are dropped
+    QUEUE_SIZE = 500
+
+    def __init__(self, run_keys: Iterable[str]):
+        self.run_keys = {str(key) for key in run_keys if key}
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.QUEUE_SIZE)
+
+    def put(self, event: Dict[str, Any]) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if none arrived within timeout seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ProgressEventBus:
+    """In-process publish/subscribe of pipeline progress, optionally relayed via LISTEN/NOTIFY."""
+
+    # Recent events kept per run and replayed to new subscribers
+    REPLAY_EVENTS = int(os.getenv('PROGRESS_REPLAY_EVENTS', '20'))
+    # Runs whose recent events are kept (least recently published evicted first)
+    MAX_TRACKED_RUNS = int(os.getenv('PROGRESS_MAX_TRACKED_RUNS', '256'))
+    # Concurrent SSE streams per process; each one holds a server thread
+    MAX_STREAMS = int(os.getenv('PROGRESS_MAX_STREAMS', '4'))
+
+    def __init__(self):
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, List[ProgressSubscription]] = {}
+        self._recent: "OrderedDict[str, deque]" = OrderedDict()
+        self._stream_slots = threading.BoundedSemaphore(max(1, self.MAX_STREAMS))
+        self._db_pool = None
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {'published': 0, 'relayed': 0, 'notify_failures': 0}
+
+    def publish(self, run_key: str, event_type: str, **data) -> Dict[str, Any]:
+        """
+        Publish an event for a run.
+
+        Args:
+            run_key: Draft id or pipeline run id
+            event_type: Event name (stage_start, stage_complete, item_progress, status, ...)
+            **data: JSON-serializable event fields
+
+        Returns:
+            The published event
+        """
+        event = {
+            'run_key': str(run_key),
+            'event': event_type,
+            'timestamp': progress_timestamp(),
+            **data,
+        }
+        self._deliver(event)
+        with self._lock:
+            self._stats['published'] += 1
+        if self._db_pool is not None:
+            self._notify(event)
+        return event
+
+    def subscribe(self, run_keys: Iterable[str], replay: bool = True,
+                  replay_filter: Optional[Callable[[Dict[str, Any]], bool]] = None) -> ProgressSubscription:
+        """
+        Subscribe to the events of one or more runs.
+
+        Args:
+            run_keys: Draft ids / pipeline run ids
+            replay: Queue the run's recent events first
+            replay_filter: Keeps a recent event in the replay when true
+
+        Returns:
+            Subscription; call unsubscribe() when done
+        """
+        subscription = ProgressSubscription(run_keys)
+        with self._lock:
+            backlog = []
+            for key in subscription.run_keys:
+                self._subscriptions.setdefault(key, []).append(subscription)
+                if replay and key in self._recent:
+                    backlog.extend(self._recent[key])
+        for event in sorted(backlog, key=lambda e: e['timestamp']):
+            if replay_filter is None or replay_filter(event):
+                subscription.put(event)
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        with self._lock:
+            for key in subscription.run_keys:
+                subscribers = self._subscriptions.get(key, [])
+                if subscription in subscribers:
+                    subscribers.remove(subscription)
+                if not subscribers:
+                    self._subscriptions.pop(key, None)
+
+    def acquire_stream_slot(self) -> bool:
+        """Reserve one of MAX_STREAMS stream slots; False if all are in use."""
+        return self._stream_slots.acquire(blocking=False)
+
+    def release_stream_slot(self) -> None:
+        self._stream_slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                'subscriptions': sum(len(subs) for subs in self._subscriptions.values()),
+                'tracked_runs': len(self._recent),
+            }
+
+    def attach_database(self, db_pool, connect: Callable[[], Any]) -> None:
+        """
+        Relay events between processes through Postgres LISTEN/NOTIFY.
+
+        Args:
+            db_pool: Pool used to send NOTIFY
+            connect: Factory for the dedicated (unpooled) LISTEN connection
+        """
+        self._db_pool = db_pool
+        if self._listener is None:
+            self._listener = threading.Thread(
+                target=self._listen_loop, args=(connect,), name="progress-listener", daemon=True
+            )
+            self._listener.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        key = event['run_key']
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is None:
+                recent = self._recent[key] = deque(maxlen=self.REPLAY_EVENTS)
+                while len(self._recent) > self.MAX_TRACKED_RUNS:
+                    self._recent.popitem(last=False)
+            else:
+                self._recent.move_to_end(key)
+            recent.append(event)
+            subscribers = list(self._subscriptions.get(key, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def _notify(self, event: Dict[str, Any]) -> None:
+        payload = json.dumps({**event, 'origin': self.origin}, default=str, separators=(',', ':'))
+        if len(payload.encode('utf-8')) > MAX_NOTIFY_PAYLOAD_BYTES:
+            essentials = {k: event[k] for k in ('run_key', 'event', 'timestamp', 'status', 'stage_name') if k in event}
+            payload = json.dumps({**essentials, 'truncated': True, 'origin': self.origin}, default=str)
+
+        conn = None
+        try:
+            conn = self._db_pool.getconn()
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", (PROGRESS_CHANNEL, payload))
+            conn.commit()
+        except Exception as e:
+            with self._lock:
+                self._stats['notify_failures'] += 1
+            logger.debug(f"Could not relay progress event: {e}")
+            if conn is not None:
+                conn.rollback()
+        finally:
+            if conn is not None:
+                self._db_pool.putconn(conn)
+
+    def _listen_loop(self, connect: Callable[[], Any]) -> None:
+        delay = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = connect()
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {PROGRESS_CHANNEL}")
+                logger.info(f"Listening for pipeline progress on channel {PROGRESS_CHANNEL}")
+                delay = 1.0
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._relay(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Progress listener disconnected: {e}; reconnecting in {delay:.0f}s")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _relay(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            return
+        if event.pop('origin', None) == self.origin or 'run_key' not in event:
+            return
+        with self._lock:
+            self._stats['relayed'] += 1
+        self._deliver(event)
+
+
+def progress_timestamp() -> str:
+    """Current time in the format of event timestamps."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+_progress_bus: Optional[ProgressEventBus] = None
+_progress_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressEventBus:
+    """Return the process-wide progress event bus."""
+    global _progress_bus
+    with _progress_bus_lock:
+        if _progress_bus is None:
+            _progress_bus = ProgressEventBus()
+        return _progress_bus
+
+
+def publish_progress(run_key: Optional[str], event_type: str, **data) -> None:
+    """Publish a progress event; never raises into the pipeline."""
+    if not run_key:
+        return
+    try:
+        get_progress_bus().publish(run_key, event_type, **data)
+    except Exception as e:
+        logger.debug(f"Dropped progress event {event_type} for {run_key}: {e}")
+
+
+class ItemProgress:
+    """
+    Thread-safe per-item progress counter for one stage.
+
+    Publishes item_progress for the first item, then at most every
+    MIN_INTERVAL_SECONDS (and always for the last item), so large stages do
+    not flood subscribers.
+    """
+
+    MIN_INTERVAL_SECONDS = float(os.getenv('PROGRESS_MIN_INTERVAL_SECONDS', '0.5'))
+
+    def __init__(self, run_key: Optional[str], stage_name: str, total: int):
+        self.run_key = run_key
+        self.stage_name = stage_name
+        self.total = total
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._last_published: Optional[float] = None
+
+    def advance(self, count: int = 1, **data) -> None:
+        """Record count finished items."""
+        with self._lock:
+            self.completed += count
+            now = time.monotonic()
+            if (self.completed < self.total and self._last_published is not None
+                    and now - self._last_published < self.MIN_INTERVAL_SECONDS):
+                return
+            self._last_published = now
+            completed = self.completed
+        publish_progress(
+            self.run_key, 'item_progress',
+            stage_name=self.stage_name, completed=completed, total=self.total, **data
+        )
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an event as a Server-Sent Events message."""
+    data = json.dumps(event, default=str, separators=(',', ':'))
+    return f"event: {event.get('event', 'message')}\ndata: {data}\n\n"
+
+
+def stream_progress(run_keys: Iterable[str], initial_events: Iterable[Dict[str, Any]] = (),
+                    is_terminal: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                    heartbeat_seconds: float = 15.0,
+                    max_seconds: Optional[float] = None) -> Iterator[str]:
+    """
+    Generate an SSE stream of a run's progress events.
+
+    The stream ends after an event for which is_terminal() is true, or after
+    max_seconds (PROGRESS_STREAM_MAX_SECONDS); clients reconnect per the
+    EventSource retry hint.
+
+    Runs are keyed by draft id, which retries and resumes reuse, so the
+    replayed recent events can include the terminal event of an earlier
+    attempt. Snapshot events should carry the 'timestamp' taken before their
+    state was read; terminal events older than the newest snapshot are left
+    out of the replay, as the snapshot already supersedes them.
+
+    Args:
+        run_keys: Runs to stream
+        initial_events: Snapshot events sent first (e.g. current status)
+        is_terminal: Predicate ending the stream
+        heartbeat_seconds: Idle interval between keep-alive comments
+        max_seconds: Maximum stream duration
+
+    Yields:
+        SSE-formatted strings
+    """
+    bus = get_progress_bus()
+    if max_seconds is None:
+        max_seconds = float(os.getenv('PROGRESS_STREAM_MAX_SECONDS', '600'))
+    initial_events = list(initial_events)
+    snapshot_times = [t for t in (_parse_timestamp(e.get('timestamp')) for e in initial_events) if t]
+    replay_filter = None
+    if is_terminal and snapshot_times:
+        snapshot_time = max(snapshot_times)
+
+        def replay_filter(event: Dict[str, Any]) -> bool:
+            if not is_terminal(event):
+                return True
+            event_time = _parse_timestamp(event.get('timestamp'))
+            return event_time is None or event_time > snapshot_time
+
+    subscription = bus.subscribe(run_keys, replay_filter=replay_filter)
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield "retry: 3000\n\n"
+        for event in initial_events:
+            yield format_sse(event)
+            if is_terminal and is_terminal(event):
+                return
+
+        while time.monotonic() < deadline:
+            event = subscription.get(timeout=heartbeat_seconds)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+            if is_terminal and is_terminal(event):
+                return
+    finally:
+        bus.unsubscribe(subscription)
+
+
+def progress_stream_response(run_keys: Iterable[str], initial_events: Iterable[Dict[str, Any]] = (),
+                             is_terminal: Optional[Callable[[Dict[str, Any]], bool]] = None):
+    """
+    Flask response streaming a run's progress events.
+
+    Each open stream holds a server thread, so streams are capped at
+    ProgressEventBus.MAX_STREAMS per process; beyond that the client gets
+    a 503 with Retry-After and should fall back to the status endpoint.
+
+    Args:
+        run_keys: Runs to stream
+        initial_events: Snapshot events sent first
+        is_terminal: Predicate ending the stream
+
+    Returns:
+        Streaming text/event-stream response, or an error response tuple
+    """
+    bus = get_progress_bus()
+    if not bus.acquire_stream_slot():
+        response, status_code = error(
+            'Too many progress streams open; poll the status endpoint or retry shortly',
+            error_code='STREAM_LIMIT_REACHED',
+            status_code=503
+        )
+        response.headers['Retry-After'] = '10'
+        return response, status_code
+
+    response = Response(
+        stream_with_context(stream_progress(run_keys, list(initial_events), is_terminal)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+    # Runs when the stream ends or the client disconnects
+    response.call_on_close(bus.release_stream_slot)
+    return response
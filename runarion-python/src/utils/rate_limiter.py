@@ -0,0 +1,393 @@
+"""
+Process-wide, provider-aware LLM rate limiter.
+
+Every LLM call made through GenerationEngine (and the advisor's direct
+Gemini client) first takes a request and its estimated tokens from a token
+bucket keyed by (provider, model, API key). Buckets refill continuously at
+the provider's requests-per-minute / tokens-per-minute limits
+(ProviderRateLimitConfig), so concurrent pipeline workers, auditor fan-outs
+and user requests share one budget instead of each backing off blindly when
+the provider starts returning 429s.
+
+Callers wait in priority order: an INTERACTIVE call (editor generation,
+advisor chat) always goes ahead of queued BATCH calls (deconstructor and
+novel pipelines, analyses), and BATCH calls leave BATCH_RESERVE of each
+bucket untouched so interactive calls rarely wait at all.
+
+After the call the reservation is settled: the token estimate is replaced by
+the provider-reported usage, and a rate-limit error pauses the whole bucket
+for the server-prescribed window (without one, for a pause that doubles
+with each consecutive rate-limit error on the key), so retries wait here
+instead of sleeping in every caller.
+
+Usage:
+    from src.utils.rate_limiter import get_rate_limiter
+
+    reservation = get_rate_limiter().acquire(provider, model, api_key, tokens=estimated)
+    response = provider.generate()
+    reservation.settle(response)
+
+Notes:
+    - Limits are per process; with several gunicorn workers set the
+      LLM_RATE_LIMIT_<PROVIDER>_RPM/_TPM overrides to the provider quota
+      divided by the worker count.
+    - Priority comes from llm_priority() when set, then from the request
+      (set_request_priority() in a blueprint's before_request hook), and is
+      BATCH otherwise. run_bounded() carries the caller's priority into its
+      worker threads.
+    - A call that has waited MAX_WAIT_SECONDS proceeds anyway; the provider's
+      own 429 handling is the backstop.
+"""
+
+import hashlib
+import heapq
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Dict, Optional, Tuple
+
+from flask import g, has_app_context
+
+from src.config.provider_config import ProviderRateLimitConfig
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: ContextVar[Optional[Priority]] = ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """Run the enclosed LLM calls (in this thread/context) with the given priority."""
+    token = _priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def set_request_priority(priority: Priority):
+    """Set the priority of every LLM call made while handling the current request."""
+    g.llm_priority = Priority(priority)
+
+
+def current_priority() -> Priority:
+    """Resolve the priority of an LLM call made from the current context."""
+    priority = _priority.get()
+    if priority is not None:
+        return priority
+    if has_app_context():
+        priority = g.get("llm_priority")
+        if priority is not None:
+            return priority
+    return Priority.BATCH
+
+
+# Signals of a provider rate-limit (not overload) error, matched case-insensitively
+_RATE_LIMIT_SIGNALS = (
+    '429',
+    'resource_exhausted',
+    'rate limit',
+    'rate_limit',
+    'too many requests',
+)
+
+
+def is_rate_limit_error(error_message: str) -> bool:
+    """Return True if the error message is a provider rate-limit response."""
+    lowered = (error_message or '').lower()
+    return any(signal in lowered for signal in _RATE_LIMIT_SIGNALS)
+
+
+def parse_retry_after(error_message: str) -> float:
+    """
+    Extract the server-prescribed retry delay from a rate-limit message.
+
+    Gemini embeds a human-readable delay, e.g. "Please retry in 38.06s."
+    Returns 0.0 if no hint is found.
+    """
+    match = re.search(r'retry in ([\d.]+)s', str(error_message))
+    return float(match.group(1)) if match else 0.0
+
+
+class _Bucket:
+    """Request and token buckets of one (provider, model, API key)."""
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int], now: float):
+        self.capacity = {name: limit for name, limit in (('requests', rpm), ('tokens', tpm)) if limit}
+        self.levels = {name: float(limit) for name, limit in self.capacity.items()}
+        self.updated = now
+        self.paused_until = 0.0
+        self.consecutive_rate_limits = 0
+        self.waiters: list = []
+
+    def refill(self, now: float):
+        elapsed = max(0.0, now - self.updated)
+        for name, capacity in self.capacity.items():
+            self.levels[name] = min(capacity, self.levels[name] + capacity * elapsed / 60.0)
+        self.updated = now
+
+    def wait_seconds(self, now: float, cost: Dict[str, float], reserve: float) -> float:
+        """Seconds until cost can be taken while leaving reserve of each bucket."""
+        wait = max(0.0, self.paused_until - now)
+        for name, capacity in self.capacity.items():
+            # Costs above what the bucket can ever hold only need a full bucket
+            need = min(cost[name], capacity * (1.0 - reserve)) + capacity * reserve
+            if self.levels[name] < need:
+                wait = max(wait, (need - self.levels[name]) * 60.0 / capacity)
+        return wait
+
+    def take(self, cost: Dict[str, float]):
+        for name in self.capacity:
+            self.levels[name] -= cost[name]
+
+    def credit(self, tokens: float):
+        if 'tokens' in self.capacity:
+            self.levels['tokens'] = min(self.capacity['tokens'], self.levels['tokens'] + tokens)
+
+
+class RateLimitReservation:
+    """
+    Capacity taken for one LLM call; settle() it once the call has finished.
+    """
+
+    def __init__(self, limiter: Optional["RateLimiter"], key: Optional[Tuple], tokens: int):
+        self.limiter = limiter
+        self.key = key
+        self.tokens = tokens
+        self.settled = False
+
+    def settle(self, response: Any = None, *, actual_tokens: Optional[int] = None,
+               error_message: Optional[str] = None):
+        """
+        Reconcile the reservation with the outcome of the call.
+
+        Args:
+            response: BaseGenerationResponse of the call, if any
+            actual_tokens: Tokens the call used, when there is no response metadata
+            error_message: Error of the call, when there is no response
+        """
+        if self.settled or self.limiter is None:
+            return
+        self.settled = True
+
+        if response is not None:
+            if not getattr(response, 'success', True):
+                error_message = getattr(response, 'error_message', None) or 'error'
+            elif actual_tokens is None:
+                metadata = getattr(response, 'metadata', None)
+                actual_tokens = getattr(metadata, 'total_tokens', None) or None
+
+        if error_message:
+            # Failed calls are not billed tokens, but rate-limit errors pause the key
+            self.limiter._settle(self.key, self.tokens, error_message=error_message)
+        else:
+            self.limiter._settle(self.key, self.tokens - actual_tokens if actual_tokens else 0.0)
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter shared by every LLM call in the process.
+    """
+
+    ENABLED = os.getenv('LLM_RATE_LIMITING', 'true').lower() not in ('0', 'false', 'no')
+
+    # Share of each bucket only INTERACTIVE calls may use
+    BATCH_RESERVE = float(os.getenv('LLM_RATE_LIMIT_BATCH_RESERVE', '0.2'))
+
+    # Longest a call waits for capacity before going ahead anyway
+    MAX_WAIT_SECONDS = float(os.getenv('LLM_RATE_LIMIT_MAX_WAIT_SECONDS', '300'))
+
+    # Bucket pause after a rate-limit error without a retry hint; doubles with
+    # each further rate-limit error in a row on the key, up to MAX_PAUSE_SECONDS
+    DEFAULT_PAUSE_SECONDS = float(os.getenv('LLM_RATE_LIMIT_PAUSE_SECONDS', '10'))
+    MAX_PAUSE_SECONDS = float(os.getenv('LLM_RATE_LIMIT_MAX_PAUSE_SECONDS', '120'))
+
+    def __init__(self, enabled: Optional[bool] = None, batch_reserve: Optional[float] = None):
+        self.enabled = self.ENABLED if enabled is None else enabled
+        self.batch_reserve = min(0.9, max(0.0, self.BATCH_RESERVE if batch_reserve is None else batch_reserve))
+        self._buckets: Dict[Tuple, _Bucket] = {}
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+        self._token_counters: Dict[Tuple[str, str], Any] = {}
+        self._stats = {
+            'acquired': 0,
+            'waited': 0,
+            'wait_seconds': 0.0,
+            'timed_out': 0,
+            'rate_limit_errors': 0,
+        }
+
+    @staticmethod
+    def bucket_key(provider: str, model: Optional[str], api_key: Optional[str]) -> Tuple[str, str, str]:
+        """Bucket key for a call; API keys are kept as a short digest."""
+        key_digest = hashlib.sha256(api_key.encode()).hexdigest()[:12] if api_key else ''
+        return ((provider or '').lower(), model or '', key_digest)
+
+    def limits_tokens(self, provider: str) -> bool:
+        """Whether calls to provider need a token estimate."""
+        return self.enabled and ProviderRateLimitConfig.get_limits(provider)[1] is not None
+
+    def count_tokens(self, provider: str, model: Optional[str], text: str) -> int:
+        """Count tokens of text with a TokenCounter cached per (provider, model)."""
+        if not text:
+            return 0
+        key = ((provider or '').lower(), model or '')
+        counter = self._token_counters.get(key)
+        if counter is None:
+            from src.utils.token_counter import TokenCounter
+
+            counter = TokenCounter(key[0], key[1])
+            self._token_counters[key] = counter
+        return counter.safe_count(text)
+
+    def acquire(self, provider: str, model: Optional[str], api_key: Optional[str], tokens: int = 0,
+                priority: Optional[Priority] = None) -> RateLimitReservation:
+        """
+        Wait until the key's buckets can take one request and tokens.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            api_key: API key the call is made with
+            tokens: Estimated input + output tokens of the call
+            priority: Scheduling class (defaults to current_priority())
+
+        Returns:
+            RateLimitReservation to settle after the call
+        """
+        if not self.enabled:
+            return RateLimitReservation(None, None, 0)
+
+        priority = current_priority() if priority is None else Priority(priority)
+        reserve = self.batch_reserve if priority == Priority.BATCH else 0.0
+        key = self.bucket_key(provider, model, api_key)
+        cost = {'requests': 1.0, 'tokens': float(max(0, tokens))}
+
+        with self._cond:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rpm, tpm = ProviderRateLimitConfig.get_limits(key[0])
+                bucket = _Bucket(rpm, tpm, time.monotonic())
+                self._buckets[key] = bucket
+
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(bucket.waiters, ticket)
+            started = time.monotonic()
+            deadline = started + self.MAX_WAIT_SECONDS
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    # Only the longest-waiting call of the highest priority may take capacity
+                    wait = bucket.wait_seconds(now, cost, reserve) if bucket.waiters[0] == ticket else 1.0
+                    if bucket.waiters[0] == ticket and wait <= 0:
+                        break
+                    if now >= deadline:
+                        self._stats['timed_out'] += 1
+                        logger.warning(
+                            f"Rate limiter wait for {key[0]}/{key[1]} exceeded {self.MAX_WAIT_SECONDS:.0f}s; proceeding"
+                        )
+                        break
+                    self._cond.wait(min(wait, deadline - now))
+                bucket.take(cost)
+            finally:
+                bucket.waiters.remove(ticket)
+                heapq.heapify(bucket.waiters)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            self._stats['acquired'] += 1
+            if waited > 0.01:
+                self._stats['waited'] += 1
+                self._stats['wait_seconds'] += waited
+
+        if waited > 1.0:
+            logger.info(f"Rate limiter held {priority.name.lower()} call to {key[0]}/{key[1]} for {waited:.1f}s")
+        return RateLimitReservation(self, key, int(cost['tokens']))
+
+    def penalize(self, key: Tuple, seconds: float):
+        """Pause a bucket, e.g. for a provider's prescribed retry window."""
+        with self._cond:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.paused_until = max(bucket.paused_until, time.monotonic() + seconds)
+                self._cond.notify_all()
+
+    def _hintless_pause(self, key: Tuple) -> float:
+        """Count a rate-limit error on key and return its backoff pause (caller holds _cond)."""
+        bucket = self._buckets.get(key)
+        streak = 1
+        if bucket is not None:
+            bucket.consecutive_rate_limits += 1
+            streak = bucket.consecutive_rate_limits
+        return min(self.DEFAULT_PAUSE_SECONDS * 2 ** min(streak - 1, 16), self.MAX_PAUSE_SECONDS)
+
+    def _settle(self, key: Tuple, token_refund: float, error_message: Optional[str] = None):
+        if error_message and is_rate_limit_error(error_message):
+            with self._cond:
+                self._stats['rate_limit_errors'] += 1
+                backoff = self._hintless_pause(key)
+            # A server-prescribed window wins; otherwise back off exponentially
+            pause = min(parse_retry_after(error_message) or backoff, self.MAX_WAIT_SECONDS)
+            logger.warning(f"Rate limit hit for {key[0]}/{key[1]}; pausing its calls for {pause:.1f}s")
+            self.penalize(key, pause)
+        elif not error_message:
+            with self._cond:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.consecutive_rate_limits = 0
+        if token_refund:
+            with self._cond:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.refill(time.monotonic())
+                    bucket.credit(token_refund)
+                    self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and per-key bucket levels for metrics endpoints."""
+        with self._cond:
+            now = time.monotonic()
+            buckets = {}
+            for (provider, model, key_digest), bucket in self._buckets.items():
+                bucket.refill(now)
+                buckets[f"{provider}/{model}/{key_digest or '-'}"] = {
+                    **{f"{name}_available": int(level) for name, level in bucket.levels.items()},
+                    **{f"{name}_per_minute": capacity for name, capacity in bucket.capacity.items()},
+                    'waiting': len(bucket.waiters),
+                    'paused_seconds': round(max(0.0, bucket.paused_until - now), 1),
+                }
+            return {
+                'enabled': self.enabled,
+                'batch_reserve': self.batch_reserve,
+                **self._stats,
+                'wait_seconds': round(self._stats['wait_seconds'], 2),
+                'buckets': buckets,
+            }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide RateLimiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,87 @@
+"""
+Integration tests for GraphDatabaseService bulk writes against a real
+Postgres + Apache AGE database.
+
+Verifies that the UNWIND statements themselves (not the per-row fallback)
+match relationship endpoints by name, and that unmatched endpoints come back
+as None. Skipped when the database from .env is unreachable or lacks AGE.
+"""
+
+import logging
+import os
+
+import pytest
+import ulid
+from dotenv import load_dotenv
+from psycopg2 import pool
+
+from src.services.graph_database_service import GraphDatabaseNotAvailableError, GraphDatabaseService
+
+pytestmark = [pytest.mark.integration, pytest.mark.database]
+
+
+@pytest.fixture
+def graph_service():
+    """GraphDatabaseService on the configured database, or skip."""
+    load_dotenv()
+    try:
+        db_pool = pool.ThreadedConnectionPool(
+            minconn=1,
+            maxconn=5,
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=os.getenv('DB_PORT', '5432'),
+            database=os.getenv('DB_DATABASE', 'runarion'),
+            user=os.getenv('DB_USER', 'postgres'),
+            password=os.getenv('DB_PASSWORD', 'postgres'),
+            connect_timeout=3,
+        )
+    except Exception as e:
+        pytest.skip(f"Postgres not available: {e}")
+
+    try:
+        service = GraphDatabaseService(db_pool)
+    except GraphDatabaseNotAvailableError as e:
+        db_pool.closeall()
+        pytest.skip(f"Apache AGE not available: {e}")
+
+    yield service
+    db_pool.closeall()
+
+
+@pytest.fixture
+def draft_id(graph_service):
+    draft_id = str(ulid.ULID())
+    yield draft_id
+    graph_service.cleanup_draft_data(draft_id)
+
+
+def test_bulk_relationships_match_endpoints_by_name(graph_service, draft_id, caplog):
+    caplog.set_level(logging.WARNING, logger="src.services.graph_database_service")
+    vertices = [
+        {'name': "Mara O'Neil", 'entity_type': 'Character', 'properties': {'role': 'lead'}},
+        {'name': 'Jun', 'entity_type': 'Character'},
+        {'name': 'Harbor', 'entity_type': 'Location'},
+    ]
+    relationships = [
+        {'source': "Mara O'Neil", 'target': 'Jun', 'relationship_type': 'distrusts',
+         'properties': {'context': 'docks', 'emotional_tone': 'tense'}},
+        {'source': 'Jun', 'target': 'Harbor', 'relationship_type': 'visits', 'scene_id': 4},
+        {'source': 'Jun', 'target': 'Ghost', 'relationship_type': 'haunts'},
+    ]
+
+    vertex_ids, edge_ids = graph_service.store_graph_batch(
+        draft_id, vertices=vertices, relationships=relationships
+    )
+
+    assert None not in vertex_ids
+    assert edge_ids[0] is not None and edge_ids[1] is not None
+    assert edge_ids[2] is None
+    # The UNWIND statements matched on their own; nothing fell back to per-row writes
+    assert "AGE bulk statement failed" not in caplog.text
+    assert "No edge created for Jun -haunts-> Ghost" in caplog.text
+
+    edges = {
+        (edge['source'], edge['relationship_type'], edge['target'])
+        for edge in graph_service.get_draft_relationships(draft_id)
+    }
+    assert edges == {("Mara O'Neil", 'DISTRUSTS', 'Jun'), ('Jun', 'VISITS', 'Harbor')}
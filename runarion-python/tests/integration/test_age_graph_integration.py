@@ -13,6 +13,7 @@ AGE-First Architecture:
 
 import sys
 import os
+import time
 import ulid
 import json
 from datetime import datetime
@@ -176,6 +177,7 @@ class AgeGraphIntegrationTest:
             print(f"   Graph Name: {status.get('graph_name')}")
             print(f"   Graph Exists: {status.get('graph_exists')}")
             print(f"   Status: {status.get('status')}")
+            print(f"   Session Pool: {status.get('session_pool')}")
             
             assert status.get('age_available') == True, "AGE must be available"
             assert status.get('status') == 'healthy', "Service must be healthy"
@@ -265,6 +267,88 @@ class AgeGraphIntegrationTest:
             print(f"✗ AGE relationship creation failed: {e}")
             return False
     
+    def test_bulk_write_benchmark(self, entity_count: int = 300):
+        """Benchmark per-item AGE writes against store_graph_batch on the same data."""
+        print(f"\n⏱️ Benchmarking AGE Writes ({entity_count} entities)...")
+        
+        try:
+            vertices = [
+                {
+                    'name': f'Bench Entity {i}',
+                    'entity_type': ('Character', 'Location', 'Item')[i % 3],
+                    'properties': {'rank': i}
+                }
+                for i in range(entity_count)
+            ]
+            relationships = [
+                {
+                    'source': vertices[i]['name'],
+                    'target': vertices[i + 1]['name'],
+                    'relationship_type': 'INTERACTS_WITH',
+                    'properties': {'context': 'benchmark', 'emotional_tone': 'neutral'}
+                }
+                for i in range(entity_count - 1)
+            ]
+            
+            # Count pool checkouts for each path (pinned AGE session pool when in use)
+            counted_pool = self.graph_service.age_pool or self.db_pool
+            checkouts = {'count': 0}
+            original_getconn = counted_pool.getconn
+            
+            def counting_getconn(*args, **kwargs):
+                checkouts['count'] += 1
+                return original_getconn(*args, **kwargs)
+            
+            counted_pool.getconn = counting_getconn
+            try:
+                self.graph_service.cleanup_draft_data(self.draft_id)
+                checkouts['count'] = 0
+                start = time.perf_counter()
+                for vertex in vertices:
+                    self.graph_service.create_vertex(
+                        draft_id=self.draft_id,
+                        entity_name=vertex['name'],
+                        entity_type=vertex['entity_type'],
+                        properties=vertex['properties']
+                    )
+                for relationship in relationships:
+                    self.graph_service.create_relationship(
+                        draft_id=self.draft_id,
+                        source_name=relationship['source'],
+                        target_name=relationship['target'],
+                        relationship_type=relationship['relationship_type'],
+                        properties=relationship['properties']
+                    )
+                per_item_seconds = time.perf_counter() - start
+                per_item_checkouts = checkouts['count']
+                
+                self.graph_service.cleanup_draft_data(self.draft_id)
+                checkouts['count'] = 0
+                start = time.perf_counter()
+                vertex_ids, edge_ids = self.graph_service.store_graph_batch(
+                    self.draft_id, vertices=vertices, relationships=relationships
+                )
+                bulk_seconds = time.perf_counter() - start
+                bulk_checkouts = checkouts['count']
+            finally:
+                counted_pool.getconn = original_getconn
+                self.graph_service.cleanup_draft_data(self.draft_id)
+            
+            print(f"   Per-item: {per_item_seconds:.2f}s, {per_item_checkouts} connection checkouts")
+            print(f"   Bulk:     {bulk_seconds:.2f}s, {bulk_checkouts} connection checkouts")
+            print(f"   Speedup:  {per_item_seconds / max(bulk_seconds, 1e-6):.1f}x")
+            
+            assert None not in vertex_ids, "Bulk write must create every vertex"
+            assert None not in edge_ids, "Bulk write must create every relationship"
+            assert bulk_checkouts < per_item_checkouts, "Bulk write must use fewer connection checkouts"
+            
+            print("✓ AGE bulk write benchmark: SUCCESS")
+            return True
+            
+        except Exception as e:
+            print(f"✗ AGE bulk write benchmark failed: {e}")
+            return False
+    
     def test_stage_4b_integration(self):
         """Test Stage 4B integration with AGE graph service."""
         print("\n🎯 Testing Stage 4B AGE Integration...")
@@ -407,6 +491,7 @@ class AgeGraphIntegrationTest:
                 ("AGE Service Status", self.test_age_service_status),
                 ("AGE Vertex Creation", self.test_vertex_creation),
                 ("AGE Relationship Creation", self.test_relationship_creation),
+                ("AGE Bulk Write Benchmark", self.test_bulk_write_benchmark),
                 ("Stage 4B AGE Integration", self.test_stage_4b_integration),
                 ("AGE Graph Cleanup", self.test_graph_cleanup)
             ]
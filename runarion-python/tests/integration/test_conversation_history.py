@@ -139,7 +139,27 @@ class TestConversationManager:
         for i, msg in enumerate(messages):
             assert msg["message_index"] == i
             assert msg["content"] == f"Message {i}"
-    
+
+    def test_load_history_pages_from_tail(self, conversation_manager, test_project_id):
+        """Test paged loading of the most recent messages."""
+        for i in range(6):
+            conversation_manager.append_message(
+                project_id=test_project_id,
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"Message {i}"
+            )
+
+        tail = conversation_manager.load_history(test_project_id, limit=2)
+        assert [msg["message_index"] for msg in tail] == [4, 5]
+
+        previous = conversation_manager.load_history(
+            test_project_id, limit=3, before_index=tail[0]["message_index"]
+        )
+        assert [msg["message_index"] for msg in previous] == [1, 2, 3]
+
+        assert conversation_manager.load_history(test_project_id, limit=10, before_index=0) == []
+        assert len(conversation_manager.load_history(test_project_id)) == 6
+
     def test_to_gemini_format(self, conversation_manager):
         """Test conversion to Gemini API format."""
         messages = [
@@ -0,0 +1,223 @@
+"""
+Unit tests for the pinned AGE session pool.
+psycopg2.connect is replaced with a fake connection factory, so the pool's
+configure hook, hit/miss metrics and GraphDatabaseService checkout path are
+exercised without a Postgres/AGE instance.
+"""
+
+import threading
+import time
+
+import pytest
+
+from psycopg2 import extensions as pg_extensions
+from psycopg2.pool import PoolError
+
+from src.services import graph_database_service as graph_module
+from src.services.graph_database_service import AgeSessionPool, GraphDatabaseService
+
+
+class _FakeInfo:
+    def __init__(self):
+        self.transaction_status = pg_extensions.TRANSACTION_STATUS_IDLE
+
+
+class _FakeSessionConnection:
+    def __init__(self, log):
+        self.log = log
+        self.closed = 0
+        self.info = _FakeInfo()
+        self.rollbacks = 0
+        self.fail_rollback = False
+
+    def cursor(self):
+        return _FakeSessionCursor(self)
+
+    def commit(self):
+        self.info.transaction_status = pg_extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise RuntimeError("server closed the connection")
+        self.rollbacks += 1
+        self.info.transaction_status = pg_extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class _FakeSessionCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.log.append(query)
+        self.conn.info.transaction_status = pg_extensions.TRANSACTION_STATUS_INTRANS
+        self._row = ("public",) if "current_setting" in query else (True,)
+
+    def fetchone(self):
+        return self._row
+
+
+@pytest.fixture
+def session_log(monkeypatch):
+    log = []
+    monkeypatch.setattr(graph_module.psycopg2, "connect", lambda *args, **kwargs: _FakeSessionConnection(log))
+    monkeypatch.setattr(GraphDatabaseService, "_validate_age_setup", lambda self: None)
+    return log
+
+
+def _pool(minconn=1, maxconn=3):
+    configured = []
+
+    def _configure(conn):
+        configured.append(conn)
+        graph_module._configure_age_session(conn, "test_graph")
+
+    return AgeSessionPool(minconn, maxconn, configure=_configure), configured
+
+
+def test_connections_are_configured_once_and_reused(session_log):
+    pool, configured = _pool()
+    service = GraphDatabaseService(pool)
+    assert service.age_pool is pool
+
+    for _ in range(5):
+        with service.get_age_connection() as conn:
+            assert conn.age_session_ready
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+    assert len(configured) == 1
+    assert sum("LOAD 'age'" in query for query in session_log) == 1
+    assert sum("SET search_path" in query for query in session_log) == 1
+
+    metrics = service.get_session_pool_metrics()
+    assert metrics["initializations"] == 1
+    assert metrics["hits"] == 5 and metrics["misses"] == 0
+    assert metrics["idle"] == 1 and metrics["in_use"] == 0
+
+
+def test_extra_sessions_stay_warm_after_return(session_log):
+    pool, configured = _pool(minconn=1, maxconn=3)
+
+    first, second, third = pool.getconn(), pool.getconn(), pool.getconn()
+    for conn in (first, second, third):
+        pool.putconn(conn)
+    again = [pool.getconn() for _ in range(3)]
+
+    assert len(configured) == 3
+    assert {id(conn) for conn in again} == {id(first), id(second), id(third)}
+    metrics = pool.get_metrics()
+    assert metrics["misses"] == 2 and metrics["hits"] == 4
+
+
+def test_uncommitted_work_is_rolled_back_and_broken_sessions_discarded(session_log):
+    pool, configured = _pool()
+    service = GraphDatabaseService(pool)
+
+    with pytest.raises(ValueError):
+        with service.get_age_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            raise ValueError("boom")
+    assert conn.rollbacks == 1 and not conn.closed
+
+    with service.get_age_connection() as broken:
+        with broken.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        broken.fail_rollback = True
+    assert broken.closed
+
+    with service.get_age_connection() as fresh:
+        assert fresh is not broken
+    assert len(configured) == 2
+
+
+def test_configure_failure_is_counted_and_closes_connection(session_log):
+    def _failing(conn):
+        raise RuntimeError("LOAD failed")
+
+    pool = AgeSessionPool(0, 2, configure=_failing)
+    with pytest.raises(RuntimeError):
+        pool.getconn()
+
+    metrics = pool.get_metrics()
+    assert metrics["init_failures"] == 1
+    assert metrics["initializations"] == 0
+    assert metrics["in_use"] == 0
+
+
+def test_pinned_and_per_checkout_setup_share_one_bootstrap(session_log):
+    pinned = _FakeSessionConnection([])
+    graph_module._configure_age_session(pinned, "test_graph")
+
+    service = GraphDatabaseService.__new__(GraphDatabaseService)
+    service.graph_name = "test_graph"
+    checkout = _FakeSessionConnection([])
+    assert service._initialize_age_session(checkout.cursor())
+
+    assert pinned.log == checkout.log
+    assert any("LOAD 'age'" in query for query in pinned.log)
+    assert any("pg_extension" in query for query in pinned.log)
+
+
+def test_bootstrap_failure_reports_phase_and_restores_search_path(session_log):
+    class _NoLoadCursor(_FakeSessionCursor):
+        def execute(self, query, params=None):
+            if "LOAD" in query:
+                raise RuntimeError("no such library")
+            super().execute(query, params)
+
+    conn = _FakeSessionConnection([])
+    service = GraphDatabaseService.__new__(GraphDatabaseService)
+    service.graph_name = "test_graph"
+
+    result = service._initialize_age_session_with_diagnostics(_NoLoadCursor(conn))
+
+    assert result["success"] is False and result["phase"] == "LOAD_AGE"
+    assert conn.log[-1] == "SET search_path = public"
+
+
+def test_default_age_pool_size_covers_all_registered_job_workers(monkeypatch):
+    monkeypatch.setattr(graph_module, "_age_pool_job_workers", 1)
+    peak = graph_module.ProviderConcurrencyConfig.peak_default_workers()
+    request_conn = graph_module.AGE_POOL_REQUEST_CONN
+
+    # Three job types with two workers each, one of them overridden to four
+    graph_module.configure_age_session_pools(2 + 2 + 4)
+    assert graph_module.default_age_pool_max_conn() == 8 * (peak + 1) + request_conn
+
+    monkeypatch.setitem(graph_module.ProviderConcurrencyConfig._MAX_WORKERS, "openai", peak + 4)
+    assert graph_module.default_age_pool_max_conn() == 8 * (peak + 5) + request_conn
+
+
+def test_exhausted_pool_waits_for_a_returned_session(session_log):
+    pool = AgeSessionPool(1, 1, checkout_timeout=5)
+    held = pool.getconn()
+    checked_out = []
+
+    waiter = threading.Thread(target=lambda: checked_out.append(pool.getconn()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not checked_out
+    pool.putconn(held)
+    waiter.join(timeout=5)
+
+    assert checked_out == [held]
+    assert pool.get_metrics()["waits"] == 1
+
+
+def test_exhausted_pool_fails_after_checkout_timeout(session_log):
+    pool = AgeSessionPool(1, 1, checkout_timeout=0.05)
+    pool.getconn()
+
+    with pytest.raises(PoolError, match="exhausted"):
+        pool.getconn()
@@ -0,0 +1,90 @@
+"""
+Unit tests for batched (multi-character) relationship extraction. The
+generation engine returns canned JSON and the graph writes are recorded in
+memory, so only request planning, parsing and deduplication are exercised.
+"""
+
+import json
+import re
+from types import SimpleNamespace
+
+from src.services import sentiment_analyzer_service as service_module
+from src.services.sentiment_analyzer_service import SentimentAnalyzerService
+
+
+CHARACTERS = [
+    {'vertex_id': str(n), 'name': name, 'properties': {}}
+    for n, name in enumerate(['Yurak', 'Ericon', 'Selene', 'Brannoc'], start=1)
+]
+
+EVIDENCE = "a quoted line of text that is long enough"
+
+
+class _FakeEngine:
+    def __init__(self, prompts):
+        self.prompts = prompts
+        self.request = SimpleNamespace(prompt="", instruction="")
+
+    def generate(self, skip_quota=False, defer_quota=False):
+        self.prompts.append(self.request.prompt)
+        focus = re.findall(r"^- (\w+)$", self.request.prompt, re.MULTILINE)
+        interactions = [
+            {'source_character': name, 'target_character': 'Yurak' if name != 'Yurak' else 'Ericon',
+             'interaction_type': 'HELPS', 'sentiment_score': 30, 'text_evidence': EVIDENCE}
+            for name in focus
+        ]
+        return SimpleNamespace(success=True, text="```json\n" + json.dumps({'interactions': interactions}) + "\n```")
+
+
+def _service(prompts, chapters):
+    service = SentimentAnalyzerService.__new__(SentimentAnalyzerService)
+    service.records_manager = SimpleNamespace(create_interaction=lambda **kwargs: "vertex")
+    service.get_chapters = lambda project_id, workspace_id: chapters
+    service.get_existing_characters = lambda project_id: CHARACTERS
+    service._create_caller = lambda project_id, workspace_id: None
+    service._get_generation_engine = lambda model, provider, caller: _FakeEngine(prompts)
+    service._aggregate_interactions_to_relationships = lambda **kwargs: []
+    return service
+
+
+def test_batched_mode_sends_each_chapter_once_for_all_focus_characters():
+    prompts = []
+    service = _service(prompts, [
+        {'order': 0, 'chapter_name': 'One', 'content': "Yurak, Ericon and Selene argued."},
+        {'order': 1, 'chapter_name': 'Two', 'content': "Brannoc watched Yurak."},
+        {'order': 2, 'chapter_name': 'Three', 'content': "Selene slept."},
+    ])
+
+    result = service.extract_relationships("project", "workspace", model="mock-model",
+                                           provider="mock", extraction_mode="batched")
+
+    assert result['success'] is True
+    assert len(prompts) == 2  # Chapter three has nobody to interact with
+    assert {(i['source_character'], i['target_character'], i['chapter_number']) for i in result['interactions']} == {
+        ('Yurak', 'Ericon', 1), ('Ericon', 'Yurak', 1), ('Selene', 'Yurak', 1),
+        ('Yurak', 'Ericon', 2), ('Brannoc', 'Yurak', 2),
+    }
+    counts = {r['character']: (r['interactions_found'], r['chapters_skipped']) for r in result['character_results']}
+    assert counts == {'Yurak': (5, 1), 'Ericon': (2, 2), 'Selene': (1, 2), 'Brannoc': (1, 2)}
+
+
+def test_character_batches_respect_output_and_request_budgets(monkeypatch):
+    service = SentimentAnalyzerService.__new__(SentimentAnalyzerService)
+    count_tokens = lambda text: len(text) // 4
+    names = [f"Character{n}" for n in range(10)]
+
+    monkeypatch.setattr(service_module, 'BATCH_OUTPUT_TOKENS_PER_CHARACTER', 1000)
+    monkeypatch.setattr(service_module, 'EXTRACTION_MAX_OUTPUT_TOKENS', 4000)
+    monkeypatch.setattr(service_module, 'BATCH_REQUEST_TOKEN_BUDGET', 100000)
+    assert [len(b) for b in service._plan_character_batches(names, 5000, count_tokens)] == [4, 4, 2]
+
+    monkeypatch.setattr(service_module, 'BATCH_REQUEST_TOKEN_BUDGET', 8100)
+    assert [len(b) for b in service._plan_character_batches(names, 5000, count_tokens)] == [3, 3, 3, 1]
+
+    # A chapter too large for any batch still gets one character per request
+    assert [len(b) for b in service._plan_character_batches(names[:2], 9000, count_tokens)] == [1, 1]
+
+
+def test_invalid_extraction_mode_is_rejected():
+    service = _service([], [])
+    assert 'error' in service.extract_relationships("project", "workspace", extraction_mode="parallel")
@@ -0,0 +1,250 @@
+"""
+Unit tests for the set-based chapter content resolver and its snapshot cache,
+shared by the auditor and sentiment analyzer. Uses a fake pool that answers
+the content hash, project_content and version control queries from
+in-memory rows.
+"""
+
+import json
+
+import pytest
+
+from src.services import chapter_content_resolver as resolver_module
+from src.services.auditor_service import AuditorService
+from src.services.chapter_content_resolver import ChapterContentResolver, ChapterSnapshotCache
+from src.services.conversation_manager import ConversationManager
+from src.services.sentiment_analyzer_service import SentimentAnalyzerService
+
+
+@pytest.fixture(autouse=True)
+def _fresh_chapter_cache(monkeypatch):
+    monkeypatch.setattr(resolver_module, "_chapter_cache", None)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        store = self.connection.store
+        store.queries.append(query)
+        if "md5(" in query:
+            if store.project_content is None:
+                self._rows = []
+            else:
+                self._rows = [(json.dumps(store.project_content), store.state_digest)]
+        elif "FROM project_content" in query:
+            self._rows = [(json.dumps(store.project_content),)] if store.project_content is not None else []
+        elif store.version_control_error:
+            raise RuntimeError('relation "chapter_states" does not exist')
+        else:
+            self._rows = list(store.version_rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeConnection:
+    def __init__(self, store):
+        self.store = store
+        self.autocommit = True
+        self.rollbacks = 0
+
+    def set_client_encoding(self, encoding):
+        pass
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _FakePool:
+    def __init__(self, project_content, version_rows=(), version_control_error=False):
+        self.project_content = project_content
+        self.version_rows = version_rows
+        self.version_control_error = version_control_error
+        self.state_digest = "v1"
+        self.queries = []
+        self.checkouts = 0
+
+    def getconn(self):
+        self.checkouts += 1
+        return _FakeConnection(self)
+
+    def putconn(self, conn):
+        pass
+
+
+def _chapters(count):
+    return [
+        {"order": order, "chapter_name": f"Chapter {order + 1}", "content": f"inline {order}", "id": f"c{order}"}
+        for order in range(count)
+    ]
+
+
+def test_all_chapters_resolved_in_two_queries():
+    version_rows = [(order, f"versioned {order}") for order in range(0, 60, 2)]
+    db_pool = _FakePool(_chapters(60), version_rows)
+
+    chapters = ChapterContentResolver(db_pool).get_chapters("proj-1")
+
+    assert len(db_pool.queries) == 3  # content hash + project_content + version control
+    assert db_pool.checkouts == 1
+    assert len(chapters) == 60
+    assert chapters[0]["content"] == "versioned 0"
+    assert chapters[1]["content"] == "inline 1"
+    assert chapters[2]["id"] == "c2"
+
+
+def test_blank_version_content_falls_back_to_project_content():
+    db_pool = _FakePool(
+        [{"order": 0, "chapter_name": "One", "content": "inline"}, {"order": 1, "chapter_name": "Two", "content": "  "}],
+        [(0, "   "), (1, None)],
+    )
+
+    chapters = ChapterContentResolver(db_pool).get_chapters("proj-1")
+
+    assert chapters[0]["content"] == "inline"
+    assert chapters[1]["content"] == "  "
+
+
+def test_missing_version_control_tables_use_project_content():
+    db_pool = _FakePool(_chapters(3), version_control_error=True)
+
+    chapters = ChapterContentResolver(db_pool).get_chapters("proj-1")
+
+    assert [chapter["content"] for chapter in chapters] == ["inline 0", "inline 1", "inline 2"]
+
+
+def test_auditor_and_sentiment_share_resolved_content():
+    db_pool = _FakePool(_chapters(2), [(1, "versioned 1")])
+
+    auditor_chapters = AuditorService(db_pool).get_chapters("proj-1")
+    sentiment_chapters = SentimentAnalyzerService(db_pool).get_chapters("proj-1")
+
+    assert auditor_chapters[1]["content"] == "versioned 1"
+    assert sentiment_chapters == [
+        {"order": 0, "chapter_name": "Chapter 1", "content": "inline 0"},
+        {"order": 1, "chapter_name": "Chapter 2", "content": "versioned 1"},
+    ]
+    assert ChapterContentResolver(_FakePool(None)).get_chapters("proj-1") == []
+
+
+def test_snapshot_is_reused_until_content_hash_changes():
+    db_pool = _FakePool(_chapters(3), [(0, "versioned 0")])
+    resolver = ChapterContentResolver(db_pool)
+
+    first = resolver.get_chapters("proj-1")
+    first[0]["content"] = "mutated by caller"
+    second = resolver.get_chapters("proj-1")
+
+    assert second[0]["content"] == "versioned 0"
+    assert len(db_pool.queries) == 4  # second call only checked the content hash
+    assert resolver.cache.stats()["hits"] == 1
+
+    db_pool.state_digest = "v2"
+    db_pool.version_rows = [(0, "versioned again")]
+    assert resolver.get_chapters("proj-1")[0]["content"] == "versioned again"
+    assert len(db_pool.queries) == 7
+
+
+def test_cache_evicts_least_recently_used_projects_by_bytes():
+    cache = ChapterSnapshotCache(max_bytes=100)
+    chapter = [{"order": 0, "content": "x" * 40}]
+
+    cache.put("a", "h", chapter)
+    cache.put("b", "h", chapter)
+    assert cache.get("a", "h") is not None
+    cache.put("c", "h", chapter)
+
+    assert cache.get("b", "h") is None
+    assert cache.get("a", "h") is not None and cache.get("c", "h") is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("huge", "h", [{"order": 0, "content": "x" * 500}])
+    assert cache.get("huge", "h") is None
+    assert cache.stats()["bytes"] <= 100
+
+
+def test_conversation_writes_invalidate_project_snapshot():
+    class _DownPool:
+        def getconn(self):
+            raise RuntimeError("db down")
+
+    cache = resolver_module.get_chapter_cache()
+    cache.put("proj-1", "h", [{"order": 0, "content": "text"}])
+    cache.put("proj-2", "h", [{"order": 0, "content": "text"}])
+
+    manager = ConversationManager(_DownPool())
+    manager.update_chapter_content("proj-1", 0, "new text")
+    assert cache.get("proj-1", "h") is None
+
+    manager.sync_from_content("proj-2")
+    assert cache.get("proj-2", "h") is None
+
+
+def test_conversation_writes_invalidate_after_commit():
+    cache = resolver_module.get_chapter_cache()
+
+    class _Cursor:
+        def __init__(self):
+            self._row = None
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def execute(self, query, params=None):
+            if "FROM project_content" in query:
+                self._row = (json.dumps(_chapters(1)),)
+            elif "FROM project_conversations" in query:
+                self._row = (json.dumps([{"chapter_id": 0, "content": "old"}]),)
+
+        def fetchone(self):
+            return self._row
+
+    class _Connection:
+        def set_client_encoding(self, encoding):
+            pass
+
+        def cursor(self):
+            return _Cursor()
+
+        def commit(self):
+            # A concurrent reader re-caches the pre-write snapshot before the commit lands
+            cache.put("proj-1", "stale", [{"order": 0, "content": "old"}])
+
+    class _Pool:
+        def getconn(self):
+            return _Connection()
+
+        def putconn(self, conn):
+            pass
+
+    manager = ConversationManager(_Pool())
+
+    assert manager.update_chapter_content("proj-1", 0, "new text") is True
+    assert cache.get("proj-1", "stale") is None
+    assert manager.sync_from_content("proj-1") is True
+    assert cache.get("proj-1", "stale") is None
+
+
+def test_content_hash_covers_version_content_rewritten_in_place():
+    query = resolver_module.CHAPTER_FINGERPRINT_QUERY
+
+    assert "md5(cv.content)" in query
+    assert "latest.digest" in query
@@ -0,0 +1,62 @@
+"""
+Unit tests for the character mention prefilter used by
+SentimentAnalyzerService.extract_relationships. Chapters and characters are
+served from memory and the per-character LLM extraction is replaced with a
+recorder, so only the skip decisions are exercised.
+"""
+
+from src.services.character_mention_index import CharacterMentionIndex, entity_aliases, name_variants
+from src.services.sentiment_analyzer_service import SINGLE_CHARACTER_CONTENT_LIMIT, SentimentAnalyzerService
+
+
+CHARACTERS = [
+    {'vertex_id': '1', 'name': 'Yurak the Barbarian', 'properties': {}},
+    {'vertex_id': '2', 'name': 'Ericon', 'properties': {'aliases': ['The Grey Mage']}},
+    {'vertex_id': '3', 'name': 'Selene Vale', 'properties': {'nickname': 'Moth; Little Moth'}},
+]
+
+
+def test_name_variants_cover_partial_names_and_aliases():
+    assert name_variants('Yurak the Barbarian') == {'yurak the barbarian', 'yurak', 'barbarian'}
+    assert entity_aliases(CHARACTERS[2]) == ['Moth', 'Little Moth']
+
+    index = CharacterMentionIndex(CHARACTERS, {
+        1: "Yurak's axe fell. The grey mage did not flinch.",
+        2: "Moth slept. Mothers wept.",
+        3: "Nobody we know.",
+    })
+
+    assert index.mentioned(1) == {'Yurak the Barbarian', 'Ericon'}
+    assert index.mentioned(2) == {'Selene Vale'}
+    assert index.can_interact('Ericon', 1)
+    assert not index.can_interact('Selene Vale', 2)  # Alone in the chapter
+    assert not index.can_interact('Ericon', 3)
+    assert index.can_interact('Unknown Person', 3)
+
+
+def test_extract_relationships_skips_chapters_without_co_mentions():
+    calls = []
+    service = SentimentAnalyzerService.__new__(SentimentAnalyzerService)
+    service.get_chapters = lambda project_id, workspace_id: [
+        {'order': 0, 'chapter_name': 'One', 'content': "Yurak shouted at Ericon."},
+        {'order': 1, 'chapter_name': 'Two', 'content': "Selene walked alone."},
+        {'order': 2, 'chapter_name': 'Three', 'content': "x" * SINGLE_CHARACTER_CONTENT_LIMIT + " Ericon met Moth."},
+        {'order': 3, 'chapter_name': 'Four', 'content': "Little Moth asked Yurak for help."},
+    ]
+    service.get_existing_characters = lambda project_id: CHARACTERS
+    service._aggregate_interactions_to_relationships = lambda **kwargs: []
+
+    def extract(character_name, chapter_number, **kwargs):
+        calls.append((character_name, chapter_number))
+        return {'interactions': []}
+    service._extract_single_character_interactions = extract
+
+    result = service.extract_relationships("project", "workspace")
+
+    assert result['success'] is True
+    # Chapter 3's mentions are past the text the prompt sees
+    assert sorted(calls) == [
+        ('Ericon', 1), ('Selene Vale', 4), ('Yurak the Barbarian', 1), ('Yurak the Barbarian', 4),
+    ]
+    skipped = {r['character']: r['chapters_skipped'] for r in result['character_results']}
+    assert skipped == {'Yurak the Barbarian': 2, 'Ericon': 3, 'Selene Vale': 3}
@@ -0,0 +1,169 @@
+"""
+Unit tests for deconstructor stage checkpoints and resume_from_stage.
+Stages are replaced with recording fakes and the checkpoint store keeps rows
+in memory, so only the orchestrator's skip/re-run decisions are exercised.
+"""
+
+import logging
+
+import pytest
+
+from src.services.deconstructor import orchestrator as orchestrator_module
+from src.services.deconstructor.checkpoints import StageCheckpointRun, normalize_stage_key
+from src.services.deconstructor.orchestrator import DeconstructorOrchestrator
+
+
+@pytest.fixture(autouse=True)
+def _quiet_orchestrator(set_logger_level):
+    set_logger_level("src.services.deconstructor", logging.CRITICAL)
+
+
+class _MemoryCheckpointStore:
+    def __init__(self):
+        self.rows = []  # (draft_id, stage, version, input_hash, result)
+
+    def load_latest(self, draft_id):
+        latest = {}
+        for row_draft, stage, version, input_hash, result in self.rows:
+            if row_draft == draft_id and version > latest.get(stage, {}).get('version', 0):
+                latest[stage] = {'version': version, 'input_hash': input_hash, 'result': dict(result)}
+        return latest
+
+    def save(self, draft_id, stage, input_hash, result):
+        version = 1 + max((row[2] for row in self.rows if row[0] == draft_id and row[1] == stage), default=0)
+        self.rows.append((draft_id, stage, version, input_hash, dict(result)))
+        return version
+
+    def delete(self, draft_id):
+        before = len(self.rows)
+        self.rows = [row for row in self.rows if row[0] != draft_id]
+        return before - len(self.rows)
+
+
+class _FakeStage:
+    def __init__(self, key, calls, **result):
+        self.key = key
+        self.calls = calls
+        self.result = {'success': True, **result}
+
+    def run_with_connection(self, conn, draft_id, *args, user_id=None, workspace_id=None,
+                            test_mode=False, config=None):
+        assert conn is None
+        self.calls.append(self.key)
+        return dict(self.result)
+
+
+class _Request:
+    provider = "mock"
+    model = "mock-model"
+
+
+class _Engine:
+    request = _Request()
+
+
+def _orchestrator(store, calls):
+    orchestrator = DeconstructorOrchestrator.__new__(DeconstructorOrchestrator)
+    orchestrator.generation_engine = _Engine()
+    orchestrator.db_pool = None
+    orchestrator.graph_service = None
+    orchestrator.checkpoints = store
+    orchestrator.stages = {
+        1: _FakeStage('1', calls, chunks_created=3),
+        2: _FakeStage('2', calls),
+        3: _FakeStage('3', calls, scenes_extracted=2),
+        4: {key: _FakeStage(f'4{key}', calls) for key in 'abc'},
+        5: _FakeStage('5', calls, issues_found=0),
+        6: _FakeStage('6', calls, scenes_enhanced=2),
+        7: _FakeStage('7', calls, chapters_created=1, chapters_stored=1),
+    }
+    orchestrator.resets = []
+    orchestrator._reset_stage_outputs = lambda draft_id, stage: orchestrator.resets.append(stage)
+    orchestrator._update_draft_status = lambda *args, **kwargs: None
+    orchestrator._store_chaptering_metadata_at_start = lambda *args, **kwargs: None
+    return orchestrator
+
+
+def test_resume_reruns_only_the_failed_stage_and_its_dependents():
+    store, calls = _MemoryCheckpointStore(), []
+    orchestrator = _orchestrator(store, calls)
+    orchestrator.stages[6].result = {'success': False, 'error': 'provider timeout'}
+
+    first = orchestrator.run_pipeline("draft-1", "book.txt")
+    assert first['success'] is False
+    assert calls == ['1', '2', '3', '4a', '4b', '4c', '5', '6', '7']
+    assert {row[1] for row in store.rows} == {'1', '2', '3', '4a', '4b', '4c', '5', '7'}
+
+    calls.clear()
+    orchestrator.stages[6].result = {'success': True, 'scenes_enhanced': 2}
+    resumed = orchestrator.resume_from_stage("draft-1", "book.txt")
+
+    assert resumed['success'] is True
+    assert calls == ['6', '7']  # Stage 7's checkpoint was built on the failed Stage 6
+    assert resumed['restored_stages'] == ['1', '2', '3', '4a', '4b', '4c', '5']
+    assert orchestrator.resets == ['6']
+    assert resumed['stages_completed'][0]['result']['restored_from_checkpoint'] is True
+
+
+def test_changed_inputs_and_explicit_stage_invalidate_checkpoints():
+    store, calls = _MemoryCheckpointStore(), []
+    orchestrator = _orchestrator(store, calls)
+    orchestrator.run_pipeline("draft-1", "book.txt")
+
+    calls.clear()
+    orchestrator.resume_from_stage("draft-1", "book.txt", stage="4B")
+    assert calls == ['4b', '4c', '5', '6', '7']
+
+    calls.clear()
+    orchestrator.resume_from_stage("draft-1", "book.txt", target_chapter_length=4000)
+    assert calls[0] == '1' and len(calls) == 9
+
+    calls.clear()
+    orchestrator.resume_from_stage("draft-1", "book.txt", target_chapter_length=4000)
+    assert calls == []
+
+
+def test_stage_4a_failures_stop_before_graph_analysis():
+    store, calls = _MemoryCheckpointStore(), []
+    orchestrator = _orchestrator(store, calls)
+    orchestrator.stages[4]['a'].result = {'success': True, 'failed_analyses': 2}
+
+    result = orchestrator.run_pipeline("draft-1", "book.txt")
+
+    assert result['stage_failed'] == '4a'
+    assert calls[-1] == '4a'
+    assert '4a' not in {row[1] for row in store.rows}
+
+
+def test_chunk_pipelining_checkpoints_both_stages(monkeypatch):
+    store, calls = _MemoryCheckpointStore(), []
+    orchestrator = _orchestrator(store, calls)
+
+    class _FakeChunkPipeline:
+        def __init__(self, cleaning_stage, detection_stage):
+            pass
+
+        def run(self, context):
+            calls.append('2+3')
+            return {'success': True}, {'success': True, 'scenes_extracted': 2}
+
+    monkeypatch.setattr(orchestrator_module, 'ChunkPipeline', _FakeChunkPipeline)
+    config = {'chunk_pipelining': True}
+
+    assert orchestrator.run_pipeline("draft-1", "book.txt", config=config)['success'] is True
+    assert calls[:3] == ['1', '2+3', '4a']
+    assert {'2', '3'} <= {row[1] for row in store.rows}
+
+    # With Stage 2 restorable, only Stage 3 re-runs, on its own
+    calls.clear()
+    orchestrator.resume_from_stage("draft-1", "book.txt", stage=3, config=config)
+    assert calls[:2] == ['3', '4a']
+
+
+def test_stage_keys_are_normalized():
+    assert normalize_stage_key(5) == '5'
+    assert normalize_stage_key('stage_4C') == '4c'
+    with pytest.raises(ValueError):
+        normalize_stage_key('8')
+    with pytest.raises(ValueError):
+        StageCheckpointRun(_MemoryCheckpointStore(), "draft-1", {}, resume=True, from_stage='4d')
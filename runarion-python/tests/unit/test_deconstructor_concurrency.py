@@ -0,0 +1,284 @@
+"""
+Unit tests for the deconstructor's concurrent stage paths.
+Runs Stage 2 and Stage 3 against MockProvider with stubbed DB access and
+checks that any worker count yields output identical to the sequential path.
+Stage 4A's scene analysis and Stage 4C's report generators are stubbed to
+check how their DB writes are batched.
+"""
+
+import json
+import logging
+import time
+
+import pytest
+from flask import Flask
+
+from src.config.deconstructor_config import Stage3Config
+from src.models.request import BaseGenerationRequest, CallerInfo, GenerationConfig
+from src.providers.mock_provider import SCENE_CATALOG
+from src.services.deconstructor import chunk_pipeline
+from src.services.deconstructor.base_stage import PipelineStageContext
+from src.services.deconstructor.chunk_pipeline import ChunkPipeline
+from src.services.deconstructor.stage_2_cleaning import TextCleaningStage
+from src.services.deconstructor.stage_3_sceneExtract import SceneDetectionStage
+from src.services.deconstructor.stage_4_analysis.analyzer_4a import SceneBySceneAnalysisStage
+from src.services.deconstructor.stage_4_analysis import analyzer_4c_reports
+from src.services.deconstructor.stage_4_analysis.analyzer_4c_reports import ComprehensiveReportingStage
+from src.services.generation_engine import GenerationEngine
+
+
+@pytest.fixture(autouse=True)
+def _quiet_stages(set_logger_level, monkeypatch):
+    set_logger_level("src.services.deconstructor", logging.ERROR)
+    monkeypatch.setattr(Stage3Config, "RETRY_RATE_LIMIT_DELAY", 0)
+
+
+@pytest.fixture
+def app_context():
+    app = Flask("deconstructor-concurrency-test")
+    with app.app_context():
+        yield
+
+
+def _mock_engine():
+    return GenerationEngine(BaseGenerationRequest(
+        provider="mock",
+        model="mock-replay-v1",
+        prompt="",
+        generation_config=GenerationConfig(),
+        caller=CallerInfo(user_id="1", workspace_id="ws-1", project_id="proj-1", api_keys={}),
+    ))
+
+
+def _context(**config):
+    return PipelineStageContext("draft-1", user_id=1, workspace_id="ws-1", config=config)
+
+
+def _chunk_text(first: int, second: int) -> str:
+    filler = " ".join(["The city hummed with static and the rain kept its slow grey count."] * 6)
+    return (
+        f"{SCENE_CATALOG[first]['start_anchor']} {filler}\n\n"
+        f"{SCENE_CATALOG[second]['start_anchor']} {filler}"
+    )
+
+
+def _run_scene_detection(chunk_data, workers):
+    stage = SceneDetectionStage(None, _mock_engine())
+    stored = []
+    stage._get_chunk_data = lambda context: chunk_data
+    stage._store_scenes_in_database = lambda context, scenes: stored.extend(scenes) or len(scenes)
+    result = stage._execute_stage(_context(scene_detection_workers=workers))
+    return result, stored
+
+
+def test_text_cleaning_concurrent_matches_sequential(app_context):
+    chunks = [(i, i, f"{SCENE_CATALOG[0]['start_anchor']}   \n\n\n\nChunk {i} ends here.") for i in range(1, 7)]
+    outputs = {}
+
+    for workers in (1, 3):
+        stage = TextCleaningStage(None, _mock_engine())
+        stage._get_draft_chunks = lambda context: chunks
+        stage._update_cleaned_chunks = lambda context, cleaned, w=workers: outputs.setdefault(w, cleaned) and len(cleaned)
+        result = stage._execute_stage(_context(cleaning_workers=workers))
+
+        assert result.success
+        assert result.data["max_workers"] == workers
+        assert [entry["chunk_number"] for entry in result.data["chunk_latencies"]] == list(range(1, 7))
+
+    assert outputs[1] == outputs[3]
+    assert [chunk_id for chunk_id, _ in outputs[3]] == list(range(1, 7))
+
+
+def test_scene_detection_concurrent_matches_sequential_byte_for_byte(app_context):
+    chunk_data = [(1, _chunk_text(0, 1)), (2, _chunk_text(2, 3)), (3, _chunk_text(1, 2)), (4, _chunk_text(3, 0))]
+
+    sequential_result, sequential_scenes = _run_scene_detection(chunk_data, workers=1)
+    concurrent_result, concurrent_scenes = _run_scene_detection(chunk_data, workers=4)
+
+    assert sequential_result.success and concurrent_result.success
+    assert json.dumps(concurrent_scenes, sort_keys=True) == json.dumps(sequential_scenes, sort_keys=True)
+    assert [scene["scene_number"] for scene in concurrent_scenes] == list(range(1, len(concurrent_scenes) + 1))
+    assert concurrent_result.data["hydration_stats"] == sequential_result.data["hydration_stats"]
+    assert concurrent_result.data["chunks_processed"] == 4
+
+
+def test_scene_detection_stops_sending_chunks_after_a_hydration_failure(app_context):
+    chunk_data = [(n, _chunk_text(n % 4, (n + 1) % 4)) for n in range(1, 11)]
+    stage = SceneDetectionStage(None, _mock_engine())
+    detected = []
+    stage._get_chunk_data = lambda context: chunk_data
+    stage._store_scenes_in_database = lambda context, scenes: len(scenes)
+
+    def detect(chunk_number, cleaned_text):
+        detected.append(chunk_number)
+        if chunk_number == 1:
+            raise ValueError("Content hydration quality too low")
+        time.sleep(0.05)
+        return [], None
+
+    stage._detect_chunk_scenes = detect
+    result = stage._execute_stage(_context(scene_detection_workers=2))
+
+    assert not result.success
+    assert result.data["error"] == "Content hydration quality too low"
+    assert len(detected) < len(chunk_data)
+
+
+def test_chunk_pipeline_matches_sequential_stages_2_and_3(app_context, monkeypatch):
+    monkeypatch.setattr(ChunkPipeline, "QUEUE_SIZE", 1)
+    chunks = [(10 + i, i, _chunk_text(i % 4, (i + 1) % 4)) for i in range(1, 6)]
+    chunks.append((16, 6, "   "))
+
+    def stages():
+        cleaning = TextCleaningStage(None, _mock_engine())
+        detection = SceneDetectionStage(None, _mock_engine())
+        stored = {}
+        cleaning._get_draft_chunks = lambda context: chunks
+        cleaning._update_cleaned_chunks = lambda context, cleaned: stored.setdefault('cleaned', cleaned) and len(cleaned)
+        detection._get_chunk_data = lambda context: [
+            (number, text) for (_, number, _), (_, text) in zip(chunks, stored['cleaned']) if text.strip()
+        ]
+        detection._store_scenes_in_database = lambda context, scenes: stored.setdefault('scenes', scenes) and len(scenes)
+        return cleaning, detection, stored
+
+    cleaning, detection, sequential = stages()
+    config = dict(cleaning_workers=1, scene_detection_workers=1)
+    assert cleaning._execute_stage(_context(**config)).success
+    sequential_3 = detection._execute_stage(_context(**config))
+
+    cleaning, detection, pipelined = stages()
+    stage_2, stage_3 = ChunkPipeline(cleaning, detection).run(_context(cleaning_workers=3, scene_detection_workers=2))
+
+    assert stage_2["success"] and stage_3["success"]
+    assert stage_3["chunk_pipelining"] and stage_3["time_to_first_scene_seconds"] is not None
+    assert pipelined["cleaned"] == sequential["cleaned"]
+    assert json.dumps(pipelined["scenes"], sort_keys=True) == json.dumps(sequential["scenes"], sort_keys=True)
+    assert stage_3["hydration_stats"] == sequential_3.data["hydration_stats"]
+    assert stage_3["chunks_processed"] == 5
+
+
+def test_chunk_pipeline_fails_stage_3_when_preparing_a_chunk_raises(app_context, monkeypatch):
+    monkeypatch.setattr(ChunkPipeline, "QUEUE_SIZE", 1)
+    chunks = [(10 + i, i, _chunk_text(i % 4, (i + 1) % 4)) for i in range(1, 6)]
+    clean_text = chunk_pipeline.clean_text_for_database
+
+    def flaky_clean(text):
+        if SCENE_CATALOG[3]['start_anchor'] in text[:200]:
+            raise ValueError("invalid byte sequence")
+        return clean_text(text)
+
+    monkeypatch.setattr(chunk_pipeline, "clean_text_for_database", flaky_clean)
+    cleaning = TextCleaningStage(None, _mock_engine())
+    detection = SceneDetectionStage(None, _mock_engine())
+    cleaning._get_draft_chunks = lambda context: chunks
+    cleaning._update_cleaned_chunks = lambda context, cleaned: len(cleaned)
+    detection._store_scenes_in_database = lambda context, scenes: len(scenes)
+
+    stage_2, stage_3 = ChunkPipeline(cleaning, detection).run(_context(cleaning_workers=1, scene_detection_workers=1))
+
+    assert stage_2["success"]
+    assert not stage_3["success"]
+    assert stage_3["error"] == "invalid byte sequence"
+
+
+def test_scene_analysis_batches_updates_for_any_worker_count(app_context, monkeypatch):
+    monkeypatch.setattr(SceneBySceneAnalysisStage, "UPDATE_BATCH_SIZE", 2)
+    scenes = [(100 + n, n, f"Scene {n}", "", "[]", f"content {n}") for n in range(1, 6)]
+
+    for workers in (1, 4):
+        stage = SceneBySceneAnalysisStage(None, _mock_engine())
+        batches = []
+        stage.get_draft_metadata = lambda draft_id: {}
+        stage._get_draft_scenes = lambda context: scenes
+        stage._update_draft_graph_metadata = lambda context: None
+        stage._update_scene_analyses = lambda context, updates: batches.append(updates)
+        stage._analyze_single_scene = lambda scene_id, scene_number, *args: (
+            {} if scene_number == 3 else {'plot_function': f"scene {scene_number}"}
+        )
+
+        result = stage._execute_stage(_context(scene_analysis_workers=workers))
+
+        assert result.success
+        assert result.data["scenes_analyzed"] == 4
+        assert result.data["failed_scene_numbers"] == [3]
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert sorted(scene_id for batch in batches for scene_id, _ in batch) == [101, 102, 104, 105]
+
+
+def test_reports_generate_concurrently_and_store_in_one_batch(app_context, monkeypatch):
+    monkeypatch.setenv("AGE_ENABLED", "false")
+    scenes_data = [
+        {'scene_number': n, 'title': f"Scene {n}", 'setting': 'Harbor' if n % 2 else 'Tower', 'characters': ['Ada', 'Bram'],
+         'content': 'x' * 100, 'analysis': {'themes': ['loyalty'], 'conflicts': ['storm']}}
+        for n in range(1, 7)
+    ]
+    stored = {}
+
+    for workers in (1, 4):
+        stage = ComprehensiveReportingStage(None, _mock_engine())
+        stage.get_draft_metadata = lambda draft_id: {}
+        stage._get_scenes_with_analysis = lambda context: scenes_data
+        stage._get_graph_data = lambda context: None
+        stage._generate_character_report = lambda name, data: {'character': name}
+        stage._generate_theme_report = lambda theme, data: None if theme == 'loyalty' else {'theme': theme}
+        stage._generate_setting_report = lambda setting, data: {'setting': setting}
+        stage._generate_plot_thread_report = lambda thread, data: {'thread': thread['description']}
+        stage._store_analysis_reports = lambda context, reports, w=workers: stored.setdefault(w, reports) and len(reports)
+
+        result = stage._execute_stage(_context(reporting_workers=workers))
+
+        assert result.success
+        assert result.data["max_workers"] == workers
+
+    assert stored[1] == stored[4]
+    report_types = [report_type for report_type, _, _ in stored[4]]
+    assert 'THEME_ANALYSIS' not in report_types  # The only theme report failed
+    assert report_types[:2] == ['CHARACTER_ARC', 'CHARACTER_ARC']
+    assert report_types[-1] == 'NARRATIVE_OVERVIEW'
+
+
+class _ReportConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return None
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_failed_bulk_report_store_falls_back_to_per_report_upserts(monkeypatch, caplog):
+    stored_subjects = []
+
+    def execute_values(cursor, query, rows, template=None, page_size=None):
+        if any(row[3] == "Bram" for row in rows):
+            raise ValueError("bad row")
+        stored_subjects.extend(row[3] for row in rows)
+
+    monkeypatch.setattr(analyzer_4c_reports, "execute_values", execute_values)
+    conn = _ReportConnection()
+    stage = ComprehensiveReportingStage(None, _mock_engine())
+    stage.get_database_connection = lambda context: conn
+    reports = [
+        ('CHARACTER_ARC', 'Ada', {'character': 'Ada'}),
+        ('CHARACTER_ARC', 'Bram', {'character': 'Bram'}),
+        ('NARRATIVE_OVERVIEW', 'story_overview', {'overview': 'storm'}),
+    ]
+
+    with caplog.at_level(logging.ERROR, logger=stage.logger.name):
+        assert stage._store_analysis_reports(_context(), reports) == 2
+
+    assert stored_subjects == ['Ada', 'story_overview']
+    assert conn.commits == 2 and conn.rollbacks == 2  # The bulk upsert and Bram's retry
+    assert "Failed to store CHARACTER_ARC report for Bram" in caplog.text
@@ -291,7 +291,7 @@ class _FakePool:
 
 
 class _NoopThread:
-    def __init__(self, target=None, kwargs=None, daemon=None):
+    def __init__(self, target=None, kwargs=None, daemon=None, name=None):
         self.target = target
         self.kwargs = kwargs or {}
 
@@ -317,7 +317,7 @@ def test_deconstruct_endpoint_persists_rewrite_policy(monkeypatch, tmp_path):
     conn = _FakeConnection(fetches=[("draft-1", "ws-1", 1), None])
     app = _make_app(deconstruct, tmp_path, _FakePool([conn]))
 
-    monkeypatch.setattr("src.api.deconstructor.threading.Thread", _NoopThread)
+    monkeypatch.setattr("src.services.job_executor.threading.Thread", _NoopThread)
     monkeypatch.setattr("src.api.deconstructor.GenerationEngine", lambda request: object())
     monkeypatch.setattr(
         "src.api.deconstructor.DeconstructorOrchestrator",
@@ -370,7 +370,7 @@ def test_novel_writer_endpoint_uses_stored_rewrite_policy(monkeypatch, tmp_path)
         def run_pipeline(self, **kwargs):
             captured.update(kwargs)
 
-    monkeypatch.setattr("src.api.novel_writer.threading.Thread", _NoopThread)
+    monkeypatch.setattr("src.services.job_executor.threading.Thread", _NoopThread)
     monkeypatch.setattr("src.api.novel_writer.GenerationEngine", lambda request: object())
     monkeypatch.setattr("src.api.novel_writer.NovelWriterOrchestrator", _FakeWriterOrchestrator)
 
@@ -444,6 +444,8 @@ def test_analyze_style_endpoint_propagates_provider_model_and_generation_config(
             max_output_tokens=None,
             generation_config=None,
             min_success_partial_style=None,
+            max_workers=None,
+            use_partial_style_cache=None,
         ):
             captured["profiling"] = {
                 "provider": provider,
@@ -451,6 +453,8 @@ def test_analyze_style_endpoint_propagates_provider_model_and_generation_config(
                 "max_output_tokens": max_output_tokens,
                 "generation_config": generation_config,
                 "min_success_partial_style": min_success_partial_style,
+                "max_workers": max_workers,
+                "use_partial_style_cache": use_partial_style_cache,
             }
 
     class _FakeOrchestrator:
@@ -483,7 +487,8 @@ def test_analyze_style_endpoint_propagates_provider_model_and_generation_config(
                 '{"caller":{"user_id":"1","workspace_id":"ws-1","project_id":"proj-1"},'
                 '"author_name":"A","on_exist":"update",'
                 '"config":{"provider":"openai","model":"gpt-test","max_output_tokens":777,'
-                '"min_success_samples":0.6,"min_success_partial_style":0.7},'
+                '"min_success_samples":0.6,"min_success_partial_style":0.7,"max_workers":3,'
+                '"use_partial_style_cache":false},'
                 '"generation_config":{"temperature":0.2,"max_output_tokens":777}}'
             ),
             "files": (BytesIO(b"sample"), "sample.txt"),
@@ -498,3 +503,5 @@ def test_analyze_style_endpoint_propagates_provider_model_and_generation_config(
     assert captured["profiling"]["max_output_tokens"] == 777
     assert captured["profiling"]["generation_config"] == {"temperature": 0.2, "max_output_tokens": 777}
     assert captured["profiling"]["min_success_partial_style"] == 0.7
+    assert captured["profiling"]["max_workers"] == 3
+    assert captured["profiling"]["use_partial_style_cache"] is False
@@ -0,0 +1,230 @@
+"""
+Unit tests for GraphDatabaseService bulk writes and their use in Stage 4B.
+A fake AGE connection answers the session-initialisation queries, echoes
+UNWIND rows back as created ids (skipping rows whose endpoints are "missing")
+and can fail chosen statements, so no Postgres/AGE instance is needed.
+"""
+
+import re
+
+import pytest
+
+from src.services.deconstructor.base_stage import PipelineStageContext
+from src.services.deconstructor.stage_4_analysis.analyzer_4b import ProgressiveGraphAnalysisStage
+from src.services.graph_database_service import GraphDatabaseNotAvailableError, GraphDatabaseService
+
+
+class _FakeAgeConnection:
+    def __init__(self, fail_on=None, missing=()):
+        self.executed = []
+        self.missing = set(missing)
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on = fail_on
+        self.next_id = 1000
+
+    def cursor(self):
+        return _FakeAgeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _FakeAgeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.executed.append(query)
+        fail_on = self.conn.fail_on
+        if fail_on and (fail_on(query) if callable(fail_on) else fail_on in query):
+            raise RuntimeError("cypher failed")
+        if "current_setting" in query:
+            self._rows = [("public",)]
+        elif "extversion" in query:
+            self._rows = [("1.6.0",)]
+        elif "ag_graph" in query:
+            self._rows = [(True,)]
+        elif "UNWIND" in query:
+            self._rows = []
+            for idx, row in re.findall(r"\{idx: (\d+),([^}]*)", query):
+                if any(f"'{name}'" in row for name in self.conn.missing):
+                    continue
+                self.conn.next_id += 1
+                self._rows.append((int(idx), self.conn.next_id))
+        elif "CREATE" in query:
+            self.conn.next_id += 1
+            missing = any(f"name: '{name}'" in query for name in self.conn.missing)
+            self._rows = [] if missing and "MATCH" in query else [(self.conn.next_id,)]
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class _CountingPool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.checkouts = 0
+
+    def getconn(self):
+        self.checkouts += 1
+        return self.conn
+
+    def putconn(self, conn):
+        pass
+
+
+def _service(conn, monkeypatch):
+    monkeypatch.setattr(GraphDatabaseService, "_validate_age_setup", lambda self: None)
+    pool = _CountingPool(conn)
+    return GraphDatabaseService(pool), pool
+
+
+def _unwind_statements(conn):
+    return [query for query in conn.executed if "UNWIND" in query]
+
+
+def test_store_graph_batch_uses_one_checkout_and_one_commit(monkeypatch):
+    conn = _FakeAgeConnection()
+    service, pool = _service(conn, monkeypatch)
+
+    vertices = [
+        {"name": "Mara", "entity_type": "Character", "properties": {"role": "lead"}},
+        {"name": "Harbor", "entity_type": "Location"},
+        {"name": "Jun", "entity_type": "Character", "properties": {"role": "rival"}},
+    ]
+    relationships = [
+        {"source": "Mara", "target": "Jun", "relationship_type": "distrusts",
+         "properties": {"context": "docks", "emotional_tone": "tense"}},
+        {"source": "Mara", "target": "Harbor", "relationship_type": "visits", "scene_id": 4},
+    ]
+
+    vertex_ids, edge_ids = service.store_graph_batch("draft-1", vertices=vertices, relationships=relationships)
+
+    assert pool.checkouts == 1
+    assert conn.commits == 1
+    assert all(vertex_id is not None for vertex_id in vertex_ids) and len(vertex_ids) == 3
+    assert all(edge_id is not None for edge_id in edge_ids) and len(edge_ids) == 2
+
+    statements = _unwind_statements(conn)
+    # One statement per vertex label, one per (edge label, property keys) group
+    assert len(statements) == 4
+    assert any("CREATE (n:Character" in query for query in statements)
+    assert any("[r:DISTRUSTS {context: row.props.context, emotional_tone: row.props.emotional_tone}]" in query
+               for query in statements)
+    assert any("[r:VISITS {scene_id: row.props.scene_id}]" in query for query in statements)
+
+
+def test_bulk_rows_are_chunked_and_escaped(monkeypatch):
+    conn = _FakeAgeConnection()
+    service, _ = _service(conn, monkeypatch)
+    monkeypatch.setattr(GraphDatabaseService, "BULK_WRITE_BATCH_SIZE", 2)
+
+    vertex_ids = service.create_vertices_bulk(
+        "draft-1",
+        [{"name": f"O'Neil {i}", "entity_type": "Character"} for i in range(5)],
+    )
+
+    assert len(vertex_ids) == 5 and None not in vertex_ids
+    statements = _unwind_statements(conn)
+    assert len(statements) == 3
+    assert "name: 'O\\'Neil 0'" in statements[0]
+
+
+def test_failed_bulk_statement_falls_back_to_per_row_creation(monkeypatch, caplog):
+    # The bulk statement fails, and so does the single-row retry of the bad edge only
+    conn = _FakeAgeConnection(
+        fail_on=lambda query: "UNWIND" in query and "MATCH" in query
+        or ("CREATE (a)-[r:HAUNTS" in query and "UNWIND" not in query)
+    )
+    service, _ = _service(conn, monkeypatch)
+
+    relationships = [
+        {"source": "Mara", "target": "Jun", "relationship_type": "haunts"},
+        {"source": "Jun", "target": "Mara", "relationship_type": "distrusts"},
+        {"source": "Mara", "target": "Harbor", "relationship_type": "distrusts"},
+    ]
+    edge_ids = service.create_relationships_bulk("draft-1", relationships)
+
+    assert edge_ids[0] is None and edge_ids[1] is not None and edge_ids[2] is not None
+    assert conn.commits == 1
+    assert sum("ROLLBACK TO SAVEPOINT graph_bulk_write" in query for query in conn.executed) == 2
+    assert sum("ROLLBACK TO SAVEPOINT graph_bulk_row" in query for query in conn.executed) == 1
+    assert "Failed to create relationship Mara -HAUNTS-> Jun" in caplog.text
+
+
+def test_unmatched_endpoints_are_logged(monkeypatch, caplog):
+    conn = _FakeAgeConnection(missing={"Ghost"})
+    service, _ = _service(conn, monkeypatch)
+
+    edge_ids = service.create_relationships_bulk("draft-1", [
+        {"source": "Mara", "target": "Ghost", "relationship_type": "haunts"},
+        {"source": "Mara", "target": "Jun", "relationship_type": "haunts"},
+    ])
+
+    assert edge_ids[0] is None and edge_ids[1] is not None
+    assert "WHERE a.name = row.source" in _unwind_statements(conn)[0]
+    assert "No edge created for Mara -haunts-> Ghost" in caplog.text
+
+
+def test_session_failure_rolls_back_and_raises(monkeypatch):
+    conn = _FakeAgeConnection(fail_on="SAVEPOINT graph_bulk_write")
+    service, _ = _service(conn, monkeypatch)
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+    with pytest.raises(GraphDatabaseNotAvailableError):
+        service.create_vertices_bulk("draft-1", [{"name": "Mara", "entity_type": "Character"}])
+
+    assert conn.commits == 0
+    assert conn.rollbacks >= 1
+
+
+def test_stage_4b_stores_batch_in_single_graph_call(monkeypatch):
+    monkeypatch.setattr(GraphDatabaseService, "_validate_age_setup", lambda self: None)
+    stage = ProgressiveGraphAnalysisStage(_CountingPool(_FakeAgeConnection()), generation_engine=None)
+    calls = []
+
+    def _store_graph_batch(draft_id, vertices=None, relationships=None):
+        calls.append((vertices, relationships))
+        return [1] * len(vertices), [2] * len(relationships)
+
+    stage.graph_service.store_graph_batch = _store_graph_batch
+
+    graph_data = {
+        "characters": [{"name": "Mara", "role": "lead"}, {"name": "  "}, {"name": "Jun"}],
+        "locations": [{"name": "..."}, {"name": "Harbor"}],
+        "objects": [],
+        "relationships": [
+            {"source": "Mara", "target": "Jun", "relationship": "distrusts"},
+            {"source": "Mara", "target": "Ghost", "relationship": "haunts"},
+        ],
+    }
+
+    created = stage._store_graph_data(PipelineStageContext("draft-1"), graph_data)
+
+    assert created == (3, 1)
+    assert len(calls) == 1
+    vertices, relationships = calls[0]
+    assert [vertex["name"] for vertex in vertices] == ["Mara", "Jun", "Harbor"]
+    assert vertices[0]["properties"] == {"role": "lead"}
+    assert relationships == [{
+        "source": "Mara",
+        "target": "Jun",
+        "relationship_type": "distrusts",
+        "properties": {"context": "", "emotional_tone": "neutral"},
+    }]
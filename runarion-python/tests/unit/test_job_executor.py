@@ -0,0 +1,206 @@
+"""
+Unit tests for the pipeline_jobs backed JobExecutor. A fake pool keeps job
+rows in memory and answers the executor's insert, claim, finish, heartbeat
+and recovery statements, so no Postgres instance is needed.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from src.services import job_executor as job_module
+from src.services.job_executor import JobExecutor, JobType, submit_job
+
+
+class _JobStore:
+    def __init__(self):
+        self.rows = {}
+        self.lock = threading.Lock()
+
+    def add_running(self, job_id, job_type, attempts, max_attempts, payload):
+        self.rows[job_id] = {
+            'id': job_id, 'job_type': job_type, 'workspace_id': 'ws', 'payload': json.dumps(payload),
+            'status': 'running', 'attempts': attempts, 'max_attempts': max_attempts,
+            'worker_id': 'dead-worker', 'heartbeat_stale': True, 'seq': 0,
+        }
+
+
+class _FakeCursor:
+    def __init__(self, store):
+        self.store = store
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        with self.store.lock:
+            self._rows = self._execute(query, params)
+
+    def _execute(self, query, params):
+        rows = self.store.rows
+        if "to_regclass" in query:
+            return [(True,)]
+        if "INSERT INTO pipeline_jobs" in query:
+            job_id, job_type, workspace_id, payload, max_attempts = params
+            rows[job_id] = {
+                'id': job_id, 'job_type': job_type, 'workspace_id': workspace_id, 'payload': payload,
+                'status': 'queued', 'attempts': 0, 'max_attempts': max_attempts,
+                'worker_id': None, 'heartbeat_stale': False, 'seq': len(rows),
+            }
+            return []
+        if "FOR UPDATE SKIP LOCKED" in query:
+            worker_id, job_type = params
+            queued = [row for row in rows.values() if row['job_type'] == job_type and row['status'] == 'queued']
+            if not queued:
+                return []
+            row = min(queued, key=lambda r: r['seq'])
+            row.update(status='running', worker_id=worker_id, attempts=row['attempts'] + 1)
+            return [(row['id'], row['payload'], row['workspace_id'], row['attempts'], 0.5)]
+        if "heartbeat_at < NOW()" in query:
+            recovered = []
+            for row in rows.values():
+                if row['status'] == 'running' and row['heartbeat_stale']:
+                    row['status'] = 'queued' if row['attempts'] < row['max_attempts'] else 'failed'
+                    row['worker_id'] = None
+                    recovered.append((row['id'], row['job_type'], row['status'], row['payload'], 'stopped responding'))
+            return recovered
+        if "finished_at = NOW()" in query:
+            status, error_message, job_id, worker_id = params
+            row = rows.get(job_id)
+            if row and row['worker_id'] == worker_id and row['status'] == 'running':
+                row.update(status=status, error_message=error_message)
+            return []
+        if "GROUP BY job_type" in query:
+            queued = [row for row in rows.values() if row['status'] == 'queued']
+            return [('work', len(queued), len({row['workspace_id'] for row in queued}), 0, 0.0)]
+        return []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeConnection:
+    def __init__(self, store):
+        self.store = store
+
+    def cursor(self):
+        return _FakeCursor(self.store)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakePool:
+    def __init__(self, store):
+        self.store = store
+
+    def getconn(self):
+        return _FakeConnection(self.store)
+
+    def putconn(self, conn):
+        pass
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def store():
+    return _JobStore()
+
+
+def test_jobs_run_with_bounded_concurrency(store):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def handler(payload, context):
+        with lock:
+            active.append(payload['n'])
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(payload['n'])
+        if payload['n'] == 4:
+            raise RuntimeError("boom")
+
+    executor = JobExecutor(_FakePool(store), job_types={'work': JobType('work', handler, max_workers=2)})
+    assert executor.start()
+    try:
+        for n in range(5):
+            executor.submit('work', {'n': n}, workspace_id=f"ws-{n % 2}")
+
+        assert _wait_for(lambda: all(row['status'] in ('completed', 'failed') for row in store.rows.values()))
+    finally:
+        executor.stop()
+
+    assert max(peak) <= 2
+    assert sorted(row['status'] for row in store.rows.values()) == ['completed'] * 4 + ['failed']
+    metrics = executor.get_metrics()['job_types']['work']
+    assert metrics['claimed'] == 5 and metrics['completed'] == 4 and metrics['failed'] == 1
+    assert metrics['avg_wait_seconds'] == 0.5 and metrics['queue_depth'] == 0
+
+
+def test_orphaned_jobs_are_requeued_or_failed(store):
+    failures = []
+    job_type = JobType(
+        'work', lambda payload, context: None, max_workers=1, max_attempts=2,
+        on_failure=lambda payload, error, db_pool: failures.append((payload['draft_id'], error)),
+    )
+    store.add_running('retry-me', 'work', attempts=1, max_attempts=2, payload={'draft_id': 'd1'})
+    store.add_running('give-up', 'work', attempts=2, max_attempts=2, payload={'draft_id': 'd2'})
+
+    executor = JobExecutor(_FakePool(store), job_types={'work': job_type})
+
+    assert executor.recover_orphaned_jobs() == 2
+    assert store.rows['retry-me']['status'] == 'queued'
+    assert store.rows['give-up']['status'] == 'failed'
+    assert failures == [('d2', 'stopped responding')]
+
+
+def test_retried_job_sees_attempt_number(store):
+    attempts = []
+    job_type = JobType('work', lambda payload, context: attempts.append(context.is_retry), max_workers=1, max_attempts=2)
+    store.add_running('retry-me', 'work', attempts=1, max_attempts=2, payload={})
+
+    executor = JobExecutor(_FakePool(store), job_types={'work': job_type})
+    executor.start()
+    try:
+        assert _wait_for(lambda: store.rows['retry-me']['status'] == 'completed')
+    finally:
+        executor.stop()
+
+    assert attempts == [True]
+
+
+def test_submit_job_without_executor_runs_on_a_thread(monkeypatch):
+    ran = threading.Event()
+    monkeypatch.setitem(job_module._job_types, 'unqueued-test', JobType('unqueued-test', lambda payload, context: ran.set()))
+    app = Flask(__name__)
+    app.config['JOB_EXECUTOR'] = None
+
+    with app.app_context():
+        assert submit_job('unqueued-test', {}) is None
+    assert ran.wait(2)
+
+    with app.app_context(), pytest.raises(ValueError):
+        submit_job('not-registered', {})
@@ -0,0 +1,137 @@
+"""
+Unit tests for outline-first prose generation in ProseGenerationStage.
+Chapter prose and summaries come from stubs and the continuity check from a
+fake generation engine, so only planning, concurrency and reconciliation are
+exercised.
+"""
+
+import json
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from src.services.novel_writer.base_stage import PipelineStageContext
+from src.services.novel_writer.scene_generator import ProseGenerationStage
+from src.services.novel_writer.story_context import GeneratedChapter, StoryContext
+
+
+PARAGRAPH = "word " * 120
+
+
+class _FakeEngine:
+    def __init__(self, responses):
+        self.responses = responses
+        self.request = SimpleNamespace(
+            prompt="", instruction="", provider="mock",
+            generation_config=SimpleNamespace(max_output_tokens=0),
+        )
+
+    def fork(self):
+        return _FakeEngine(self.responses)
+
+    def generate(self, skip_quota=False, defer_quota=False):
+        chapter = int(self.request.prompt.split("OPENING OF CHAPTER ")[1].split(":")[0])
+        return SimpleNamespace(success=True, text=json.dumps(self.responses.get(chapter, {'consistent': True})))
+
+
+def _story_context(chapter_count):
+    story_context = StoryContext()
+    story_context.scenes = [
+        {'scene_number': n, 'title': f"Scene {n}", 'summary': f"Event {n} happens"}
+        for n in range(1, chapter_count * 2 + 1)
+    ]
+    story_context.chapters = [
+        {'chapter_number': n, 'title': f"Chapter {n}", 'start_scene': 2 * n - 1, 'end_scene': 2 * n}
+        for n in range(1, chapter_count + 1)
+    ]
+    return story_context
+
+
+def _stage(responses, prompts, active, peak):
+    lock = threading.Lock()
+    stage = ProseGenerationStage.__new__(ProseGenerationStage)
+    stage.stage_name = "ProseGenerationStage"
+    stage.logger = logging.getLogger("test.outline_first")
+    stage.generation_engine = _FakeEngine(responses)
+    stage.update_draft_metadata = lambda draft_id, updates: None
+
+    def generate_chapter(prompt, target_word_count):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            prompts.append(prompt)
+        try:
+            time.sleep(0.05)
+            if "CHAPTER: 3 of" in prompt:
+                return ""
+            chapter = prompt.split("CHAPTER: ")[1].split(" of")[0]
+            return f"Opening of chapter {chapter}. {PARAGRAPH}\n\n{PARAGRAPH}\n\nEnding of chapter {chapter}."
+        finally:
+            with lock:
+                active[0] -= 1
+
+    stage._build_generation_prompt = lambda story_context, chapter_context, number, title, total, target: (
+        f"CHAPTER: {number} of {total}\n" + "\n".join(s['summary'] for s in chapter_context['previous_summaries'])
+    )
+    stage._generate_chapter = generate_chapter
+    stage._generate_chapter_summary = lambda content, number: f"Actual summary {number}"
+    stage.CONTINUITY_EXCERPT_CHARS = 200
+    return stage
+
+
+def test_planned_summaries_come_from_scenes():
+    story_context = _story_context(2)
+
+    planned = story_context.build_planned_summaries()
+
+    assert planned == {1: "Event 1 happens. Event 2 happens.", 2: "Event 3 happens. Event 4 happens."}
+    context = story_context.get_chapter_context(2, planned=True)
+    assert context['previous_summaries'] == [
+        {'chapter': 1, 'title': "Chapter 1", 'summary': "Event 1 happens. Event 2 happens."}
+    ]
+
+
+def test_outline_first_writes_chapters_concurrently_and_reconciles_openings():
+    prompts, active, peak = [], [0], [0]
+    story_context = _story_context(6)
+    revised = "Revised opening of chapter 5. " + "word " * 59 + "word"
+    stage = _stage({5: {'consistent': False, 'issues': ["wrong room"], 'revised_opening': revised}},
+                   prompts, active, peak)
+    context = PipelineStageContext(
+        "draft", config={'outline_first': True, 'chapter_workers': 3}, story_context=story_context
+    )
+
+    result = stage._execute_stage(context)
+
+    assert result.success
+    assert result.data['chapters_generated'] == 5
+    assert result.data['chapters_failed'] == 1
+    assert 1 < peak[0] <= 3
+    # Every chapter was written against planned summaries, never generated ones
+    assert not any("Actual summary" in prompt for prompt in prompts)
+    assert any("Event 7 happens" in prompt for prompt in prompts)
+
+    # Chapter 3 fell back, so only 1-2, 4-5 and 5-6 are checked
+    assert result.data['continuity_checks'] == 3
+    assert result.data['continuity_revisions'] == 1
+    chapter_5 = story_context.generated_chapters[5]
+    assert chapter_5.content.startswith(revised)
+    assert chapter_5.content.endswith("Ending of chapter 5.")
+    assert story_context.generated_chapters[4].content.startswith("Opening of chapter 4.")
+    assert "fallback" in story_context.generated_chapters[3].summary
+
+
+def test_sequential_mode_uses_generated_summaries():
+    prompts, active, peak = [], [0], [0]
+    story_context = _story_context(2)
+    stage = _stage({}, prompts, active, peak)
+    context = PipelineStageContext("draft", config={}, story_context=story_context)
+
+    result = stage._execute_stage(context)
+
+    assert result.success
+    assert "Actual summary 1" in prompts[1]
+    assert peak[0] == 1
+    assert 'outline_first' not in result.data
+    assert isinstance(story_context.generated_chapters[2], GeneratedChapter)
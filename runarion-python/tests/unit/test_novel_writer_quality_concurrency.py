@@ -0,0 +1,142 @@
+"""
+Unit tests for concurrent chapter assessment (Stage 3) and improvement
+(Stage 4) in the novel writer. LLM-backed methods are replaced with stubs
+that finish out of chapter order, so only fan-out, aggregation order and
+telemetry ordering are exercised.
+"""
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from src.services.novel_writer.base_stage import PipelineStageContext, PipelineStageResult
+from src.services.novel_writer.orchestrator import NovelWriterOrchestrator
+from src.services.novel_writer.stage_3_quality import ALL_DIMENSIONS, QualityAssessmentStage
+from src.services.novel_writer.stage_4_improvement import SceneImprovementStage
+from src.services.novel_writer.story_context import GeneratedChapter, StoryContext
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.request = SimpleNamespace(provider="mock")
+
+    def fork(self):
+        return _FakeEngine()
+
+
+def _story_context(chapter_count):
+    story_context = StoryContext()
+    for n in range(1, chapter_count + 1):
+        story_context.generated_chapters[n] = GeneratedChapter(
+            chapter_number=n, title=f"Chapter {n}", content=f"content {n}", word_count=2,
+        )
+    return story_context
+
+
+def _stage(stage_cls, name):
+    stage = stage_cls.__new__(stage_cls)
+    stage.stage_name = name
+    stage.logger = logging.getLogger(f"test.{name}")
+    stage.generation_engine = _FakeEngine()
+    return stage
+
+
+def _tracked(active, peak, lock, delay):
+    with lock:
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+    time.sleep(delay)
+    with lock:
+        active[0] -= 1
+
+
+def test_assessments_run_concurrently_and_aggregate_in_chapter_order():
+    active, peak, lock = [0], [0], threading.Lock()
+    story_context = _story_context(5)
+    stage = _stage(QualityAssessmentStage, "QualityAssessmentStage")
+
+    def assess(story_context, chapter, chapter_number):
+        # Earlier chapters finish last
+        _tracked(active, peak, lock, 0.02 * (6 - chapter_number))
+        if chapter_number == 2:
+            return None
+        score = 4.0 if chapter_number % 2 else 8.0
+        return {'overall_score': score, 'scores': {dim: score for dim in ALL_DIMENSIONS}, 'feedback': {}}
+
+    stage._assess_chapter = assess
+    stage._run_deterministic_checks = lambda story_context, number, content, perspective: {}
+    stage._blend_deterministic_scores = lambda assessment, checks: {
+        'downgraded_dimensions': ['scene_coverage'] if assessment['overall_score'] < 6 else []
+    }
+    context = PipelineStageContext(
+        "draft", config={'quality_threshold': 6.0, 'assessment_workers': 3}, story_context=story_context
+    )
+
+    result = stage._execute_stage(context)
+
+    assert result.success
+    assert 1 < peak[0] <= 3
+    assessments = context.get('quality_assessments')
+    assert list(assessments) == [1, 2, 3, 4, 5]
+    assert assessments[2]['assessment_error'] is True
+    assert result.data['chapters_needing_improvement'] == 4
+    assert result.data['average_score'] == round((4 + 4 + 8 + 4) / 5, 2)
+    assert [f['chapter'] for f in result.data['deterministic_gate_outcomes']['chapters_failing']] == [1, 3, 5]
+    assert result.data['degradation_report']['llm_assessment_failures'] == 1
+    assert result.data['degradation_report']['deterministic_downgrades']['scene_coverage'] == 3
+
+
+def test_improvements_run_concurrently_and_apply_in_chapter_order():
+    active, peak, lock = [0], [0], threading.Lock()
+    story_context = _story_context(4)
+    stage = _stage(SceneImprovementStage, "SceneImprovementStage")
+    passes = []
+
+    def improve(story_context, content, assessment, chapter_number):
+        _tracked(active, peak, lock, 0.02 * (5 - chapter_number))
+        with lock:
+            passes.append(chapter_number)
+        return f"{content} improved"
+
+    # Chapter 3 never scores higher, so only its first pass runs
+    stage._improve_chapter = improve
+    stage._quick_score_check = lambda content, story_context: (
+        3.0 if content.startswith("content 3") else 3.0 + content.count("improved")
+    )
+    context = PipelineStageContext(
+        "draft",
+        config={'max_improvement_passes': 2, 'improvement_workers': 4},
+        story_context=story_context,
+        quality_assessments={
+            n: {'overall_score': 3.0, 'needs_improvement': n != 2} for n in range(1, 5)
+        } | {9: {'overall_score': 1.0, 'needs_improvement': True}},
+    )
+
+    result = stage._execute_stage(context)
+
+    assert result.success
+    assert 1 < peak[0] <= 3
+    assert [d['chapter'] for d in result.data['improvement_details']] == [1, 3, 4]
+    assert result.data['chapters_improved'] == 2
+    assert result.data['chapters_failed'] == 2  # Chapter 3 did not improve; chapter 9 is missing
+    assert result.data['total_passes'] == 5
+    assert story_context.generated_chapters[1].content == "content 1 improved improved"
+    assert story_context.generated_chapters[2].content == "content 2"
+    assert story_context.generated_chapters[3].content == "content 3"
+
+
+def test_quality_telemetry_lists_chapters_in_order():
+    orchestrator = NovelWriterOrchestrator.__new__(NovelWriterOrchestrator)
+    stage_3 = PipelineStageResult.success_result(
+        "QualityAssessmentStage",
+        deterministic_gate_outcomes={'chapters_failing': [{'chapter': 4}, {'chapter': 2}]},
+    )
+
+    telemetry = orchestrator._build_quality_telemetry(
+        None, stage_3, None, [{'chapter': 7}, {'chapter': 3}], 6.0, True
+    )
+
+    assert [f['chapter'] for f in telemetry['hard_gate_failures']] == [3, 7]
+    initial = telemetry['quality_assessment']['initial']
+    assert [f['chapter'] for f in initial['deterministic_gate_outcomes']['chapters_failing']] == [2, 4]
@@ -232,6 +232,68 @@ def test_story_context_string_characters():
     print("  String characters handling: OK")
 
 
+def test_story_context_indexed_lookups():
+    """Test scene, chapter, character and thread lookups go through the indexes."""
+    ctx = StoryContext()
+    ctx.scenes = [
+        {'scene_number': 1, 'characters': ['Alice', 'Bob']},
+        {'scene_number': 2, 'characters': 'Alice'},
+        {'scene_number': 4, 'characters': []},
+    ]
+    ctx.chapters = [{'chapter_number': 1, 'start_scene': 1, 'end_scene': 4}]
+    ctx.plot_threads = [
+        {'report_subject': 'Legacy', 'content_json': json.dumps({'scenes': ['4']})},
+        {'report_subject': 'Early', 'content_json': {'scenes': [1, 2]}},
+    ]
+
+    assert ctx.get_scene(2)['characters'] == 'Alice'
+    assert ctx.get_scene(3) is None
+    assert [s['scene_number'] for s in ctx.get_scenes_in_range(2, 10)] == [2, 4]
+    assert ctx.get_chapter(1) is ctx.chapters[0]
+    assert ctx.get_character_scenes('Alice') == [1, 2]
+    assert [t['report_subject'] for t in ctx._get_active_threads(3, 4)] == ['Legacy']
+    assert [t['report_subject'] for t in ctx._get_active_threads(1, 4)] == ['Legacy', 'Early']
+
+    # Appending to or replacing a list rebuilds the indexes
+    ctx.scenes.append({'scene_number': 3, 'characters': ['Bob']})
+    assert ctx.get_character_scenes('Bob') == [1, 3]
+    ctx.scenes = [{'scene_number': 7}]
+    assert ctx.get_scene(1) is None
+    assert ctx.get_scene(7) == {'scene_number': 7}
+
+    print("  Indexed lookups: OK")
+
+
+def test_story_context_previous_summaries_out_of_order():
+    """Test previous_summaries picks the nearest earlier chapters whatever the insertion order."""
+    ctx = StoryContext()
+    ctx.chapters = [
+        {'chapter_number': i, 'start_scene': i, 'end_scene': i}
+        for i in range(1, 7)
+    ]
+    for i in (6, 1, 4, 2):
+        ctx.generated_chapters[i] = GeneratedChapter(
+            chapter_number=i, title=f'Ch {i}', content='...', word_count=1, summary=f'Summary {i}'
+        )
+
+    summaries = ctx.get_chapter_context(5)['previous_summaries']
+    assert [s['chapter'] for s in summaries] == [1, 2, 4]
+
+    print("  previous_summaries (out of order): OK")
+
+
+def test_story_context_dataclasses_use_slots():
+    """Test the per-entity dataclasses are slotted and reject unknown attributes."""
+    chapter = GeneratedChapter(chapter_number=1, title='T', content='c', word_count=1)
+
+    for obj in (CharacterProfile(name='A'), LocationProfile(name='B'), chapter):
+        assert not hasattr(obj, '__dict__')
+    with pytest.raises(AttributeError):
+        chapter.notes = 'not a field'
+
+    print("  Slotted dataclasses: OK")
+
+
 # ─── Dataclass Tests ───────────────────────────────────────────────────────────
 
 def test_character_profile_defaults():
@@ -0,0 +1,130 @@
+"""
+Unit tests for the pipeline progress event bus and its SSE response.
+Each test gets a fresh in-process bus; the LISTEN/NOTIFY relay is exercised
+through _relay() with hand-built payloads, so no Postgres is needed.
+"""
+
+import json
+import threading
+
+import pytest
+from flask import Flask
+
+from src.utils import progress_events
+from src.utils.progress_events import (
+    ItemProgress,
+    ProgressEventBus,
+    get_progress_bus,
+    progress_stream_response,
+    progress_timestamp,
+    publish_progress,
+    stream_progress,
+)
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    fresh = ProgressEventBus()
+    monkeypatch.setattr(progress_events, '_progress_bus', fresh)
+    return fresh
+
+
+def _drain(subscription):
+    events = []
+    while True:
+        event = subscription.get(timeout=0)
+        if event is None:
+            return events
+        events.append(event)
+
+
+def test_subscribers_receive_events_and_replay_of_recent_ones(bus):
+    publish_progress("draft-1", "stage_start", stage_name="TextCleaningStage")
+    publish_progress("draft-2", "stage_start", stage_name="other")
+
+    subscription = bus.subscribe(["draft-1"])
+    publish_progress("draft-1", "stage_complete", stage_name="TextCleaningStage")
+    publish_progress(None, "stage_start")  # ignored
+
+    events = _drain(subscription)
+    assert [e['event'] for e in events] == ['stage_start', 'stage_complete']
+    assert all(e['run_key'] == 'draft-1' for e in events)
+
+    bus.unsubscribe(subscription)
+    assert bus.stats()['subscriptions'] == 0
+
+
+def test_item_progress_is_throttled_but_always_reports_completion(bus, monkeypatch):
+    monkeypatch.setattr(ItemProgress, 'MIN_INTERVAL_SECONDS', 3600)
+    subscription = bus.subscribe(["draft-1"])
+    progress = ItemProgress("draft-1", "SceneBySceneAnalysisStage", total=50)
+
+    workers = [threading.Thread(target=lambda: [progress.advance() for _ in range(10)]) for _ in range(5)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    events = _drain(subscription)
+    assert [(e['completed'], e['total']) for e in events] == [(1, 50), (50, 50)]
+
+
+def test_relayed_events_skip_own_notifications(bus):
+    subscription = bus.subscribe(["run-1"])
+
+    bus._relay(json.dumps({'run_key': 'run-1', 'event': 'pipeline_run', 'status': 'running', 'origin': bus.origin}))
+    bus._relay(json.dumps({'run_key': 'run-1', 'event': 'pipeline_run', 'status': 'running', 'origin': 'other'}))
+    bus._relay("not json")
+
+    events = _drain(subscription)
+    assert len(events) == 1 and 'origin' not in events[0]
+    assert bus.stats()['relayed'] == 1
+
+
+def test_stream_ends_on_terminal_event_and_streams_are_capped(bus, monkeypatch):
+    monkeypatch.setattr(bus, '_stream_slots', threading.BoundedSemaphore(1))
+    app = Flask(__name__)
+
+    @app.route('/events/<run_key>')
+    def events(run_key):
+        snapshot = {'run_key': run_key, 'event': 'status', 'status': 'processing'}
+        return progress_stream_response(
+            [run_key], [snapshot], lambda event: event.get('status') in ('completed', 'failed')
+        )
+
+    publish_progress("draft-1", "item_progress", stage_name="TextCleaningStage", completed=2, total=4)
+    publish_progress("draft-1", "status", status="completed")
+
+    client = app.test_client()
+    response = client.get('/events/draft-1', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+
+    assert client.get('/events/draft-2').status_code == 503  # The only slot is held
+
+    body = response.get_data(as_text=True)
+    response.close()
+    messages = [line[len('event: '):] for line in body.splitlines() if line.startswith('event: ')]
+    assert messages == ['status', 'item_progress', 'status']
+    assert '"status":"completed"' in body
+
+    assert get_progress_bus().acquire_stream_slot()  # Released when the stream closed
+
+
+def test_terminal_event_of_earlier_attempt_is_not_replayed(bus):
+    def is_terminal(event):
+        return event.get('event') == 'status' and event.get('status') in ('completed', 'failed')
+
+    # The previous attempt on this draft failed; a retry is now running
+    publish_progress("draft-1", "status", status="failed", error_message="first attempt")
+    snapshot = {'run_key': 'draft-1', 'event': 'status', 'timestamp': progress_timestamp(), 'status': 'processing'}
+    publish_progress("draft-1", "stage_start", stage_name="TextCleaningStage")
+
+    stream = stream_progress(["draft-1"], [snapshot], is_terminal, heartbeat_seconds=0.01, max_seconds=5)
+    assert next(stream).startswith("retry:")
+    assert '"status":"processing"' in next(stream)
+    assert '"stage_start"' in next(stream)
+    assert next(stream) == ": keep-alive\n\n"  # Stale failure was dropped, the stream stays open
+
+    publish_progress("draft-1", "status", status="completed")
+    assert '"status":"completed"' in next(stream)
+    assert list(stream) == []
@@ -0,0 +1,125 @@
+"""
+Unit tests for provider client reuse and the keyed GenerationEngine cache.
+The OpenAI SDK client is replaced with a counting fake; no network calls are made.
+"""
+
+import pytest
+from flask import Flask
+
+from src.models.request import BaseGenerationRequest, CallerInfo, GenerationConfig
+from src.providers.client_registry import ProviderClientRegistry
+from src.providers.openai_provider import OpenAIProvider
+from src.services.generation_engine import GenerationEngine
+
+
+class _FakeOpenAI:
+    created = 0
+
+    def __init__(self, api_key):
+        type(self).created += 1
+        self.api_key = api_key
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registries(monkeypatch):
+    _FakeOpenAI.created = 0
+    monkeypatch.setattr("src.providers.openai_provider.OpenAI", _FakeOpenAI)
+    ProviderClientRegistry.clear()
+    GenerationEngine.clear_cache()
+    app = Flask("client-reuse-test")
+    with app.app_context():
+        yield
+    ProviderClientRegistry.clear()
+    GenerationEngine.clear_cache()
+
+
+def _request(prompt="hello", api_key="sk-test-a", model="gpt-4o-mini", provider="openai", **config):
+    api_keys = {provider: api_key} if api_key else {}
+    return BaseGenerationRequest(
+        provider=provider,
+        model=model,
+        prompt=prompt,
+        instruction=f"instruction for {prompt}",
+        generation_config=GenerationConfig(**config),
+        caller=CallerInfo(user_id="1", workspace_id="ws-1", project_id="proj-1", api_keys=api_keys),
+    )
+
+
+def test_engines_share_one_client_per_provider_key_and_model():
+    first = GenerationEngine(_request())
+    second = GenerationEngine(_request(prompt="again"))
+    other_key = GenerationEngine(_request(api_key="sk-test-b"))
+    other_model = GenerationEngine(_request(model="gpt-4o"))
+
+    assert first.provider_instance.client is second.provider_instance.client
+    assert other_key.provider_instance.client is not first.provider_instance.client
+    assert other_model.provider_instance.client is not first.provider_instance.client
+    assert _FakeOpenAI.created == 3
+    assert ProviderClientRegistry.stats() == {"hits": 1, "misses": 3, "clients": 3}
+
+
+def test_for_request_rebinds_request_without_rebuilding_provider(monkeypatch):
+    inits = []
+    original_init = OpenAIProvider.__init__
+
+    def _counting_init(self, request):
+        inits.append(request)
+        original_init(self, request)
+
+    monkeypatch.setattr(OpenAIProvider, "__init__", _counting_init)
+
+    first_request, second_request = _request(prompt="one"), _request(prompt="two")
+    first = GenerationEngine.for_request(first_request)
+    second = GenerationEngine.for_request(second_request)
+
+    assert len(inits) == 1
+    assert first is not second
+    assert first.request is first_request and second.request is second_request
+    assert first.provider_instance is not second.provider_instance
+    assert first.provider_instance.client is second.provider_instance.client
+    assert second.provider_instance.prompt == "two"
+    assert second.provider_instance.instruction == "instruction for two"
+    assert first.provider_instance.instruction == "instruction for one"
+
+
+def test_mixed_case_provider_key_is_not_reused_for_keyless_requests(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-default")
+
+    own = GenerationEngine.for_request(_request(provider="OpenAI", api_key="sk-own"))
+    keyless = GenerationEngine.for_request(_request(api_key=None))
+
+    assert own.provider_instance.key_used == "own"
+    assert own.provider_instance.api_key == "sk-own"
+    assert keyless.provider_instance.key_used == "default"
+    assert keyless.provider_instance.api_key == "sk-default"
+    assert keyless.provider_instance.client is not own.provider_instance.client
+
+
+def test_bias_is_tokenized_once_per_request_and_not_on_fork(monkeypatch):
+    calls = []
+
+    def _tokenize_phrase_bias(phrase_bias, model):
+        calls.append("bias")
+        return [{"101": value} for item in phrase_bias for value in item.values()]
+
+    def _tokenize_banned(banned_tokens, model):
+        calls.append("banned")
+        return [202 for _ in banned_tokens]
+
+    monkeypatch.setattr("src.providers.base_provider.TokenizerManager.tokenize_phrase_bias", _tokenize_phrase_bias)
+    monkeypatch.setattr("src.providers.base_provider.TokenizerManager.tokenize_banned_tokens", _tokenize_banned)
+
+    first = _request(phrase_bias=[{"dragon": -2.0}], banned_tokens=["moist"])
+    second = _request(phrase_bias=[{"dragon": -2.0}], banned_tokens=["moist"])
+    engine = GenerationEngine.for_request(first)
+    GenerationEngine.for_request(second)
+
+    assert calls == ["bias", "banned", "bias", "banned"]
+    assert first.generation_config.phrase_bias == [{"101": -2.0}]
+    assert second.generation_config.banned_tokens == [202]
+
+    forked = engine.fork()
+    assert len(calls) == 4
+    assert forked.request is not first
+    assert forked.request.generation_config.phrase_bias == [{"101": -2.0}]
+    assert forked.request.generation_config.banned_tokens == [202]
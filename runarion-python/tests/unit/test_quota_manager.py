@@ -0,0 +1,207 @@
+"""
+Unit tests for the shared QuotaManager: pool resolution, quota caching and
+batched decrements for deferred (skip_quota + defer_quota) pipeline calls.
+Uses an in-memory fake pool that mimics the workspaces table.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from src.models.request import BaseGenerationRequest, CallerInfo, GenerationConfig
+from src.providers.openai_provider import OpenAIProvider
+from src.services import quota_manager as quota_module
+from src.services.quota_manager import QuotaManager, get_quota_manager
+
+
+class _WorkspaceConnection:
+    def __init__(self, store):
+        self.store = store
+        self.commits = 0
+
+    def cursor(self):
+        return _WorkspaceCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class _WorkspaceCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        store = self.conn.store
+        store.queries.append(query)
+        if store.fail:
+            raise RuntimeError("db down")
+        if query.strip().startswith("SELECT"):
+            workspace = store.workspaces.get(params[0])
+            self._row = (workspace["is_active"], workspace["quota"]) if workspace else None
+        elif "GREATEST" in query:
+            count, workspace_id = params
+            workspace = store.workspaces.get(workspace_id)
+            if workspace:
+                workspace["quota"] = max(workspace["quota"] - count, 0)
+            self._row = (workspace["quota"],) if workspace else None
+        else:
+            count, workspace_id, minimum = params
+            workspace = store.workspaces.get(workspace_id)
+            if workspace and workspace["quota"] >= minimum:
+                workspace["quota"] -= count
+                self._row = (workspace["quota"],)
+            else:
+                self._row = None
+
+    def fetchone(self):
+        return self._row
+
+
+class _WorkspacePool:
+    def __init__(self, **workspaces):
+        self.workspaces = {key: {"is_active": True, "quota": quota} for key, quota in workspaces.items()}
+        self.queries = []
+        self.fail = False
+        self.checked_out = 0
+
+    def getconn(self):
+        self.checked_out += 1
+        return _WorkspaceConnection(self)
+
+    def putconn(self, conn):
+        self.checked_out -= 1
+
+
+def _caller(workspace_id="ws-1"):
+    return CallerInfo(user_id="1", workspace_id=workspace_id, project_id="proj-1", api_keys={})
+
+
+def test_check_quota_is_cached_within_ttl(monkeypatch):
+    db_pool = _WorkspacePool(**{"ws-1": 50})
+    manager = QuotaManager(db_pool)
+    clock = [100.0]
+    monkeypatch.setattr(quota_module.time, "monotonic", lambda: clock[0])
+
+    assert manager.check_quota(_caller()) == 50
+    assert manager.check_quota(_caller()) == 50
+    assert len(db_pool.queries) == 1
+
+    clock[0] += manager.CACHE_TTL_SECONDS + 1
+    db_pool.workspaces["ws-1"]["quota"] = 40
+    assert manager.check_quota(_caller()) == 40
+    assert len(db_pool.queries) == 2
+    assert db_pool.checked_out == 0
+
+
+def test_update_quota_tolerates_stale_expected_value_and_refreshes_cache():
+    db_pool = _WorkspacePool(**{"ws-1": 10})
+    manager = QuotaManager(db_pool)
+
+    expected = manager.check_quota(_caller())
+    db_pool.workspaces["ws-1"]["quota"] = 7  # Another process spent quota meanwhile
+    manager.update_quota(_caller(), expected_quota=expected, quota_generation_count=1)
+
+    assert db_pool.workspaces["ws-1"]["quota"] == 6
+    assert manager.check_quota(_caller()) == 6
+    assert sum(query.strip().startswith("SELECT") for query in db_pool.queries) == 1
+
+    db_pool.workspaces["ws-1"]["quota"] = 0
+    with pytest.raises(RuntimeError, match="Insufficient quota"):
+        manager.update_quota(_caller(), expected_quota=6)
+
+
+def test_deferred_usage_is_flushed_in_batches(monkeypatch):
+    db_pool = _WorkspacePool(**{"ws-1": 100, "ws-2": 5})
+    manager = QuotaManager(db_pool)
+    monkeypatch.setattr(QuotaManager, "USAGE_FLUSH_THRESHOLD", 5)
+    monkeypatch.setattr(QuotaManager, "USAGE_FLUSH_INTERVAL_SECONDS", 3600)
+
+    for _ in range(4):
+        manager.record_usage(_caller("ws-1"))
+    assert db_pool.queries == []
+    manager.record_usage(_caller("ws-2"), 8)
+
+    # ws-2 crossed the threshold on its own call; both workspaces flushed together
+    assert db_pool.workspaces["ws-1"]["quota"] == 96
+    assert db_pool.workspaces["ws-2"]["quota"] == 0
+    assert len(db_pool.queries) == 2
+
+    manager.record_usage(_caller("ws-1"))
+    assert manager.flush_usage() == 1
+    assert db_pool.workspaces["ws-1"]["quota"] == 95
+
+
+def test_failed_flush_requeues_usage():
+    db_pool = _WorkspacePool(**{"ws-1": 20})
+    manager = QuotaManager(db_pool)
+    manager.record_usage(_caller(), 3)
+
+    db_pool.fail = True
+    assert manager.flush_usage() == 0
+    db_pool.fail = False
+    assert manager.flush_usage() == 3
+    assert db_pool.workspaces["ws-1"]["quota"] == 17
+
+
+def test_shared_manager_uses_app_connection_pool(monkeypatch):
+    monkeypatch.setattr(quota_module, "_quota_manager", None)
+    app_pool = _WorkspacePool(**{"ws-1": 3})
+    app = Flask("quota-test")
+    app.config["CONNECTION_POOL"] = app_pool
+
+    with app.app_context():
+        manager = get_quota_manager()
+        assert get_quota_manager() is manager
+        assert manager.connection_pool is app_pool
+        assert manager.check_quota(_caller()) == 3
+
+
+class _RecordingQuotaManager:
+    def __init__(self):
+        self.recorded = []
+
+    def record_usage(self, caller, quota_generation_count=1):
+        self.recorded.append((caller.workspace_id, quota_generation_count))
+
+
+class _FakeCompletions:
+    def create(self, **kwargs):
+        message = SimpleNamespace(content="rewritten")
+        return SimpleNamespace(id="resp-1", choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=None)
+
+
+def _provider():
+    provider = OpenAIProvider.__new__(OpenAIProvider)
+    provider.request = BaseGenerationRequest(
+        usecase="editor", provider="openai", model="gpt", prompt="text", instruction="",
+        generation_config=GenerationConfig(max_output_tokens=100), caller=_caller(),
+    )
+    provider.instruction = ""
+    provider.model, provider.key_used = "gpt", "default"
+    provider.client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions()))
+    provider.quota_manager = _RecordingQuotaManager()
+    return provider
+
+
+def test_only_pipeline_calls_defer_skip_quota_usage():
+    app = Flask("quota-test")
+    with app.app_context():
+        # Editor rewrite/enhance endpoints: skip_quota alone stays free
+        editor = _provider()
+        assert editor.generate(skip_quota=True).success
+        assert editor.quota_manager.recorded == []
+
+        pipeline = _provider()
+        assert pipeline.generate(skip_quota=True, defer_quota=True).success
+        assert pipeline.quota_manager.recorded == [("ws-1", 1)]
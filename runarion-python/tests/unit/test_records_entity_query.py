@@ -0,0 +1,164 @@
+"""
+Unit tests for RecordsManager's typed entity query and its vertex cache.
+A fake connection answers the novel_graph_vertices metadata query and the
+Cypher vertex read from in-memory rows, so no Postgres/AGE instance is needed.
+"""
+
+import json
+import re
+from datetime import datetime
+
+import pytest
+
+from src.services import records_manager as records_module
+from src.services.graph_database_service import GraphDatabaseService
+from src.services.records_manager import RecordsManager
+
+
+class _GraphStore:
+    def __init__(self):
+        self.metadata = []  # (vertex_id, entity_type, created_at, updated_at)
+        self.vertices = {}  # vertex_id -> (name, properties)
+        self.queries = []
+
+    def add(self, vertex_id, name, entity_type, properties=None, updated_at=1):
+        self.metadata.append((vertex_id, entity_type, datetime(2025, 1, 1), updated_at))
+        self.vertices[vertex_id] = (name, properties or {})
+
+    def cypher_queries(self):
+        return [query for query in self.queries if "cypher(" in query]
+
+
+class _FakeCursor:
+    def __init__(self, store):
+        self.store = store
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        self.store.queries.append(query)
+        if "current_setting" in query:
+            self._rows = [("public",)]
+        elif "extversion" in query:
+            self._rows = [("1.6.0",)]
+        elif "ag_graph" in query:
+            self._rows = [(True,)]
+        elif "FROM novel_graph_vertices" in query:
+            wanted = set(params[1]) if len(params) > 1 else None
+            self._rows = [
+                row for row in self.store.metadata
+                if row[1].lower() != "interaction"
+                and (wanted is None or row[1].lower().replace("_", " ").replace("-", " ") in wanted)
+            ]
+        elif "cypher(" in query:
+            match = re.search(r"id\(v\) IN \[([\d, ]+)\]", query)
+            ids = {int(value) for value in match.group(1).split(",")} if match else set(self.store.vertices)
+            self._rows = [
+                (json.dumps(name), json.dumps(props), vertex_id)
+                for vertex_id, (name, props) in self.store.vertices.items()
+                if vertex_id in ids
+            ]
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeConnection:
+    def __init__(self, store):
+        self.store = store
+
+    def cursor(self):
+        return _FakeCursor(self.store)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakePool:
+    def __init__(self, store):
+        self.store = store
+
+    def getconn(self):
+        return _FakeConnection(self.store)
+
+    def putconn(self, conn):
+        pass
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(GraphDatabaseService, "_validate_age_setup", lambda self: None)
+    monkeypatch.setattr(records_module, "_entity_cache", None)
+    store = _GraphStore()
+    store.add(1, "Aria", "character", {"_settings": json.dumps({"color": "red"})})
+    store.add(2, "Harbor", "location")
+    store.add(3, "Chapter 1", "record_keeper", {"chapter_number": 1})
+    store.add(4, "Scan", "_scan_metadata")
+    store.add(5, "Aria-Bren", "interaction")
+    return store
+
+
+def test_type_filter_runs_in_sql_and_reads_only_matching_vertices(store):
+    manager = RecordsManager(_FakePool(store))
+
+    entities = manager.get_project_entities("proj-1", entity_type="Record-Keeper")
+
+    assert [entity["name"] for entity in entities] == ["Chapter 1"]
+    assert entities[0]["vertex_id"] == "3" and entities[0]["type"] == "record_keeper"
+    cypher = store.cypher_queries()
+    assert len(cypher) == 1 and "id(v) IN [3]" in cypher[0]
+
+
+def test_unfiltered_query_matches_legacy_shape(store):
+    manager = RecordsManager(_FakePool(store))
+
+    entities = manager.get_project_entities("proj-1")
+
+    assert [entity["vertex_id"] for entity in entities] == ["1", "2", "3", "4"]
+    assert entities[0]["properties"]["_settings"] == {"color": "red"}
+    assert entities[0]["created_at"] == "2025-01-01T00:00:00"
+    assert list(entities[0]) == ["vertex_id", "name", "properties", "type", "created_at"]
+
+
+def test_unchanged_vertices_are_served_from_cache(store):
+    manager = RecordsManager(_FakePool(store))
+    manager.get_project_entities("proj-1")
+    entities = manager.get_project_entities("proj-1")
+    entities[0]["properties"]["mutated"] = True
+
+    assert len(store.cypher_queries()) == 1
+    assert "mutated" not in manager.get_project_entities("proj-1")[0]["properties"]
+
+    # A write from elsewhere bumps updated_at; only that vertex is re-read
+    store.vertices[2] = ("Old Harbor", {})
+    store.metadata[1] = (2, "location", datetime(2025, 1, 1), 2)
+    entities = manager.get_project_entities("proj-1")
+
+    assert entities[1]["name"] == "Old Harbor"
+    assert "id(v) IN [2]" in store.cypher_queries()[-1]
+
+
+def test_entity_writes_invalidate_project_cache(store, monkeypatch):
+    manager = RecordsManager(_FakePool(store))
+    manager.get_project_entities("proj-1")
+    assert len(store.cypher_queries()) == 1
+
+    manager.update_entity("proj-1", 1, entity_name="Aria Vale")
+    manager.get_project_entities("proj-1")
+
+    # update_entity's own Cypher SET plus a full re-read of the project's vertices
+    assert len(store.cypher_queries()) == 3
+    assert records_module.get_entity_cache().get_many("proj-1", {1: 1}) != {}
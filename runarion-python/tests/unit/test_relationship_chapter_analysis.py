@@ -0,0 +1,73 @@
+"""
+Unit tests for the concurrent chapter fan-out in
+SentimentAnalyzerService.analyze_relationship_by_chapters. Per-chapter
+analysis and synthesis are replaced with stubs, so only ordering,
+streaming and worker bounds are exercised.
+"""
+
+import threading
+import time
+
+from src.services.sentiment_analyzer_service import SentimentAnalyzerService
+
+
+CHAPTERS = [
+    {'order': 0, 'chapter_name': 'One', 'content': "slow"},
+    {'order': '1', 'chapter_name': 'Two', 'content': "fast"},
+    {'order': 2, 'chapter_name': 'Three', 'content': "   "},
+    {'order': 3, 'chapter_name': 'Four', 'content': "fast"},
+    {'order': 4, 'chapter_name': 'Five', 'content': "fails"},
+]
+
+
+def _service(active, peak):
+    lock = threading.Lock()
+    service = SentimentAnalyzerService.__new__(SentimentAnalyzerService)
+
+    def analyze(chapter_name, chapter_number, chapter_content, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            time.sleep(0.2 if chapter_content == "slow" else 0.02)
+            if chapter_content == "fails":
+                raise RuntimeError("provider error")
+            return {'chapter_number': chapter_number, 'chapter_name': chapter_name, 'sentiment_score': 10}
+        finally:
+            with lock:
+                active[0] -= 1
+
+    service._analyze_single_chapter = analyze
+    service._synthesize_overall_relationship = lambda chapter_analyses, **kwargs: {
+        'overall_sentiment': len(chapter_analyses)
+    }
+    return service
+
+
+def test_chapters_run_concurrently_and_keep_chapter_order():
+    active, peak, streamed = [0], [0], []
+    service = _service(active, peak)
+
+    result = service.analyze_relationship_by_chapters(
+        "project", "workspace", "Alice", "Bob", CHAPTERS, provider="mock", max_workers=3,
+        on_chapter_result=lambda analysis: streamed.append(analysis['chapter_number']),
+    )
+
+    assert result['success'] is True
+    assert [a['chapter_number'] for a in result['chapter_analyses']] == [1, 2, 4]
+    assert result['overall'] == {'overall_sentiment': 3}
+    assert streamed[-1] == 1  # The slow first chapter is reported last
+    assert sorted(streamed) == [1, 2, 4]
+    assert 1 < peak[0] <= 3
+
+
+def test_single_worker_runs_sequentially():
+    active, peak = [0], [0]
+    service = _service(active, peak)
+
+    result = service.analyze_relationship_by_chapters(
+        "project", "workspace", "Alice", "Bob", CHAPTERS, provider="mock", max_workers=1,
+    )
+
+    assert [a['chapter_number'] for a in result['chapter_analyses']] == [1, 2, 4]
+    assert peak[0] == 1
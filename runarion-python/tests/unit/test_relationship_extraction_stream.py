@@ -0,0 +1,110 @@
+"""
+Unit tests for the streamed relationship extraction routes. The sentiment
+service is replaced with a stub whose extraction waits on an event, so the
+fetch and resume routes are exercised before and after it finishes; the
+progress bus is a fresh in-process one.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+from flask import Flask
+
+from src.api import auditor as auditor_api
+from src.utils import progress_events
+from src.utils.progress_events import ProgressEventBus
+
+RESULT = {'success': True, 'relationships': [{'source': 'Alice', 'target': 'Bob'}], 'total_pairs': 1}
+
+
+class _StubSentimentService:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def extract_relationships_v2(self, on_chapter_result=None, **kwargs):
+        on_chapter_result('Alice', 'Bob', {'chapter_number': 1, 'sentiment_score': 10})
+        assert self.release.wait(timeout=5)
+        return RESULT
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(progress_events, '_progress_bus', ProgressEventBus())
+    monkeypatch.setattr(auditor_api, '_extractions', OrderedDict())
+    service = _StubSentimentService()
+    monkeypatch.setattr(auditor_api, 'get_sentiment_service', lambda: service)
+    app = Flask(__name__)
+    app.register_blueprint(auditor_api.auditor, url_prefix="/api")
+    test_client = app.test_client()
+    test_client.service = service
+    return test_client
+
+
+def _sse_events(body):
+    return [
+        json.loads(line[len('data: '):])
+        for line in body.splitlines()
+        if line.startswith('data: ')
+    ]
+
+
+def _wait_until_finished(client, extraction_id):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        state = client.get(f"/api/auditor/extract-relationships-v2/{extraction_id}").get_json()
+        if state['status'] != 'running':
+            return state
+        time.sleep(0.01)
+    raise AssertionError("extraction did not finish")
+
+
+def test_streamed_extraction_result_outlives_its_stream(client):
+    response = client.post(
+        "/api/auditor/extract-relationships-v2",
+        json={'project_id': 'project-1', 'stream': True},
+        buffered=False,
+    )
+    first = next(chunk for chunk in response.response if b'data: ' in chunk)
+    extraction_id = _sse_events(first.decode())[0]['extraction_id']
+    # The client goes away before the extraction finishes
+    response.close()
+
+    running = client.get(f"/api/auditor/extract-relationships-v2/{extraction_id}")
+    assert running.status_code == 200
+    assert running.get_json() == {'extraction_id': extraction_id, 'status': 'running'}
+
+    client.service.release.set()
+    assert _wait_until_finished(client, extraction_id) == {
+        'extraction_id': extraction_id, 'status': 'completed', 'result': RESULT,
+    }
+
+    resumed = client.get(f"/api/auditor/extract-relationships-v2/{extraction_id}/events")
+    events = _sse_events(resumed.get_data(as_text=True))
+    assert events[-1]['event'] == 'relationship_extraction'
+    assert events[-1]['status'] == 'completed'
+    assert events[-1]['result'] == RESULT
+
+
+def test_resumed_stream_replays_chapters_and_ends_with_the_result(client):
+    response = client.post(
+        "/api/auditor/extract-relationships-v2",
+        json={'project_id': 'project-1', 'stream': True},
+        buffered=False,
+    )
+    first = next(chunk for chunk in response.response if b'data: ' in chunk)
+    extraction_id = _sse_events(first.decode())[0]['extraction_id']
+    response.close()
+
+    threading.Timer(0.1, client.service.release.set).start()
+    resumed = client.get(f"/api/auditor/extract-relationships-v2/{extraction_id}/events")
+    events = [e['event'] for e in _sse_events(resumed.get_data(as_text=True))]
+
+    assert events == ['extraction_started', 'chapter_analysis', 'relationship_extraction']
+
+
+def test_unknown_extraction_is_not_found(client):
+    assert client.get("/api/auditor/extract-relationships-v2/missing").status_code == 404
+    assert client.get("/api/auditor/extract-relationships-v2/missing/events").status_code == 404
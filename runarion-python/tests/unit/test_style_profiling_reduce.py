@@ -0,0 +1,163 @@
+"""
+Unit tests for concurrent partial styles, the partial style cache and the
+map-reduce combination of styles in the style analyzer's ProfilingStage. LLM
+calls and storage are stubs, the cache keeps rows in memory and tokens are
+counted as words, so only grouping, concurrency, cache reuse and the shape of
+the reduce tree are exercised.
+"""
+
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+from src.models.request import GenerationConfig
+from src.services.style_analyzer.partial_style_cache import compute_partial_style_cache_key
+from src.services.style_analyzer.stage_2_profiling import ProfilingStage
+
+
+class _MemoryPartialStyleCache:
+    def __init__(self):
+        self.rows = {}
+
+    def get_many(self, cache_keys):
+        return {key: dict(self.rows[key]) for key in cache_keys if key in self.rows}
+
+    def put(self, cache_key, author_sample_id, provider, model, style):
+        self.rows.setdefault(cache_key, dict(style))
+        return True
+
+
+class _WordCounter:
+    def safe_count(self, text):
+        return len(text.split())
+
+
+def _stage(token_limit, max_workers=3):
+    stage = ProfilingStage.__new__(ProfilingStage)
+    stage.document_processor = SimpleNamespace(token_counter=_WordCounter(), chunk_token_limit=token_limit)
+    stage.max_workers = max_workers
+    stage.partial_style_cache = None
+    stage._provider, stage._model = "mock", "mock-model"
+    stage.generation_config = GenerationConfig(max_output_tokens=2000)
+    stage.calls = []
+    stage.active, stage.peak, stage.lock = [0], [0], threading.Lock()
+
+    def call_llm(text, mode, caller, raise_errors=False):
+        with stage.lock:
+            stage.calls.append((mode, text))
+            stage.active[0] += 1
+            stage.peak[0] = max(stage.peak[0], stage.active[0])
+        time.sleep(0.03)
+        with stage.lock:
+            stage.active[0] -= 1
+        failed = "fail" in text
+        return SimpleNamespace(
+            success=not failed,
+            text="" if failed else f"{mode} style",
+            error_message="boom" if failed else None,
+            metadata=SimpleNamespace(output_tokens=0 if failed else 2, processing_time_ms=1),
+        )
+
+    ids = itertools.count(1)
+
+    def store(author_style_id, style, error_message):
+        with stage.lock:
+            return {"id": f"style-{next(ids)}", **style}
+
+    stage._call_llm = call_llm
+    stage._store_style_chunk = store
+    return stage
+
+
+def _style(style_id, words):
+    return {
+        "id": style_id, "text": " ".join(["w"] * words), "token": words,
+        "processing_time_ms": 0, "chunk": None, "ref_style_ids": None,
+    }
+
+
+def test_styles_are_grouped_by_token_budget():
+    stage = _stage(token_limit=100)
+
+    groups = stage._group_styles([_style(str(n), 30) for n in range(8)])
+
+    assert [len(group) for group in groups] == [3, 3, 2]
+    # Oversized styles are still paired so every round shrinks the list
+    assert [len(group) for group in stage._group_styles([_style(str(n), 150) for n in range(3)])] == [2, 1]
+
+
+def test_combined_style_is_reduced_level_by_level_concurrently():
+    stage = _stage(token_limit=100)
+    styles = [_style(str(n), 30) for n in range(8)]
+
+    combined = stage._handle_combined_style("author-style", styles, caller=None)
+
+    # Level 0 combines 3 groups concurrently, level 1 combines their results
+    assert [mode for mode, _ in stage.calls] == ["combined"] * 4
+    assert stage.peak[0] == 3
+    assert len(combined["ref_style_ids"]) == 3
+    assert combined["text"].endswith("combined style")
+
+
+def test_run_computes_partials_concurrently_and_skips_failed_ones():
+    stage = _stage(token_limit=1000, max_workers=4)
+    stage.min_success_partial_style = 0.5
+    chunks = [
+        {"raw_text": "fail" if n == 2 else f"passage {n}", "chunk_number": n, "sample_name": "a.txt"}
+        for n in range(1, 5)
+    ]
+    stage._get_samples = lambda author_style_id: []
+    stage._chunk_samples = lambda samples: chunks
+    stage._handle_structured_style = lambda combined_style, caller: combined_style
+
+    combined = stage.run("author-style", caller=None)
+
+    partial_calls = [text for mode, text in stage.calls if mode == "partial"]
+    combined_calls = [text for mode, text in stage.calls if mode == "combined"]
+    assert sorted(partial_calls) == ["fail", "passage 1", "passage 3", "passage 4"]
+    assert stage.peak[0] == 4
+    assert len(combined_calls) == 1
+    assert combined_calls[0].count("PASSAGE") == 3
+    assert len(combined["ref_style_ids"]) == 3
+
+
+def _run(stage, texts):
+    chunks = [
+        {"raw_text": text, "chunk_number": n, "sample_id": f"sample-{text}", "sample_name": f"{text}.txt"}
+        for n, text in enumerate(texts, start=1)
+    ]
+    stage.calls.clear()
+    stage.min_success_partial_style = 0.5
+    stage._get_samples = lambda author_style_id: []
+    stage._chunk_samples = lambda samples: chunks
+    stage._handle_structured_style = lambda combined_style, caller: combined_style
+    return stage.run("author-style", caller=None)
+
+
+def test_reprofiling_only_analyzes_uncached_chunks():
+    stage = _stage(token_limit=1000)
+    stage.partial_style_cache = _MemoryPartialStyleCache()
+
+    _run(stage, ["alpha", "beta", "fail"])
+    combined = _run(stage, ["alpha", "beta", "fail", "gamma"])
+
+    # Failed partial styles are not cached, so only they and the new chunk are analyzed again
+    assert sorted(text for mode, text in stage.calls if mode == "partial") == ["fail", "gamma"]
+    combined_text = [text for mode, text in stage.calls if mode == "combined"][0]
+    assert "PASSAGE 1 from FILE alpha.txt\n\npartial style" in combined_text
+    assert len(combined["ref_style_ids"]) == 3
+
+
+def test_cache_key_covers_text_model_prompt_and_generation_config():
+    key = compute_partial_style_cache_key("text", "gemini", "flash", "v1", {"temperature": 0.7})
+
+    assert key == compute_partial_style_cache_key("text", "gemini", "flash", "v1", {"temperature": 0.7})
+    for changed in (
+        ("other", "gemini", "flash", "v1", {"temperature": 0.7}),
+        ("text", "openai", "flash", "v1", {"temperature": 0.7}),
+        ("text", "gemini", "pro", "v1", {"temperature": 0.7}),
+        ("text", "gemini", "flash", "v2", {"temperature": 0.7}),
+        ("text", "gemini", "flash", "v1", {"temperature": 0.2}),
+    ):
+        assert compute_partial_style_cache_key(*changed) != key
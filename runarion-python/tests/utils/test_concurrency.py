@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+from flask import Flask, current_app
+
+from src.config.provider_config import ProviderConcurrencyConfig
+from src.utils.concurrency import run_bounded
+
+
+class TestRunBounded:
+    """Test suite for run_bounded helper."""
+
+    def test_results_preserve_input_order(self):
+        """Results come back in input order even when completion order differs."""
+        delays = [0.05, 0.0, 0.03, 0.01]
+
+        def _work(index):
+            time.sleep(delays[index])
+            return index * 10
+
+        assert run_bounded(_work, range(4), max_workers=4) == [0, 10, 20, 30]
+
+    def test_single_worker_runs_inline(self):
+        """max_workers=1 runs in the calling thread and never builds worker state."""
+        caller = threading.current_thread()
+        factory_calls = []
+
+        def _factory():
+            factory_calls.append(1)
+            return "state"
+
+        results = run_bounded(
+            lambda item, state: (item, state, threading.current_thread() is caller),
+            [1, 2],
+            max_workers=1,
+            worker_state_factory=_factory,
+        )
+
+        assert results == [(1, None, True), (2, None, True)]
+        assert factory_calls == []
+
+    def test_worker_state_created_once_per_thread(self):
+        """Each worker thread builds its own state exactly once."""
+        created = []
+        lock = threading.Lock()
+
+        def _factory():
+            with lock:
+                created.append(threading.get_ident())
+            return threading.get_ident()
+
+        results = run_bounded(
+            lambda item, state: state == threading.get_ident(),
+            range(12),
+            max_workers=3,
+            worker_state_factory=_factory,
+        )
+
+        assert all(results)
+        assert len(created) == len(set(created)) <= 3
+
+    def test_concurrency_is_bounded(self):
+        """No more than max_workers items are in flight at once."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _work(_):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        run_bounded(_work, range(10), max_workers=2)
+        assert peak <= 2
+
+    def test_on_result_sees_every_item(self):
+        """on_result is invoked once per item with the matching index."""
+        seen = {}
+        run_bounded(lambda x: x + 1, [5, 6, 7], max_workers=3, on_result=seen.__setitem__)
+        assert seen == {0: 6, 1: 7, 2: 8}
+
+    def test_first_error_is_raised_after_all_work(self):
+        """The earliest failing item's exception propagates after completion."""
+        finished = []
+
+        def _work(item):
+            if item in (1, 3):
+                raise ValueError(f"bad {item}")
+            time.sleep(0.01)
+            finished.append(item)
+            return item
+
+        with pytest.raises(ValueError, match="bad 1"):
+            run_bounded(_work, range(5), max_workers=3)
+        assert sorted(finished) == [0, 2, 4]
+
+    def test_cancel_on_error_skips_items_not_yet_started(self):
+        """With cancel_on_error, items queued behind a failure never run."""
+        started = []
+
+        def _work(item):
+            started.append(item)
+            if item == 0:
+                raise ValueError("bad 0")
+            time.sleep(0.05)
+            return item
+
+        with pytest.raises(ValueError, match="bad 0"):
+            run_bounded(_work, range(10), max_workers=2, cancel_on_error=True)
+        assert len(started) < 10
+
+    def test_app_context_is_propagated(self):
+        """Workers run inside the caller's Flask app context."""
+        app = Flask("concurrency-test")
+
+        with app.app_context():
+            names = run_bounded(lambda _: current_app.name, range(4), max_workers=4)
+
+        assert names == ["concurrency-test"] * 4
+
+
+class TestProviderConcurrencyConfig:
+    """Test suite for ProviderConcurrencyConfig."""
+
+    def test_provider_default(self):
+        assert ProviderConcurrencyConfig.get_max_workers("gemini") == 4
+
+    def test_unknown_provider_uses_default(self):
+        assert ProviderConcurrencyConfig.get_max_workers("unknown") == 2
+
+    def test_override_and_clamping(self):
+        assert ProviderConcurrencyConfig.get_max_workers("gemini", 1) == 1
+        assert ProviderConcurrencyConfig.get_max_workers("gemini", "3") == 3
+        assert ProviderConcurrencyConfig.get_max_workers("gemini", 0) == 4
+        assert ProviderConcurrencyConfig.get_max_workers("gemini", "bogus") == 4
+        assert ProviderConcurrencyConfig.get_max_workers("gemini", 500) == (
+            ProviderConcurrencyConfig.MAX_WORKERS_CEILING
+        )
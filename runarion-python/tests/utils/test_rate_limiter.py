@@ -0,0 +1,142 @@
+import threading
+import time
+
+from flask import Flask
+
+from src.config.provider_config import ProviderRateLimitConfig
+from src.utils.concurrency import run_bounded
+from src.utils.rate_limiter import (
+    Priority,
+    RateLimiter,
+    current_priority,
+    llm_priority,
+    set_request_priority,
+)
+
+
+PROVIDER = "testprov"
+
+
+def _limiter(monkeypatch, rpm="0", tpm="60000", **kwargs):
+    """Limiter whose test provider refills 1000 tokens per second."""
+    monkeypatch.setenv(f"LLM_RATE_LIMIT_{PROVIDER.upper()}_RPM", rpm)
+    monkeypatch.setenv(f"LLM_RATE_LIMIT_{PROVIDER.upper()}_TPM", tpm)
+    return RateLimiter(enabled=True, **kwargs)
+
+
+def _timed_acquire(limiter, tokens, priority=Priority.BATCH):
+    started = time.monotonic()
+    limiter.acquire(PROVIDER, "model", "key", tokens, priority=priority)
+    return time.monotonic() - started
+
+
+class TestRateLimiter:
+    """Test suite for the process-wide LLM rate limiter."""
+
+    def test_limits_resolve_from_env_overrides(self, monkeypatch):
+        """Env overrides replace provider defaults and 0 disables a limit."""
+        monkeypatch.setenv("LLM_RATE_LIMIT_GEMINI_RPM", "30")
+        monkeypatch.setenv("LLM_RATE_LIMIT_GEMINI_TPM", "0")
+        assert ProviderRateLimitConfig.get_limits("gemini") == (30, None)
+        assert ProviderRateLimitConfig.get_limits("mock") == (None, None)
+
+    def test_tokens_are_paced_at_the_per_minute_rate(self, monkeypatch):
+        """Once the bucket is drained a call waits for its tokens to refill."""
+        limiter = _limiter(monkeypatch, batch_reserve=0.0)
+
+        assert _timed_acquire(limiter, 60000) < 0.05
+        assert 0.15 < _timed_acquire(limiter, 200) < 1.0
+        assert limiter.stats()['waited'] == 1
+
+    def test_interactive_calls_preempt_queued_batch_calls(self, monkeypatch):
+        """An interactive call arriving later is served before a waiting batch call."""
+        limiter = _limiter(monkeypatch, batch_reserve=0.0)
+        limiter.acquire(PROVIDER, "model", "key", 60000)
+        served = []
+
+        def call(name, priority):
+            limiter.acquire(PROVIDER, "model", "key", 300, priority=priority)
+            served.append(name)
+
+        batch = threading.Thread(target=call, args=("batch", Priority.BATCH))
+        batch.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=call, args=("interactive", Priority.INTERACTIVE))
+        interactive.start()
+        batch.join(5)
+        interactive.join(5)
+
+        assert served == ["interactive", "batch"]
+
+    def test_batch_calls_leave_the_reserve_to_interactive_calls(self, monkeypatch):
+        """Batch calls wait once the bucket is down to the reserve; interactive ones don't."""
+        limiter = _limiter(monkeypatch, batch_reserve=0.5)
+
+        assert _timed_acquire(limiter, 30000, Priority.INTERACTIVE) < 0.05
+        assert _timed_acquire(limiter, 100, Priority.INTERACTIVE) < 0.05
+        assert _timed_acquire(limiter, 100, Priority.BATCH) > 0.1
+
+    def test_settling_refunds_unused_tokens(self, monkeypatch):
+        """The reservation is corrected to the tokens the call really used."""
+        limiter = _limiter(monkeypatch, batch_reserve=0.0)
+
+        reservation = limiter.acquire(PROVIDER, "model", "key", 60000)
+        reservation.settle(actual_tokens=1000)
+
+        assert _timed_acquire(limiter, 50000) < 0.05
+
+    def test_rate_limit_error_pauses_the_key(self, monkeypatch):
+        """A 429 pauses every call on that key; other keys are unaffected."""
+        limiter = _limiter(monkeypatch, rpm="6000")
+        limiter.DEFAULT_PAUSE_SECONDS = 0.2
+
+        reservation = limiter.acquire(PROVIDER, "model", "key", 10)
+        reservation.settle(error_message="429 Too Many Requests")
+
+        started = time.monotonic()
+        limiter.acquire(PROVIDER, "other-model", "key", 10)
+        assert time.monotonic() - started < 0.05
+        assert _timed_acquire(limiter, 10) > 0.15
+        assert limiter.stats()['rate_limit_errors'] == 1
+
+    def test_hintless_rate_limit_pauses_back_off_until_a_success(self, monkeypatch):
+        """Consecutive 429s without a retry hint double the pause up to the cap; a success resets it."""
+        limiter = _limiter(monkeypatch, rpm="6000")
+        limiter.DEFAULT_PAUSE_SECONDS = 10
+        limiter.MAX_PAUSE_SECONDS = 35
+        pauses = []
+        monkeypatch.setattr(limiter, "penalize", lambda key, seconds: pauses.append(seconds))
+
+        for message in ["429 Too Many Requests"] * 4 + ["429 Please retry in 3s."]:
+            limiter.acquire(PROVIDER, "model", "key", 10).settle(error_message=message)
+        limiter.acquire(PROVIDER, "model", "key", 10).settle(actual_tokens=10)
+        limiter.acquire(PROVIDER, "model", "key", 10).settle(error_message="429 Too Many Requests")
+
+        assert pauses == [10, 20, 35, 35, 3, 10]
+
+    def test_disabled_limiter_never_waits(self, monkeypatch):
+        """With rate limiting off acquire returns at once."""
+        monkeypatch.setenv(f"LLM_RATE_LIMIT_{PROVIDER.upper()}_TPM", "60")
+        limiter = RateLimiter(enabled=False)
+
+        assert _timed_acquire(limiter, 10000) < 0.05
+        assert _timed_acquire(limiter, 10000) < 0.05
+
+
+class TestPriorityResolution:
+    """Test suite for resolving the priority of an LLM call."""
+
+    def test_default_is_batch_and_context_manager_overrides(self):
+        assert current_priority() == Priority.BATCH
+        with llm_priority(Priority.INTERACTIVE):
+            assert current_priority() == Priority.INTERACTIVE
+        assert current_priority() == Priority.BATCH
+
+    def test_request_priority_is_carried_into_run_bounded_workers(self):
+        app = Flask(__name__)
+
+        with app.test_request_context():
+            set_request_priority(Priority.INTERACTIVE)
+            seen = run_bounded(lambda _: current_priority(), range(4), max_workers=4)
+
+        assert seen == [Priority.INTERACTIVE] * 4